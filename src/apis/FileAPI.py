@@ -4,6 +4,19 @@ from flask_restful import Api
 
 # import local files
 from configs.FileAPIConfig import FileAPIConfig
+from utils.Bulkheads import Bulkhead, Bulkheads
+from utils.Deadlines import Deadlines
+from utils.DiskCache import DiskCache
+from utils.FileAPIContext import FileAPIContext
+from utils.FileIndex import FileIndex
+from utils.HTTPClient import HTTPClient
+from utils.IndexSnapshot import IndexSnapshot
+from utils.Metrics import Metrics
+from utils.ParsePool import ParsePool
+from utils.RequestProfiler import RequestProfiler
+from utils.ResponseCompression import ResponseCompression
+from utils.ServerTiming import ServerTiming
+from utils.TableCache import TableCache
 
 class FileAPI:
     """Class to define an API matching the original website API.
@@ -22,6 +35,116 @@ class FileAPI:
         :type app: Flask
         """
         api = Api(app)
+        metrics = None
+        if settings.MetricsEnabled:
+            # Registered ahead of every other hook, so request latencies include time spent waiting for a bulkhead turn.
+            metrics = app.extensions[Metrics.EXTENSION_KEY] = Metrics(path=settings.MetricsPath, buckets=settings.MetricsLatencyBuckets, token=settings.MetricsToken)
+            app.before_request(metrics.BeforeRequest)
+            app.after_request(metrics.AfterRequest)
+            app.teardown_request(metrics.TeardownRequest)
+        if settings.ServerTimingEnabled:
+            # Registered ahead of response compression, so its after_request hook runs once the body is compressed.
+            app.extensions[ServerTiming.EXTENSION_KEY] = ServerTiming(header=settings.ServerTimingHeader, metrics=metrics)
+            app.before_request(app.extensions[ServerTiming.EXTENSION_KEY].BeforeRequest)
+            app.after_request(app.extensions[ServerTiming.EXTENSION_KEY].AfterRequest)
+        if settings.ProfilingEnabled:
+            app.extensions[RequestProfiler.EXTENSION_KEY] = RequestProfiler(
+                header=settings.ProfilingHeader,
+                token=settings.ProfilingToken,
+                directory=settings.ProfilingDirectory,
+                max_files=settings.ProfilingMaxFiles
+            )
+            if app.extensions[RequestProfiler.EXTENSION_KEY].Enabled:
+                app.before_request(app.extensions[RequestProfiler.EXTENSION_KEY].BeforeRequest)
+                app.after_request(app.extensions[RequestProfiler.EXTENSION_KEY].AfterRequest)
+                app.teardown_request(app.extensions[RequestProfiler.EXTENSION_KEY].TeardownRequest)
+            else:
+                app.logger.warning("PROFILING is enabled, but has no TOKEN or DIRECTORY, so no requests will be profiled.")
+        app.extensions[ParsePool.EXTENSION_KEY] = ParsePool(
+            max_workers=settings.ParsePoolWorkers,
+            max_queued=settings.ParsePoolMaxQueued,
+            job_timeout=settings.ParsePoolJobTimeout,
+            start_method=settings.ParsePoolStartMethod,
+            python_path=settings.ParsePoolPythonPath
+        )
+        app.extensions[TableCache.EXTENSION_KEY] = TableCache(max_bytes=settings.CacheMaxBytes)
+        app.extensions[DiskCache.EXTENSION_KEY] = DiskCache(
+            directory=settings.DiskCacheDirectory,
+            max_bytes=settings.DiskCacheMaxBytes,
+            max_age_seconds=settings.DiskCacheMaxAgeSeconds,
+            evict_interval=settings.DiskCacheEvictInterval,
+            logger=app.logger
+        )
+        app.extensions[HTTPClient.EXTENSION_KEY] = HTTPClient(
+            max_hosts=settings.HTTPClientMaxHosts,
+            max_per_host=settings.HTTPClientMaxPerHost,
+            block=settings.HTTPClientBlock,
+            connect_timeout=settings.HTTPClientConnectTimeout,
+            read_timeout=settings.HTTPClientReadTimeout,
+            retries=settings.HTTPClientRetries,
+            backoff=settings.HTTPClientBackoff,
+            failure_threshold=settings.CircuitBreakerFailureThreshold,
+            reset_seconds=settings.CircuitBreakerResetSeconds,
+            half_open_probes=settings.CircuitBreakerHalfOpenProbes,
+            metrics=metrics
+        )
+        app.extensions[ResponseCompression.EXTENSION_KEY] = ResponseCompression(
+            encodings=settings.CompressionEncodings,
+            min_bytes=settings.CompressionMinBytes,
+            levels=settings.CompressionLevels,
+            cached_levels=settings.CompressionCachedLevels
+        )
+        app.after_request(app.extensions[ResponseCompression.EXTENSION_KEY].Apply)
+        # Registered ahead of the bulkheads, so time spent waiting for a turn counts against the deadline.
+        app.extensions[Deadlines.EXTENSION_KEY] = Deadlines(default_seconds=settings.DeadlineDefaultSeconds, route_seconds=settings.DeadlineRouteSeconds)
+        app.before_request(app.extensions[Deadlines.EXTENSION_KEY].BeforeRequest)
+        app.extensions[Bulkheads.EXTENSION_KEY] = Bulkheads(
+            files=Bulkhead(
+                name="files",
+                max_active=settings.BulkheadFileActive,
+                max_queued=settings.BulkheadFileQueued,
+                queue_timeout=settings.BulkheadFileQueueTimeout
+            ),
+            metadata=Bulkhead(
+                name="metadata",
+                max_active=settings.BulkheadMetadataActive,
+                max_queued=settings.BulkheadMetadataQueued,
+                queue_timeout=settings.BulkheadMetadataQueueTimeout
+            ),
+            retry_after=settings.BulkheadRetryAfter
+        )
+        app.before_request(app.extensions[Bulkheads.EXTENSION_KEY].BeforeRequest)
+        app.after_request(app.extensions[Bulkheads.EXTENSION_KEY].AfterRequest)
+        app.teardown_request(app.extensions[Bulkheads.EXTENSION_KEY].TeardownRequest)
+        snapshot = None
+        if settings.FileIndexSnapshotDir:
+            if IndexSnapshot.Supported():
+                snapshot = IndexSnapshot(directory=settings.FileIndexSnapshotDir)
+            else:
+                app.logger.warning("FILE_INDEX.SNAPSHOT_DIR is set, but shared snapshots aren't supported on this platform; each process will fetch its own file list.")
+        app.extensions[FileAPIContext.EXTENSION_KEY] = FileAPIContext(
+            config=settings,
+            index=FileIndex(
+                url=settings.FileListURL,
+                client=app.extensions[HTTPClient.EXTENSION_KEY],
+                refresh_seconds=settings.FileIndexRefreshSeconds,
+                snapshot=snapshot,
+                metrics=metrics
+            ),
+            http_client=app.extensions[HTTPClient.EXTENSION_KEY],
+            parse_pool=app.extensions[ParsePool.EXTENSION_KEY],
+            table_cache=app.extensions[TableCache.EXTENSION_KEY],
+            disk_cache=app.extensions[DiskCache.EXTENSION_KEY],
+            compression=app.extensions[ResponseCompression.EXTENSION_KEY]
+        )
+        if metrics is not None:
+            context : FileAPIContext = app.extensions[FileAPIContext.EXTENSION_KEY]
+            metrics.AddStats("table_cache", lambda : context.table_cache.Stats, counters={"hits", "misses", "evictions"})
+            metrics.AddStats("disk_cache", lambda : context.disk_cache.Stats, counters={"hits", "misses", "writes", "errors", "evictions"})
+            metrics.AddStats("bulkhead", lambda : app.extensions[Bulkheads.EXTENSION_KEY].Stats, counters={"admitted", "rejected", "timed_out"}, label="bulkhead")
+            metrics.AddBreakers(lambda : context.http_client.BreakerStats)
+            metrics.AddGauge("file_index_age_seconds", "Seconds since the copy of the file list in use was fetched.", lambda : context.index.Age)
+            app.add_url_rule(metrics.Path, endpoint="metrics", view_func=metrics.View)
 
         try:
             from apis.resources.GameList import GameList
@@ -54,6 +177,26 @@ class FileAPI:
             api.add_resource(DatasetManifest,  '/games/<string:game_id>/datasets/<int:year>/<int:month>/manifest')
         except Exception as err:
             app.logger.warning(f"Couldn't register DatasetManifest resource:\n   {err}")
+        try:
+            from apis.resources.DatasetFileJoin import DatasetFileJoin
+            api.add_resource(DatasetFileJoin,  '/games/<string:game_id>/datasets/<int:year>/<int:month>/joined')
+        except Exception as err:
+            app.logger.warning(f"Couldn't register DatasetFileJoin resource:\n   {err}")
+        try:
+            from apis.resources.DatasetFileStats import DatasetFileStats
+            api.add_resource(DatasetFileStats, '/games/<string:game_id>/datasets/<int:year>/<int:month>/<string:file_type>/stats')
+        except Exception as err:
+            app.logger.warning(f"Couldn't register DatasetFileStats resource:\n   {err}")
+        try:
+            from apis.resources.DatasetFileFacets import DatasetFileFacets
+            api.add_resource(DatasetFileFacets, '/games/<string:game_id>/datasets/<int:year>/<int:month>/<string:file_type>/facets')
+        except Exception as err:
+            app.logger.warning(f"Couldn't register DatasetFileFacets resource:\n   {err}")
+        try:
+            from apis.resources.DatasetFileRange import DatasetFileRange
+            api.add_resource(DatasetFileRange, '/games/<string:game_id>/datasets/<string:month_range>/<string:file_type>')
+        except Exception as err:
+            app.logger.warning(f"Couldn't register DatasetFileRange resource:\n   {err}")
         try:
             from apis.resources.DatasetFile import DatasetFile
             api.add_resource(DatasetFile,      '/games/<string:game_id>/datasets/<int:year>/<int:month>/<string:file_type>')
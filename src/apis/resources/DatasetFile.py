@@ -1,29 +1,36 @@
 # import standard libraries
-import dataclasses
-import json
 import zipfile
-from io import BytesIO
-from typing import Optional
+from tempfile import SpooledTemporaryFile
+from typing import Dict, Final, Optional, Set
 from urllib import error as url_error
-from urllib import request as url_request
 
 # import 3rd-party libraries
-import pandas as pd
-from flask import current_app
+import numpy as np
+from flask import current_app, request, Response
 from flask_restful import Resource
 
 # import ogd libraries
 from ogd.apis.models.APIResponse import APIResponse
 from ogd.apis.models.enums.RESTType import RESTType
 from ogd.apis.models.enums.ResponseStatus import ResponseStatus
-from ogd.apis.models.files.DatasetFile import DatasetFile as DatasetFileModel
+from ogd.apis.models.files.DatasetFile import FileTypes
 from ogd.common.configs.storage.DatasetRepositoryConfig import DatasetRepositoryConfig
 from ogd.common.schemas.datasets.DatasetSchema import DatasetSchema
 
 # import local files
 from configs.FileAPIConfig import FileAPIConfig
+from utils.CircuitBreaker import CircuitOpenError
+from utils.DatasetFileParser import DatasetFileParser, FileTooLargeError, TableTooLargeError
+from utils.DatasetTables import DatasetTables
+from utils.Deadlines import DeadlineExceededError
+from utils.FileAPIContext import FileAPIContext
+from utils.FileQuery import FileQuery
+from utils.ParsePool import ParsePool, ParsePoolFullError, ParsePoolTimeoutError
+from utils.ResponseCompression import ResponseCompression
 from utils.SanitizedParams import SanitizedParams
-from utils.utils import GetFileList, FindDataset
+from utils.TableAnalysis import TableAnalysis
+from utils.TableCache import TableCache
+from utils.utils import DownloadFile, FindDataset
 
 
 class DatasetFile(Resource):
@@ -34,22 +41,37 @@ class DatasetFile(Resource):
     - Game ID
     - Year
     - Month
+    - File Type
+    - (optional) `columns`, `session_id`, `offset`, and `limit` query args, to select part of the file
+    - (optional) `group_by` and `agg` query args, to get an aggregate table instead of the file's rows
+    - (optional) `sort` query arg, to sort the rows by a column
+    - (optional) `sample` and `seed` query args, to get a reproducible random sample of the rows
+    - (optional) `members` query arg, a pattern for the names of the archive's `.tsv` members to return as separate tables
     Outputs:
-    - DatasetSchema of most recently-exported dataset for game in month
+    - Columns and rows of the requested file from the most recently-exported dataset for game in month,
+      or a `members` mapping from member name to columns and rows, if `members` was given
     """
+    SUCCESS_MSG    : Final[str]            = "Retrieved game file info by month"
+    STREAMED_TYPES : Final[Set[FileTypes]] = {FileTypes.EVENT, FileTypes.ALL_EVENT, FileTypes.COMBINED}
+
     def get(self, game_id, month, year, file_type):
-        ret_val = APIResponse.Default(req_type=RESTType.GET)
+        ret_val   = APIResponse.Default(req_type=RESTType.GET)
+        response  : Optional[Response] = None
+        file_link : Optional[str]      = None
 
         safe_game_id  = SanitizedParams.SanitizeGameID(game_id=game_id)
         safe_year     = SanitizedParams.SanitizeYear(year=year)
         safe_month    = SanitizedParams.SanitizeMonth(month=month)
         safe_filetype = SanitizedParams.SanitizeFileType(file_type=file_type)
+        safe_query    = FileQuery.FromArgs(args=request.args)
+        raw_members   = request.args.get("members")
+        safe_members  = SanitizedParams.SanitizeMemberPattern(pattern=raw_members)
+        members_ok    = raw_members is None or (safe_members is not None and safe_query is not None and not safe_query.NeedsTable and safe_query.sample is None)
 
         # 1. Get the list of datasets available on the server, for given game.
-        if safe_game_id and safe_year and safe_month and safe_filetype:
+        if safe_game_id and safe_year and safe_month and safe_filetype and safe_query is not None and members_ok:
             try:
-                cfg             : FileAPIConfig           = FileAPIConfig("FileAPIConfig", {})
-                file_list       : DatasetRepositoryConfig = GetFileList(cfg.FileListURL)
+                file_list       : DatasetRepositoryConfig = FileAPIContext.Current().FileList()
                 matched_dataset : Optional[DatasetSchema] = FindDataset(game_id=safe_game_id, year=safe_year, month=safe_month, available_datasets=file_list.Games)
 
             # 2. Search for the most recently modified dataset that contains the requested month and year
@@ -58,35 +80,74 @@ class DatasetFile(Resource):
                     if file_list.RemoteURL is not None:
                         matched_dataset.BaseFileLocation = file_list.RemoteURL
 
-                    file_link = None
-                    missing_file_msg = f"Dataset for {game_id} from {f'{month:02}/{year:04}'} was not found."
-                    match str(file_type).upper():
-                        case "SESSION":
-                            file_link = matched_dataset.SessionsFile(relative=False)
-                        case "PLAYER":
-                            file_link = matched_dataset.PlayersFile(relative=False)
-                        case "POPULATION":
-                            file_link = matched_dataset.PopulationFile(relative=False)
-                        case "EVENT":
-                            missing_file_msg="Event files are not yet supported."
-                        case _:
-                            missing_file_msg=f"Unrecognized file type {file_type}."
-                    if file_link:
-                        datafile_response = url_request.urlopen(file_link)
-                        with zipfile.ZipFile(BytesIO(datafile_response.read())) as zipped:
-                            for f_name in zipped.namelist():
-                                if f_name.endswith(".tsv"):
-                                    raw_data = pd.read_csv(zipped.open(f_name), sep="\t").replace({float('nan'):None})
-                                    raw_data = self._secondaryParse(raw_data)
-                                    dataset = DatasetFileModel(
-                                        columns=list(raw_data.columns),
-                                        rows=list(raw_data.apply(lambda series : series.to_dict(), axis=1))
-                                    )
-                                    ret_val.RequestSucceeded(msg="Retrieved game file info by month", val=dataclasses.asdict(dataset))
+                    file_link = DatasetTables.FileLink(dataset=matched_dataset, file_type=safe_filetype)
+                    if file_link and safe_members is not None:
+                        # 3. Requested members are each parsed as their own table, in one parse pool job, which reads them in parallel threads.
+                        response = self._parseMembers(file_link=file_link, pattern=safe_members, query=safe_query, types=DatasetTables.ParseTypes(dataset=matched_dataset, file_type=safe_filetype))
+                    elif file_link and safe_query.NeedsTable:
+                        # 3. Aggregates and sorts are computed from the cached table.
+                        #    Aggregates are small, so they're cached themselves, per query, while sorts cache a permutation per column.
+                        if safe_filetype in DatasetTables.TABLE_TYPES:
+                            if safe_query.IsAggregate:
+                                response = self._aggregateFile(dataset=matched_dataset, file_type=safe_filetype, query=safe_query)
+                            else:
+                                response = self._sortFile(dataset=matched_dataset, file_type=safe_filetype, query=safe_query)
+                            if response is None:
+                                ret_val.ServerErrored(msg=f"The {file_type} file for {safe_game_id} in {safe_month:>02}/{safe_year:>04} did not contain a data table.", status=ResponseStatus.INTERNAL_ERR)
+                        else:
+                            ret_val.RequestErrored(msg=f"Aggregation and sorting are not available for {file_type} files", status=ResponseStatus.BAD_REQUEST)
+                    elif file_link and safe_query.sample is not None and safe_filetype in DatasetTables.TABLE_TYPES:
+                        # 3. Feature files are sampled by row position from the cached table, so only the sampled rows are copied.
+                        #    A table too big to load is sampled from the stream instead, the same as an event file.
+                        try:
+                            response = self._sampleFile(dataset=matched_dataset, file_type=safe_filetype, query=safe_query)
+                        except TableTooLargeError as err:
+                            current_app.logger.info(f"Sampling {file_link} from a stream, since it's too large to load:\n{err}")
+                            response = self._streamFile(file_link=file_link, query=safe_query, types=DatasetTables.ParseTypes(dataset=matched_dataset, file_type=safe_filetype))
+                        if response is None:
+                            ret_val.ServerErrored(msg=f"The {file_type} file for {safe_game_id} in {safe_month:>02}/{safe_year:>04} did not contain a data table.", status=ResponseStatus.INTERNAL_ERR)
+                    elif file_link:
+                        # 3. Event and combined files are too big to ever hold in memory, so they're always streamed, and sampled from the stream.
+                        #    Everything else is parsed in the parse pool, so it doesn't hold up the rest of the worker, unless it's too big to parse whole.
+                        types = DatasetTables.ParseTypes(dataset=matched_dataset, file_type=safe_filetype)
+                        if safe_filetype in self.STREAMED_TYPES:
+                            response = self._streamFile(file_link=file_link, query=safe_query, types=types)
+                        else:
+                            try:
+                                response = self._parseFile(file_link=file_link, query=safe_query, types=types)
+                            except CircuitOpenError as err:
+                                # While the file server is down, a table that's still cached is served as it was, rather than failing the request.
+                                response = self._staleFile(dataset=matched_dataset, file_type=safe_filetype, query=safe_query)
+                                if response is None:
+                                    raise
+                                current_app.logger.warning(f"Served cached {file_type} file for {safe_game_id} in {safe_month:>02}/{safe_year:>04}, since the file server is unavailable:\n{err}")
+                        if response is None:
+                            ret_val.ServerErrored(msg=f"The {file_type} file for {safe_game_id} in {safe_month:>02}/{safe_year:>04} did not contain a data table.", status=ResponseStatus.INTERNAL_ERR)
                     else:
-                        ret_val.RequestErrored(msg=missing_file_msg, status=ResponseStatus.BAD_REQUEST)
+                        ret_val.RequestErrored(msg=f"Dataset for {game_id} from {f'{month:02}/{year:04}'} was not found.", status=ResponseStatus.BAD_REQUEST)
                 else:
                     ret_val.RequestErrored(msg=f"Could not find a dataset for {safe_game_id} in {safe_month:>02}/{safe_year:>04}", status=ResponseStatus.NOT_FOUND)
+            except TableTooLargeError as err:
+                current_app.logger.warning(f"Rejected {file_type} file request for {safe_game_id} in {safe_month:>02}/{safe_year:>04}, table was too large to load:\n{err}")
+                if safe_members is not None:
+                    ret_val.RequestErrored(msg=f"The members of the {file_type} file for {safe_game_id} in {safe_month:>02}/{safe_year:>04} that match '{safe_members}' are too large to load together ({err.Description}). Request fewer members at a time instead.", status=ResponseStatus.CONTENT_TOO_LARGE)
+                else:
+                    ret_val.RequestErrored(msg=f"The {file_type} file for {safe_game_id} in {safe_month:>02}/{safe_year:>04} is too large to aggregate or sort ({err.Description}). Request its rows without group_by or sort to have them streamed instead.", status=ResponseStatus.CONTENT_TOO_LARGE)
+            except FileTooLargeError as err:
+                current_app.logger.warning(f"Rejected {file_type} file request for {safe_game_id} in {safe_month:>02}/{safe_year:>04}, file was too large to serve:\n{err}")
+                ret_val.RequestErrored(msg=f"The {file_type} file for {safe_game_id} in {safe_month:>02}/{safe_year:>04} is too large to serve through the API ({err.Description}). Download it from {file_link} instead.", status=ResponseStatus.CONTENT_TOO_LARGE)
+            except ParsePoolFullError as err:
+                current_app.logger.warning(f"Rejected {file_type} file request for {safe_game_id} in {safe_month:>02}/{safe_year:>04}, parse pool was full:\n{err}")
+                ret_val.ServerErrored(msg="Server is busy processing other dataset files, please try again shortly.", status=ResponseStatus.UNAVAILABLE)
+            except CircuitOpenError as err:
+                current_app.logger.warning(f"Rejected {file_type} file request for {safe_game_id} in {safe_month:>02}/{safe_year:>04}, the file server's circuit is open:\n{err}")
+                ret_val.ServerErrored(msg=f"Server could not retrieve {file_type} file from {safe_game_id} in {safe_month:>02}/{safe_year:>04} while the file server is unavailable, please try again shortly.", status=ResponseStatus.UNAVAILABLE)
+            except DeadlineExceededError as err:
+                current_app.logger.warning(f"Stopped {file_type} file request for {safe_game_id} in {safe_month:>02}/{safe_year:>04}, its deadline passed:\n{err}")
+                ret_val.ServerErrored(msg=f"Server could not retrieve {file_type} file from {safe_game_id} in {safe_month:>02}/{safe_year:>04} within the time allowed for this request.", status=ResponseStatus.GATEWAY_TIMEOUT)
+            except ParsePoolTimeoutError as err:
+                current_app.logger.error(f"Timed out parsing {file_type} file from {file_link}:\n{err}")
+                ret_val.ServerErrored(msg=f"Server timed out while processing {file_type} file from {safe_game_id} in {safe_month:>02}/{safe_year:>04}.", status=ResponseStatus.GATEWAY_TIMEOUT)
             except url_error.HTTPError as err:
                 current_app.logger.error(f"HTTP error getting {file_type} file from {file_link}:\n{err}")
                 ret_val.ServerErrored(msg=f"Server experienced an error retrieving {file_type} file from {safe_game_id} in {safe_month:>02}/{safe_year:>04}.", status=ResponseStatus.INTERNAL_ERR)
@@ -102,18 +163,213 @@ class DatasetFile(Resource):
             ret_val.RequestErrored(msg=f"Invalid Month '{month}'", status=ResponseStatus.BAD_REQUEST)
         elif safe_filetype is None:
             ret_val.RequestErrored(msg=f"Invalid File Type '{file_type}'", status=ResponseStatus.BAD_REQUEST)
+        elif safe_query is None:
+            ret_val.RequestErrored(msg=f"Invalid query parameters '{request.query_string.decode()}'", status=ResponseStatus.BAD_REQUEST)
+        elif safe_members is None:
+            ret_val.RequestErrored(msg=f"Invalid members pattern '{raw_members}'", status=ResponseStatus.BAD_REQUEST)
+        else:
+            ret_val.RequestErrored(msg="The members query arg can't be combined with group_by, sort, or sample", status=ResponseStatus.BAD_REQUEST)
 
-        return ret_val.AsFlaskResponse
+        return response if response is not None else ret_val.AsFlaskResponse
 
     @staticmethod
-    def _secondaryParse(df:pd.DataFrame) -> pd.DataFrame:
-        json_cols = [col for col in df.select_dtypes("object").columns if set(map(type, df[col])) == {str} and df[col].iloc[0][0] in {"[", "{"}]
-        for col in json_cols:
-            try:
-                df[col] = df[col].apply(json.loads)
-            except json.decoder.JSONDecodeError as err:
-                current_app.logger.debug(f"Column {col} was identified as JSON-format, but could not be parsed:\n{err}")
-        df = df.astype({col:"object" for col in df.select_dtypes("int64").columns})
-        df = df.astype({col:"object" for col in df.select_dtypes("bool").columns})
+    def _parseFile(file_link:str, query:FileQuery, types:Dict[str, str]) -> Optional[Response]:
+        """Parse a whole file in the parse pool, or stream it if its table is too big to load into memory.
+
+        The table's size is checked from the archive's central directory, before anything is decompressed.
+        """
+        ret_val : Optional[Response] = None
+
+        cfg      : FileAPIConfig = FileAPIContext.Current().config
+        archive  = DownloadFile(url=file_link, max_memory=cfg.StreamSpoolBytes)
+        streamed = False
+        try:
+            with zipfile.ZipFile(archive) as zipped:
+                member = DatasetFileParser.TableMember(zipped, expected=DatasetFileParser.ExpectedMember(file_link))
+            if member is not None:
+                try:
+                    DatasetFileParser.CheckSize(member, max_file_bytes=cfg.SizeLimitFileBytes, max_table_bytes=cfg.SizeLimitTableBytes)
+                except TableTooLargeError as err:
+                    # The streamed body is the same as the parsed one, just built one chunk of rows at a time.
+                    current_app.logger.info(f"Streaming {file_link}, since it's too large to parse whole:\n{err}")
+                    streamed = True
+                    ret_val  = DatasetFile._streamArchive(archive=archive, file_link=file_link, query=query, types=types)
+                else:
+                    archive.seek(0)
+                    pool : ParsePool = FileAPIContext.Current().parse_pool
+                    body = pool.Run(DatasetFileParser.ParseAndEncode, archive.read(), DatasetFile._successMessage(query), query, types, member.filename)
+                    if body is not None:
+                        ret_val = Response(response=body, status=ResponseStatus.OK.value, mimetype='application/json')
+                        # A sample with a random seed is a one-off, so there's no point caching its compressed body.
+                        if query.sample is None:
+                            ResponseCompression.CacheBody()
+        finally:
+            if not streamed:
+                archive.close()
+
+        return ret_val
+
+    @staticmethod
+    def _parseMembers(file_link:str, pattern:str, query:FileQuery, types:Dict[str, str]) -> Response:
+        """Parse each of the archive's `.tsv` members that match a pattern as its own table, in one parse pool job.
+
+        Only the matching members are decompressed, and their combined size is checked against the table limit before any of them are.
+        """
+        ret_val : Response
+
+        cfg     : FileAPIConfig = FileAPIContext.Current().config
+        archive = DownloadFile(url=file_link, max_memory=cfg.StreamSpoolBytes)
+        with archive:
+            with zipfile.ZipFile(archive) as zipped:
+                members = [info for info in DatasetFileParser.MatchMembers(zipped, pattern) if info.filename.endswith(".tsv")]
+            if len(members) > 0:
+                total = sum(info.file_size for info in members)
+                for info in members:
+                    DatasetFileParser.CheckSize(info, max_file_bytes=cfg.SizeLimitFileBytes)
+                if 0 < cfg.SizeLimitTableBytes < total:
+                    raise TableTooLargeError(member=", ".join(info.filename for info in members), size=total, limit=cfg.SizeLimitTableBytes)
+                archive.seek(0)
+                pool : ParsePool = FileAPIContext.Current().parse_pool
+                body = pool.Run(DatasetFileParser.ParseAndEncodeMembers, archive.read(), DatasetFile.SUCCESS_MSG, [info.filename for info in members], query, types, cfg.ParsePoolMemberThreads)
+                ret_val = Response(response=body, status=ResponseStatus.OK.value, mimetype='application/json')
+            else:
+                missing_response = APIResponse.Default(req_type=RESTType.GET)
+                missing_response.RequestErrored(msg=f"No tables in {file_link} match the members pattern '{pattern}'", status=ResponseStatus.NOT_FOUND)
+                ret_val = missing_response.AsFlaskResponse
+
+        return ret_val
+
+    @staticmethod
+    def _aggregateFile(dataset:DatasetSchema, file_type:FileTypes, query:FileQuery) -> Optional[Response]:
+        ret_val : Optional[Response] = None
+
+        cache : TableCache = FileAPIContext.Current().table_cache
+        key   = DatasetTables.CacheKey(dataset, file_type, "query", query.CacheVariant)
+        body  : Optional[bytes] = cache.Get(key)
+        if body is None:
+            table = DatasetTables.LoadTable(dataset=dataset, file_type=file_type)
+            if table is not None:
+                missing_cols = [col for col in query.AggregateColumns if col not in table.columns]
+                if query.sort is not None and query.sort[0] not in query.AggregateOutputColumns:
+                    missing_cols.append(query.sort[0])
+                bad_cols = TableAnalysis.UnaggregatableColumns(table, group_by=query.group_by or [], aggregations=query.aggregations) if len(missing_cols) == 0 else []
+                if len(missing_cols) == 0 and len(bad_cols) == 0:
+                    body = DatasetFileParser.EncodeTable(table=query.Apply(table), msg=DatasetFile.SUCCESS_MSG)
+                    cache.Put(key, body)
+                else:
+                    error_response = APIResponse.Default(req_type=RESTType.GET)
+                    if len(missing_cols) > 0:
+                        error_response.RequestErrored(msg=f"Columns {missing_cols} were not found in the {file_type.name.lower()} file", status=ResponseStatus.BAD_REQUEST)
+                    else:
+                        error_response.RequestErrored(msg=f"Columns {bad_cols} can't be grouped or aggregated as requested", status=ResponseStatus.BAD_REQUEST)
+                    ret_val = error_response.AsFlaskResponse
+        if body is not None:
+            ret_val = Response(response=body, status=ResponseStatus.OK.value, mimetype='application/json')
+            ResponseCompression.CacheBody()
+
+        return ret_val
+
+    @staticmethod
+    def _sortFile(dataset:DatasetSchema, file_type:FileTypes, query:FileQuery) -> Optional[Response]:
+        """Sort a table by one column, and return the requested page of it.
+
+        The full sort permutation is cached per column and direction, so repeated top-N requests only cost a slice of the table.
+        When caching is disabled, `argpartition` is used to sort just the rows up to the requested limit.
+        """
+        ret_val : Optional[Response] = None
+
+        table = DatasetTables.LoadTable(dataset=dataset, file_type=file_type)
+        if table is not None:
+            column, descending = query.sort or ("", False)
+            order : Optional[np.ndarray] = None
+            error_response = APIResponse.Default(req_type=RESTType.GET)
+            if column in table.columns:
+                cache : TableCache = FileAPIContext.Current().table_cache
+                try:
+                    if cache.Enabled:
+                        order = cache.GetOrCompute(
+                            DatasetTables.CacheKey(dataset, file_type, "sort", column, descending),
+                            lambda : TableAnalysis.SortPermutation(TableAnalysis.SortKey(table[column]), descending=descending)
+                        )
+                    else:
+                        k     = query.offset + query.limit if query.limit is not None else None
+                        order = TableAnalysis.TopPositions(TableAnalysis.SortKey(table[column]), k=k, descending=descending, candidates=query.MatchingPositions(table))
+                except TypeError:
+                    error_response.RequestErrored(msg=f"Column {column} can't be sorted", status=ResponseStatus.BAD_REQUEST)
+            else:
+                error_response.RequestErrored(msg=f"Column {column} was not found in the {file_type.name.lower()} file", status=ResponseStatus.BAD_REQUEST)
+
+            if order is not None:
+                body = DatasetFileParser.EncodeTable(table=query.Apply(table, order=order), msg=DatasetFile.SUCCESS_MSG)
+                ret_val = Response(response=body, status=ResponseStatus.OK.value, mimetype='application/json')
+                ResponseCompression.CacheBody()
+            else:
+                ret_val = error_response.AsFlaskResponse
+
+        return ret_val
+
+    @staticmethod
+    def _sampleFile(dataset:DatasetSchema, file_type:FileTypes, query:FileQuery) -> Optional[Response]:
+        ret_val : Optional[Response] = None
+
+        table = DatasetTables.LoadTable(dataset=dataset, file_type=file_type)
+        if table is not None:
+            body = DatasetFileParser.EncodeTable(table=query.Apply(table), msg=DatasetFile._successMessage(query))
+            ret_val = Response(response=body, status=ResponseStatus.OK.value, mimetype='application/json')
+
+        return ret_val
+
+    @staticmethod
+    def _staleFile(dataset:DatasetSchema, file_type:FileTypes, query:FileQuery) -> Optional[Response]:
+        """Answer from a table that's already in the cache, if there is one, marked with a `Warning` header as possibly out of date."""
+        ret_val : Optional[Response] = None
+
+        table = DatasetTables.CachedTable(dataset=dataset, file_type=file_type) if file_type in DatasetTables.TABLE_TYPES else None
+        if table is not None:
+            body = DatasetFileParser.EncodeTable(table=query.Apply(table), msg=DatasetFile._successMessage(query))
+            ret_val = Response(response=body, status=ResponseStatus.OK.value, mimetype='application/json')
+            ret_val.headers["Warning"] = '110 - "Response is Stale"'
+
+        return ret_val
+
+    @staticmethod
+    def _successMessage(query:FileQuery) -> str:
+        """Get the success message for a query, which includes the seed of a sample, so the client can repeat it."""
+        return f"{DatasetFile.SUCCESS_MSG}, sampled with seed {query.seed}" if query.sample is not None else DatasetFile.SUCCESS_MSG
+
+    @staticmethod
+    def _streamFile(file_link:str, query:FileQuery, types:Dict[str, str]) -> Optional[Response]:
+        """Stream a file's table back in chunks, holding at most one chunk of rows in memory.
+
+        The download itself spills to disk past the configured spool size, since a zip can't be read until its central directory (at the end) has arrived.
+        """
+        cfg     : FileAPIConfig = FileAPIContext.Current().config
+        archive = DownloadFile(url=file_link, max_memory=cfg.StreamSpoolBytes)
+        return DatasetFile._streamArchive(archive=archive, file_link=file_link, query=query, types=types)
+
+    @staticmethod
+    def _streamArchive(archive:SpooledTemporaryFile, file_link:str, query:FileQuery, types:Dict[str, str]) -> Optional[Response]:
+        """Stream the table of an already-downloaded archive.
+
+        The response takes ownership of the archive, closing it once the response is done, or right away if there's nothing to stream.
+        """
+        ret_val : Optional[Response] = None
+
+        cfg    : FileAPIConfig             = FileAPIContext.Current().config
+        zipped : Optional[zipfile.ZipFile] = None
+        try:
+            zipped = zipfile.ZipFile(archive)
+            member = DatasetFileParser.TableMember(zipped, expected=DatasetFileParser.ExpectedMember(file_link))
+            if member is not None:
+                DatasetFileParser.CheckSize(member, max_file_bytes=cfg.SizeLimitFileBytes)
+                stream = DatasetFileParser.StreamTable(zipped=zipped, member=member.filename, msg=DatasetFile._successMessage(query), query=query, chunk_rows=cfg.StreamChunkRows, types=types)
+                ret_val = Response(response=stream, status=ResponseStatus.OK.value, mimetype='application/json')
+                ret_val.call_on_close(zipped.close)
+                ret_val.call_on_close(archive.close)
+        finally:
+            if ret_val is None:
+                if zipped is not None:
+                    zipped.close()
+                archive.close()
 
-        return df
+        return ret_val
@@ -0,0 +1,139 @@
+# import standard libraries
+from typing import Any, Dict, Final, Optional
+from urllib import error as url_error
+
+# import 3rd-party libraries
+from flask import current_app, request
+from flask_restful import Resource
+
+# import ogd libraries
+from ogd.apis.models.APIResponse import APIResponse
+from ogd.apis.models.enums.RESTType import RESTType
+from ogd.apis.models.enums.ResponseStatus import ResponseStatus
+from ogd.apis.models.files.DatasetFile import FileTypes
+from ogd.common.configs.storage.DatasetRepositoryConfig import DatasetRepositoryConfig
+from ogd.common.schemas.datasets.DatasetSchema import DatasetSchema
+
+# import local files
+from utils.CircuitBreaker import CircuitOpenError
+from utils.DatasetFileParser import FileTooLargeError
+from utils.DatasetTables import DatasetTables
+from utils.Deadlines import DeadlineExceededError
+from utils.FileAPIContext import FileAPIContext
+from utils.ParsePool import ParsePoolFullError, ParsePoolTimeoutError
+from utils.ResponseCompression import ResponseCompression
+from utils.SanitizedParams import SanitizedParams
+from utils.TableAnalysis import TableAnalysis
+from utils.TableCache import TableCache
+from utils.utils import FindDataset
+
+
+class DatasetFileFacets(Resource):
+    """
+    Get histograms or top value counts for columns of the specific requested file
+
+    Inputs:
+    - Game ID
+    - Year
+    - Month
+    - File Type, one of the session, player, or population feature files
+    - `column` query arg, with one or more comma-separated column names
+    - (optional) `bins` query arg, the number of histogram bins for numeric columns
+    - (optional) `top` query arg, the number of most common values for other columns
+    Outputs:
+    - Histogram or top value counts for each requested column that exists in the file
+    """
+    DEFAULT_BINS : Final[int] = 20
+    MAX_BINS     : Final[int] = 1000
+    DEFAULT_TOP  : Final[int] = 10
+    MAX_TOP      : Final[int] = 1000
+
+    def get(self, game_id, month, year, file_type):
+        ret_val = APIResponse.Default(req_type=RESTType.GET)
+
+        safe_game_id  = SanitizedParams.SanitizeGameID(game_id=game_id)
+        safe_year     = SanitizedParams.SanitizeYear(year=year)
+        safe_month    = SanitizedParams.SanitizeMonth(month=month)
+        safe_filetype = SanitizedParams.SanitizeFileType(file_type=file_type)
+        safe_columns  = SanitizedParams.SanitizeColumns(columns=request.args.get("column"))
+        safe_bins     = SanitizedParams.SanitizeCount(count=request.args.get("bins", str(self.DEFAULT_BINS)))
+        safe_top      = SanitizedParams.SanitizeCount(count=request.args.get("top", str(self.DEFAULT_TOP)))
+        valid_bins    = safe_bins is not None and 0 < safe_bins <= self.MAX_BINS
+        valid_top     = safe_top  is not None and 0 < safe_top  <= self.MAX_TOP
+
+        if safe_game_id and safe_year and safe_month and safe_filetype in DatasetTables.TABLE_TYPES and safe_columns and valid_bins and valid_top:
+            try:
+                file_list       : DatasetRepositoryConfig = FileAPIContext.Current().FileList()
+                matched_dataset : Optional[DatasetSchema] = FindDataset(game_id=safe_game_id, year=safe_year, month=safe_month, available_datasets=file_list.Games)
+
+                if matched_dataset and matched_dataset.Key.DateFrom and matched_dataset.Key.DateTo:
+                    if file_list.RemoteURL is not None:
+                        matched_dataset.BaseFileLocation = file_list.RemoteURL
+
+                    # Facets are cached per column, so charts asking for different combinations of columns still share work.
+                    cache  : TableCache                = FileAPIContext.Current().table_cache
+                    facets : Dict[str, Dict[str, Any]] = {}
+                    for col in safe_columns:
+                        col_facets = cache.GetOrCompute(
+                            DatasetTables.CacheKey(matched_dataset, safe_filetype, "facets", col, safe_bins, safe_top),
+                            lambda col=col : DatasetFileFacets._computeFacets(dataset=matched_dataset, file_type=safe_filetype, column=col, bins=safe_bins, top=safe_top)
+                        )
+                        if col_facets is not None:
+                            facets[col] = col_facets
+                    if len(facets) > 0:
+                        ret_val.RequestSucceeded(msg=f"Retrieved {file_type} file facets for {safe_game_id} in {safe_month:>02}/{safe_year:>04}", val={"columns" : facets})
+                        ResponseCompression.CacheBody()
+                    else:
+                        ret_val.RequestErrored(msg=f"None of the requested columns were found in the {file_type} file for {safe_game_id} in {safe_month:>02}/{safe_year:>04}", status=ResponseStatus.BAD_REQUEST)
+                else:
+                    ret_val.RequestErrored(msg=f"Could not find a dataset for {safe_game_id} in {safe_month:>02}/{safe_year:>04}", status=ResponseStatus.NOT_FOUND)
+            except FileTooLargeError as err:
+                current_app.logger.warning(f"Rejected {file_type} facets request for {safe_game_id} in {safe_month:>02}/{safe_year:>04}, table was too large to load:\n{err}")
+                ret_val.RequestErrored(msg=f"The {file_type} file for {safe_game_id} in {safe_month:>02}/{safe_year:>04} is too large to compute facets for ({err.Description}).", status=ResponseStatus.CONTENT_TOO_LARGE)
+            except ParsePoolFullError as err:
+                current_app.logger.warning(f"Rejected {file_type} facets request for {safe_game_id} in {safe_month:>02}/{safe_year:>04}, parse pool was full:\n{err}")
+                ret_val.ServerErrored(msg="Server is busy processing other dataset files, please try again shortly.", status=ResponseStatus.UNAVAILABLE)
+            except CircuitOpenError as err:
+                current_app.logger.warning(f"Rejected {file_type} facets request for {safe_game_id} in {safe_month:>02}/{safe_year:>04}, the file server's circuit is open:\n{err}")
+                ret_val.ServerErrored(msg=f"Server could not retrieve {file_type} file from {safe_game_id} in {safe_month:>02}/{safe_year:>04} while the file server is unavailable, please try again shortly.", status=ResponseStatus.UNAVAILABLE)
+            except DeadlineExceededError as err:
+                current_app.logger.warning(f"Stopped {file_type} facets request for {safe_game_id} in {safe_month:>02}/{safe_year:>04}, its deadline passed:\n{err}")
+                ret_val.ServerErrored(msg=f"Server could not retrieve {file_type} file from {safe_game_id} in {safe_month:>02}/{safe_year:>04} within the time allowed for this request.", status=ResponseStatus.GATEWAY_TIMEOUT)
+            except ParsePoolTimeoutError as err:
+                current_app.logger.error(f"Timed out parsing {file_type} file for {safe_game_id} in {safe_month:>02}/{safe_year:>04}:\n{err}")
+                ret_val.ServerErrored(msg=f"Server timed out while processing {file_type} file from {safe_game_id} in {safe_month:>02}/{safe_year:>04}.", status=ResponseStatus.GATEWAY_TIMEOUT)
+            except url_error.HTTPError as err:
+                current_app.logger.error(f"HTTP error getting {file_type} file for {safe_game_id} in {safe_month:>02}/{safe_year:>04}:\n{err}")
+                ret_val.ServerErrored(msg=f"Server experienced an error retrieving {file_type} file from {safe_game_id} in {safe_month:>02}/{safe_year:>04}.", status=ResponseStatus.INTERNAL_ERR)
+            except Exception as err: # pylint: disable=broad-exception-caught
+                msg = f"Unexpected error while computing dataset file facets for {safe_game_id} in {safe_month:>02}/{safe_year:>04}!"
+                current_app.logger.error(f"{msg}\n{type(err)}:\n{err}")
+                ret_val.ServerErrored(msg=msg, status=ResponseStatus.INTERNAL_ERR)
+        elif safe_game_id is None:
+            ret_val.RequestErrored(msg=f"Invalid GameID '{game_id}'", status=ResponseStatus.BAD_REQUEST)
+        elif safe_year is None:
+            ret_val.RequestErrored(msg=f"Invalid Year '{year}'", status=ResponseStatus.BAD_REQUEST)
+        elif safe_month is None:
+            ret_val.RequestErrored(msg=f"Invalid Month '{month}'", status=ResponseStatus.BAD_REQUEST)
+        elif safe_filetype is None:
+            ret_val.RequestErrored(msg=f"Invalid File Type '{file_type}'", status=ResponseStatus.BAD_REQUEST)
+        elif safe_filetype not in DatasetTables.TABLE_TYPES:
+            ret_val.RequestErrored(msg=f"Facets are not available for {file_type} files", status=ResponseStatus.BAD_REQUEST)
+        elif safe_columns is None:
+            ret_val.RequestErrored(msg=f"Invalid or missing column '{request.args.get('column')}'", status=ResponseStatus.BAD_REQUEST)
+        elif not valid_bins:
+            ret_val.RequestErrored(msg=f"Invalid bins '{request.args.get('bins')}', must be between 1 and {self.MAX_BINS}", status=ResponseStatus.BAD_REQUEST)
+        else:
+            ret_val.RequestErrored(msg=f"Invalid top '{request.args.get('top')}', must be between 1 and {self.MAX_TOP}", status=ResponseStatus.BAD_REQUEST)
+
+        return ret_val.AsFlaskResponse
+
+    @staticmethod
+    def _computeFacets(dataset:DatasetSchema, file_type:FileTypes, column:str, bins:int, top:int) -> Optional[Dict[str, Any]]:
+        ret_val : Optional[Dict[str, Any]] = None
+
+        table = DatasetTables.LoadTable(dataset=dataset, file_type=file_type)
+        if table is not None and column in table.columns:
+            ret_val = TableAnalysis.ColumnFacets(table[column], bins=bins, top=top)
+
+        return ret_val
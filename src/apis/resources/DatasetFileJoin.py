@@ -0,0 +1,136 @@
+# import standard libraries
+from typing import Final, Optional, Set, Tuple
+from urllib import error as url_error
+
+# import 3rd-party libraries
+from flask import current_app, request, Response
+from flask_restful import Resource
+
+# import ogd libraries
+from ogd.apis.models.APIResponse import APIResponse
+from ogd.apis.models.enums.RESTType import RESTType
+from ogd.apis.models.enums.ResponseStatus import ResponseStatus
+from ogd.apis.models.files.DatasetFile import FileTypes
+from ogd.common.configs.storage.DatasetRepositoryConfig import DatasetRepositoryConfig
+from ogd.common.schemas.datasets.DatasetSchema import DatasetSchema
+
+# import local files
+from utils.CircuitBreaker import CircuitOpenError
+from utils.DatasetFileParser import DatasetFileParser, FileTooLargeError
+from utils.DatasetTables import DatasetTables
+from utils.Deadlines import DeadlineExceededError
+from utils.FileAPIContext import FileAPIContext
+from utils.FileQuery import FileQuery
+from utils.ParsePool import ParsePoolFullError, ParsePoolTimeoutError
+from utils.ResponseCompression import ResponseCompression
+from utils.SanitizedParams import SanitizedParams
+from utils.TableAnalysis import TableAnalysis
+from utils.utils import FindDataset
+
+
+class DatasetFileJoin(Resource):
+    """
+    Get the session features of a dataset, joined to the features of each session's player
+
+    Inputs:
+    - Game ID
+    - Year
+    - Month
+    - (optional) `session_columns` and `player_columns` query args, to select the columns from each file
+    - (optional) `how` query arg, either `left` (the default) to keep every session, or `inner` to keep only sessions with a matching player
+    - (optional) `session_id`, `offset`, and `limit` query args, to select which sessions are joined
+    Outputs:
+    - Columns and rows of the joined table
+    """
+    SUCCESS_MSG   : Final[str]             = "Retrieved joined session and player features by month"
+    JOIN_COLUMNS  : Final[Tuple[str, ...]] = ("PlayerID", "player_id")
+    JOIN_TYPES    : Final[Set[str]]        = {"left", "inner"}
+    PLAYER_SUFFIX : Final[str]             = "-Player"
+
+    def get(self, game_id, month, year):
+        ret_val  = APIResponse.Default(req_type=RESTType.GET)
+        response : Optional[Response] = None
+
+        raw_session_cols = request.args.get("session_columns")
+        raw_player_cols  = request.args.get("player_columns")
+        raw_session_ids  = request.args.getlist("session_id")
+        raw_offset       = request.args.get("offset")
+        raw_limit        = request.args.get("limit")
+        join_type        = request.args.get("how", "left")
+
+        safe_game_id      = SanitizedParams.SanitizeGameID(game_id=game_id)
+        safe_year         = SanitizedParams.SanitizeYear(year=year)
+        safe_month        = SanitizedParams.SanitizeMonth(month=month)
+        safe_session_cols = SanitizedParams.SanitizeColumns(columns=raw_session_cols)
+        safe_player_cols  = SanitizedParams.SanitizeColumns(columns=raw_player_cols)
+        safe_session_ids  = SanitizedParams.SanitizeSessionIDs(session_ids=raw_session_ids)
+        safe_offset       = SanitizedParams.SanitizeCount(count=raw_offset)
+        safe_limit        = SanitizedParams.SanitizeCount(count=raw_limit)
+        valid_query       = not ((raw_session_cols is not None and safe_session_cols is None)
+                              or (raw_player_cols is not None and safe_player_cols is None)
+                              or (len(raw_session_ids) > 0 and safe_session_ids is None)
+                              or (raw_offset is not None and safe_offset is None)
+                              or (raw_limit is not None and safe_limit is None)
+                              or join_type not in self.JOIN_TYPES)
+
+        if safe_game_id and safe_year and safe_month and valid_query:
+            try:
+                file_list       : DatasetRepositoryConfig = FileAPIContext.Current().FileList()
+                matched_dataset : Optional[DatasetSchema] = FindDataset(game_id=safe_game_id, year=safe_year, month=safe_month, available_datasets=file_list.Games)
+
+                if matched_dataset and matched_dataset.Key.DateFrom and matched_dataset.Key.DateTo:
+                    if file_list.RemoteURL is not None:
+                        matched_dataset.BaseFileLocation = file_list.RemoteURL
+
+                    sessions = DatasetTables.LoadTable(dataset=matched_dataset, file_type=FileTypes.SESSION)
+                    players  = DatasetTables.LoadTable(dataset=matched_dataset, file_type=FileTypes.PLAYER)
+                    if sessions is not None and players is not None:
+                        join_col = next((col for col in self.JOIN_COLUMNS if col in sessions.columns and col in players.columns), None)
+                        if join_col is not None:
+                            # Sessions are filtered before the join, so only the requested sessions are ever copied out of the cached table.
+                            filtered = FileQuery(session_ids=safe_session_ids).Apply(sessions)
+                            joined   = TableAnalysis.JoinTables(filtered, players, on=join_col,
+                                                                left_columns=safe_session_cols, right_columns=safe_player_cols,
+                                                                how=join_type, right_suffix=self.PLAYER_SUFFIX)
+                            page     = FileQuery(offset=safe_offset or 0, limit=safe_limit).Apply(joined)
+                            body     = DatasetFileParser.EncodeTable(table=page, msg=self.SUCCESS_MSG)
+                            response = Response(response=body, status=ResponseStatus.OK.value, mimetype='application/json')
+                            ResponseCompression.CacheBody()
+                        else:
+                            ret_val.ServerErrored(msg=f"The session and player files for {safe_game_id} in {safe_month:>02}/{safe_year:>04} do not share a player ID column.", status=ResponseStatus.INTERNAL_ERR)
+                    else:
+                        ret_val.ServerErrored(msg=f"The session or player file for {safe_game_id} in {safe_month:>02}/{safe_year:>04} did not contain a data table.", status=ResponseStatus.INTERNAL_ERR)
+                else:
+                    ret_val.RequestErrored(msg=f"Could not find a dataset for {safe_game_id} in {safe_month:>02}/{safe_year:>04}", status=ResponseStatus.NOT_FOUND)
+            except FileTooLargeError as err:
+                current_app.logger.warning(f"Rejected joined file request for {safe_game_id} in {safe_month:>02}/{safe_year:>04}, table was too large to load:\n{err}")
+                ret_val.RequestErrored(msg=f"The session or player file for {safe_game_id} in {safe_month:>02}/{safe_year:>04} is too large to join ({err.Description}).", status=ResponseStatus.CONTENT_TOO_LARGE)
+            except ParsePoolFullError as err:
+                current_app.logger.warning(f"Rejected joined file request for {safe_game_id} in {safe_month:>02}/{safe_year:>04}, parse pool was full:\n{err}")
+                ret_val.ServerErrored(msg="Server is busy processing other dataset files, please try again shortly.", status=ResponseStatus.UNAVAILABLE)
+            except CircuitOpenError as err:
+                current_app.logger.warning(f"Rejected joined file request for {safe_game_id} in {safe_month:>02}/{safe_year:>04}, the file server's circuit is open:\n{err}")
+                ret_val.ServerErrored(msg=f"Server could not retrieve session and player files from {safe_game_id} in {safe_month:>02}/{safe_year:>04} while the file server is unavailable, please try again shortly.", status=ResponseStatus.UNAVAILABLE)
+            except DeadlineExceededError as err:
+                current_app.logger.warning(f"Stopped joined file request for {safe_game_id} in {safe_month:>02}/{safe_year:>04}, its deadline passed:\n{err}")
+                ret_val.ServerErrored(msg=f"Server could not retrieve session and player files from {safe_game_id} in {safe_month:>02}/{safe_year:>04} within the time allowed for this request.", status=ResponseStatus.GATEWAY_TIMEOUT)
+            except ParsePoolTimeoutError as err:
+                current_app.logger.error(f"Timed out parsing session or player file for {safe_game_id} in {safe_month:>02}/{safe_year:>04}:\n{err}")
+                ret_val.ServerErrored(msg=f"Server timed out while processing session and player files from {safe_game_id} in {safe_month:>02}/{safe_year:>04}.", status=ResponseStatus.GATEWAY_TIMEOUT)
+            except url_error.HTTPError as err:
+                current_app.logger.error(f"HTTP error getting session or player file for {safe_game_id} in {safe_month:>02}/{safe_year:>04}:\n{err}")
+                ret_val.ServerErrored(msg=f"Server experienced an error retrieving session and player files from {safe_game_id} in {safe_month:>02}/{safe_year:>04}.", status=ResponseStatus.INTERNAL_ERR)
+            except Exception as err: # pylint: disable=broad-exception-caught
+                msg = f"Unexpected error while joining session and player files from {safe_game_id} in {safe_month:>02}/{safe_year:>04}!"
+                current_app.logger.error(f"{msg}\n{type(err)}:\n{err}")
+                ret_val.ServerErrored(msg=msg, status=ResponseStatus.INTERNAL_ERR)
+        elif safe_game_id is None:
+            ret_val.RequestErrored(msg=f"Invalid GameID '{game_id}'", status=ResponseStatus.BAD_REQUEST)
+        elif safe_year is None:
+            ret_val.RequestErrored(msg=f"Invalid Year '{year}'", status=ResponseStatus.BAD_REQUEST)
+        elif safe_month is None:
+            ret_val.RequestErrored(msg=f"Invalid Month '{month}'", status=ResponseStatus.BAD_REQUEST)
+        else:
+            ret_val.RequestErrored(msg=f"Invalid query parameters '{request.query_string.decode()}'", status=ResponseStatus.BAD_REQUEST)
+
+        return response if response is not None else ret_val.AsFlaskResponse
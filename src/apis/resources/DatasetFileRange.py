@@ -0,0 +1,245 @@
+# import standard libraries
+import dataclasses
+import zipfile
+from tempfile import SpooledTemporaryFile
+from typing import Dict, Final, Iterator, List, Optional, Tuple
+from urllib import error as url_error
+
+# import 3rd-party libraries
+import pandas as pd
+from flask import current_app, request, Flask, Response
+from flask_restful import Resource
+
+# import ogd libraries
+from ogd.apis.models.APIResponse import APIResponse
+from ogd.apis.models.enums.RESTType import RESTType
+from ogd.apis.models.enums.ResponseStatus import ResponseStatus
+from ogd.apis.models.files.DatasetFile import FileTypes
+from ogd.common.configs.storage.DatasetRepositoryConfig import DatasetRepositoryConfig
+from ogd.common.schemas.datasets.DatasetSchema import DatasetSchema
+
+# import local files
+from configs.FileAPIConfig import FileAPIConfig
+from utils.CircuitBreaker import CircuitOpenError
+from utils.DatasetFileParser import DatasetFileParser, FileTooLargeError, TableTooLargeError
+from utils.DatasetTables import DatasetTables
+from utils.Deadlines import Deadline, DeadlineExceededError
+from utils.FileAPIContext import FileAPIContext
+from utils.FileQuery import FileQuery
+from utils.HTTPClient import HTTPClient
+from utils.ParsePool import ParsePoolFullError, ParsePoolTimeoutError
+from utils.ResponseCompression import ResponseCompression
+from utils.SanitizedParams import SanitizedParams
+from utils.ServerTiming import PhaseTimings
+from utils.TableAnalysis import TableAnalysis
+from utils.utils import DownloadFile, FindDataset, PrefetchMap
+
+
+class DatasetFileRange(Resource):
+    """
+    Get one type of file from every dataset in a range of months, as a single table
+
+    Inputs:
+    - Game ID
+    - Month range, as `<year>-<month>..<year>-<month>`
+    - File Type
+    - (optional) The same query args as a single-month DatasetFile request
+    Outputs:
+    - Columns and rows of the requested file from each month's dataset, concatenated in month order, with a `month` column first
+    """
+    SUCCESS_MSG  : Final[str] = "Retrieved game file info by month range"
+    MONTH_COLUMN : Final[str] = "month"
+
+    def get(self, game_id, month_range, file_type):
+        ret_val  = APIResponse.Default(req_type=RESTType.GET)
+        response : Optional[Response] = None
+
+        cfg           : FileAPIConfig = FileAPIContext.Current().config
+        safe_game_id  = SanitizedParams.SanitizeGameID(game_id=game_id)
+        safe_range    = SanitizedParams.SanitizeMonthRange(month_range=month_range)
+        safe_filetype = SanitizedParams.SanitizeFileType(file_type=file_type)
+        safe_query    = FileQuery.FromArgs(args=request.args)
+        months        = DatasetFileRange._monthsInRange(safe_range) if safe_range else []
+        valid_months  = 0 < len(months) <= cfg.MonthRangeMaxMonths
+
+        if safe_game_id and safe_range and valid_months and safe_filetype and safe_query is not None:
+            range_str = f"{safe_range[0][1]:>02}/{safe_range[0][0]:>04}-{safe_range[1][1]:>02}/{safe_range[1][0]:>04}"
+            try:
+                # 1. Resolve every month from a single fetch of the file list.
+                #    A dataset that spans several months is only included once, labeled with the first requested month it covers.
+                file_list : DatasetRepositoryConfig              = FileAPIContext.Current().FileList()
+                datasets  : Dict[str, Tuple[str, DatasetSchema]] = {}
+                for year, month in months:
+                    matched_dataset = FindDataset(game_id=safe_game_id, year=year, month=month, available_datasets=file_list.Games)
+                    if matched_dataset and matched_dataset.Key.DateFrom and matched_dataset.Key.DateTo and str(matched_dataset.Key) not in datasets:
+                        if file_list.RemoteURL is not None:
+                            matched_dataset.BaseFileLocation = file_list.RemoteURL
+                        if DatasetTables.FileLink(dataset=matched_dataset, file_type=safe_filetype):
+                            datasets[str(matched_dataset.Key)] = (f"{year:04}-{month:02}", matched_dataset)
+
+                # 2. Fetch and parse the months concurrently, then put them together in month order.
+                if len(datasets) == 0:
+                    ret_val.RequestErrored(msg=f"Could not find any {file_type} files for {safe_game_id} in {range_str}", status=ResponseStatus.NOT_FOUND)
+                elif safe_filetype in DatasetTables.TABLE_TYPES:
+                    try:
+                        response = self._combineTables(months=list(datasets.values()), file_type=safe_filetype, query=safe_query, workers=cfg.MonthRangeFetchWorkers)
+                    except TableTooLargeError as err:
+                        # A month too big to load can still be streamed, as long as the query doesn't need the whole table.
+                        if safe_query.NeedsTable:
+                            raise
+                        current_app.logger.info(f"Streaming {file_type} files for {safe_game_id} in {range_str}, since one is too large to load:\n{err}")
+                        response = self._streamFiles(months=list(datasets.values()), file_type=safe_filetype, query=safe_query, cfg=cfg)
+                    if response is None:
+                        ret_val.ServerErrored(msg=f"The {file_type} files for {safe_game_id} in {range_str} did not contain any data tables.", status=ResponseStatus.INTERNAL_ERR)
+                elif safe_query.NeedsTable:
+                    ret_val.RequestErrored(msg=f"Aggregation and sorting are not available for {file_type} files", status=ResponseStatus.BAD_REQUEST)
+                else:
+                    response = self._streamFiles(months=list(datasets.values()), file_type=safe_filetype, query=safe_query, cfg=cfg)
+            except TableTooLargeError as err:
+                current_app.logger.warning(f"Rejected {file_type} file range request for {safe_game_id} in {range_str}, a table was too large to load:\n{err}")
+                ret_val.RequestErrored(msg=f"One of the {file_type} files for {safe_game_id} in {range_str} is too large to aggregate or sort ({err.Description}). Request their rows without group_by or sort to have them streamed instead.", status=ResponseStatus.CONTENT_TOO_LARGE)
+            except FileTooLargeError as err:
+                current_app.logger.warning(f"Rejected {file_type} file range request for {safe_game_id} in {range_str}, a file was too large to serve:\n{err}")
+                ret_val.RequestErrored(msg=f"One of the {file_type} files for {safe_game_id} in {range_str} is too large to serve through the API ({err.Description}). Request a smaller range, or download the files directly.", status=ResponseStatus.CONTENT_TOO_LARGE)
+            except ParsePoolFullError as err:
+                current_app.logger.warning(f"Rejected {file_type} file range request for {safe_game_id} in {range_str}, parse pool was full:\n{err}")
+                ret_val.ServerErrored(msg="Server is busy processing other dataset files, please try again shortly.", status=ResponseStatus.UNAVAILABLE)
+            except CircuitOpenError as err:
+                current_app.logger.warning(f"Rejected {file_type} file range request for {safe_game_id} in {range_str}, the file server's circuit is open:\n{err}")
+                ret_val.ServerErrored(msg=f"Server could not retrieve {file_type} files from {safe_game_id} in {range_str} while the file server is unavailable, please try again shortly.", status=ResponseStatus.UNAVAILABLE)
+            except DeadlineExceededError as err:
+                current_app.logger.warning(f"Stopped {file_type} file range request for {safe_game_id} in {range_str}, its deadline passed:\n{err}")
+                ret_val.ServerErrored(msg=f"Server could not retrieve {file_type} files from {safe_game_id} in {range_str} within the time allowed for this request.", status=ResponseStatus.GATEWAY_TIMEOUT)
+            except ParsePoolTimeoutError as err:
+                current_app.logger.error(f"Timed out parsing {file_type} files for {safe_game_id} in {range_str}:\n{err}")
+                ret_val.ServerErrored(msg=f"Server timed out while processing {file_type} files from {safe_game_id} in {range_str}.", status=ResponseStatus.GATEWAY_TIMEOUT)
+            except url_error.HTTPError as err:
+                current_app.logger.error(f"HTTP error getting {file_type} files for {safe_game_id} in {range_str}:\n{err}")
+                ret_val.ServerErrored(msg=f"Server experienced an error retrieving {file_type} files from {safe_game_id} in {range_str}.", status=ResponseStatus.INTERNAL_ERR)
+            except Exception as err: # pylint: disable=broad-exception-caught
+                msg = f"Unexpected error while retrieving dataset file contents from {safe_game_id} in {range_str}!"
+                current_app.logger.error(f"{msg}\n{type(err)}:\n{err}")
+                ret_val.ServerErrored(msg=msg, status=ResponseStatus.INTERNAL_ERR)
+        elif safe_game_id is None:
+            ret_val.RequestErrored(msg=f"Invalid GameID '{game_id}'", status=ResponseStatus.BAD_REQUEST)
+        elif safe_range is None:
+            ret_val.RequestErrored(msg=f"Invalid month range '{month_range}', expected '<year>-<month>..<year>-<month>'", status=ResponseStatus.BAD_REQUEST)
+        elif not valid_months:
+            ret_val.RequestErrored(msg=f"Month range '{month_range}' covers more than {cfg.MonthRangeMaxMonths} months", status=ResponseStatus.BAD_REQUEST)
+        elif safe_filetype is None:
+            ret_val.RequestErrored(msg=f"Invalid File Type '{file_type}'", status=ResponseStatus.BAD_REQUEST)
+        elif safe_query is None:
+            ret_val.RequestErrored(msg=f"Invalid query parameters '{request.query_string.decode()}'", status=ResponseStatus.BAD_REQUEST)
+
+        return response if response is not None else ret_val.AsFlaskResponse
+
+    @staticmethod
+    def _monthsInRange(month_range:Tuple[Tuple[int, int], Tuple[int, int]]) -> List[Tuple[int, int]]:
+        (first_year, first_month), (last_year, last_month) = month_range
+        return [(index // 12, index % 12 + 1) for index in range(first_year * 12 + first_month - 1, last_year * 12 + last_month)]
+
+    @staticmethod
+    def _combineTables(months:List[Tuple[str, DatasetSchema]], file_type:FileTypes, query:FileQuery, workers:int) -> Optional[Response]:
+        """Load each month's table through the cache, and apply the query to all of them together.
+
+        Each month is cut down to the needed rows and columns before concatenating, so only those are ever copied out of the cached tables.
+        """
+        ret_val : Optional[Response] = None
+
+        app      : Flask                  = current_app._get_current_object() # pylint: disable=protected-access
+        deadline : Optional[Deadline]     = Deadline.Current()
+        timings  : Optional[PhaseTimings] = PhaseTimings.Current()
+        def _load(month:Tuple[str, DatasetSchema]) -> Tuple[str, Optional[pd.DataFrame]]:
+            with app.app_context():
+                if deadline is not None:
+                    deadline.Activate()
+                if timings is not None:
+                    timings.Activate()
+                return month[0], DatasetTables.LoadTable(dataset=month[1], file_type=file_type)
+
+        if query.IsAggregate:
+            needed = [col for col in query.AggregateColumns if col != DatasetFileRange.MONTH_COLUMN]
+        elif query.columns is not None:
+            needed = [col for col in query.columns if col != DatasetFileRange.MONTH_COLUMN] + ([query.sort[0]] if query.sort is not None else [])
+        else:
+            needed = None
+        trim   = FileQuery(columns=list(dict.fromkeys(needed)) if needed is not None else None, session_ids=query.session_ids)
+        tables = {label : trim.Apply(table) for label, table in PrefetchMap(_load, months, workers=workers) if table is not None}
+        if len(tables) > 0:
+            combined = pd.concat(tables, names=[DatasetFileRange.MONTH_COLUMN, None]).reset_index(level=0).reset_index(drop=True)
+            missing_cols = [col for col in (query.AggregateColumns if query.IsAggregate else []) if col not in combined.columns]
+            if query.sort is not None and query.sort[0] not in (query.AggregateOutputColumns if query.IsAggregate else combined.columns):
+                missing_cols.append(query.sort[0])
+            bad_cols = TableAnalysis.UnaggregatableColumns(combined, group_by=query.group_by or [], aggregations=query.aggregations) if query.IsAggregate and len(missing_cols) == 0 else []
+            if len(missing_cols) == 0 and len(bad_cols) == 0:
+                result  = dataclasses.replace(query, columns=DatasetFileRange._withMonth(query.columns), session_ids=None).Apply(combined)
+                body    = DatasetFileParser.EncodeTable(table=result, msg=DatasetFileRange._successMessage(query))
+                ret_val = Response(response=body, status=ResponseStatus.OK.value, mimetype='application/json')
+                # A sample with a random seed is a one-off, so there's no point caching its compressed body.
+                if query.sample is None:
+                    ResponseCompression.CacheBody()
+            else:
+                error_response = APIResponse.Default(req_type=RESTType.GET)
+                if len(missing_cols) > 0:
+                    error_response.RequestErrored(msg=f"Columns {missing_cols} were not found in the {file_type.name.lower()} files", status=ResponseStatus.BAD_REQUEST)
+                else:
+                    error_response.RequestErrored(msg=f"Columns {bad_cols} can't be grouped or aggregated as requested", status=ResponseStatus.BAD_REQUEST)
+                ret_val = error_response.AsFlaskResponse
+
+        return ret_val
+
+    @staticmethod
+    def _streamFiles(months:List[Tuple[str, DatasetSchema]], file_type:FileTypes, query:FileQuery, cfg:FileAPIConfig) -> Response:
+        """Stream each month's file back in turn, as one table.
+
+        The next few months are downloaded in the background while the current one is streamed,
+        but downloads never run more than the configured number of months ahead, so disk and memory use stay bounded.
+        A month whose table is over the size limit can only be found once the stream has started, so it ends the stream early, with an error message.
+        """
+        # Downloads run in background threads, and the stream outlives the request, so neither has an app context to find the client in.
+        client = HTTPClient.Current()
+        def _download(month:Tuple[str, DatasetSchema]) -> Tuple[str, str, SpooledTemporaryFile]:
+            file_link = DatasetTables.FileLink(dataset=month[1], file_type=file_type) or ""
+            return month[0], file_link, DownloadFile(url=file_link, max_memory=cfg.StreamSpoolBytes, client=client)
+
+        # Every month is parsed with the first month's types, so a column can't change type partway through the stream.
+        types = DatasetTables.ParseTypes(dataset=months[0][1], file_type=file_type)
+
+        def _chunks() -> Iterator[pd.DataFrame]:
+            # Likewise, the JSON columns are found once, in the first month's first chunk, so a column can't switch between decoded values and raw strings.
+            json_columns : Optional[List[str]] = None
+            archives = PrefetchMap(_download, months, workers=cfg.MonthRangeFetchWorkers, discard=lambda month : month[2].close())
+            try:
+                for label, file_link, archive in archives:
+                    with archive, zipfile.ZipFile(archive) as zipped:
+                        member = DatasetFileParser.TableMember(zipped, expected=DatasetFileParser.ExpectedMember(file_link))
+                        if member is not None:
+                            DatasetFileParser.CheckSize(member, max_file_bytes=cfg.SizeLimitFileBytes)
+                            chunks = DatasetFileParser.ReadChunks(zipped=zipped, member=member.filename, use_columns=query.UseColumns, chunk_rows=cfg.StreamChunkRows, types=types, decode_json=False)
+                            try:
+                                for chunk in chunks:
+                                    if json_columns is None:
+                                        json_columns = DatasetFileParser.JSONColumns(chunk)
+                                    chunk = DatasetFileParser.SecondaryParse(chunk, json_columns=json_columns)
+                                    chunk.insert(0, DatasetFileRange.MONTH_COLUMN, label)
+                                    yield chunk
+                            finally:
+                                chunks.close()
+            finally:
+                archives.close()
+
+        chunks  = _chunks()
+        stream  = DatasetFileParser.EncodeChunks(chunks=dataclasses.replace(query, columns=DatasetFileRange._withMonth(query.columns)).ApplyToChunks(chunks), msg=DatasetFileRange._successMessage(query), source=f"{file_type.name.lower()} files")
+        ret_val = Response(response=stream, status=ResponseStatus.OK.value, mimetype='application/json')
+        ret_val.call_on_close(chunks.close)
+
+        return ret_val
+
+    @staticmethod
+    def _withMonth(columns:Optional[List[str]]) -> Optional[List[str]]:
+        """Add the month column to the front of a column selection, so it's always part of the result."""
+        return list(dict.fromkeys([DatasetFileRange.MONTH_COLUMN] + columns)) if columns is not None else None
+
+    @staticmethod
+    def _successMessage(query:FileQuery) -> str:
+        return f"{DatasetFileRange.SUCCESS_MSG}, sampled with seed {query.seed}" if query.sample is not None else DatasetFileRange.SUCCESS_MSG
@@ -0,0 +1,121 @@
+# import standard libraries
+import dataclasses
+from typing import Optional
+from urllib import error as url_error
+
+# import 3rd-party libraries
+from flask import current_app
+from flask_restful import Resource
+
+# import ogd libraries
+from ogd.apis.models.APIResponse import APIResponse
+from ogd.apis.models.enums.RESTType import RESTType
+from ogd.apis.models.enums.ResponseStatus import ResponseStatus
+from ogd.apis.models.files.DatasetFile import FileTypes
+from ogd.apis.models.files.DatasetFileStats import ColumnStats, DatasetFileStats as DatasetFileStatsModel
+from ogd.common.configs.storage.DatasetRepositoryConfig import DatasetRepositoryConfig
+from ogd.common.schemas.datasets.DatasetSchema import DatasetSchema
+
+# import local files
+from utils.CircuitBreaker import CircuitOpenError
+from utils.DatasetFileParser import FileTooLargeError
+from utils.DatasetTables import DatasetTables
+from utils.Deadlines import DeadlineExceededError
+from utils.FileAPIContext import FileAPIContext
+from utils.ParsePool import ParsePoolFullError, ParsePoolTimeoutError
+from utils.ResponseCompression import ResponseCompression
+from utils.SanitizedParams import SanitizedParams
+from utils.TableAnalysis import TableAnalysis
+from utils.TableCache import TableCache
+from utils.utils import FindDataset
+
+
+class DatasetFileStats(Resource):
+    """
+    Get summary statistics for each column of the specific requested file
+
+    Inputs:
+    - Game ID
+    - Year
+    - Month
+    - File Type, one of the session, player, or population feature files
+    Outputs:
+    - Row count, and per-column count, null count, min, max, mean, standard deviation, and quartiles of the requested file
+    """
+    def get(self, game_id, month, year, file_type):
+        ret_val = APIResponse.Default(req_type=RESTType.GET)
+
+        safe_game_id  = SanitizedParams.SanitizeGameID(game_id=game_id)
+        safe_year     = SanitizedParams.SanitizeYear(year=year)
+        safe_month    = SanitizedParams.SanitizeMonth(month=month)
+        safe_filetype = SanitizedParams.SanitizeFileType(file_type=file_type)
+
+        if safe_game_id and safe_year and safe_month and safe_filetype in DatasetTables.TABLE_TYPES:
+            try:
+                file_list       : DatasetRepositoryConfig = FileAPIContext.Current().FileList()
+                matched_dataset : Optional[DatasetSchema] = FindDataset(game_id=safe_game_id, year=safe_year, month=safe_month, available_datasets=file_list.Games)
+
+                if matched_dataset and matched_dataset.Key.DateFrom and matched_dataset.Key.DateTo:
+                    if file_list.RemoteURL is not None:
+                        matched_dataset.BaseFileLocation = file_list.RemoteURL
+
+                    # Stats are cached separately from the table, so a hit here doesn't need the table to still be cached.
+                    cache : TableCache = FileAPIContext.Current().table_cache
+                    stats : Optional[DatasetFileStatsModel] = cache.GetOrCompute(
+                        DatasetTables.CacheKey(matched_dataset, safe_filetype, "stats"),
+                        lambda : DatasetFileStats._computeStats(dataset=matched_dataset, file_type=safe_filetype)
+                    )
+                    if stats is not None:
+                        ret_val.RequestSucceeded(msg=f"Retrieved {file_type} file statistics for {safe_game_id} in {safe_month:>02}/{safe_year:>04}", val=dataclasses.asdict(stats))
+                        ResponseCompression.CacheBody()
+                    else:
+                        ret_val.ServerErrored(msg=f"The {file_type} file for {safe_game_id} in {safe_month:>02}/{safe_year:>04} did not contain a data table.", status=ResponseStatus.INTERNAL_ERR)
+                else:
+                    ret_val.RequestErrored(msg=f"Could not find a dataset for {safe_game_id} in {safe_month:>02}/{safe_year:>04}", status=ResponseStatus.NOT_FOUND)
+            except FileTooLargeError as err:
+                current_app.logger.warning(f"Rejected {file_type} stats request for {safe_game_id} in {safe_month:>02}/{safe_year:>04}, table was too large to load:\n{err}")
+                ret_val.RequestErrored(msg=f"The {file_type} file for {safe_game_id} in {safe_month:>02}/{safe_year:>04} is too large to compute statistics for ({err.Description}).", status=ResponseStatus.CONTENT_TOO_LARGE)
+            except ParsePoolFullError as err:
+                current_app.logger.warning(f"Rejected {file_type} stats request for {safe_game_id} in {safe_month:>02}/{safe_year:>04}, parse pool was full:\n{err}")
+                ret_val.ServerErrored(msg="Server is busy processing other dataset files, please try again shortly.", status=ResponseStatus.UNAVAILABLE)
+            except CircuitOpenError as err:
+                current_app.logger.warning(f"Rejected {file_type} stats request for {safe_game_id} in {safe_month:>02}/{safe_year:>04}, the file server's circuit is open:\n{err}")
+                ret_val.ServerErrored(msg=f"Server could not retrieve {file_type} file from {safe_game_id} in {safe_month:>02}/{safe_year:>04} while the file server is unavailable, please try again shortly.", status=ResponseStatus.UNAVAILABLE)
+            except DeadlineExceededError as err:
+                current_app.logger.warning(f"Stopped {file_type} stats request for {safe_game_id} in {safe_month:>02}/{safe_year:>04}, its deadline passed:\n{err}")
+                ret_val.ServerErrored(msg=f"Server could not retrieve {file_type} file from {safe_game_id} in {safe_month:>02}/{safe_year:>04} within the time allowed for this request.", status=ResponseStatus.GATEWAY_TIMEOUT)
+            except ParsePoolTimeoutError as err:
+                current_app.logger.error(f"Timed out parsing {file_type} file for {safe_game_id} in {safe_month:>02}/{safe_year:>04}:\n{err}")
+                ret_val.ServerErrored(msg=f"Server timed out while processing {file_type} file from {safe_game_id} in {safe_month:>02}/{safe_year:>04}.", status=ResponseStatus.GATEWAY_TIMEOUT)
+            except url_error.HTTPError as err:
+                current_app.logger.error(f"HTTP error getting {file_type} file for {safe_game_id} in {safe_month:>02}/{safe_year:>04}:\n{err}")
+                ret_val.ServerErrored(msg=f"Server experienced an error retrieving {file_type} file from {safe_game_id} in {safe_month:>02}/{safe_year:>04}.", status=ResponseStatus.INTERNAL_ERR)
+            except Exception as err: # pylint: disable=broad-exception-caught
+                msg = f"Unexpected error while computing dataset file statistics for {safe_game_id} in {safe_month:>02}/{safe_year:>04}!"
+                current_app.logger.error(f"{msg}\n{type(err)}:\n{err}")
+                ret_val.ServerErrored(msg=msg, status=ResponseStatus.INTERNAL_ERR)
+        elif safe_game_id is None:
+            ret_val.RequestErrored(msg=f"Invalid GameID '{game_id}'", status=ResponseStatus.BAD_REQUEST)
+        elif safe_year is None:
+            ret_val.RequestErrored(msg=f"Invalid Year '{year}'", status=ResponseStatus.BAD_REQUEST)
+        elif safe_month is None:
+            ret_val.RequestErrored(msg=f"Invalid Month '{month}'", status=ResponseStatus.BAD_REQUEST)
+        elif safe_filetype is None:
+            ret_val.RequestErrored(msg=f"Invalid File Type '{file_type}'", status=ResponseStatus.BAD_REQUEST)
+        else:
+            ret_val.RequestErrored(msg=f"Statistics are not available for {file_type} files", status=ResponseStatus.BAD_REQUEST)
+
+        return ret_val.AsFlaskResponse
+
+    @staticmethod
+    def _computeStats(dataset:DatasetSchema, file_type:FileTypes) -> Optional[DatasetFileStatsModel]:
+        ret_val : Optional[DatasetFileStatsModel] = None
+
+        table = DatasetTables.LoadTable(dataset=dataset, file_type=file_type)
+        if table is not None:
+            ret_val = DatasetFileStatsModel(
+                row_count=len(table),
+                columns={name : ColumnStats.FromDict(stats) for name, stats in TableAnalysis.ColumnStats(table).items()}
+            )
+
+        return ret_val
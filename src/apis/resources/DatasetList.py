@@ -15,9 +15,11 @@ from ogd.common.configs.storage.DatasetRepositoryConfig import DatasetRepository
 from ogd.common.schemas.datasets.DatasetCollectionSchema import DatasetCollectionSchema
 
 # import local files
-from configs.FileAPIConfig import FileAPIConfig
+from utils.CircuitBreaker import CircuitOpenError
+from utils.Deadlines import DeadlineExceededError
+from utils.FileAPIContext import FileAPIContext
+from utils.ResponseCompression import ResponseCompression
 from utils.SanitizedParams import SanitizedParams
-from utils.utils import GetFileList
 
 class DatasetList(Resource):
     """
@@ -38,8 +40,7 @@ class DatasetList(Resource):
 
         if safe_game_id:
             try:
-                cfg           : FileAPIConfig           = FileAPIConfig("FileAPIConfig", {})
-                file_list     : DatasetRepositoryConfig = GetFileList(cfg.FileListURL)
+                file_list     : DatasetRepositoryConfig = FileAPIContext.Current().FileList()
                 game_datasets : DatasetCollectionSchema = file_list.Games.get(safe_game_id, DatasetCollectionSchema.Default())
 
                 if safe_game_id in file_list.Games and len(file_list.Games[safe_game_id].Datasets) > 0:
@@ -56,9 +57,16 @@ class DatasetList(Resource):
 
                     value = dataclasses.asdict(dataset_list_model)
                     ret_val.RequestSucceeded(msg="Retrieved monthly game usage", val=value)
+                    ResponseCompression.CacheBody()
                 # If the given game isn't in our dictionary, or our dictionary doesn't have any date ranges for this game
                 else:
                     ret_val.RequestErrored(msg=f"GameID '{safe_game_id}' not found in list of games with datasets, or had no datasets listed", status=ResponseStatus.NOT_FOUND)
+            except CircuitOpenError as err:
+                current_app.logger.warning(f"Rejected request for the list of datasets for {safe_game_id}, the file server's circuit is open:\n{err}")
+                ret_val.ServerErrored(msg=f"Server could not retrieve the list of datasets for {safe_game_id} while the file server is unavailable, please try again shortly.", status=ResponseStatus.UNAVAILABLE)
+            except DeadlineExceededError as err:
+                current_app.logger.warning(f"Stopped request for the list of datasets for {safe_game_id}, its deadline passed:\n{err}")
+                ret_val.ServerErrored(msg=f"Server could not retrieve the list of datasets for {safe_game_id} within the time allowed for this request.", status=ResponseStatus.GATEWAY_TIMEOUT)
             except Exception as err: # pylint: disable=broad-exception-caught
                 msg = "Unexpected error while retrieving list of games with available datasets!"
                 current_app.logger.error(f"{msg}\n{type(err)}:\n{err}")
@@ -14,9 +14,12 @@ from ogd.common.configs.storage.DatasetRepositoryConfig import DatasetRepository
 from ogd.common.schemas.datasets.DatasetSchema import DatasetSchema
 
 # import local files
-from configs.FileAPIConfig import FileAPIConfig
+from utils.CircuitBreaker import CircuitOpenError
+from utils.Deadlines import DeadlineExceededError
+from utils.FileAPIContext import FileAPIContext
+from utils.ResponseCompression import ResponseCompression
 from utils.SanitizedParams import SanitizedParams
-from utils.utils import GetFileList, FindDataset
+from utils.utils import FindDataset
 
 class DatasetResources(Resource):
     """
@@ -40,8 +43,7 @@ class DatasetResources(Resource):
         safe_month   = SanitizedParams.SanitizeMonth(month=month)
         if safe_game_id and safe_year and safe_month:
             try:
-                cfg             : FileAPIConfig           = FileAPIConfig("FileAPIConfig", {})
-                file_list       : DatasetRepositoryConfig = GetFileList(cfg.FileListURL)
+                file_list       : DatasetRepositoryConfig = FileAPIContext.Current().FileList()
                 matched_dataset : Optional[DatasetSchema] = FindDataset(game_id=safe_game_id, year=safe_year, month=safe_month, available_datasets=file_list.Games)
 
                 if matched_dataset and matched_dataset.Key.DateFrom and matched_dataset.Key.DateTo:
@@ -57,8 +59,15 @@ class DatasetResources(Resource):
                     )
 
                     ret_val.RequestSucceeded(msg=f"Retrieved dataset resources for {safe_game_id} in {safe_month:>02}/{safe_year:>04}", val=dataset_resources.AsDict)
+                    ResponseCompression.CacheBody()
                 else:
                     ret_val.RequestErrored(msg=f"Could not find a dataset for {safe_game_id} in {safe_month:>02}/{safe_year:>04}", status=ResponseStatus.NOT_FOUND)
+            except CircuitOpenError as err:
+                current_app.logger.warning(f"Rejected request for dataset resources for {safe_game_id} in {safe_month:>02}/{safe_year:>04}, the file server's circuit is open:\n{err}")
+                ret_val.ServerErrored(msg=f"Server could not retrieve dataset resources for {safe_game_id} in {safe_month:>02}/{safe_year:>04} while the file server is unavailable, please try again shortly.", status=ResponseStatus.UNAVAILABLE)
+            except DeadlineExceededError as err:
+                current_app.logger.warning(f"Stopped request for dataset resources for {safe_game_id} in {safe_month:>02}/{safe_year:>04}, its deadline passed:\n{err}")
+                ret_val.ServerErrored(msg=f"Server could not retrieve dataset resources for {safe_game_id} in {safe_month:>02}/{safe_year:>04} within the time allowed for this request.", status=ResponseStatus.GATEWAY_TIMEOUT)
             except Exception as err: # pylint: disable=broad-exception-caught
                 msg = f"Unexpected error while retrieving dataset resources for {safe_game_id} in {safe_month:>02}/{safe_year:>04}!"
                 current_app.logger.error(f"{msg}\n{type(err)}:\n{err}")
@@ -12,8 +12,10 @@ from ogd.common.configs.storage.DatasetRepositoryConfig import DatasetRepository
 
 # import local files
 from ogd.apis.models.files.GameList import GameList as GameListModel
-from configs.FileAPIConfig import FileAPIConfig
-from utils.utils import GetFileList
+from utils.CircuitBreaker import CircuitOpenError
+from utils.Deadlines import DeadlineExceededError
+from utils.FileAPIContext import FileAPIContext
+from utils.ResponseCompression import ResponseCompression
 
 class GameList(Resource):
     """
@@ -30,15 +32,21 @@ class GameList(Resource):
         ret_val = APIResponse.Default(req_type=RESTType.GET)
 
         try:
-            cfg       : FileAPIConfig           = FileAPIConfig("FileAPIConfig", {})
-            file_list : DatasetRepositoryConfig = GetFileList(cfg.FileListURL)
+            file_list : DatasetRepositoryConfig = FileAPIContext.Current().FileList()
 
             # If the given game isn't in our dictionary, or our dictionary doesn't have any date ranges for this game
             if file_list.Games is not None and len(file_list.Games) > 0:
                 games = GameListModel(game_ids=list(file_list.Games.keys()))
                 ret_val.RequestSucceeded(msg="Retrieved list of games with available data", val=dataclasses.asdict(games))
+                ResponseCompression.CacheBody()
             else:
                 ret_val.RequestErrored(msg="Could not find any games!", status=ResponseStatus.NOT_FOUND)
+        except CircuitOpenError as err:
+            current_app.logger.warning(f"Rejected request for the list of games with available data, the file server's circuit is open:\n{err}")
+            ret_val.ServerErrored(msg="Server could not retrieve the list of games with available data while the file server is unavailable, please try again shortly.", status=ResponseStatus.UNAVAILABLE)
+        except DeadlineExceededError as err:
+            current_app.logger.warning(f"Stopped request for the list of games with available data, its deadline passed:\n{err}")
+            ret_val.ServerErrored(msg="Server could not retrieve the list of games with available data within the time allowed for this request.", status=ResponseStatus.GATEWAY_TIMEOUT)
         except Exception as err: # pylint: disable=broad-exception-caught
             msg = "Unexpected error while retrieving list of games with available data!"
             current_app.logger.error(f"{msg}\n{type(err)}:\n{err}")
@@ -11,8 +11,10 @@ from ogd.apis.models.files.GameSummaries import GameSummaries as GameSummariesMo
 from ogd.common.configs.storage.DatasetRepositoryConfig import DatasetRepositoryConfig
 
 # import local files
-from configs.FileAPIConfig import FileAPIConfig
-from utils.utils import GetFileList
+from utils.CircuitBreaker import CircuitOpenError
+from utils.Deadlines import DeadlineExceededError
+from utils.FileAPIContext import FileAPIContext
+from utils.ResponseCompression import ResponseCompression
 
 class GameSummaries(Resource):
     """
@@ -29,8 +31,7 @@ class GameSummaries(Resource):
         ret_val = APIResponse.Default(req_type=RESTType.GET)
 
         try:
-            cfg       : FileAPIConfig           = FileAPIConfig("FileAPIConfig", {})
-            file_list : DatasetRepositoryConfig = GetFileList(cfg.FileListURL)
+            file_list : DatasetRepositoryConfig = FileAPIContext.Current().FileList()
 
             # If the file_list didn't actually have games
             if file_list.Games is not None and len(file_list.Games) > 0:
@@ -39,8 +40,15 @@ class GameSummaries(Resource):
                     for game_id,datasets in file_list.Games.items()
                 })
                 ret_val.RequestSucceeded(msg="Retrieved list of game summaries", val=summaries.AsDict)
+                ResponseCompression.CacheBody()
             else:
                 ret_val.RequestErrored(msg="Could not find any games!", status=ResponseStatus.NOT_FOUND)
+        except CircuitOpenError as err:
+            current_app.logger.warning(f"Rejected request for the list of game summaries, the file server's circuit is open:\n{err}")
+            ret_val.ServerErrored(msg="Server could not retrieve the list of game summaries while the file server is unavailable, please try again shortly.", status=ResponseStatus.UNAVAILABLE)
+        except DeadlineExceededError as err:
+            current_app.logger.warning(f"Stopped request for the list of game summaries, its deadline passed:\n{err}")
+            ret_val.ServerErrored(msg="Server could not retrieve the list of game summaries within the time allowed for this request.", status=ResponseStatus.GATEWAY_TIMEOUT)
         except Exception as err: # pylint: disable=broad-exception-caught
             msg = "Unexpected error while retrieving list of game summaries!"
             current_app.logger.error(f"{msg}\n{type(err)}:\n{err}")
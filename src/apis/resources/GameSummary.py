@@ -14,9 +14,11 @@ from ogd.common.configs.storage.DatasetRepositoryConfig import DatasetRepository
 from ogd.common.schemas.datasets.DatasetCollectionSchema import DatasetCollectionSchema
 
 # import local files
-from configs.FileAPIConfig import FileAPIConfig
+from utils.CircuitBreaker import CircuitOpenError
+from utils.Deadlines import DeadlineExceededError
+from utils.FileAPIContext import FileAPIContext
+from utils.ResponseCompression import ResponseCompression
 from utils.SanitizedParams import SanitizedParams
-from utils.utils import GetFileList
 
 
 class GameSummary(Resource):
@@ -33,16 +35,22 @@ class GameSummary(Resource):
         
         if safe_game_id := SanitizedParams.SanitizeGameID(game_id):
             try:
-                cfg           : FileAPIConfig           = FileAPIConfig("FileAPIConfig", {})
-                file_list     : DatasetRepositoryConfig = GetFileList(cfg.FileListURL)
+                file_list     : DatasetRepositoryConfig = FileAPIContext.Current().FileList()
                 game_datasets : Optional[DatasetCollectionSchema] = file_list.Games.get(safe_game_id, None)
 
                 if game_datasets and len(game_datasets.Datasets) > 0:
                     summary = GameSummaryModel.FromDatasetCollection(game_id=safe_game_id, dataset_collection=game_datasets)
                     ret_val.RequestSucceeded(f"Retrieved {safe_game_id} summary", val=dataclasses.asdict(summary))
+                    ResponseCompression.CacheBody()
                 else:
                     # If the given game isn't in our dictionary, or our dictionary doesn't have any date ranges for this game
                     ret_val.RequestErrored(msg=f"GameID '{safe_game_id}' not found in list of games with datasets, or had no datasets listed", status=ResponseStatus.NOT_FOUND)
+            except CircuitOpenError as err:
+                current_app.logger.warning(f"Rejected request for the {safe_game_id} summary, the file server's circuit is open:\n{err}")
+                ret_val.ServerErrored(msg=f"Server could not retrieve the {safe_game_id} summary while the file server is unavailable, please try again shortly.", status=ResponseStatus.UNAVAILABLE)
+            except DeadlineExceededError as err:
+                current_app.logger.warning(f"Stopped request for the {safe_game_id} summary, its deadline passed:\n{err}")
+                ret_val.ServerErrored(msg=f"Server could not retrieve the {safe_game_id} summary within the time allowed for this request.", status=ResponseStatus.GATEWAY_TIMEOUT)
             except Exception as err: # pylint: disable=broad-exception-caught
                 msg = f"Unexpected error while retrieving {safe_game_id} summary!"
                 current_app.logger.error(f"{msg}\n{type(err)}:\n{err}")
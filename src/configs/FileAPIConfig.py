@@ -5,7 +5,8 @@ Contains a Schema class for managing config data for server configurations.
 """
 
 # import standard libraries
-from typing import Any, Dict, Final, Optional, Self
+import threading
+from typing import Any, ClassVar, Dict, Final, List, Optional, Self
 
 # import 3rd-party libraries
 
@@ -16,27 +17,150 @@ from ogd.common.utils.typing import Map
 # import local files
 
 class FileAPIConfig(ServerConfig):
+    """Config for the File API. There is one instance per process, which is shared by every request thread, and read-only once it's created.
+
+    Resources should get the instance from `FileAPIContext.Current().config`.
+    """
     _DEFAULT_FILE_LIST_URL : Final[str] = 'https://opengamedata.fielddaylab.wisc.edu/data/file_list.json'
+    _DEFAULT_FILE_INDEX    : Final[Dict[str, Any]] = {
+        "REFRESH_SECONDS" : 60,
+        "SNAPSHOT_DIR"    : None
+    }
+    _DEFAULT_PARSE_POOL    : Final[Dict[str, Any]] = {
+        "WORKERS"        : 2,
+        "MAX_QUEUED"     : 8,
+        "JOB_TIMEOUT"    : 120,
+        "START_METHOD"   : "spawn",
+        "PYTHON_PATH"    : None,
+        "MEMBER_THREADS" : 4
+    }
+    _DEFAULT_STREAMING     : Final[Dict[str, Any]] = {
+        "CHUNK_ROWS"  : 10_000,
+        "SPOOL_BYTES" : 32 * 1024 * 1024
+    }
+    _DEFAULT_CACHE         : Final[Dict[str, Any]] = {
+        "MAX_BYTES" : 256 * 1024 * 1024
+    }
+    _DEFAULT_DISK_CACHE    : Final[Dict[str, Any]] = {
+        "DIRECTORY"       : None,
+        "MAX_BYTES"       : 4 * 1024 * 1024 * 1024,
+        "MAX_AGE_SECONDS" : 7 * 24 * 60 * 60,
+        "EVICT_INTERVAL"  : 300
+    }
+    _DEFAULT_MONTH_RANGE   : Final[Dict[str, Any]] = {
+        "MAX_MONTHS"    : 36,
+        "FETCH_WORKERS" : 4
+    }
+    _DEFAULT_COLUMN_TYPES  : Final[Dict[str, Any]] = {
+        "FROM_SCHEMA" : True,
+        "LEARN"       : True,
+        "FLOAT32"     : False
+    }
+    _DEFAULT_COMPRESSION   : Final[Dict[str, Any]] = {
+        "ENCODINGS"     : ["br", "zstd", "gzip"],
+        "MIN_BYTES"     : 1024,
+        "LEVELS"        : {"br" : 4, "zstd" : 3,  "gzip" : 6},
+        "CACHED_LEVELS" : {"br" : 9, "zstd" : 12, "gzip" : 9}
+    }
+    _DEFAULT_SIZE_LIMITS   : Final[Dict[str, Any]] = {
+        "MAX_TABLE_BYTES" : 256 * 1024 * 1024,
+        "MAX_FILE_BYTES"  : 0
+    }
+    _DEFAULT_HTTP_CLIENT   : Final[Dict[str, Any]] = {
+        "MAX_HOSTS"       : 8,
+        "MAX_PER_HOST"    : 16,
+        "BLOCK"           : False,
+        "CONNECT_TIMEOUT" : 5.0,
+        "READ_TIMEOUT"    : 60.0,
+        "RETRIES"         : 2,
+        "BACKOFF"         : 0.25
+    }
+    _DEFAULT_BULKHEADS     : Final[Dict[str, Any]] = {
+        "FILE_ACTIVE"            : 8,
+        "FILE_QUEUED"            : 8,
+        "FILE_QUEUE_TIMEOUT"     : 10.0,
+        "METADATA_ACTIVE"        : 0,
+        "METADATA_QUEUED"        : 0,
+        "METADATA_QUEUE_TIMEOUT" : 5.0,
+        "RETRY_AFTER"            : 5
+    }
+    _DEFAULT_DEADLINES     : Final[Dict[str, Any]] = {
+        "DEFAULT_SECONDS" : 30,
+        "ROUTES"          : {
+            "datasetfile"       : 120,
+            "datasetfilerange"  : 300,
+            "datasetfilejoin"   : 120,
+            "datasetfilestats"  : 120,
+            "datasetfilefacets" : 120
+        }
+    }
+    _DEFAULT_CIRCUIT_BREAKER : Final[Dict[str, Any]] = {
+        "FAILURE_THRESHOLD" : 5,
+        "RESET_SECONDS"     : 30,
+        "HALF_OPEN_PROBES"  : 1
+    }
+    _DEFAULT_METRICS       : Final[Dict[str, Any]] = {
+        "ENABLED"         : False,
+        "PATH"            : "/metrics",
+        "TOKEN"           : None,
+        "LATENCY_BUCKETS" : None
+    }
+    _DEFAULT_SERVER_TIMING : Final[Dict[str, Any]] = {
+        "ENABLED" : True,
+        "HEADER"  : False
+    }
+    _DEFAULT_PROFILING : Final[Dict[str, Any]] = {
+        "ENABLED"   : False,
+        "HEADER"    : "X-OGD-Profile",
+        "TOKEN"     : None,
+        "DIRECTORY" : None,
+        "MAX_FILES" : 50
+    }
+    # Held while the instance is created and initialized, so threads that race to create it all get the same, fully-initialized instance.
+    _lock : ClassVar[threading.RLock] = threading.RLock()
 
     def __new__(cls, *args, **kwargs):
         if not hasattr(cls, '_instance'):
-            cls._instance = super(FileAPIConfig, cls).__new__(cls)
+            with cls._lock:
+                if not hasattr(cls, '_instance'):
+                    cls._instance = super(FileAPIConfig, cls).__new__(cls)
         return cls._instance
 
     def __init__(self, name:str, all_elements:Dict[str, Any]):
         if not hasattr(self, '_initialized'):
-            self._game_mapping  : Dict[str, Dict[str, str]] = all_elements.get("BIGQUERY_GAME_MAPPING", {})
-            self._file_list_url : str                       = all_elements.get("FILE_LIST_URL", FileAPIConfig._DEFAULT_FILE_LIST_URL)
+            with FileAPIConfig._lock:
+                if not hasattr(self, '_initialized'):
+                    self._initialize(name=name, all_elements=all_elements)
 
-            _used = {"DB_CONFIG", "OGD_CORE_PATH", "GOOGLE_CLIENT_ID"}
-            _leftovers = { key : val for key,val in all_elements.items() if key not in _used }
-            super().__init__(
-                name=name,
-                debug_level=None,
-                version=None,
-                other_elements=_leftovers
-            )
-            self._initialized = True
+    def _initialize(self, name:str, all_elements:Dict[str, Any]):
+        self._game_mapping  : Dict[str, Dict[str, str]] = all_elements.get("BIGQUERY_GAME_MAPPING", {})
+        self._file_list_url : str                       = all_elements.get("FILE_LIST_URL", FileAPIConfig._DEFAULT_FILE_LIST_URL)
+        self._file_index    : Dict[str, Any]            = FileAPIConfig._DEFAULT_FILE_INDEX | all_elements.get("FILE_INDEX", {})
+        self._parse_pool    : Dict[str, Any]            = FileAPIConfig._DEFAULT_PARSE_POOL | all_elements.get("PARSE_POOL", {})
+        self._streaming     : Dict[str, Any]            = FileAPIConfig._DEFAULT_STREAMING  | all_elements.get("STREAMING", {})
+        self._cache         : Dict[str, Any]            = FileAPIConfig._DEFAULT_CACHE      | all_elements.get("CACHE", {})
+        self._disk_cache    : Dict[str, Any]            = FileAPIConfig._DEFAULT_DISK_CACHE | all_elements.get("DISK_CACHE", {})
+        self._month_range   : Dict[str, Any]            = FileAPIConfig._DEFAULT_MONTH_RANGE | all_elements.get("MONTH_RANGE", {})
+        self._column_types  : Dict[str, Any]            = FileAPIConfig._DEFAULT_COLUMN_TYPES | all_elements.get("COLUMN_TYPES", {})
+        self._compression   : Dict[str, Any]            = FileAPIConfig._DEFAULT_COMPRESSION | all_elements.get("COMPRESSION", {})
+        self._size_limits   : Dict[str, Any]            = FileAPIConfig._DEFAULT_SIZE_LIMITS | all_elements.get("SIZE_LIMITS", {})
+        self._http_client   : Dict[str, Any]            = FileAPIConfig._DEFAULT_HTTP_CLIENT | all_elements.get("HTTP_CLIENT", {})
+        self._bulkheads     : Dict[str, Any]            = FileAPIConfig._DEFAULT_BULKHEADS | all_elements.get("BULKHEADS", {})
+        self._deadlines     : Dict[str, Any]            = FileAPIConfig._DEFAULT_DEADLINES | all_elements.get("DEADLINES", {})
+        self._breaker       : Dict[str, Any]            = FileAPIConfig._DEFAULT_CIRCUIT_BREAKER | all_elements.get("CIRCUIT_BREAKER", {})
+        self._metrics       : Dict[str, Any]            = FileAPIConfig._DEFAULT_METRICS | all_elements.get("METRICS", {})
+        self._server_timing : Dict[str, Any]            = FileAPIConfig._DEFAULT_SERVER_TIMING | all_elements.get("SERVER_TIMING", {})
+        self._profiling     : Dict[str, Any]            = FileAPIConfig._DEFAULT_PROFILING | all_elements.get("PROFILING", {})
+
+        _used = {"DB_CONFIG", "OGD_CORE_PATH", "GOOGLE_CLIENT_ID"}
+        _leftovers = { key : val for key,val in all_elements.items() if key not in _used }
+        super().__init__(
+            name=name,
+            debug_level=None,
+            version=None,
+            other_elements=_leftovers
+        )
+        self._initialized = True
 
     @property
     def GameMapping(self) -> Dict[str, Dict[str, str]]:
@@ -46,6 +170,301 @@ class FileAPIConfig(ServerConfig):
     def FileListURL(self) -> str:
         return self._file_list_url
 
+    @property
+    def FileIndexRefreshSeconds(self) -> float:
+        """Longest time a process keeps using its copy of the file list before fetching it again. A value of 0 fetches it for every request."""
+        return float(self._file_index["REFRESH_SECONDS"])
+
+    @property
+    def FileIndexSnapshotDir(self) -> Optional[str]:
+        """Directory where the server processes on a host share their copy of the file list.
+
+        When set, only one process fetches the file list when it's out of date, and the others read that process's copy.
+        """
+        return self._file_index["SNAPSHOT_DIR"]
+
+    @property
+    def ParsePoolWorkers(self) -> int:
+        """Number of worker processes used to parse and encode dataset files.
+
+        A value of 0 disables the pool, in which case parsing happens on the request thread.
+        """
+        return int(self._parse_pool["WORKERS"])
+
+    @property
+    def ParsePoolMaxQueued(self) -> int:
+        return int(self._parse_pool["MAX_QUEUED"])
+
+    @property
+    def ParsePoolJobTimeout(self) -> float:
+        return float(self._parse_pool["JOB_TIMEOUT"])
+
+    @property
+    def ParsePoolStartMethod(self) -> Optional[str]:
+        return self._parse_pool["START_METHOD"]
+
+    @property
+    def ParsePoolPythonPath(self) -> Optional[str]:
+        """Python interpreter for worker processes.
+
+        Needed under mod_wsgi, where `sys.executable` is the Apache binary rather than Python.
+        """
+        return self._parse_pool["PYTHON_PATH"]
+
+    @property
+    def ParsePoolMemberThreads(self) -> int:
+        """Number of threads each parse job uses to read the members of an archive, when several members are requested at once."""
+        return max(1, int(self._parse_pool["MEMBER_THREADS"]))
+
+    @property
+    def StreamChunkRows(self) -> int:
+        return int(self._streaming["CHUNK_ROWS"])
+
+    @property
+    def StreamSpoolBytes(self) -> int:
+        """Bytes of a streamed file's download that are held in memory before spilling to a temporary file."""
+        return int(self._streaming["SPOOL_BYTES"])
+
+    @property
+    def CacheMaxBytes(self) -> int:
+        """Memory budget for parsed tables and the results computed from them, such as column statistics.
+
+        A value of 0 disables the cache.
+        """
+        return int(self._cache["MAX_BYTES"])
+
+    @property
+    def DiskCacheDirectory(self) -> Optional[str]:
+        """Directory for parsed tables shared by every process that uses it, which may be on NFS to share them between hosts.
+
+        A value of None disables the disk cache.
+        """
+        return self._disk_cache["DIRECTORY"]
+
+    @property
+    def DiskCacheMaxBytes(self) -> int:
+        """Disk budget for the shared parsed tables. A value of 0 disables the disk cache."""
+        return int(self._disk_cache["MAX_BYTES"])
+
+    @property
+    def DiskCacheMaxAgeSeconds(self) -> float:
+        """Longest time a shared parsed table is kept without being used. A value of 0 means no limit."""
+        return float(self._disk_cache["MAX_AGE_SECONDS"])
+
+    @property
+    def DiskCacheEvictInterval(self) -> float:
+        """Shortest time between two eviction passes over the disk cache by the same process."""
+        return float(self._disk_cache["EVICT_INTERVAL"])
+
+    @property
+    def MonthRangeMaxMonths(self) -> int:
+        """Largest number of months a single month-range request may cover."""
+        return int(self._month_range["MAX_MONTHS"])
+
+    @property
+    def MonthRangeFetchWorkers(self) -> int:
+        """Number of months of a month-range request that are downloaded and parsed at once."""
+        return int(self._month_range["FETCH_WORKERS"])
+
+    @property
+    def ColumnTypesFromSchema(self) -> bool:
+        """Whether to parse feature columns with the types given in the dataset's feature metadata."""
+        return bool(self._column_types["FROM_SCHEMA"])
+
+    @property
+    def ColumnTypesLearn(self) -> bool:
+        """Whether to parse each game's files with the column types seen in the first of its files to be parsed."""
+        return bool(self._column_types["LEARN"])
+
+    @property
+    def ColumnTypesFloat32(self) -> bool:
+        """Whether cached tables store floats as `float32`, which halves their memory, but rounds them to about 7 significant digits."""
+        return bool(self._column_types["FLOAT32"])
+
+    @property
+    def CompressionEncodings(self) -> List[str]:
+        """Encodings offered for compressed responses, in order of preference. An empty list disables compression."""
+        return list(self._compression["ENCODINGS"])
+
+    @property
+    def CompressionMinBytes(self) -> int:
+        """Smallest response body worth compressing. Streamed responses are always compressed, since their size isn't known."""
+        return int(self._compression["MIN_BYTES"])
+
+    @property
+    def CompressionLevels(self) -> Dict[str, int]:
+        return dict(self._compression["LEVELS"])
+
+    @property
+    def CompressionCachedLevels(self) -> Dict[str, int]:
+        """Compression levels for bodies whose compressed form is cached, which can afford to be slower, since they're only compressed once."""
+        return dict(self._compression["CACHED_LEVELS"])
+
+    @property
+    def SizeLimitTableBytes(self) -> int:
+        """Largest uncompressed table that is loaded into memory as a whole.
+
+        Bigger tables are streamed instead, and requests that need the whole table, such as aggregates and statistics, are rejected.
+        A value of 0 means no limit.
+        """
+        return int(self._size_limits["MAX_TABLE_BYTES"])
+
+    @property
+    def SizeLimitFileBytes(self) -> int:
+        """Largest uncompressed table that is served at all, even by streaming. A value of 0 means no limit."""
+        return int(self._size_limits["MAX_FILE_BYTES"])
+
+    @property
+    def HTTPClientMaxHosts(self) -> int:
+        """Number of upstream hosts to keep connection pools for at once."""
+        return max(1, int(self._http_client["MAX_HOSTS"]))
+
+    @property
+    def HTTPClientMaxPerHost(self) -> int:
+        """Number of keep-alive connections kept open to each upstream host."""
+        return max(1, int(self._http_client["MAX_PER_HOST"]))
+
+    @property
+    def HTTPClientBlock(self) -> bool:
+        """Whether requests wait for a free connection when a host is at its limit, rather than opening a one-off connection."""
+        return bool(self._http_client["BLOCK"])
+
+    @property
+    def HTTPClientConnectTimeout(self) -> float:
+        return float(self._http_client["CONNECT_TIMEOUT"])
+
+    @property
+    def HTTPClientReadTimeout(self) -> float:
+        return float(self._http_client["READ_TIMEOUT"])
+
+    @property
+    def HTTPClientRetries(self) -> int:
+        """Number of times an upstream request is retried after a connection error or a 502, 503, or 504 response."""
+        return max(0, int(self._http_client["RETRIES"]))
+
+    @property
+    def HTTPClientBackoff(self) -> float:
+        return float(self._http_client["BACKOFF"])
+
+    @property
+    def BulkheadFileActive(self) -> int:
+        """Most dataset file requests each process handles at once. A value of 0 means no limit."""
+        return int(self._bulkheads["FILE_ACTIVE"])
+
+    @property
+    def BulkheadFileQueued(self) -> int:
+        """Most dataset file requests each process keeps waiting for a turn, beyond which they're turned away with a 503."""
+        return int(self._bulkheads["FILE_QUEUED"])
+
+    @property
+    def BulkheadFileQueueTimeout(self) -> float:
+        """Longest time a dataset file request waits for a turn before it's turned away with a 503."""
+        return float(self._bulkheads["FILE_QUEUE_TIMEOUT"])
+
+    @property
+    def BulkheadMetadataActive(self) -> int:
+        """Most metadata requests, such as `/games`, each process handles at once. A value of 0 means no limit."""
+        return int(self._bulkheads["METADATA_ACTIVE"])
+
+    @property
+    def BulkheadMetadataQueued(self) -> int:
+        """Most metadata requests each process keeps waiting for a turn, beyond which they're turned away with a 503."""
+        return int(self._bulkheads["METADATA_QUEUED"])
+
+    @property
+    def BulkheadMetadataQueueTimeout(self) -> float:
+        """Longest time a metadata request waits for a turn before it's turned away with a 503."""
+        return float(self._bulkheads["METADATA_QUEUE_TIMEOUT"])
+
+    @property
+    def BulkheadRetryAfter(self) -> int:
+        """Seconds that clients are told to wait before retrying, in the `Retry-After` header of every 503."""
+        return int(self._bulkheads["RETRY_AFTER"])
+
+    @property
+    def DeadlineDefaultSeconds(self) -> float:
+        """Longest time a request can take before it's answered with a 504, for routes not in `DeadlineRouteSeconds`. A value of 0 means no deadline."""
+        return float(self._deadlines["DEFAULT_SECONDS"])
+
+    @property
+    def DeadlineRouteSeconds(self) -> Dict[str, float]:
+        """Deadlines for particular routes, by endpoint name, on top of the default deadlines for the dataset file routes."""
+        return {
+            endpoint : float(seconds)
+            for endpoint, seconds in (FileAPIConfig._DEFAULT_DEADLINES["ROUTES"] | self._deadlines.get("ROUTES", {})).items()
+        }
+
+    @property
+    def CircuitBreakerFailureThreshold(self) -> int:
+        """Failed fetches in a row from an upstream host before its circuit opens, and fetches from it fail at once. A value of 0 disables the breaker."""
+        return int(self._breaker["FAILURE_THRESHOLD"])
+
+    @property
+    def CircuitBreakerResetSeconds(self) -> float:
+        """Seconds an open circuit waits before letting a probe fetch through to see whether the host has recovered."""
+        return float(self._breaker["RESET_SECONDS"])
+
+    @property
+    def CircuitBreakerHalfOpenProbes(self) -> int:
+        """Most probe fetches let through at once while a circuit is half-open."""
+        return int(self._breaker["HALF_OPEN_PROBES"])
+
+    @property
+    def MetricsEnabled(self) -> bool:
+        """Whether request, upstream fetch, and cache metrics are collected and served."""
+        return bool(self._metrics["ENABLED"])
+
+    @property
+    def MetricsPath(self) -> str:
+        """Route the metrics are served at, in the Prometheus text format."""
+        return str(self._metrics["PATH"])
+
+    @property
+    def MetricsToken(self) -> Optional[str]:
+        """Secret scrapers must send as `Authorization: Bearer <token>` to read the metrics. A value of None serves them to anyone who can reach the route."""
+        return self._metrics["TOKEN"]
+
+    @property
+    def MetricsLatencyBuckets(self) -> Optional[List[float]]:
+        """Upper bounds, in seconds, of the buckets of the latency histograms, or None for the defaults in `Metrics.DEFAULT_BUCKETS`."""
+        buckets = self._metrics["LATENCY_BUCKETS"]
+        return [float(bound) for bound in buckets] if buckets else None
+
+    @property
+    def ServerTimingEnabled(self) -> bool:
+        """Whether the time each request spends in each phase, such as downloading or parsing a file, is measured."""
+        return bool(self._server_timing["ENABLED"])
+
+    @property
+    def ServerTimingHeader(self) -> bool:
+        """Whether each response reports its phase times to the client, in a `Server-Timing` header."""
+        return bool(self._server_timing["HEADER"])
+
+    @property
+    def ProfilingEnabled(self) -> bool:
+        """Whether requests can ask to be profiled. Profiling also needs a token and a directory."""
+        return bool(self._profiling["ENABLED"])
+
+    @property
+    def ProfilingHeader(self) -> str:
+        """Request header that carries the profiling token, and response header that names the saved profile."""
+        return str(self._profiling["HEADER"])
+
+    @property
+    def ProfilingToken(self) -> Optional[str]:
+        """Secret a request must send in the profiling header to be profiled. A value of None disables profiling."""
+        return self._profiling["TOKEN"]
+
+    @property
+    def ProfilingDirectory(self) -> Optional[str]:
+        """Directory the profiles are saved to. A value of None disables profiling."""
+        return self._profiling["DIRECTORY"]
+
+    @property
+    def ProfilingMaxFiles(self) -> int:
+        """Most profiles kept in the directory, removing the oldest first. A value of 0 keeps every profile."""
+        return int(self._profiling["MAX_FILES"])
+
     @property
     def AsMarkdown(self) -> str:
         ret_val : str
@@ -59,7 +478,23 @@ class FileAPIConfig(ServerConfig):
             "API_VERSION":self.Version,
             "DEBUG_LEVEL":self.DebugLevel,
             "BIGQUERY_GAME_MAPPING":self.GameMapping,
-            "FILE_LIST_URL":self.FileListURL
+            "FILE_LIST_URL":self.FileListURL,
+            "FILE_INDEX":self._file_index,
+            "PARSE_POOL":self._parse_pool,
+            "STREAMING":self._streaming,
+            "CACHE":self._cache,
+            "DISK_CACHE":self._disk_cache,
+            "MONTH_RANGE":self._month_range,
+            "COLUMN_TYPES":self._column_types,
+            "COMPRESSION":self._compression,
+            "SIZE_LIMITS":self._size_limits,
+            "HTTP_CLIENT":self._http_client,
+            "BULKHEADS":self._bulkheads,
+            "DEADLINES":self._deadlines,
+            "CIRCUIT_BREAKER":self._breaker,
+            "METRICS":self._metrics,
+            "SERVER_TIMING":self._server_timing,
+            "PROFILING":self._profiling
         }
 
     @classmethod
@@ -1,7 +1,7 @@
 import logging
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 from ogd.apis.models.APIRequest import APIRequest
 from ogd.apis.models.APIResponse import APIResponse
@@ -13,19 +13,30 @@ class FileTypes(Enum):
     """Enum type representing the file types currently supported by the DatasetFile endpoint.
 
     In particular, this endpoint can be used to retrieve any of the three granular feature file types:
-    sessions, players, and population.
-
-    Event data and the "combined" feature format are not yet supported.
+    sessions, players, and population, or the "combined" feature file containing all three granularities.
+    It can also retrieve event data, either the game events alone (EVENT),
+    or game events together with detector events (ALL_EVENT, also accepted as DETECTOR_EVENT).
+    Event and combined files are always streamed back in chunks by the server.
     """
     SESSION = 1
     PLAYER = 2
     POPULATION = 3
+    EVENT = 4
+    ALL_EVENT = 5
+    DETECTOR_EVENT = 5
+    COMBINED = 6
 
     def __str__(self):
         return self.name
 
 class DatasetFileRequest(APIRequest):
-    def __init__(self, api_base_url:URLLocationConfig | str, game_id:str, year:int, month:int, file_type:FileTypes | str, timeout:int=1):
+    def __init__(self, api_base_url:URLLocationConfig | str, game_id:str, year:int, month:int, file_type:FileTypes | str, timeout:int=1, params:Optional[Map]=None):
+        """Request for the contents of a dataset file.
+
+        `params` may include `columns` (comma-separated), `session_id`, `offset`, and `limit`,
+        to retrieve only part of the file, as well as `group_by`, `agg`, `sort`, `sample`, and `seed`.
+        With `members` (a pattern for member names, such as `*.tsv`), each matching table in the file's archive is returned separately.
+        """
 
         url : URLLocationConfig
         match api_base_url:
@@ -34,14 +45,17 @@ class DatasetFileRequest(APIRequest):
             case str():
                 url = URLLocationConfig.FromString(name="API Location", raw_url=api_base_url)
         endpoint = URLLocationConfig.FromString(name="Endpoint", raw_url=f"/games/{game_id}/datasets/{year}/{month}/{file_type}")
-        super().__init__(url=url + endpoint, request_type=RESTType.GET, params=None, body=None, timeout=timeout)
+        super().__init__(url=url + endpoint, request_type=RESTType.GET, params=params, body=None, timeout=timeout)
 
-    def Execute(self, logger:Optional[logging.Logger]=None, retry:int=0) -> "DatasetFile | APIResponse":
-        ret_val : DatasetFile | APIResponse
+    def Execute(self, logger:Optional[logging.Logger]=None, retry:int=0) -> "DatasetFile | DatasetFileMembers | APIResponse":
+        ret_val : DatasetFile | DatasetFileMembers | APIResponse
 
         api_response = super().Execute(logger=logger, retry=retry)
         try:
-            ret_val = DatasetFile.FromAPIResponse(response=api_response)
+            if isinstance(api_response.Value, dict) and "members" in api_response.Value:
+                ret_val = DatasetFileMembers.FromAPIResponse(response=api_response)
+            else:
+                ret_val = DatasetFile.FromAPIResponse(response=api_response)
         except (ValueError, KeyError):
             ret_val = api_response
 
@@ -91,4 +105,42 @@ class DatasetFile:
             ret_val = DatasetFile.FromDict(raw_dict=response.Value)
         else:
             raise ValueError("Response for DatasetFile contained no values!")
+        return ret_val
+
+@dataclass
+class DatasetFileMembers:
+    members : Dict[str, DatasetFile]
+
+    @property
+    def Members(self) -> Dict[str, DatasetFile]:
+        return self.members
+
+    @staticmethod
+    def FromDict(raw_dict:Map) -> "DatasetFileMembers":
+        ret_val : DatasetFileMembers
+
+        if "members" in raw_dict.keys():
+            ret_val = DatasetFileMembers(
+                members = {name : DatasetFile.FromDict(raw_dict=member) for name, member in raw_dict["members"].items()}
+            )
+        else:
+            raise KeyError("DatasetFileMembers source dict was missing its members")
+
+        return ret_val
+
+    @staticmethod
+    def FromAPIResponse(response:APIResponse) -> "DatasetFileMembers":
+        """Parse a DatasetFileMembers from an APIResponse
+
+        :param response: The APIResponse object containing the DatasetFileMembers data.
+        :type response: APIResponse
+        :return: A DatasetFileMembers object constructed from the data given in the APIResponse
+        :rtype: DatasetFileMembers
+        """
+        ret_val : DatasetFileMembers
+
+        if isinstance(response.Value, dict):
+            ret_val = DatasetFileMembers.FromDict(raw_dict=response.Value)
+        else:
+            raise ValueError("Response for DatasetFileMembers contained no values!")
         return ret_val
\ No newline at end of file
@@ -0,0 +1,119 @@
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from ogd.apis.models.APIRequest import APIRequest
+from ogd.apis.models.APIResponse import APIResponse
+from ogd.apis.models.enums.RESTType import RESTType
+from ogd.apis.models.files.DatasetFile import FileTypes
+from ogd.common.configs.locations.URLLocationConfig import URLLocationConfig
+from ogd.common.utils.typing import Map
+
+class DatasetFileFacetsRequest(APIRequest):
+    def __init__(self, api_base_url:URLLocationConfig | str, game_id:str, year:int, month:int, file_type:FileTypes | str, columns:List[str], bins:Optional[int]=None, top:Optional[int]=None, timeout:int=1):
+        url : URLLocationConfig
+        match api_base_url:
+            case URLLocationConfig():
+                url = api_base_url
+            case str():
+                url = URLLocationConfig.FromString(name="API Location", raw_url=api_base_url)
+        endpoint = URLLocationConfig.FromString(name="Endpoint", raw_url=f"/games/{game_id}/datasets/{year}/{month}/{file_type}/facets")
+        params : Dict[str, Any] = {"column" : ",".join(columns)}
+        if bins is not None:
+            params["bins"] = bins
+        if top is not None:
+            params["top"] = top
+        super().__init__(url=url + endpoint, request_type=RESTType.GET, params=params, body=None, timeout=timeout)
+
+    def Execute(self, logger:Optional[logging.Logger]=None, retry:int=0) -> "DatasetFileFacets | APIResponse":
+        ret_val : DatasetFileFacets | APIResponse
+
+        api_response = super().Execute(logger=logger, retry=retry)
+        try:
+            ret_val = DatasetFileFacets.FromAPIResponse(response=api_response)
+        except (ValueError, KeyError):
+            ret_val = api_response
+
+        return ret_val
+
+@dataclass
+class ColumnFacets:
+    """Distribution of the values in one column of a dataset file.
+
+    Numeric columns have a `histogram`, with `edges` and `counts` lists.
+    String and boolean columns instead have `top_values`, a list of `value` and `count` pairs, most common first.
+    """
+    count      : int
+    null_count : int
+    histogram  : Optional[Dict[str, List[float]]]
+    top_values : Optional[List[Dict[str, Any]]]
+
+    @property
+    def Count(self) -> int:
+        return self.count
+    @property
+    def NullCount(self) -> int:
+        return self.null_count
+    @property
+    def Histogram(self) -> Optional[Dict[str, List[float]]]:
+        return self.histogram
+    @property
+    def TopValues(self) -> Optional[List[Dict[str, Any]]]:
+        return self.top_values
+
+    @staticmethod
+    def FromDict(raw_dict:Map) -> "ColumnFacets":
+        ret_val : ColumnFacets
+
+        expected_keys = {"count", "null_count", "histogram", "top_values"}
+        missing_keys = expected_keys - raw_dict.keys()
+
+        if len(missing_keys) == 0:
+            ret_val = ColumnFacets(
+                count      = raw_dict["count"],
+                null_count = raw_dict["null_count"],
+                histogram  = raw_dict["histogram"],
+                top_values = raw_dict["top_values"]
+            )
+        else:
+            raise KeyError(f"ColumnFacets source dict had incorrect set of keys, missing {missing_keys}")
+
+        return ret_val
+
+@dataclass
+class DatasetFileFacets:
+    columns : Dict[str, ColumnFacets]
+
+    @property
+    def Columns(self) -> Dict[str, ColumnFacets]:
+        return self.columns
+
+    @staticmethod
+    def FromDict(raw_dict:Map) -> "DatasetFileFacets":
+        ret_val : DatasetFileFacets
+
+        if "columns" in raw_dict.keys():
+            ret_val = DatasetFileFacets(
+                columns = {name : ColumnFacets.FromDict(facets) for name, facets in raw_dict["columns"].items()}
+            )
+        else:
+            raise KeyError("DatasetFileFacets source dict had incorrect set of keys, missing {'columns'}")
+
+        return ret_val
+
+    @staticmethod
+    def FromAPIResponse(response:APIResponse) -> "DatasetFileFacets":
+        """Parse a DatasetFileFacets from an APIResponse
+
+        :param response: The APIResponse object containing the DatasetFileFacets data.
+        :type response: APIResponse
+        :return: A DatasetFileFacets object constructed from the data given in the APIResponse
+        :rtype: DatasetFileFacets
+        """
+        ret_val : DatasetFileFacets
+
+        if isinstance(response.Value, dict):
+            ret_val = DatasetFileFacets.FromDict(raw_dict=response.Value)
+        else:
+            raise ValueError("Response for DatasetFileFacets contained no values!")
+        return ret_val
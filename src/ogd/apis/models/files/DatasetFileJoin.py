@@ -0,0 +1,40 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+from ogd.apis.models.APIRequest import APIRequest
+from ogd.apis.models.APIResponse import APIResponse
+from ogd.apis.models.enums.RESTType import RESTType
+from ogd.apis.models.files.DatasetFile import DatasetFile
+from ogd.common.configs.locations.URLLocationConfig import URLLocationConfig
+
+class DatasetFileJoinRequest(APIRequest):
+    def __init__(self, api_base_url:URLLocationConfig | str, game_id:str, year:int, month:int,
+                 session_columns:Optional[List[str]]=None, player_columns:Optional[List[str]]=None, how:str="left", timeout:int=1):
+        """Request for a month's session features, joined to the features of each session's player.
+
+        The response has the same shape as a DatasetFile, so it is parsed into one.
+        """
+        url : URLLocationConfig
+        match api_base_url:
+            case URLLocationConfig():
+                url = api_base_url
+            case str():
+                url = URLLocationConfig.FromString(name="API Location", raw_url=api_base_url)
+        endpoint = URLLocationConfig.FromString(name="Endpoint", raw_url=f"/games/{game_id}/datasets/{year}/{month}/joined")
+        params : Dict[str, Any] = {"how" : how}
+        if session_columns is not None:
+            params["session_columns"] = ",".join(session_columns)
+        if player_columns is not None:
+            params["player_columns"] = ",".join(player_columns)
+        super().__init__(url=url + endpoint, request_type=RESTType.GET, params=params, body=None, timeout=timeout)
+
+    def Execute(self, logger:Optional[logging.Logger]=None, retry:int=0) -> DatasetFile | APIResponse:
+        ret_val : DatasetFile | APIResponse
+
+        api_response = super().Execute(logger=logger, retry=retry)
+        try:
+            ret_val = DatasetFile.FromAPIResponse(response=api_response)
+        except (ValueError, KeyError):
+            ret_val = api_response
+
+        return ret_val
@@ -0,0 +1,38 @@
+import logging
+from typing import Optional
+
+from ogd.apis.models.APIRequest import APIRequest
+from ogd.apis.models.APIResponse import APIResponse
+from ogd.apis.models.enums.RESTType import RESTType
+from ogd.apis.models.files.DatasetFile import DatasetFile, FileTypes
+from ogd.common.configs.locations.URLLocationConfig import URLLocationConfig
+from ogd.common.utils.typing import Map
+
+class DatasetFileRangeRequest(APIRequest):
+    def __init__(self, api_base_url:URLLocationConfig | str, game_id:str, first_year:int, first_month:int, last_year:int, last_month:int, file_type:FileTypes | str,
+                 timeout:int=1, params:Optional[Map]=None):
+        """Request for one type of file from every dataset in an inclusive range of months, as a single table with a `month` column.
+
+        `params` may include the same query args as a DatasetFileRequest.
+        The response has the same shape as a DatasetFile, so it is parsed into one.
+        """
+        url : URLLocationConfig
+        match api_base_url:
+            case URLLocationConfig():
+                url = api_base_url
+            case str():
+                url = URLLocationConfig.FromString(name="API Location", raw_url=api_base_url)
+        month_range = f"{first_year:04}-{first_month:02}..{last_year:04}-{last_month:02}"
+        endpoint = URLLocationConfig.FromString(name="Endpoint", raw_url=f"/games/{game_id}/datasets/{month_range}/{file_type}")
+        super().__init__(url=url + endpoint, request_type=RESTType.GET, params=params, body=None, timeout=timeout)
+
+    def Execute(self, logger:Optional[logging.Logger]=None, retry:int=0) -> DatasetFile | APIResponse:
+        ret_val : DatasetFile | APIResponse
+
+        api_response = super().Execute(logger=logger, retry=retry)
+        try:
+            ret_val = DatasetFile.FromAPIResponse(response=api_response)
+        except (ValueError, KeyError):
+            ret_val = api_response
+
+        return ret_val
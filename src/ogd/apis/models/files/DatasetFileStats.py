@@ -0,0 +1,142 @@
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from ogd.apis.models.APIRequest import APIRequest
+from ogd.apis.models.APIResponse import APIResponse
+from ogd.apis.models.enums.RESTType import RESTType
+from ogd.apis.models.files.DatasetFile import FileTypes
+from ogd.common.configs.locations.URLLocationConfig import URLLocationConfig
+from ogd.common.utils.typing import Map
+
+class DatasetFileStatsRequest(APIRequest):
+    def __init__(self, api_base_url:URLLocationConfig | str, game_id:str, year:int, month:int, file_type:FileTypes | str, timeout:int=1):
+        url : URLLocationConfig
+        match api_base_url:
+            case URLLocationConfig():
+                url = api_base_url
+            case str():
+                url = URLLocationConfig.FromString(name="API Location", raw_url=api_base_url)
+        endpoint = URLLocationConfig.FromString(name="Endpoint", raw_url=f"/games/{game_id}/datasets/{year}/{month}/{file_type}/stats")
+        super().__init__(url=url + endpoint, request_type=RESTType.GET, params=None, body=None, timeout=timeout)
+
+    def Execute(self, logger:Optional[logging.Logger]=None, retry:int=0) -> "DatasetFileStats | APIResponse":
+        ret_val : DatasetFileStats | APIResponse
+
+        api_response = super().Execute(logger=logger, retry=retry)
+        try:
+            ret_val = DatasetFileStats.FromAPIResponse(response=api_response)
+        except (ValueError, KeyError):
+            ret_val = api_response
+
+        return ret_val
+
+@dataclass
+class ColumnStats:
+    """Summary statistics for one column of a dataset file.
+
+    `count` and `null_count` are given for every column.
+    The numeric statistics are only given for numeric columns, and `unique` only for string or boolean columns.
+    """
+    count      : int
+    null_count : int
+    min        : Optional[float]
+    max        : Optional[float]
+    mean       : Optional[float]
+    std        : Optional[float]
+    quantiles  : Optional[Dict[str, float]]
+    unique     : Optional[int]
+
+    @property
+    def Count(self) -> int:
+        return self.count
+    @property
+    def NullCount(self) -> int:
+        return self.null_count
+    @property
+    def Min(self) -> Optional[float]:
+        return self.min
+    @property
+    def Max(self) -> Optional[float]:
+        return self.max
+    @property
+    def Mean(self) -> Optional[float]:
+        return self.mean
+    @property
+    def StandardDeviation(self) -> Optional[float]:
+        return self.std
+    @property
+    def Quantiles(self) -> Optional[Dict[str, float]]:
+        return self.quantiles
+    @property
+    def UniqueCount(self) -> Optional[int]:
+        return self.unique
+
+    @staticmethod
+    def FromDict(raw_dict:Map) -> "ColumnStats":
+        ret_val : ColumnStats
+
+        expected_keys = {"count", "null_count", "min", "max", "mean", "std", "quantiles", "unique"}
+        missing_keys = expected_keys - raw_dict.keys()
+
+        if len(missing_keys) == 0:
+            ret_val = ColumnStats(
+                count      = raw_dict["count"],
+                null_count = raw_dict["null_count"],
+                min        = raw_dict["min"],
+                max        = raw_dict["max"],
+                mean       = raw_dict["mean"],
+                std        = raw_dict["std"],
+                quantiles  = raw_dict["quantiles"],
+                unique     = raw_dict["unique"]
+            )
+        else:
+            raise KeyError(f"ColumnStats source dict had incorrect set of keys, missing {missing_keys}")
+
+        return ret_val
+
+@dataclass
+class DatasetFileStats:
+    row_count : int
+    columns   : Dict[str, ColumnStats]
+
+    @property
+    def RowCount(self) -> int:
+        return self.row_count
+    @property
+    def Columns(self) -> Dict[str, ColumnStats]:
+        return self.columns
+
+    @staticmethod
+    def FromDict(raw_dict:Map) -> "DatasetFileStats":
+        ret_val : DatasetFileStats
+
+        expected_keys = {"row_count", "columns"}
+        missing_keys = expected_keys - raw_dict.keys()
+
+        if len(missing_keys) == 0:
+            ret_val = DatasetFileStats(
+                row_count = raw_dict["row_count"],
+                columns   = {name : ColumnStats.FromDict(stats) for name, stats in raw_dict["columns"].items()}
+            )
+        else:
+            raise KeyError(f"DatasetFileStats source dict had incorrect set of keys, missing {missing_keys}")
+
+        return ret_val
+
+    @staticmethod
+    def FromAPIResponse(response:APIResponse) -> "DatasetFileStats":
+        """Parse a DatasetFileStats from an APIResponse
+
+        :param response: The APIResponse object containing the DatasetFileStats data.
+        :type response: APIResponse
+        :return: A DatasetFileStats object constructed from the data given in the APIResponse
+        :rtype: DatasetFileStats
+        """
+        ret_val : DatasetFileStats
+
+        if isinstance(response.Value, dict):
+            ret_val = DatasetFileStats.FromDict(raw_dict=response.Value)
+        else:
+            raise ValueError("Response for DatasetFileStats contained no values!")
+        return ret_val
@@ -0,0 +1,188 @@
+"""
+Bulkheads
+
+Contains the Bulkheads class, which caps how many requests of each kind a server process handles at once,
+so a burst of heavy dataset file requests can't use up the threads that metadata requests need.
+"""
+
+# import standard libraries
+import threading
+from collections import deque
+from typing import Deque, Dict, Final, Optional, Set
+
+# import 3rd-party libraries
+from flask import g, request, Response
+
+# import ogd libraries
+from ogd.apis.models.APIResponse import APIResponse
+from ogd.apis.models.enums.RESTType import RESTType
+from ogd.apis.models.enums.ResponseStatus import ResponseStatus
+
+# import local files
+
+class _Ticket:
+    """A request's place in a bulkhead's queue, which `Bulkhead.Leave` grants a turn to."""
+
+    def __init__(self, lock:threading.Lock):
+        self.Granted : bool                = False
+        self.Wakeup  : threading.Condition = threading.Condition(lock)
+
+class Bulkhead:
+    """One compartment: at most `max_active` requests run at once, and at most `max_queued` more wait for a turn.
+
+    Waiting requests are admitted in the order they arrived, as running ones finish, and give up after `queue_timeout` seconds.
+    A finishing request hands its turn straight to the first waiting request, so the turn can't be taken by a new arrival,
+    and a request that has been handed a turn no longer counts against the queue while it wakes up.
+    Anything beyond the queue is turned away immediately, rather than holding a server thread while it waits.
+    A `max_active` of 0 disables the limit.
+    """
+
+    def __init__(self, name:str, max_active:int, max_queued:int, queue_timeout:float):
+        self._name          : str            = name
+        self._max_active    : int            = max(0, max_active)
+        self._max_queued    : int            = max(0, max_queued)
+        self._queue_timeout : float          = max(0.0, queue_timeout)
+        self._lock          : threading.Lock = threading.Lock()
+        self._queue         : Deque[_Ticket] = deque()
+        self._active        : int            = 0
+        self._admitted      : int            = 0
+        self._rejected      : int            = 0
+        self._timed_out     : int            = 0
+
+    @property
+    def Name(self) -> str:
+        return self._name
+
+    @property
+    def Enabled(self) -> bool:
+        return self._max_active > 0
+
+    @property
+    def Stats(self) -> Dict[str, int]:
+        """Requests running and waiting now, and counts of requests admitted, rejected because the queue was full, and timed out in the queue."""
+        with self._lock:
+            return {
+                "active"     : self._active,
+                "waiting"    : len(self._queue),
+                "max_active" : self._max_active,
+                "max_queued" : self._max_queued,
+                "admitted"   : self._admitted,
+                "rejected"   : self._rejected,
+                "timed_out"  : self._timed_out
+            }
+
+    def Enter(self) -> bool:
+        """Take a turn in the compartment, waiting in the queue if it's full.
+
+        :return: True if the request was admitted, and must call `Leave` when it's done, or False if it was turned away.
+        :rtype: bool
+        """
+        ret_val : bool = True
+
+        if self.Enabled:
+            with self._lock:
+                # requests only skip the queue when nobody is waiting in it
+                if self._active < self._max_active and len(self._queue) == 0:
+                    self._active   += 1
+                    self._admitted += 1
+                elif len(self._queue) >= self._max_queued:
+                    self._rejected += 1
+                    ret_val         = False
+                else:
+                    ticket = _Ticket(lock=self._lock)
+                    self._queue.append(ticket)
+                    ret_val = ticket.Wakeup.wait_for(lambda : ticket.Granted, timeout=self._queue_timeout)
+                    if ret_val:
+                        # `Leave` already counted the turn as active when it granted it
+                        self._admitted += 1
+                    else:
+                        self._queue.remove(ticket)
+                        self._timed_out += 1
+
+        return ret_val
+
+    def Leave(self):
+        """Give back a turn, handing it to the first waiting request if there is one."""
+        if self.Enabled:
+            with self._lock:
+                if len(self._queue) > 0:
+                    ticket = self._queue.popleft()
+                    ticket.Granted = True
+                    ticket.Wakeup.notify()
+                else:
+                    self._active -= 1
+
+class Bulkheads:
+    """Assigns each request to a `Bulkhead` by its endpoint, with dataset file requests in one compartment and everything else in another.
+
+    The file compartment should be kept smaller than the server's threads per process, counting its queue,
+    so the rest of the threads are always left for metadata requests like `/games`.
+
+    `BeforeRequest` and `AfterRequest` are registered as request hooks.
+    A request's turn lasts until its response is closed, so a streamed file holds its turn for as long as it streams.
+    Requests that are turned away get a 503 with a `Retry-After` header, and so does any other 503 the resources return.
+    """
+    EXTENSION_KEY  : Final[str]      = "ogd_bulkheads"
+    FILE_ENDPOINTS : Final[Set[str]] = {"datasetfile", "datasetfilerange", "datasetfilejoin", "datasetfilestats", "datasetfilefacets"}
+    """Endpoints of the resources that download and parse dataset files. flask_restful names each endpoint after its resource class, in lower case."""
+    _TURN_KEY      : Final[str]      = "ogd_bulkhead"
+
+    def __init__(self, files:Bulkhead, metadata:Bulkhead, retry_after:int):
+        self._files       : Bulkhead = files
+        self._metadata    : Bulkhead = metadata
+        self._retry_after : int      = max(1, retry_after)
+
+    @property
+    def Files(self) -> Bulkhead:
+        return self._files
+
+    @property
+    def Metadata(self) -> Bulkhead:
+        return self._metadata
+
+    @property
+    def Stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            self._files.Name    : self._files.Stats,
+            self._metadata.Name : self._metadata.Stats
+        }
+
+    def BeforeRequest(self) -> Optional[Response]:
+        """Wait for the request's turn in its compartment. Registered as a `before_request` handler.
+
+        :return: A 503 response if the request was turned away, or None to go on handling it.
+        :rtype: Optional[Response]
+        """
+        ret_val : Optional[Response] = None
+
+        bulkhead = self._files if request.endpoint in Bulkheads.FILE_ENDPOINTS else self._metadata
+        if bulkhead.Enter():
+            setattr(g, Bulkheads._TURN_KEY, bulkhead)
+        else:
+            busy_response = APIResponse.Default(req_type=RESTType.GET)
+            busy_response.ServerErrored(msg="Server is busy handling other requests, please try again shortly.", status=ResponseStatus.UNAVAILABLE)
+            ret_val = busy_response.AsFlaskResponse
+
+        return ret_val
+
+    def AfterRequest(self, response:Response) -> Response:
+        """Hand the request's turn over to its response, to give back when the response is closed. Registered as an `after_request` handler.
+
+        :param response: The response to the request.
+        :type response: Response
+        :return: The same response, with a `Retry-After` header if it's a 503.
+        :rtype: Response
+        """
+        bulkhead : Optional[Bulkhead] = g.pop(Bulkheads._TURN_KEY, None)
+        if bulkhead is not None:
+            response.call_on_close(bulkhead.Leave)
+        if response.status_code == ResponseStatus.UNAVAILABLE.value and "Retry-After" not in response.headers:
+            response.headers["Retry-After"] = str(self._retry_after)
+
+        return response
+
+    def TeardownRequest(self, _error:Optional[BaseException]):
+        """Give back the turn of a request that failed before it had a response. Registered as a `teardown_request` handler."""
+        bulkhead : Optional[Bulkhead] = g.pop(Bulkheads._TURN_KEY, None)
+        if bulkhead is not None:
+            bulkhead.Leave()
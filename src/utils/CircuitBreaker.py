@@ -0,0 +1,152 @@
+"""
+CircuitBreaker
+
+Contains the CircuitBreaker class, which stops fetches to an upstream server that keeps failing, until it has had time to recover.
+"""
+
+# import standard libraries
+import threading
+import time
+from enum import Enum
+from typing import Any, Dict, Final, Optional
+
+# import 3rd-party libraries
+from flask import current_app, has_app_context
+
+# import local files
+
+class CircuitOpenError(Exception):
+    """Raised instead of fetching from an upstream server whose circuit is open."""
+
+    def __init__(self, host:str, retry_after:float):
+        super().__init__(f"The circuit for {host} is open after repeated failures, retrying in {retry_after:.0f} seconds.")
+        self.Host       : str   = host
+        self.RetryAfter : float = retry_after
+
+class CircuitState(Enum):
+    CLOSED    = "closed"
+    OPEN      = "open"
+    HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker for one upstream server.
+
+    The circuit starts closed, letting every fetch through.
+    After `failure_threshold` failures in a row it opens, and fetches fail at once with a `CircuitOpenError`,
+    rather than every request waiting on, and retrying against, a server that's already struggling.
+    Once `reset_seconds` have passed it's half-open, and lets `half_open_probes` fetches through at a time to probe the server:
+    a success closes the circuit again, and a failure opens it for another `reset_seconds`.
+
+    Each fetch calls `Acquire` first, and `Record` once it's done, passing on whatever `Acquire` returned.
+    A `failure_threshold` of 0 disables the breaker.
+    """
+    TRANSITIONS : Final[tuple] = ("opened", "half_opened", "closed")
+
+    def __init__(self, host:str, failure_threshold:int, reset_seconds:float, half_open_probes:int):
+        self._host              : str                 = host
+        self._failure_threshold : int                 = max(0, failure_threshold)
+        self._reset_seconds     : float               = max(0.0, reset_seconds)
+        self._half_open_probes  : int                 = max(1, half_open_probes)
+        self._lock              : threading.Lock      = threading.Lock()
+        self._state             : CircuitState        = CircuitState.CLOSED
+        self._failures          : int                 = 0
+        self._opened_at         : float               = 0.0
+        self._probes            : int                 = 0
+        self._rejected          : int                 = 0
+        self._transitions       : Dict[str, int]      = {transition : 0 for transition in CircuitBreaker.TRANSITIONS}
+        self._changed_at        : Optional[float]     = None
+
+    @property
+    def Host(self) -> str:
+        return self._host
+
+    @property
+    def Enabled(self) -> bool:
+        return self._failure_threshold > 0
+
+    @property
+    def State(self) -> CircuitState:
+        with self._lock:
+            return self._currentState()
+
+    @property
+    def Stats(self) -> Dict[str, Any]:
+        """The current state, the failures in a row, fetches rejected while open, and how many times the circuit has opened, half-opened, and closed."""
+        with self._lock:
+            return {
+                "state"       : self._currentState().value,
+                "failures"    : self._failures,
+                "rejected"    : self._rejected,
+                "transitions" : dict(self._transitions),
+                "changed_at"  : self._changed_at
+            }
+
+    def Acquire(self) -> bool:
+        """Get permission to fetch from the server.
+
+        :return: Whether the fetch is a probe of a half-open circuit, to be passed on when the fetch is done.
+        :rtype: bool
+        :raises CircuitOpenError: If the circuit is open, or half-open with every probe already in flight.
+        """
+        ret_val : bool = False
+
+        if self.Enabled:
+            with self._lock:
+                state = self._currentState()
+                if state == CircuitState.HALF_OPEN and self._probes < self._half_open_probes:
+                    if self._state != CircuitState.HALF_OPEN:
+                        self._transition(CircuitState.HALF_OPEN)
+                    self._probes += 1
+                    ret_val       = True
+                elif state != CircuitState.CLOSED:
+                    self._rejected += 1
+                    raise CircuitOpenError(host=self._host, retry_after=max(1.0, self._opened_at + self._reset_seconds - time.monotonic()))
+
+        return ret_val
+
+    def Record(self, probe:bool, healthy:Optional[bool]):
+        """Record how a fetch went.
+
+        :param probe: Whatever `Acquire` returned for the fetch.
+        :type probe: bool
+        :param healthy: True if the server answered, False if it failed or answered with a server error, or None if the fetch ended without saying either way.
+        :type healthy: Optional[bool]
+        """
+        if self.Enabled:
+            with self._lock:
+                if probe:
+                    self._probes -= 1
+                if healthy is True:
+                    self._failures = 0
+                    # fetches that started before the circuit opened don't close it, only probes do
+                    if probe and self._state == CircuitState.HALF_OPEN:
+                        self._transition(CircuitState.CLOSED)
+                elif healthy is False:
+                    self._failures += 1
+                    if probe or (self._state == CircuitState.CLOSED and self._failures >= self._failure_threshold):
+                        self._opened_at = time.monotonic()
+                        self._transition(CircuitState.OPEN)
+
+    def _currentState(self) -> CircuitState:
+        """The state as fetches see it, where an open circuit counts as half-open once it has waited long enough."""
+        ret_val = self._state
+
+        if ret_val == CircuitState.OPEN and time.monotonic() - self._opened_at >= self._reset_seconds:
+            ret_val = CircuitState.HALF_OPEN
+
+        return ret_val
+
+    def _transition(self, state:CircuitState):
+        self._state      = state
+        self._changed_at = time.time()
+        match state:
+            case CircuitState.OPEN:
+                self._transitions["opened"] += 1
+            case CircuitState.HALF_OPEN:
+                self._transitions["half_opened"] += 1
+            case CircuitState.CLOSED:
+                self._transitions["closed"] += 1
+        # fetches from background threads have no app to log to, but their transitions are still counted
+        if has_app_context():
+            reason = f", after {self._failures} failures in a row" if state == CircuitState.OPEN else ""
+            current_app.logger.warning(f"Circuit for {self._host} is now {state.value}{reason}.")
@@ -0,0 +1,182 @@
+"""
+ColumnTypes
+
+Contains the ColumnTypes class, which chooses explicit dtypes for parsing dataset tables,
+and converts parsed tables to and from their compact in-memory form.
+"""
+
+# import standard libraries
+from typing import Dict, Final, Optional
+
+# import 3rd-party libraries
+import numpy as np
+import pandas as pd
+
+# import ogd libraries
+from ogd.common.schemas.datasets.DatasetSchema import DatasetSchema
+
+class ColumnTypes:
+    """Static functions for giving dataset tables explicit, compact, and consistent column types.
+
+    Without explicit types, pandas infers each column's type from the values it happens to see,
+    so an integer feature with a single missing value becomes a float column in one month but not the next,
+    and any column pandas isn't sure about is left as Python objects.
+
+    Types are given as a mapping from column name to a `pd.read_csv` dtype, using only the nullable types in `PARSE_TYPES`,
+    so a missing value never changes a column's type.
+    Compact types only change how a table is stored, not its values, so tables encode to the same JSON either way,
+    except for the opt-in `float32`, which rounds floats.
+
+    These are run inside ParsePool worker processes, so they must not rely on the Flask app context.
+    """
+    SCHEMA_TYPES   : Final[Dict[str, str]] = {
+        "int"     : "Int64",
+        "integer" : "Int64",
+        "float"   : "float64",
+        "double"  : "float64",
+        "number"  : "float64",
+        "bool"    : "boolean",
+        "boolean" : "boolean",
+        "str"     : "object",
+        "string"  : "object"
+    }
+    """Parse types for the value types used in feature metadata. Features with any other value type are left to inference."""
+    PARSE_TYPES    : Final[set] = {"Int64", "float64", "boolean", "category", "object"}
+    CATEGORY_RATIO : Final[float] = 0.5
+    """Text columns with at most this many distinct values per row are stored as categories."""
+
+    @staticmethod
+    def FromSchema(dataset:DatasetSchema) -> Dict[str, str]:
+        """Get parse types for the features listed in a dataset's metadata.
+
+        Iterated features are skipped, since their columns are named per-iteration rather than after the feature.
+
+        :param dataset: The dataset whose features to use.
+        :type dataset: DatasetSchema
+        :return: A mapping from column name to parse type, for each feature with a recognized value type.
+        :rtype: Dict[str, str]
+        """
+        ret_val : Dict[str, str] = {}
+
+        for name, feature in (dataset.Features or {}).items():
+            parse_type = ColumnTypes.SCHEMA_TYPES.get(str(feature.ValueType).strip().lower())
+            if parse_type is not None and not feature.IterationCount:
+                ret_val[feature.FeatureName or name] = parse_type
+
+        return ret_val
+
+    @staticmethod
+    def Learn(table:pd.DataFrame) -> Dict[str, str]:
+        """Get parse types from the columns of an already-parsed table, so later months of the same game are parsed the same way.
+
+        Columns that are entirely null, or that mix types, are left out, so they are still inferred next time.
+
+        :param table: A table returned by `Compact`.
+        :type table: pd.DataFrame
+        :return: A mapping from column name to parse type.
+        :rtype: Dict[str, str]
+        """
+        ret_val : Dict[str, str] = {}
+
+        for name in table.columns:
+            column = table[name]
+            if column.notna().any():
+                if isinstance(column.dtype, pd.CategoricalDtype):
+                    ret_val[str(name)] = "category"
+                elif pd.api.types.is_bool_dtype(column.dtype):
+                    ret_val[str(name)] = "boolean"
+                elif pd.api.types.is_integer_dtype(column.dtype):
+                    ret_val[str(name)] = "Int64"
+                elif pd.api.types.is_float_dtype(column.dtype):
+                    ret_val[str(name)] = "float64"
+                elif pd.api.types.infer_dtype(column, skipna=True) == "string":
+                    ret_val[str(name)] = "object"
+
+        return ret_val
+
+    @staticmethod
+    def Apply(table:pd.DataFrame, types:Optional[Dict[str, str]]=None) -> pd.DataFrame:
+        """Give a freshly-parsed table its explicit types, and normalize its nulls.
+
+        Columns with a parse type are converted to it, unless their values don't fit, in which case they're left as parsed.
+        Other integer and boolean columns get the nullable form of their type, and nulls in text columns become None.
+
+        :param table: A table straight from `pd.read_csv`, which is modified in place.
+        :type table: pd.DataFrame
+        :param types: A mapping from column name to parse type, defaults to no explicit types.
+        :type types: Optional[Dict[str, str]], optional
+        :return: The same table, with its new types.
+        :rtype: pd.DataFrame
+        """
+        types = types or {}
+
+        for name in table.columns:
+            column = table[name]
+            target = types.get(name)
+            if target is not None and target in ColumnTypes.PARSE_TYPES and column.dtype != target:
+                try:
+                    column = column.astype(target) if target != "object" else column
+                except (TypeError, ValueError):
+                    pass
+            if column.dtype == np.int64:
+                column = column.astype("Int64")
+            elif column.dtype == np.bool_:
+                column = column.astype("boolean")
+            elif column.dtype == object and column.isna().any():
+                column = column.where(column.notna(), None)
+            table[name] = column
+
+        return table
+
+    @staticmethod
+    def Compact(table:pd.DataFrame, float32:bool=False) -> pd.DataFrame:
+        """Store a table's columns in their smallest lossless types, for tables that will be held in memory.
+
+        Integers are downcast to the smallest nullable integer type that holds them, and repetitive text columns become categories.
+        Floats are only downcast to `float32` if asked, since that rounds them.
+
+        :param table: A table returned by `Apply`, and by `SecondaryParse` if it has JSON columns, which is modified in place.
+        :type table: pd.DataFrame
+        :param float32: Whether to store floats as `float32`, defaults to False.
+        :type float32: bool, optional
+        :return: The same table, with its compact types.
+        :rtype: pd.DataFrame
+        """
+        for name in table.columns:
+            column = table[name]
+            if isinstance(column.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(column.dtype):
+                continue
+            if pd.api.types.is_integer_dtype(column.dtype):
+                table[name] = pd.to_numeric(column, downcast="integer")
+            elif pd.api.types.is_float_dtype(column.dtype):
+                if float32:
+                    table[name] = column.astype(np.float32)
+            elif len(column) > 0 and pd.api.types.infer_dtype(column, skipna=True) == "string" \
+            and column.nunique(dropna=True) <= ColumnTypes.CATEGORY_RATIO * len(column):
+                table[name] = column.astype("category")
+
+        return table
+
+    @staticmethod
+    def ForEncoding(table:pd.DataFrame) -> pd.DataFrame:
+        """Get a version of a table whose values are all plain Python values, with None for nulls, ready to be encoded as JSON.
+
+        The table itself is left unchanged, since it may be shared out of the TableCache.
+
+        :param table: The table to encode.
+        :type table: pd.DataFrame
+        :return: The table with every typed or null-containing column converted to Python objects.
+        :rtype: pd.DataFrame
+        """
+        ret_val = table
+
+        convert = [pos for pos, dtype in enumerate(table.dtypes) if dtype != object or table.iloc[:, pos].isna().any()]
+        if len(convert) > 0:
+            ret_val = table.copy(deep=False)
+            for pos in convert:
+                column = table.iloc[:, pos]
+                if column.dtype == np.float32:
+                    column = column.astype(np.float64)
+                ret_val.isetitem(pos, column.astype(object).where(column.notna(), None))
+
+        return ret_val
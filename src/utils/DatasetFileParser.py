@@ -0,0 +1,427 @@
+"""
+DatasetFileParser
+
+Contains the CPU-bound steps of serving a dataset file:
+unzipping the archive, parsing the TSV table, and encoding the response body.
+"""
+
+# import standard libraries
+import dataclasses
+import json
+import logging
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from io import BytesIO
+from pathlib import PurePosixPath
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlparse
+
+# import 3rd-party libraries
+import pandas as pd
+
+# import ogd libraries
+from ogd.apis.models.APIResponse import APIResponse
+from ogd.apis.models.enums.RESTType import RESTType
+from ogd.apis.models.files.DatasetFile import DatasetFile as DatasetFileModel
+from ogd.common.utils.Logger import Logger
+
+# import local files
+from utils.ColumnTypes import ColumnTypes
+from utils.FileQuery import FileQuery
+from utils.ServerTiming import PhaseTimings
+
+class FileTooLargeError(Exception):
+    """Raised when a dataset file's table is bigger, uncompressed, than the server will serve at all."""
+    def __init__(self, member:str, size:int, limit:int):
+        super().__init__(f"{member} is {size} bytes uncompressed, over the limit of {limit} bytes.")
+        self.member : str = member
+        self.size   : int = size
+        self.limit  : int = limit
+
+    @property
+    def Description(self) -> str:
+        """A readable description of the table's size and the limit it's over, for error messages."""
+        return f"{FileTooLargeError._readable(self.size)} uncompressed, over the {FileTooLargeError._readable(self.limit)} limit"
+
+    @staticmethod
+    def _readable(size:int) -> str:
+        ret_val = f"{size:,} bytes"
+
+        for unit, scale in [("GB", 2**30), ("MB", 2**20), ("KB", 2**10)]:
+            if size >= scale:
+                ret_val = f"{size / scale:,.1f} {unit}"
+                break
+
+        return ret_val
+
+class TableTooLargeError(FileTooLargeError):
+    """Raised when a dataset file's table is bigger, uncompressed, than the server will load into memory, though it could still be streamed."""
+
+class DatasetFileParser:
+    """Static functions for turning a zipped dataset file into a response.
+
+    These are run inside ParsePool worker processes, so they must not rely on the Flask app context.
+    """
+
+    @staticmethod
+    def ParseArchive(raw_zip:bytes, query:Optional[FileQuery]=None, types:Optional[Dict[str, str]]=None, compact:bool=False, float32:bool=False, member:Optional[str]=None) -> Optional[pd.DataFrame]:
+        """Unzip a dataset archive and parse its TSV table into a DataFrame.
+
+        Only the table's own member is decompressed, so any other members of the archive cost nothing.
+
+        :param raw_zip: The raw bytes of the zip archive.
+        :type raw_zip: bytes
+        :param query: Rows and columns to select from the table, defaults to the whole table.
+        :type query: Optional[FileQuery], optional
+        :param types: Explicit parse types for some or all columns, from `ColumnTypes`, defaults to inferring every column's type.
+        :type types: Optional[Dict[str, str]], optional
+        :param compact: Whether to store the table in compact types, for tables that will be cached, defaults to False.
+        :type compact: bool, optional
+        :param float32: Whether a compact table should store floats as `float32`, defaults to False.
+        :type float32: bool, optional
+        :param member: The name of the member to parse, defaults to the archive's last `.tsv` member.
+        :type member: Optional[str], optional
+        :return: The parsed table, or None if the archive had no `.tsv` member.
+        :rtype: Optional[pd.DataFrame]
+        """
+        ret_val : Optional[pd.DataFrame] = None
+        query = query or FileQuery()
+
+        with zipfile.ZipFile(BytesIO(raw_zip)) as zipped:
+            with PhaseTimings.Phase("unzip"):
+                table_member = zipped.getinfo(member) if member is not None else DatasetFileParser.TableMember(zipped)
+            if table_member is not None:
+                # the member is decompressed as it's read, so its decompression counts toward read_csv
+                with PhaseTimings.Phase("read_csv"):
+                    try:
+                        raw_data = pd.read_csv(zipped.open(table_member), sep="\t", usecols=query.UseColumns, dtype=types or None)
+                    except (TypeError, ValueError) as err:
+                        # Some column didn't fit its expected type this month, so let pandas infer them all, and convert what fits afterward.
+                        Logger.Log(f"Could not parse {table_member.filename} with explicit column types, falling back to inferred types:\n{err}", logging.DEBUG)
+                        raw_data = pd.read_csv(zipped.open(table_member), sep="\t", usecols=query.UseColumns)
+                with PhaseTimings.Phase("column_types"):
+                    table = ColumnTypes.Apply(raw_data, types=types)
+                with PhaseTimings.Phase("secondary_parse"):
+                    table = DatasetFileParser.SecondaryParse(table)
+                if compact:
+                    with PhaseTimings.Phase("compact"):
+                        table = ColumnTypes.Compact(table, float32=float32)
+                with PhaseTimings.Phase("query"):
+                    ret_val = query.Apply(table)
+
+        return ret_val
+
+    @staticmethod
+    def ExpectedMember(file_link:str) -> str:
+        """Get the name of the member that should hold an archive's table, which is named after the archive itself.
+
+        :param file_link: The link to the archive.
+        :type file_link: str
+        :return: The archive's file name, with a `.tsv` extension in place of `.zip`.
+        :rtype: str
+        """
+        return PurePosixPath(urlparse(file_link).path).with_suffix(".tsv").name
+
+    @staticmethod
+    def MatchMembers(zipped:zipfile.ZipFile, pattern:str) -> List[zipfile.ZipInfo]:
+        """Find the members of an archive whose file names match a pattern, in archive order.
+
+        :param zipped: The open archive.
+        :type zipped: zipfile.ZipFile
+        :param pattern: An `fnmatch`-style pattern, matched against each member's file name, without its directory.
+        :type pattern: str
+        :return: The info of each matching member.
+        :rtype: List[zipfile.ZipInfo]
+        """
+        return [info for info in zipped.infolist() if not info.is_dir() and fnmatchcase(PurePosixPath(info.filename).name, pattern)]
+
+    @staticmethod
+    def TableMember(zipped:zipfile.ZipFile, expected:Optional[str]=None) -> Optional[zipfile.ZipInfo]:
+        """Find the `.tsv` member of an archive that holds its table.
+
+        That's the member with the expected name if there is one, and otherwise the last `.tsv` member, for archives that were renamed after they were made.
+        This only reads the archive's central directory, so the member's uncompressed size can be checked before anything is decompressed.
+
+        :param zipped: The open archive.
+        :type zipped: zipfile.ZipFile
+        :param expected: The expected name of the member, from `ExpectedMember`, defaults to just using the last `.tsv` member.
+        :type expected: Optional[str], optional
+        :return: The info of the table's member, or None if the archive has no `.tsv` member.
+        :rtype: Optional[zipfile.ZipInfo]
+        """
+        members = DatasetFileParser.MatchMembers(zipped, "*.tsv")
+        matches = [info for info in members if expected is not None and PurePosixPath(info.filename).name == expected]
+        return (matches or members)[-1] if len(members) > 0 else None
+
+    @staticmethod
+    def CheckSize(member:zipfile.ZipInfo, max_file_bytes:int, max_table_bytes:int=0):
+        """Check a table's uncompressed size against the server's limits, where a limit of 0 means no limit.
+
+        :param member: The info of the table's member, from `TableMember`.
+        :type member: zipfile.ZipInfo
+        :param max_file_bytes: The most the table may take up, uncompressed, to be served at all.
+        :type max_file_bytes: int
+        :param max_table_bytes: The most the table may take up, uncompressed, to be loaded into memory, defaults to no limit.
+        :type max_table_bytes: int, optional
+        :raises FileTooLargeError: If the table is over `max_file_bytes`.
+        :raises TableTooLargeError: If the table is over `max_table_bytes`.
+        """
+        if 0 < max_file_bytes < member.file_size:
+            raise FileTooLargeError(member=member.filename, size=member.file_size, limit=max_file_bytes)
+        if 0 < max_table_bytes < member.file_size:
+            raise TableTooLargeError(member=member.filename, size=member.file_size, limit=max_table_bytes)
+
+    @staticmethod
+    def EncodeTable(table:pd.DataFrame, msg:str) -> bytes:
+        """Encode a parsed table into a complete, successful APIResponse body.
+
+        :param table: The parsed dataset table.
+        :type table: pd.DataFrame
+        :param msg: The success message to include in the response.
+        :type msg: str
+        :return: The UTF-8 JSON body of the response.
+        :rtype: bytes
+        """
+        response = APIResponse.Default(req_type=RESTType.GET)
+        with PhaseTimings.Phase("rows"):
+            table   = ColumnTypes.ForEncoding(table)
+            dataset = DatasetFileModel(
+                columns=list(table.columns),
+                rows=list(table.apply(lambda series : series.to_dict(), axis=1)) if len(table) > 0 else []
+            )
+        with PhaseTimings.Phase("json"):
+            response.RequestSucceeded(msg=msg, val=dataclasses.asdict(dataset))
+            body = response.AsJSON.encode("utf-8")
+        return body
+
+    @staticmethod
+    def EncodeTables(tables:Dict[str, pd.DataFrame], msg:str) -> bytes:
+        """Encode several parsed tables into a complete, successful APIResponse body, with each table under its own name.
+
+        :param tables: The parsed tables, by name, in the order they should appear.
+        :type tables: Dict[str, pd.DataFrame]
+        :param msg: The success message to include in the response.
+        :type msg: str
+        :return: The UTF-8 JSON body of the response.
+        :rtype: bytes
+        """
+        response = APIResponse.Default(req_type=RESTType.GET)
+        members  = {}
+        with PhaseTimings.Phase("rows"):
+            for name, table in tables.items():
+                table = ColumnTypes.ForEncoding(table)
+                members[name] = dataclasses.asdict(DatasetFileModel(
+                    columns=list(table.columns),
+                    rows=list(table.apply(lambda series : series.to_dict(), axis=1)) if len(table) > 0 else []
+                ))
+        with PhaseTimings.Phase("json"):
+            response.RequestSucceeded(msg=msg, val={"members" : members})
+            body = response.AsJSON.encode("utf-8")
+        return body
+
+    @staticmethod
+    def ParseMembers(raw_zip:bytes, members:List[str], query:Optional[FileQuery]=None, types:Optional[Dict[str, str]]=None, workers:int=1) -> Dict[str, pd.DataFrame]:
+        """Parse several members of a dataset archive as separate tables, decompressing and parsing them in parallel threads.
+
+        Each thread opens the archive for itself, so the members are decompressed independently.
+        Both decompression and most of the parsing release the GIL, so threads are enough for them to run in parallel.
+
+        :param raw_zip: The raw bytes of the zip archive.
+        :type raw_zip: bytes
+        :param members: The names of the members to parse.
+        :type members: List[str]
+        :param query: Rows and columns to select from each table, defaults to the whole tables.
+        :type query: Optional[FileQuery], optional
+        :param types: Explicit parse types for some or all columns, from `ColumnTypes`, defaults to inferring every column's type.
+        :type types: Optional[Dict[str, str]], optional
+        :param workers: The most members to parse at once, defaults to 1.
+        :type workers: int, optional
+        :return: The parsed tables, by member name, in the same order as `members`.
+        :rtype: Dict[str, pd.DataFrame]
+        """
+        timings = PhaseTimings.Current()
+        def _parse(member:str) -> Optional[pd.DataFrame]:
+            with PhaseTimings.Using(timings):
+                return DatasetFileParser.ParseArchive(raw_zip, query=query, types=types, member=member)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(members))), thread_name_prefix="ogd-members") as executor:
+            tables = list(executor.map(_parse, members))
+        return {name : table for name, table in zip(members, tables) if table is not None}
+
+    @staticmethod
+    def ParseAndEncodeMembers(raw_zip:bytes, msg:str, members:List[str], query:Optional[FileQuery]=None, types:Optional[Dict[str, str]]=None, workers:int=1) -> bytes:
+        """Do all of the CPU-bound work for a request for several members of an archive, so it can be sent to the ParsePool as one job.
+
+        See `ParseMembers` for the parameters.
+
+        :return: The UTF-8 JSON body of the response.
+        :rtype: bytes
+        """
+        return DatasetFileParser.EncodeTables(tables=DatasetFileParser.ParseMembers(raw_zip, members=members, query=query, types=types, workers=workers), msg=msg)
+
+    @staticmethod
+    def ParseAndEncode(raw_zip:bytes, msg:str, query:Optional[FileQuery]=None, types:Optional[Dict[str, str]]=None, member:Optional[str]=None) -> Optional[bytes]:
+        """Do all of the CPU-bound work for a dataset file request, so it can be sent to the ParsePool as one job.
+
+        :param raw_zip: The raw bytes of the zip archive.
+        :type raw_zip: bytes
+        :param msg: The success message to include in the response.
+        :type msg: str
+        :param query: Rows and columns to select from the table, defaults to the whole table.
+        :type query: Optional[FileQuery], optional
+        :param types: Explicit parse types for some or all columns, from `ColumnTypes`, defaults to inferring every column's type.
+        :type types: Optional[Dict[str, str]], optional
+        :param member: The name of the member to parse, defaults to the archive's last `.tsv` member.
+        :type member: Optional[str], optional
+        :return: The UTF-8 JSON body of the response, or None if the archive had no `.tsv` member.
+        :rtype: Optional[bytes]
+        """
+        table = DatasetFileParser.ParseArchive(raw_zip, query=query, types=types, member=member)
+        return DatasetFileParser.EncodeTable(table=table, msg=msg) if table is not None else None
+
+    @staticmethod
+    def StreamTable(zipped:zipfile.ZipFile, member:str, msg:str, query:FileQuery, chunk_rows:int, types:Optional[Dict[str, str]]=None) -> Iterator[bytes]:
+        """Stream a table from an open archive as a successful APIResponse body, one chunk of rows at a time.
+
+        Only one chunk of the table is held in memory at a time, and reading stops early once the query's limit is reached.
+        The body matches what `EncodeTable` would produce for the same rows, so clients can't tell the difference.
+
+        :param zipped: The open archive containing the table.
+        :type zipped: zipfile.ZipFile
+        :param member: The name of the `.tsv` member to read.
+        :type member: str
+        :param msg: The success message to include in the response.
+        :type msg: str
+        :param query: Rows and columns to select from the table.
+        :type query: FileQuery
+        :param chunk_rows: Number of rows to parse at a time.
+        :type chunk_rows: int
+        :param types: Explicit types for some or all columns, from `ColumnTypes`, defaults to inferring every column's type.
+        :type types: Optional[Dict[str, str]], optional
+        :yield: Successive pieces of the UTF-8 JSON body.
+        :rtype: Iterator[bytes]
+        """
+        chunks = DatasetFileParser.ReadChunks(zipped=zipped, member=member, use_columns=query.UseColumns, chunk_rows=chunk_rows, types=types)
+        try:
+            yield from DatasetFileParser.EncodeChunks(chunks=query.ApplyToChunks(chunks), msg=msg, source=member)
+        finally:
+            chunks.close()
+
+    @staticmethod
+    def ReadChunks(zipped:zipfile.ZipFile, member:str, use_columns:Optional[Callable[[str], bool]], chunk_rows:int, types:Optional[Dict[str, str]]=None, decode_json:bool=True) -> Iterator[pd.DataFrame]:
+        """Parse a table from an open archive, one chunk of rows at a time.
+
+        Explicit types are applied to each chunk after it's parsed, rather than while parsing,
+        so a value that doesn't fit its type can't end the stream partway through.
+        They keep every chunk's columns the same type, even when only some chunks have missing values.
+        Likewise, the JSON columns are found once, in the first chunk, and decoded in every chunk,
+        so a column can't switch between decoded values and raw strings partway through.
+
+        :param zipped: The open archive containing the table.
+        :type zipped: zipfile.ZipFile
+        :param member: The name of the `.tsv` member to read.
+        :type member: str
+        :param use_columns: A `usecols` filter for the columns to parse, or None to parse every column.
+        :type use_columns: Optional[Callable[[str], bool]]
+        :param chunk_rows: Number of rows to parse at a time.
+        :type chunk_rows: int
+        :param types: Explicit types for some or all columns, from `ColumnTypes`, defaults to inferring every column's type.
+        :type types: Optional[Dict[str, str]], optional
+        :param decode_json: Whether to decode the JSON columns, defaults to True. Callers that join several tables into one stream
+            should pass False, and decode the JSON columns they find in the stream's first chunk themselves.
+        :type decode_json: bool, optional
+        :yield: Successive parsed chunks of the table.
+        :rtype: Iterator[pd.DataFrame]
+        """
+        json_columns : Optional[List[str]] = None
+        reader = pd.read_csv(zipped.open(member), sep="\t", usecols=use_columns, chunksize=chunk_rows)
+        try:
+            for chunk in reader:
+                chunk = ColumnTypes.Apply(chunk, types=types)
+                if decode_json:
+                    if json_columns is None:
+                        json_columns = DatasetFileParser.JSONColumns(chunk)
+                    chunk = DatasetFileParser.SecondaryParse(chunk, json_columns=json_columns)
+                yield chunk
+        finally:
+            reader.close()
+
+    @staticmethod
+    def EncodeChunks(chunks:Iterable[pd.DataFrame], msg:str, source:str) -> Iterator[bytes]:
+        """Encode chunks of a table as a successful APIResponse body, one chunk at a time.
+
+        If a chunk fails partway through, the rows sent so far are closed off and the message says the rows are incomplete,
+        since the response headers have already gone out by then.
+
+        :param chunks: The chunks of the table, in order.
+        :type chunks: Iterable[pd.DataFrame]
+        :param msg: The success message to include in the response.
+        :type msg: str
+        :param source: A description of where the chunks come from, for logging.
+        :type source: str
+        :yield: Successive pieces of the UTF-8 JSON body.
+        :rtype: Iterator[bytes]
+        """
+        columns   : Optional[list] = None
+        wrote_row : bool           = False
+        status_msg = f"SUCCESS: {msg}"
+        try:
+            for chunk in chunks:
+                chunk = ColumnTypes.ForEncoding(chunk)
+                if columns is None:
+                    columns = list(chunk.columns)
+                    yield f'{{"type": {json.dumps(str(RESTType.GET))}, "val": {{"columns": {json.dumps(columns)}, "rows": ['.encode("utf-8")
+                rows = chunk.to_dict(orient="records")
+                if len(rows) > 0:
+                    yield ((", " if wrote_row else "") + ", ".join(json.dumps(row) for row in rows)).encode("utf-8")
+                    wrote_row = True
+        except Exception as err: # pylint: disable=broad-exception-caught
+            # Headers are already sent by now, so the best we can do is log it and say so in the message.
+            Logger.Log(f"Error while streaming {source}:\n{type(err)}:\n{err}", logging.ERROR)
+            status_msg = "SERVER ERROR: Dataset file stream was interrupted, rows are incomplete."
+        if columns is None:
+            yield f'{{"type": {json.dumps(str(RESTType.GET))}, "val": {{"columns": [], "rows": ['.encode("utf-8")
+        yield f']}}, "msg": {json.dumps(status_msg)}}}'.encode("utf-8")
+
+    @staticmethod
+    def JSONColumns(df:pd.DataFrame) -> List[str]:
+        """Find the columns of a table whose values are all text, starting with a JSON list or object."""
+        return [col for col in df.select_dtypes("object").columns if set(map(type, df[col])) == {str} and df[col].iloc[0][0] in {"[", "{"}]
+
+    @staticmethod
+    def SecondaryParse(df:pd.DataFrame, json_columns:Optional[List[str]]=None) -> pd.DataFrame:
+        """Decode the JSON columns of a table.
+
+        :param df: The table, which is modified in place.
+        :type df: pd.DataFrame
+        :param json_columns: Columns already found to be JSON, e.g. in the first chunk of a stream, defaults to the ones `JSONColumns` finds in this table.
+            Values in these columns that aren't JSON text, such as missing values, are left as they are, so a later chunk can't fail the stream.
+        :type json_columns: Optional[List[str]], optional
+        :return: The same table, with its JSON columns decoded.
+        :rtype: pd.DataFrame
+        """
+        if json_columns is None:
+            for col in DatasetFileParser.JSONColumns(df):
+                try:
+                    df[col] = df[col].apply(json.loads)
+                except json.decoder.JSONDecodeError as err:
+                    Logger.Log(f"Column {col} was identified as JSON-format, but could not be parsed:\n{err}", logging.DEBUG)
+        else:
+            for col in [col for col in json_columns if col in df.columns]:
+                df[col] = df[col].apply(DatasetFileParser._loadJSON)
+
+        return df
+
+    @staticmethod
+    def _loadJSON(value:Any) -> Any:
+        """Decode a value that's JSON text, leaving any other value as it is."""
+        ret_val = value
+
+        if isinstance(value, str):
+            try:
+                ret_val = json.loads(value)
+            except json.decoder.JSONDecodeError:
+                pass
+
+        return ret_val
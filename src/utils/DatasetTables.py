@@ -0,0 +1,186 @@
+"""
+DatasetTables
+
+Contains helpers for locating a dataset's files, and loading their parsed tables through the TableCache.
+"""
+
+# import standard libraries
+import zipfile
+from typing import Dict, Final, Hashable, Optional, Set, Tuple
+
+# import 3rd-party libraries
+import pandas as pd
+
+# import ogd libraries
+from ogd.apis.models.files.DatasetFile import FileTypes
+from ogd.common.schemas.datasets.DatasetSchema import DatasetSchema
+
+# import local files
+from configs.FileAPIConfig import FileAPIConfig
+from utils.ColumnTypes import ColumnTypes
+from utils.DatasetFileParser import DatasetFileParser
+from utils.DiskCache import DiskCache
+from utils.FileAPIContext import FileAPIContext
+from utils.ParsePool import ParsePool
+from utils.TableCache import TableCache
+from utils.utils import DownloadFile
+
+class DatasetTables:
+    """Static functions for finding and loading dataset file tables.
+
+    Must be called from within a Flask app context, since the cache and parse pool live in `app.extensions`.
+    """
+    TABLE_TYPES : Final[Set[FileTypes]] = {FileTypes.SESSION, FileTypes.PLAYER, FileTypes.POPULATION}
+    """File types small enough to be loaded into memory as a whole table."""
+
+    @staticmethod
+    def FileLink(dataset:DatasetSchema, file_type:FileTypes) -> Optional[str]:
+        ret_val : Optional[str] = None
+
+        match file_type:
+            case FileTypes.SESSION:
+                ret_val = dataset.SessionsFile(relative=False)
+            case FileTypes.PLAYER:
+                ret_val = dataset.PlayersFile(relative=False)
+            case FileTypes.POPULATION:
+                ret_val = dataset.PopulationFile(relative=False)
+            case FileTypes.EVENT:
+                ret_val = dataset.GameEventsFile(relative=False)
+            case FileTypes.ALL_EVENT:
+                ret_val = dataset.AllEventsFile(relative=False)
+            case FileTypes.COMBINED:
+                ret_val = dataset.CombinedFeaturesFile(relative=False)
+
+        return ret_val
+
+    @staticmethod
+    def CacheKey(dataset:DatasetSchema, file_type:FileTypes, *variant:Hashable) -> Tuple[Hashable, ...]:
+        """Build a cache key for a table, or for something computed from a table.
+
+        The key includes the dataset's modification date and file link,
+        so a re-export of the same month gets a fresh key instead of serving stale entries.
+
+        :param dataset: The dataset the table belongs to.
+        :type dataset: DatasetSchema
+        :param file_type: The type of file the table comes from.
+        :type file_type: FileTypes
+        :param variant: Any further parts of the key, to tell apart different values computed from the same table.
+        :type variant: Hashable
+        :return: The cache key.
+        :rtype: Tuple[Hashable, ...]
+        """
+        return (str(dataset.Key), dataset.DateModifiedStr, file_type.name, DatasetTables.FileLink(dataset=dataset, file_type=file_type)) + variant
+
+    @staticmethod
+    def ParseTypes(dataset:DatasetSchema, file_type:FileTypes) -> Dict[str, str]:
+        """Get the explicit parse types for a dataset file's columns.
+
+        Types learned from an earlier file of the same game and type come first,
+        with the types from the dataset's feature metadata taking precedence over them.
+
+        :param dataset: The dataset the file belongs to.
+        :type dataset: DatasetSchema
+        :param file_type: The type of file to be parsed.
+        :type file_type: FileTypes
+        :return: A mapping from column name to parse type, which may be empty.
+        :rtype: Dict[str, str]
+        """
+        ret_val : Dict[str, str] = {}
+
+        context : FileAPIContext = FileAPIContext.Current()
+        cfg     : FileAPIConfig  = context.config
+        cache   : TableCache     = context.table_cache
+        if cfg.ColumnTypesLearn:
+            ret_val.update(cache.Get(DatasetTables._typesKey(dataset=dataset, file_type=file_type)) or {})
+        if cfg.ColumnTypesFromSchema:
+            ret_val.update(ColumnTypes.FromSchema(dataset))
+
+        return ret_val
+
+    @staticmethod
+    def LoadTable(dataset:DatasetSchema, file_type:FileTypes) -> Optional[pd.DataFrame]:
+        """Get the whole parsed table of a dataset file, from the cache if possible.
+
+        On a miss, the table is read from the DiskCache shared with other processes if it's there.
+        Otherwise, the file is downloaded to a spooled temporary file and parsed in the ParsePool, with explicit column types from `ParseTypes`, and the result is cached in compact types, in memory and on disk.
+        The column types of the result are also remembered for the game, so its other months are parsed the same way.
+        The returned table is shared with other requests, so it must not be modified.
+
+        The table's uncompressed size is checked against the configured limits before it's decompressed.
+        The size is cached too, so requests for a table that's too big are rejected without downloading it again.
+
+        :param dataset: The dataset to load a table from.
+        :type dataset: DatasetSchema
+        :param file_type: The type of file to load, which should be one of `TABLE_TYPES`.
+        :type file_type: FileTypes
+        :return: The parsed table, or None if the dataset has no such file, or the file had no table.
+        :rtype: Optional[pd.DataFrame]
+        :raises FileTooLargeError: If the table is too big to be loaded into memory, which is a `TableTooLargeError` if it could still be streamed.
+        """
+        file_link = DatasetTables.FileLink(dataset=dataset, file_type=file_type)
+        if file_link is None:
+            return None
+
+        context : FileAPIContext = FileAPIContext.Current()
+        cfg     : FileAPIConfig  = context.config
+        cache   : TableCache     = context.table_cache
+
+        member_key = DatasetTables.CacheKey(dataset, file_type, "member")
+        member     : Optional[zipfile.ZipInfo] = cache.Get(member_key)
+        if member is not None:
+            DatasetFileParser.CheckSize(member, max_file_bytes=cfg.SizeLimitFileBytes, max_table_bytes=cfg.SizeLimitTableBytes)
+
+        def _parse() -> Optional[pd.DataFrame]:
+            table : Optional[pd.DataFrame] = None
+
+            pool : ParsePool = context.parse_pool
+            # The archive is spooled to disk past the stream spool size, and only read back in for the pool once its table is known to fit.
+            with DownloadFile(url=file_link, max_memory=cfg.StreamSpoolBytes, client=context.http_client) as archive:
+                with zipfile.ZipFile(archive) as zipped:
+                    table_member = DatasetFileParser.TableMember(zipped, expected=DatasetFileParser.ExpectedMember(file_link))
+                if table_member is not None:
+                    cache.Put(member_key, table_member)
+                    DatasetFileParser.CheckSize(table_member, max_file_bytes=cfg.SizeLimitFileBytes, max_table_bytes=cfg.SizeLimitTableBytes)
+                    archive.seek(0)
+                    table = pool.Run(DatasetFileParser.ParseArchive, archive.read(), None, DatasetTables.ParseTypes(dataset=dataset, file_type=file_type), True, cfg.ColumnTypesFloat32, table_member.filename)
+
+            return table
+
+        def _load() -> Optional[pd.DataFrame]:
+            disk  : DiskCache              = context.disk_cache
+            table : Optional[pd.DataFrame] = disk.GetOrCompute(table_key, _parse)
+            if table is not None and cfg.ColumnTypesLearn:
+                types_key = DatasetTables._typesKey(dataset=dataset, file_type=file_type)
+                cache.Put(types_key, (cache.Get(types_key) or {}) | ColumnTypes.Learn(table))
+            return table
+
+        table_key = DatasetTables.CacheKey(dataset, file_type, "table")
+        return cache.GetOrCompute(table_key, _load)
+
+    @staticmethod
+    def CachedTable(dataset:DatasetSchema, file_type:FileTypes) -> Optional[pd.DataFrame]:
+        """Get the parsed table of a dataset file only if it's already in the memory or disk cache, without downloading or parsing anything.
+
+        Used to keep serving a table while its file server is unavailable.
+        The returned table is shared with other requests, so it must not be modified.
+
+        :param dataset: The dataset to get a table from.
+        :type dataset: DatasetSchema
+        :param file_type: The type of file to get, which should be one of `TABLE_TYPES`.
+        :type file_type: FileTypes
+        :return: The cached table, or None if it isn't cached.
+        :rtype: Optional[pd.DataFrame]
+        """
+        ret_val : Optional[pd.DataFrame]
+
+        context   : FileAPIContext = FileAPIContext.Current()
+        table_key = DatasetTables.CacheKey(dataset, file_type, "table")
+        ret_val   = context.table_cache.Get(table_key)
+        if ret_val is None:
+            ret_val = context.disk_cache.Get(table_key)
+
+        return ret_val
+
+    @staticmethod
+    def _typesKey(dataset:DatasetSchema, file_type:FileTypes) -> Tuple[Hashable, ...]:
+        return (dataset.Key.GameID, file_type.name, "column_types")
@@ -0,0 +1,97 @@
+"""
+Deadlines
+
+Contains the Deadline class, which limits how long a request can take before it's answered,
+and the Deadlines class, which gives each request a deadline according to its route.
+"""
+
+# import standard libraries
+import time
+from typing import Dict, Final, Optional
+
+# import 3rd-party libraries
+from flask import g, has_app_context, request
+
+# import local files
+
+class DeadlineExceededError(Exception):
+    """Raised when a request's deadline passes before it could be answered."""
+
+class Deadline:
+    """A point in time by which a request should be answered.
+
+    Upstream fetches, parse pool jobs, and parse steps on the request thread each wait at most until the deadline,
+    so a stalled file server or a slow file frees the request thread with a `DeadlineExceededError`, rather than holding it indefinitely.
+
+    The deadline of the current request lives in the app context, where `Current` finds it.
+    Threads that push an app context of their own should `Activate` the request's deadline in it,
+    and threads without an app context should be handed the deadline by the thread that starts them.
+    """
+    _G_KEY : Final[str] = "ogd_deadline"
+
+    def __init__(self, seconds:float):
+        self._seconds    : float = seconds
+        self._expires_at : float = time.monotonic() + seconds
+
+    @property
+    def Seconds(self) -> float:
+        """The length of the deadline, from when the request started."""
+        return self._seconds
+
+    @property
+    def Expired(self) -> bool:
+        return time.monotonic() >= self._expires_at
+
+    @staticmethod
+    def Current() -> Optional["Deadline"]:
+        """Get the deadline of the request being handled, or None if it has none, or there's no app context."""
+        return g.get(Deadline._G_KEY) if has_app_context() else None
+
+    def Activate(self):
+        """Make this the deadline of the current app context."""
+        setattr(g, Deadline._G_KEY, self)
+
+    def Remaining(self) -> float:
+        """Seconds left until the deadline, which is never less than 0."""
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def Timeout(self, timeout:Optional[float]) -> float:
+        """Shorten a timeout so that it ends by the deadline.
+
+        :param timeout: The timeout that would apply without a deadline, or None for no timeout.
+        :type timeout: Optional[float]
+        :return: The shorter of the timeout and the time left until the deadline.
+        :rtype: float
+        """
+        return min(timeout, self.Remaining()) if timeout is not None else self.Remaining()
+
+    def Check(self):
+        """Stop the request if its deadline has passed.
+
+        :raises DeadlineExceededError: If the deadline has passed.
+        """
+        if self.Expired:
+            raise DeadlineExceededError(f"The request's deadline of {self._seconds:g} seconds has passed.")
+
+class Deadlines:
+    """Gives each request a deadline, `route_seconds` for the endpoints listed there, and `default_seconds` for everything else.
+
+    `BeforeRequest` is registered as a request hook, ahead of any hook that might wait, so time spent waiting for a turn counts against the deadline too.
+    A deadline only covers the time until a response starts, so a streamed response isn't cut off partway through.
+    A value of 0 gives requests no deadline.
+    """
+    EXTENSION_KEY : Final[str] = "ogd_deadlines"
+
+    def __init__(self, default_seconds:float, route_seconds:Dict[str, float]):
+        self._default_seconds : float            = max(0.0, default_seconds)
+        self._route_seconds   : Dict[str, float] = {endpoint : max(0.0, seconds) for endpoint, seconds in route_seconds.items()}
+
+    def SecondsFor(self, endpoint:Optional[str]) -> float:
+        """Get the length of the deadline for an endpoint. flask_restful names each endpoint after its resource class, in lower case."""
+        return self._route_seconds.get(endpoint or "", self._default_seconds)
+
+    def BeforeRequest(self):
+        """Start the request's deadline. Registered as a `before_request` handler."""
+        seconds = self.SecondsFor(request.endpoint)
+        if seconds > 0:
+            Deadline(seconds=seconds).Activate()
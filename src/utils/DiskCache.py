@@ -0,0 +1,291 @@
+"""
+DiskCache
+
+Contains the DiskCache class, a cache for parsed dataset tables that is shared by every process using the same directory.
+"""
+
+# import standard libraries
+import contextlib
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Final, Hashable, Iterator, List, Optional, Tuple
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# import 3rd-party libraries
+
+# import local files
+from utils.ServerTiming import PhaseTimings
+
+class DiskCache:
+    """Cache of pickled values in a directory shared by every server process on a host, or by several hosts over NFS.
+
+    Concurrent misses on the same key, from any process, wait on a lock file for a single computation,
+    so each table is parsed once for every process that shares the directory, rather than once per process.
+    Entries are written to a temporary file and renamed into place, so a reader never sees a partial entry.
+    Locks are taken with `fcntl.lockf`, which NFS passes on to the server, unlike `flock`.
+
+    Keys should identify the exact version of the data they were computed from (see `DatasetTables.CacheKey`),
+    so entries never need to be invalidated, only evicted.
+    Entries that haven't been used for `max_age_seconds`, and then the least recently used entries past `max_bytes`,
+    are evicted at most once per `evict_interval` by any one process.
+
+    Entries are unpickled, so the directory must only be writable by the server.
+    A cache with no directory, or a budget of 0, is disabled, and so is any cache on a platform without `fcntl`.
+
+    Problems are logged to `logger`, since the cache is also used from threads without an app context, such as PrefetchMap's and streaming threads.
+    """
+    EXTENSION_KEY : Final[str] = "ogd_disk_cache"
+    FORMAT        : Final[str] = "1"
+    """Included in every entry's file name, so entries written in an older format are never read, and age out instead."""
+
+    def __init__(self, directory:Optional[str], max_bytes:int, max_age_seconds:float, evict_interval:float, logger:Optional[logging.Logger]=None):
+        self._directory      : Optional[Path]        = Path(directory) if directory else None
+        self._logger         : logging.Logger        = logger or logging.getLogger(__name__)
+        self._max_bytes      : int                   = max(0, max_bytes)
+        self._max_age        : float                 = max(0.0, max_age_seconds)
+        self._evict_interval : float                 = max(0.0, evict_interval)
+        self._lock           : threading.Lock        = threading.Lock()
+        self._pending        : Dict[Path, List[Any]] = {}
+        self._last_evicted   : float                 = 0.0
+        self._disk_entries   : int                   = 0
+        self._disk_bytes     : int                   = 0
+        self._hits           : int                   = 0
+        self._misses         : int                   = 0
+        self._writes         : int                   = 0
+        self._errors         : int                   = 0
+        self._evictions      : int                   = 0
+
+    @property
+    def Enabled(self) -> bool:
+        return self._directory is not None and self._max_bytes > 0 and fcntl is not None
+
+    @property
+    def Stats(self) -> Dict[str, int]:
+        """Counts of this process's hits, misses, writes, errors, and evictions, and the size of the whole cache as of its last eviction pass."""
+        with self._lock:
+            return {
+                "entries"   : self._disk_entries,
+                "bytes"     : self._disk_bytes,
+                "max_bytes" : self._max_bytes,
+                "hits"      : self._hits,
+                "misses"    : self._misses,
+                "writes"    : self._writes,
+                "errors"    : self._errors,
+                "evictions" : self._evictions
+            }
+
+    def Get(self, key:Hashable) -> Optional[Any]:
+        ret_val : Optional[Any] = None
+
+        if self.Enabled:
+            ret_val = self._read(self._entryPath(key))
+            with self._lock:
+                if ret_val is not None:
+                    self._hits += 1
+                else:
+                    self._misses += 1
+
+        return ret_val
+
+    def GetOrCompute(self, key:Hashable, compute:Callable[[], Any]) -> Any:
+        """Get a cached value, or compute and cache it on a miss.
+
+        Concurrent misses on the same key, in any process sharing the directory, wait for a single computation.
+        A computed value of None is returned, but not cached.
+        If the cache can't be read or written, the value is computed as if it were disabled.
+
+        :param key: The key of the value.
+        :type key: Hashable
+        :param compute: Function to produce the value on a miss.
+        :type compute: Callable[[], Any]
+        :return: The cached or newly-computed value.
+        :rtype: Any
+        """
+        ret_val : Optional[Any] = None
+
+        if self.Enabled:
+            path     = self._entryPath(key)
+            computed = False
+            ret_val  = self._read(path)
+            if ret_val is None:
+                try:
+                    with self._keyLock(path):
+                        # another process may have computed the value while this one waited for the lock
+                        ret_val = self._read(path)
+                        if ret_val is None:
+                            ret_val  = compute()
+                            computed = True
+                            if ret_val is not None:
+                                self._write(path, ret_val)
+                except OSError as err:
+                    self._logger.warning(f"Could not use the disk cache in {self._directory}:\n{err}")
+                    with self._lock:
+                        self._errors += 1
+                    if ret_val is None and not computed:
+                        ret_val  = compute()
+                        computed = True
+                self._maybeEvict()
+            with self._lock:
+                if computed:
+                    self._misses += 1
+                else:
+                    self._hits += 1
+        else:
+            ret_val = compute()
+
+        return ret_val
+
+    def Evict(self):
+        """Remove entries that haven't been used for the maximum age, and then the least recently used entries until the cache fits its budget.
+
+        Skipped if another process is already evicting from the same directory.
+        """
+        if self.Enabled:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            with open(self._directory / "evict.lock", "a+b") as lock_file:
+                try:
+                    fcntl.lockf(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    return
+                try:
+                    self._evict()
+                finally:
+                    fcntl.lockf(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _evict(self):
+        now = time.time()
+        entries : List[Tuple[float, int, Path]] = []
+        for path in self._directory.glob("*/*.entry"):
+            with contextlib.suppress(FileNotFoundError):
+                info = path.stat()
+                entries.append((info.st_mtime, info.st_size, path))
+        entries.sort()
+
+        total   = sum(size for _, size, _ in entries)
+        removed = 0
+        for used_at, size, path in entries:
+            if total <= self._max_bytes and (self._max_age <= 0 or now - used_at < self._max_age):
+                break
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+                removed += 1
+            total -= size
+        # lock files and leftover temporary files of abandoned writes only need to go once they're old,
+        # but a lock file's time is when it was created, so an old one may still be held by a long computation
+        for path in self._directory.glob("*/.*.tmp"):
+            with contextlib.suppress(FileNotFoundError):
+                if now - path.stat().st_mtime >= max(self._max_age, 3600):
+                    path.unlink()
+        for path in self._directory.glob("*/*.lock"):
+            with contextlib.suppress(FileNotFoundError):
+                if now - path.stat().st_mtime >= max(self._max_age, 3600):
+                    self._unlinkLock(path)
+
+        with self._lock:
+            self._disk_entries = len(entries) - removed
+            self._disk_bytes   = total
+            self._evictions   += removed
+
+    def _unlinkLock(self, path:Path):
+        """Remove an entry's lock file, unless a thread in this process or another process holds it.
+
+        `lockf` never sees this process's own locks as held, and closing the probe's handle would drop them,
+        so entries this process is working on are skipped without touching their lock files.
+        Holding the thread lock keeps this process's threads from starting on the entry until the probe is done.
+        """
+        with self._lock:
+            if path.with_suffix(".entry") not in self._pending:
+                with open(path, "r+b") as lock_file:
+                    try:
+                        fcntl.lockf(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except OSError:
+                        # another process is computing the entry
+                        return
+                    try:
+                        path.unlink()
+                    finally:
+                        fcntl.lockf(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _maybeEvict(self):
+        now = time.monotonic()
+        with self._lock:
+            due = self._last_evicted == 0.0 or now - self._last_evicted >= self._evict_interval
+            if due:
+                self._last_evicted = now
+        if due:
+            try:
+                self.Evict()
+            except OSError as err:
+                self._logger.warning(f"Could not evict from the disk cache in {self._directory}:\n{err}")
+
+    def _read(self, path:Path) -> Optional[Any]:
+        ret_val : Optional[Any] = None
+
+        try:
+            with open(path, "rb") as entry_file, PhaseTimings.Phase("disk_cache"):
+                ret_val = pickle.load(entry_file)
+            # the modification time doubles as the last-used time, since access times are often disabled
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        except Exception as err: # pylint: disable=broad-exception-caught
+            # besides damaged files, unpickling can fail in many ways after an upgrade to pandas or numpy
+            self._logger.warning(f"Could not read the disk cache entry {path.name}, it will be computed again:\n{err}")
+            with self._lock:
+                self._errors += 1
+
+        return ret_val
+
+    def _write(self, path:Path, value:Any):
+        handle, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}-", suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as temp_file:
+                pickle.dump(value, temp_file, protocol=pickle.HIGHEST_PROTOCOL)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temp_path)
+            raise
+        with self._lock:
+            self._writes += 1
+
+    @contextlib.contextmanager
+    def _keyLock(self, path:Path) -> Iterator[None]:
+        """Hold the lock on one entry, against threads in this process and against other processes.
+
+        `lockf` locks belong to the whole process, and closing any handle on the file drops them,
+        so threads in the same process take turns through a thread lock before reaching the file.
+        """
+        with self._lock:
+            # each pending entry is [lock, number of threads waiting on it]
+            pending = self._pending.setdefault(path, [threading.Lock(), 0])
+            pending[1] += 1
+        try:
+            with pending[0]:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path.with_suffix(".lock"), "a+b") as lock_file:
+                    fcntl.lockf(lock_file.fileno(), fcntl.LOCK_EX)
+                    try:
+                        yield
+                    finally:
+                        fcntl.lockf(lock_file.fileno(), fcntl.LOCK_UN)
+        finally:
+            with self._lock:
+                pending[1] -= 1
+                if pending[1] == 0:
+                    del self._pending[path]
+
+    def _entryPath(self, key:Hashable) -> Path:
+        digest = hashlib.sha256(f"{DiskCache.FORMAT}:{key!r}".encode("utf-8")).hexdigest()
+        return self._directory / digest[:2] / f"{digest}.entry"
@@ -0,0 +1,55 @@
+"""
+FileAPIContext
+
+Contains the FileAPIContext class, which holds the state that the File API's request threads share.
+"""
+
+# import standard libraries
+from dataclasses import dataclass
+from typing import ClassVar
+
+# import 3rd-party libraries
+from flask import current_app
+
+# import ogd libraries
+from ogd.common.configs.storage.DatasetRepositoryConfig import DatasetRepositoryConfig
+
+# import local files
+from configs.FileAPIConfig import FileAPIConfig
+from utils.DiskCache import DiskCache
+from utils.FileIndex import FileIndex
+from utils.HTTPClient import HTTPClient
+from utils.ParsePool import ParsePool
+from utils.ResponseCompression import ResponseCompression
+from utils.ServerTiming import PhaseTimings
+from utils.TableCache import TableCache
+
+@dataclass(frozen=True)
+class FileAPIContext:
+    """Everything the File API's resources share between requests, created once per app by `FileAPI.register`.
+
+    Each member is safe to use from any number of request threads at once, so a server process can run many threads
+    while keeping a single copy of the config, the file list, the table cache, and the upstream connections.
+    Resources should reach these through `Current`, rather than constructing their own.
+    """
+    EXTENSION_KEY : ClassVar[str] = "ogd_file_api"
+
+    config      : FileAPIConfig
+    index       : FileIndex
+    http_client : HTTPClient
+    parse_pool  : ParsePool
+    table_cache : TableCache
+    disk_cache  : DiskCache
+    compression : ResponseCompression
+
+    @staticmethod
+    def Current() -> "FileAPIContext":
+        """Get the context of the app handling the current request."""
+        return current_app.extensions[FileAPIContext.EXTENSION_KEY]
+
+    def FileList(self) -> DatasetRepositoryConfig:
+        """Get the shared copy of the file list, refreshing it if it's out of date."""
+        with PhaseTimings.Phase("index"):
+            ret_val = self.index.Get()
+
+        return ret_val
@@ -0,0 +1,154 @@
+"""
+FileIndex
+
+Contains the FileIndex class, which keeps one parsed copy of the file list for every request thread in a process.
+"""
+
+# import standard libraries
+import threading
+import time
+from typing import Optional, Tuple
+
+# import 3rd-party libraries
+from flask import current_app
+
+# import ogd libraries
+from ogd.common.configs.storage.DatasetRepositoryConfig import DatasetRepositoryConfig
+
+# import local files
+from utils.HTTPClient import HTTPClient
+from utils.IndexSnapshot import IndexSnapshot
+from utils.Metrics import Metrics
+from utils.utils import FetchFileList, ParseFileList
+
+class FileIndex:
+    """Thread-safe holder for the parsed file list, refreshed at most once per `refresh_seconds`.
+
+    Only one thread refreshes the list at a time, and the others keep getting the previous copy while it does,
+    so a slow file list server never holds up more than one request.
+    If a refresh fails, the previous copy keeps being served until the next refresh succeeds.
+    The returned list is shared between threads, so it must be treated as read-only.
+
+    With a `snapshot`, the processes on a host share the fetch as well:
+    whichever process finds the list out of date first fetches it and publishes the raw list,
+    and the others parse that copy instead of fetching their own.
+    Each process still holds its own parsed copy, so this saves upstream requests, not memory.
+
+    A `refresh_seconds` of 0 fetches the file list for every request.
+
+    With `metrics`, the time taken by each refresh, and each refresh that failed, are recorded.
+    """
+
+    def __init__(self, url:str, client:HTTPClient, refresh_seconds:float, snapshot:Optional[IndexSnapshot]=None, metrics:Optional[Metrics]=None):
+        self._url        : str                               = url
+        self._client     : HTTPClient                        = client
+        self._refresh    : float                             = max(0.0, refresh_seconds)
+        self._snapshot   : Optional[IndexSnapshot]           = snapshot
+        self._metrics    : Optional[Metrics]                 = metrics
+        self._lock       : threading.Lock                    = threading.Lock()
+        self._refreshing : threading.Lock                    = threading.Lock()
+        self._adopting   : threading.Lock                    = threading.Lock()
+        self._file_list  : Optional[DatasetRepositoryConfig] = None
+        self._fetched_at : float                             = 0.0
+        self._generation : int                               = 0
+
+    @property
+    def URL(self) -> str:
+        return self._url
+
+    @property
+    def Age(self) -> Optional[float]:
+        """Seconds since the copy of the file list in use was fetched, or None if there's no copy yet."""
+        with self._lock:
+            fetched_at = self._fetched_at if self._file_list is not None else None
+        return time.time() - fetched_at if fetched_at is not None else None
+
+    def Get(self) -> DatasetRepositoryConfig:
+        """Get the file list, refreshing it first if it's out of date.
+
+        :return: The parsed file list.
+        :rtype: DatasetRepositoryConfig
+        :raises urllib.error.HTTPError: If there's no copy of the file list yet, and fetching it failed.
+        :raises CircuitOpenError: If there's no copy of the file list yet, and the file list server's circuit is open.
+        """
+        ret_val : Optional[DatasetRepositoryConfig]
+
+        if self._refresh <= 0:
+            _, ret_val = self._fetchAndParse()
+        else:
+            if self._snapshot is not None and self._snapshot.Generation != self._generation:
+                self._adopt()
+            with self._lock:
+                ret_val = self._file_list
+                stale   = time.time() - self._fetched_at >= self._refresh
+            if ret_val is None:
+                # With no copy at all, every thread has to wait for the first fetch.
+                with self._refreshing:
+                    ret_val = self._file_list or self._fetch()
+            elif stale and self._refreshing.acquire(blocking=False):
+                try:
+                    ret_val = self._fetch()
+                except Exception as err: # pylint: disable=broad-exception-caught
+                    current_app.logger.warning(f"Could not refresh the file list from {self._url}, still using the previous copy:\n{err}")
+                    if self._metrics is not None:
+                        self._metrics.Count("file_index_refresh_failures")
+                finally:
+                    self._refreshing.release()
+
+        return ret_val
+
+    def _fetch(self) -> DatasetRepositoryConfig:
+        ret_val : DatasetRepositoryConfig
+
+        if self._snapshot is None:
+            _, ret_val = self._fetchAndParse()
+            self._store(file_list=ret_val, fetched_at=time.time(), generation=self._generation)
+        else:
+            with self._snapshot.RefreshLock():
+                # Another process may have refreshed the list while this one waited for the lock.
+                latest = self._snapshot.Load()
+                fresh  = latest is not None and time.time() - latest.fetched_at < self._refresh
+                if fresh and latest.generation != self._generation:
+                    ret_val = ParseFileList(latest.body)
+                    self._store(file_list=ret_val, fetched_at=latest.fetched_at, generation=latest.generation)
+                elif fresh and self._file_list is not None:
+                    ret_val = self._file_list
+                else:
+                    fetched_at   = time.time()
+                    # Parse before publishing, so a broken list never reaches the other processes.
+                    raw, ret_val = self._fetchAndParse()
+                    generation = self._generation
+                    try:
+                        generation = self._snapshot.Publish(body=raw, fetched_at=fetched_at)
+                    except OSError as err:
+                        current_app.logger.warning(f"Could not publish the file list to {self._snapshot.Directory}, other processes will fetch their own:\n{err}")
+                    self._store(file_list=ret_val, fetched_at=fetched_at, generation=generation)
+
+        return ret_val
+
+    def _fetchAndParse(self) -> Tuple[bytes, DatasetRepositoryConfig]:
+        """Fetch the raw file list and parse it, recording how long that took."""
+        started = time.perf_counter()
+        raw     = FetchFileList(self._url, client=self._client)
+        parsed  = ParseFileList(raw)
+        if self._metrics is not None:
+            self._metrics.Observe("file_index_refresh_duration_seconds", time.perf_counter() - started)
+        return raw, parsed
+
+    def _adopt(self):
+        """Switch to the newest snapshot published by any process, if this process doesn't have it yet."""
+        with self._adopting:
+            latest = self._snapshot.Load()
+            if latest is not None and latest.generation != self._generation:
+                try:
+                    self._store(file_list=ParseFileList(latest.body), fetched_at=latest.fetched_at, generation=latest.generation)
+                except Exception as err: # pylint: disable=broad-exception-caught
+                    current_app.logger.warning(f"Could not read the file list snapshot from {self._snapshot.Directory}, still using the previous copy:\n{err}")
+                    with self._lock:
+                        self._generation = latest.generation
+
+    def _store(self, file_list:DatasetRepositoryConfig, fetched_at:float, generation:int):
+        with self._lock:
+            self._file_list  = file_list
+            self._fetched_at = fetched_at
+            self._generation = generation
@@ -0,0 +1,284 @@
+"""
+FileQuery
+
+Contains the FileQuery class, which holds the row and column selection a client asked for on a dataset file.
+"""
+
+# import standard libraries
+import random
+from dataclasses import dataclass
+from typing import Callable, ClassVar, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+# import 3rd-party libraries
+import numpy as np
+import pandas as pd
+from werkzeug.datastructures import MultiDict
+
+# import local files
+from utils.SanitizedParams import SanitizedParams
+from utils.TableAnalysis import TableAnalysis
+
+@dataclass
+class FileQuery:
+    """Row and column selection to apply to a dataset file before it is returned.
+
+    Every field is optional, and a query with no fields set selects the whole file.
+    Session filtering looks for any of the `SESSION_ID_COLUMNS`, and is skipped for files that have none of them (e.g. population files).
+
+    The query is a plain dataclass so it can be pickled and sent along with ParsePool jobs.
+    """
+    SESSION_ID_COLUMNS : ClassVar[Tuple[str, ...]] = ("SessionID", "session_id")
+
+    columns      : Optional[List[str]]             = None
+    session_ids  : Optional[Set[str]]              = None
+    offset       : int                             = 0
+    limit        : Optional[int]                   = None
+    group_by     : Optional[List[str]]             = None
+    aggregations : Optional[List[Tuple[str, str]]] = None
+    sort         : Optional[Tuple[str, bool]]      = None
+    sample       : Optional[int]                   = None
+    seed         : Optional[int]                   = None
+
+    @property
+    def IsEmpty(self) -> bool:
+        return self.columns is None and self.session_ids is None and self.offset == 0 and self.limit is None and self.group_by is None and self.sort is None and self.sample is None
+
+    @property
+    def IsAggregate(self) -> bool:
+        return self.group_by is not None
+
+    @property
+    def NeedsTable(self) -> bool:
+        """Whether the query needs the whole table at once, rather than working on streamed chunks."""
+        return self.IsAggregate or self.sort is not None
+
+    @property
+    def AggregateColumns(self) -> List[str]:
+        """All columns that must be in the table for the query's aggregation to run."""
+        return list(dict.fromkeys((self.group_by or []) + [col for col, _ in (self.aggregations or [])]))
+
+    @property
+    def AggregateOutputColumns(self) -> List[str]:
+        """The columns of the table produced by the query's aggregation."""
+        return (self.group_by or []) + ([f"{col}:{func}" for col, func in self.aggregations] if self.aggregations else ["count"])
+
+    @property
+    def CacheVariant(self) -> Tuple[Hashable, ...]:
+        """A hashable form of the query, for caching results that depend on it."""
+        return (
+            tuple(self.columns) if self.columns is not None else None,
+            tuple(sorted(self.session_ids)) if self.session_ids is not None else None,
+            self.offset,
+            self.limit,
+            tuple(self.group_by) if self.group_by is not None else None,
+            tuple(self.aggregations) if self.aggregations is not None else None,
+            self.sort,
+            self.sample,
+            self.seed
+        )
+
+    @property
+    def UseColumns(self) -> Optional[Callable[[str], bool]]:
+        """A `usecols` filter for `pd.read_csv`, so unrequested columns are never parsed.
+
+        :return: A predicate on column names, or None if every column is needed.
+        :rtype: Optional[Callable[[str], bool]]
+        """
+        ret_val : Optional[Callable[[str], bool]] = None
+
+        if self.group_by is not None:
+            needed = set(self.AggregateColumns)
+            if self.session_ids is not None:
+                needed.update(self.SESSION_ID_COLUMNS)
+            ret_val = needed.__contains__
+        elif self.columns is not None:
+            needed = set(self.columns)
+            if self.session_ids is not None:
+                needed.update(self.SESSION_ID_COLUMNS)
+            if self.sort is not None:
+                needed.add(self.sort[0])
+            ret_val = needed.__contains__
+
+        return ret_val
+
+    @staticmethod
+    def FromArgs(args:MultiDict) -> Optional["FileQuery"]:
+        """Build a FileQuery from request args.
+
+        Recognized args are `columns` (comma-separated), `session_id` (repeatable, or comma-separated), `offset`, and `limit`,
+        plus `group_by` (comma-separated) and `agg` (comma-separated `column:function` pairs) for aggregation,
+        `sort` (a column, with a leading `-` for descending order), and `sample` (a number of random rows) with an optional `seed`.
+        Since an aggregate table's columns are set by `group_by` and `agg`, `columns` can't be combined with `group_by`,
+        and a sample can't be combined with paging, sorting, or grouping.
+        When a sample is requested without a seed, a random seed is chosen, so the query can still be repeated exactly.
+
+        :param args: The request's query args.
+        :type args: MultiDict
+        :return: The parsed query, or None if any of the recognized args had an invalid value.
+        :rtype: Optional[FileQuery]
+        """
+        raw_columns     = args.get("columns")
+        raw_session_ids = args.getlist("session_id")
+        raw_offset      = args.get("offset")
+        raw_limit       = args.get("limit")
+        raw_group_by    = args.get("group_by")
+        raw_aggs        = args.get("agg")
+        raw_sort        = args.get("sort")
+        raw_sample      = args.get("sample")
+        raw_seed        = args.get("seed")
+
+        columns     = SanitizedParams.SanitizeColumns(columns=raw_columns)
+        session_ids = SanitizedParams.SanitizeSessionIDs(session_ids=raw_session_ids)
+        offset      = SanitizedParams.SanitizeCount(count=raw_offset)
+        limit       = SanitizedParams.SanitizeCount(count=raw_limit)
+        group_by    = SanitizedParams.SanitizeColumns(columns=raw_group_by)
+        aggs        = SanitizedParams.SanitizeAggregations(aggregations=raw_aggs)
+        sort        = SanitizedParams.SanitizeSort(sort=raw_sort)
+        sample      = SanitizedParams.SanitizeCount(count=raw_sample)
+        seed        = SanitizedParams.SanitizeCount(count=raw_seed)
+
+        if (raw_columns is not None and columns is None) \
+        or (len(raw_session_ids) > 0 and session_ids is None) \
+        or (raw_offset is not None and offset is None) \
+        or (raw_limit is not None and limit is None) \
+        or (raw_group_by is not None and group_by is None) \
+        or (raw_aggs is not None and (aggs is None or group_by is None or any(func not in TableAnalysis.AGGREGATIONS for _, func in aggs))) \
+        or (group_by is not None and columns is not None) \
+        or (raw_sort is not None and sort is None) \
+        or (raw_sample is not None and not sample) \
+        or (raw_seed is not None and (seed is None or sample is None)) \
+        or (sample is not None and (offset is not None or limit is not None or sort is not None or group_by is not None)):
+            return None
+        if sample is not None and seed is None:
+            seed = random.randrange(2**32)
+        return FileQuery(columns=columns, session_ids=session_ids, offset=offset or 0, limit=limit, group_by=group_by, aggregations=aggs, sort=sort, sample=sample, seed=seed)
+
+    def Apply(self, table:pd.DataFrame, order:Optional[np.ndarray]=None) -> pd.DataFrame:
+        """Apply the query to a fully-loaded table.
+
+        For an aggregate query, the session filter is applied before grouping, and the sort, offset, and limit apply to the groups.
+        For a sorted query, the sort order can be given as row positions, such as a cached `TableAnalysis.SortPermutation`,
+        so only the selected rows are ever copied out of the table.
+        For a sampled query, rows are sampled directly by position, and only the sampled rows are copied.
+
+        :param table: The parsed dataset table.
+        :type table: pd.DataFrame
+        :param order: Positions of the table's rows in sorted order, computed from the table if not given.
+            May be just the first rows of the order, as long as it includes every row up to the query's limit.
+        :type order: Optional[np.ndarray], optional
+        :return: The selected rows and columns of the table.
+        :rtype: pd.DataFrame
+        """
+        ret_val : pd.DataFrame
+
+        if self.IsAggregate:
+            filtered   = FileQuery(session_ids=self.session_ids)._select(table)
+            aggregated = TableAnalysis.GroupAggregate(filtered, group_by=self.group_by or [], aggregations=self.aggregations)
+            if self.sort is not None:
+                aggregated = aggregated.iloc[TableAnalysis.SortPermutation(TableAnalysis.SortKey(aggregated[self.sort[0]]), descending=self.sort[1])]
+            ret_val    = next(FileQuery(offset=self.offset, limit=self.limit).ApplyToChunks([aggregated]))
+        elif self.sort is not None:
+            if order is None:
+                order = TableAnalysis.SortPermutation(TableAnalysis.SortKey(table[self.sort[0]]), descending=self.sort[1])
+            matching = self.MatchingPositions(table)
+            if matching is not None:
+                mask = np.zeros(len(table), dtype=bool)
+                mask[matching] = True
+                order = order[mask[order]]
+            end     = self.offset + self.limit if self.limit is not None else None
+            ret_val = FileQuery(columns=self.columns)._select(table.iloc[order[self.offset:end]])
+        elif self.sample is not None:
+            matching = self.MatchingPositions(table)
+            if matching is None:
+                matching = np.arange(len(table))
+            keys    = TableAnalysis.SampleKeys(len(matching), rng=np.random.default_rng(self.seed))
+            ret_val = FileQuery(columns=self.columns)._select(table.iloc[matching[TableAnalysis.BottomK(keys, self.sample)]])
+        else:
+            ret_val = next(self.ApplyToChunks([table]))
+
+        return ret_val
+
+    def MatchingPositions(self, table:pd.DataFrame) -> Optional[np.ndarray]:
+        """Get the positions of the rows that match the query's session filter.
+
+        :param table: The parsed dataset table.
+        :type table: pd.DataFrame
+        :return: The matching row positions, or None if every row matches.
+        :rtype: Optional[np.ndarray]
+        """
+        ret_val : Optional[np.ndarray] = None
+
+        if self.session_ids is not None:
+            id_col = next((col for col in self.SESSION_ID_COLUMNS if col in table.columns), None)
+            if id_col is not None:
+                ret_val = np.flatnonzero(table[id_col].astype(str).isin(self.session_ids).to_numpy())
+
+        return ret_val
+
+    def ApplyToChunks(self, chunks:Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Apply the query to a table that is read in chunks.
+
+        Stops pulling chunks as soon as the limit is reached, so a small page from the front of a huge file only reads the front of the file.
+        Chunks are yielded even when they end up empty, so callers always see the selected columns.
+        A sampled query reads every chunk, and yields the sample as a single chunk at the end.
+
+        :param chunks: The chunks of the table, in order.
+        :type chunks: Iterable[pd.DataFrame]
+        :yield: The selected rows and columns of each chunk.
+        :rtype: Iterator[pd.DataFrame]
+        """
+        if self.sample is not None:
+            yield from self._sampleChunks(chunks)
+            return
+
+        to_skip   : int           = self.offset
+        remaining : Optional[int] = self.limit
+
+        for chunk in chunks:
+            chunk = self._select(chunk)
+            if to_skip > 0:
+                skipped = min(to_skip, len(chunk))
+                chunk = chunk.iloc[skipped:]
+                to_skip -= skipped
+            if remaining is not None:
+                chunk = chunk.iloc[:remaining]
+                remaining -= len(chunk)
+            yield chunk
+            if remaining is not None and remaining <= 0:
+                break
+
+    def _sampleChunks(self, chunks:Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Reservoir-sample rows from a chunked table in a single pass, holding at most the sample and one chunk in memory.
+
+        Each row gets a random key, and the reservoir keeps the rows with the smallest keys seen so far.
+        Keys are drawn the same way as in `Apply`, so a seed gives the same sample from a streamed file as from a loaded one.
+        """
+        k         = self.sample or 0
+        rng       = np.random.default_rng(self.seed)
+        reservoir : Optional[pd.DataFrame] = None
+        res_keys  = np.empty(0, dtype=np.float64)
+
+        for chunk in chunks:
+            chunk     = self._select(chunk)
+            reservoir = pd.concat([reservoir, chunk]) if reservoir is not None else chunk
+            res_keys  = np.concatenate([res_keys, TableAnalysis.SampleKeys(len(chunk), rng=rng)])
+            if len(reservoir) > k:
+                keep      = TableAnalysis.BottomK(res_keys, k)
+                reservoir = reservoir.iloc[keep]
+                res_keys  = res_keys[keep]
+
+        if reservoir is not None:
+            # BottomK keeps positions in order, and chunks were appended in order, so the sample is already in file order.
+            yield reservoir
+
+    def _select(self, chunk:pd.DataFrame) -> pd.DataFrame:
+        ret_val = chunk
+
+        if self.session_ids is not None:
+            id_col = next((col for col in self.SESSION_ID_COLUMNS if col in ret_val.columns), None)
+            if id_col is not None:
+                ret_val = ret_val[ret_val[id_col].astype(str).isin(self.session_ids)]
+        if self.columns is not None:
+            ret_val = ret_val[[col for col in self.columns if col in ret_val.columns]]
+
+        return ret_val
@@ -0,0 +1,252 @@
+"""
+HTTPClient
+
+Contains the HTTPClient class, which holds the pool of keep-alive connections used for every upstream request.
+"""
+
+# import standard libraries
+import threading
+import time
+from email.message import Message
+from io import BytesIO
+from typing import IO, Any, Dict, Final, Optional
+from urllib import error as url_error
+
+# import 3rd-party libraries
+import urllib3
+from flask import current_app
+
+# import local files
+from utils.CircuitBreaker import CircuitBreaker
+from utils.Deadlines import Deadline, DeadlineExceededError
+from utils.Metrics import Metrics
+from utils.ServerTiming import PhaseTimings
+
+class HTTPClient:
+    """Thread-safe pool of keep-alive connections to the servers that host the file list and dataset files.
+
+    Connections are reused across requests and request threads, so each upstream host only costs a TCP and TLS handshake
+    the first time, rather than on every fetch.
+    Failed connections, and 502, 503, and 504 responses, are retried with exponential backoff.
+
+    Any other error response is raised as a `urllib.error.HTTPError`, the same as `urlopen`, so resources handle upstream errors the same way either way.
+
+    Fetches made during a request with a `Deadline` are retried the same way, but each attempt's timeouts, and each wait between attempts,
+    are cut short to end by the deadline, and the fetch raises a `DeadlineExceededError` if it passes before the whole body has arrived.
+
+    Each upstream host has a `CircuitBreaker`: connection failures, timeouts, and 5xx responses, after any retries, count against the host,
+    and once its circuit is open, fetches from it raise a `CircuitOpenError` at once, rather than waiting on a server that's down.
+    A timeout that a deadline cut short doesn't count against the host, since it only shows the request ran out of time.
+
+    With `metrics`, every fetch is counted by host and outcome, and its time and size are recorded.
+    """
+    EXTENSION_KEY  : Final[str]       = "ogd_http_client"
+    RETRY_STATUSES : Final[frozenset] = frozenset({502, 503, 504})
+
+    def __init__(self, max_hosts:int, max_per_host:int, block:bool, connect_timeout:float, read_timeout:float, retries:int, backoff:float,
+                 failure_threshold:int=0, reset_seconds:float=30.0, half_open_probes:int=1, metrics:Optional[Metrics]=None):
+        self._connect_timeout   : float                     = connect_timeout
+        self._read_timeout      : float                     = read_timeout
+        self._failure_threshold : int                       = failure_threshold
+        self._reset_seconds     : float                     = reset_seconds
+        self._half_open_probes  : int                       = half_open_probes
+        self._breakers          : Dict[str, CircuitBreaker] = {}
+        self._breakers_lock     : threading.Lock            = threading.Lock()
+        self._metrics           : Optional[Metrics]         = metrics
+        self._retry             : urllib3.Retry             = urllib3.Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=HTTPClient.RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False
+        )
+        # each call to the pool makes a single attempt, following any redirects, and `CopyTo` retries it according to `_retry`
+        self._attempt           : urllib3.Retry             = self._retry.new(connect=0, read=0, status=0, other=0)
+        self._pool              : urllib3.PoolManager       = urllib3.PoolManager(
+            num_pools=max(1, max_hosts),
+            maxsize=max(1, max_per_host),
+            block=block,
+            timeout=urllib3.Timeout(connect=connect_timeout, read=read_timeout),
+            retries=self._attempt
+        )
+
+    @staticmethod
+    def Current() -> "HTTPClient":
+        """Get the app's shared client. Threads without an app context should be handed the client by the thread that starts them."""
+        return current_app.extensions[HTTPClient.EXTENSION_KEY]
+
+    @property
+    def BreakerStats(self) -> Dict[str, Dict[str, Any]]:
+        """The `CircuitBreaker.Stats` of each upstream host fetched from so far."""
+        with self._breakers_lock:
+            breakers = list(self._breakers.values())
+        return {breaker.Host : breaker.Stats for breaker in breakers}
+
+    def Read(self, url:str, deadline:Optional[Deadline]=None, phase:Optional[str]="download") -> bytes:
+        """Fetch the whole body of a URL.
+
+        :param url: The URL to fetch.
+        :type url: str
+        :param deadline: Deadline for the fetch, defaults to the current request's deadline, if there is one.
+        :type deadline: Optional[Deadline], optional
+        :param phase: The `PhaseTimings` phase to add the fetch's time to, or None for a fetch that's already timed as part of another phase, defaults to `download`.
+        :type phase: Optional[str], optional
+        :return: The response body.
+        :rtype: bytes
+        :raises urllib.error.HTTPError: If the server responded with an error status, after any retries.
+        :raises DeadlineExceededError: If the deadline passed before the whole body arrived.
+        :raises CircuitOpenError: If the server's circuit is open, after too many failures in a row.
+        """
+        body = BytesIO()
+        self.CopyTo(url, body, deadline=deadline, phase=phase)
+        return body.getvalue()
+
+    def CopyTo(self, url:str, destination:IO[bytes], chunk_bytes:int=1024*1024, deadline:Optional[Deadline]=None, phase:Optional[str]="download"):
+        """Stream the body of a URL into a file, without holding more than one chunk of it in memory.
+
+        :param url: The URL to fetch.
+        :type url: str
+        :param destination: The file to write the body to.
+        :type destination: IO[bytes]
+        :param chunk_bytes: Size of each chunk that's copied, defaults to 1 MB.
+        :type chunk_bytes: int, optional
+        :param deadline: Deadline for the fetch, defaults to the current request's deadline, if there is one.
+        :type deadline: Optional[Deadline], optional
+        :param phase: The `PhaseTimings` phase to add the fetch's time to, or None for a fetch that's already timed as part of another phase, defaults to `download`.
+        :type phase: Optional[str], optional
+        :raises urllib.error.HTTPError: If the server responded with an error status, after any retries.
+        :raises DeadlineExceededError: If the deadline passed before the whole body arrived.
+        :raises CircuitOpenError: If the server's circuit is open, after too many failures in a row.
+        """
+        _deadline = deadline or Deadline.Current()
+        if _deadline is not None:
+            _deadline.Check()
+        breaker = self._breakerFor(url)
+        probe   = breaker.Acquire()
+        timeout : urllib3.Timeout = urllib3.Timeout(connect=self._connect_timeout, read=self._read_timeout)
+        healthy : Optional[bool]  = None
+        outcome : str             = "failed"
+        copied  : int             = 0
+        started : float           = time.perf_counter()
+        try:
+            retries = self._retry
+            while True:
+                timeout = self._timeoutFor(_deadline)
+                try:
+                    response = self._pool.request("GET", url, preload_content=False, timeout=timeout, retries=self._attempt)
+                except urllib3.exceptions.MaxRetryError as err:
+                    healthy = None if self._cutShort(err=err, timeout=timeout) else False
+                    # raises the last error once the retries are used up
+                    retries = retries.increment("GET", url, error=err.reason)
+                    HTTPClient._wait(retries=retries, response=None, deadline=_deadline)
+                    continue
+                if retries.is_retry("GET", response.status, has_retry_after="Retry-After" in response.headers):
+                    try:
+                        retries = retries.increment("GET", url, response=response)
+                    except urllib3.exceptions.MaxRetryError:
+                        # with the retries used up, the error status is raised below, like any other
+                        pass
+                    else:
+                        healthy = False
+                        response.drain_conn()
+                        response.release_conn()
+                        HTTPClient._wait(retries=retries, response=response, deadline=_deadline)
+                        continue
+                break
+            try:
+                # the server answered, so only an error on its side, or a failure partway through the body, counts against it
+                healthy = response.status < 500
+                outcome = "error_status" if response.status >= 400 else outcome
+                HTTPClient._raiseForStatus(url=url, response=response)
+                while chunk := response.read(chunk_bytes):
+                    destination.write(chunk)
+                    copied += len(chunk)
+                    if _deadline is not None:
+                        _deadline.Check()
+                outcome = "ok"
+            finally:
+                # hands the connection back to the pool, or drops it if the body wasn't read to the end
+                response.release_conn()
+        except urllib3.exceptions.HTTPError as err:
+            healthy = None if self._cutShort(err=err, timeout=timeout) else False
+            if _deadline is not None and _deadline.Expired:
+                outcome = "deadline"
+                raise DeadlineExceededError(f"The request's deadline passed while fetching {url}.") from err
+            raise
+        except DeadlineExceededError:
+            outcome = "deadline"
+            raise
+        finally:
+            breaker.Record(probe=probe, healthy=healthy)
+            if phase is not None:
+                PhaseTimings.Record(phase, time.perf_counter() - started)
+            if self._metrics is not None:
+                self._metrics.Count("upstream_fetches", (breaker.Host, outcome))
+                self._metrics.Count("upstream_fetch_bytes", (breaker.Host,), copied)
+                self._metrics.Observe("upstream_fetch_duration_seconds", time.perf_counter() - started, (breaker.Host,))
+
+    def Close(self):
+        """Close every pooled connection."""
+        self._pool.clear()
+
+    def _timeoutFor(self, deadline:Optional[Deadline]) -> urllib3.Timeout:
+        """Get the timeouts for an attempt at a fetch, cut short to end by the deadline, if there is one."""
+        ret_val = urllib3.Timeout(connect=self._connect_timeout, read=self._read_timeout)
+
+        if deadline is not None:
+            deadline.Check()
+            # urllib3 won't take a timeout of 0, and the deadline check above already stops fetches with no time left
+            ret_val = urllib3.Timeout(connect=max(0.001, deadline.Timeout(self._connect_timeout)), read=max(0.001, deadline.Timeout(self._read_timeout)))
+
+        return ret_val
+
+    def _cutShort(self, err:urllib3.exceptions.HTTPError, timeout:urllib3.Timeout) -> bool:
+        """Whether a fetch failed by timing out, on a timeout that a deadline had made shorter than the configured one."""
+        ret_val : bool = False
+
+        reason = err.reason if isinstance(err, urllib3.exceptions.MaxRetryError) else err
+        # a refused connection is a kind of connect timeout to urllib3, but it's the host's failure either way
+        if isinstance(reason, urllib3.exceptions.NewConnectionError):
+            ret_val = False
+        elif isinstance(reason, urllib3.exceptions.ConnectTimeoutError):
+            ret_val = timeout.connect_timeout is not None and timeout.connect_timeout < self._connect_timeout
+        elif isinstance(reason, urllib3.exceptions.ReadTimeoutError):
+            ret_val = timeout.read_timeout is not None and timeout.read_timeout < self._read_timeout
+
+        return ret_val
+
+    @staticmethod
+    def _wait(retries:urllib3.Retry, response:Optional[urllib3.BaseHTTPResponse], deadline:Optional[Deadline]):
+        """Wait before retrying, for as long as the server's `Retry-After` header or the backoff says, but no later than the deadline."""
+        seconds = retries.get_retry_after(response) if response is not None and retries.respect_retry_after_header else None
+        if seconds is None:
+            seconds = retries.get_backoff_time()
+        if deadline is not None:
+            seconds = min(seconds, deadline.Remaining())
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def _breakerFor(self, url:str) -> CircuitBreaker:
+        ret_val : CircuitBreaker
+
+        host = urllib3.util.parse_url(url).netloc or ""
+        with self._breakers_lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(
+                    host=host,
+                    failure_threshold=self._failure_threshold,
+                    reset_seconds=self._reset_seconds,
+                    half_open_probes=self._half_open_probes
+                )
+            ret_val = self._breakers[host]
+
+        return ret_val
+
+    @staticmethod
+    def _raiseForStatus(url:str, response:urllib3.BaseHTTPResponse):
+        if response.status >= 400:
+            headers = Message()
+            for name, value in response.headers.items():
+                headers[name] = value
+            response.drain_conn()
+            raise url_error.HTTPError(url=url, code=response.status, msg=response.reason or "", hdrs=headers, fp=None)
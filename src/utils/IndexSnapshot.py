@@ -0,0 +1,160 @@
+"""
+IndexSnapshot
+
+Contains the IndexSnapshot class, which shares the most recent fetch of the file list between every server process on a host.
+"""
+
+# import standard libraries
+import contextlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Final, Iterator, Optional
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# import 3rd-party libraries
+
+# import local files
+
+@dataclass(frozen=True)
+class Snapshot:
+    generation : int
+    fetched_at : float
+    body       : bytes
+
+class IndexSnapshot:
+    """Snapshots of the raw file list, published by one process and read by all of them, so the list is only fetched once per host.
+
+    Only the fetch is shared. `Load` reads the raw list from the snapshot file, and each process parses its own `DatasetRepositoryConfig` from it,
+    since ogd-common's parsed objects can't live in shared memory. Loads only happen when the generation changes, so they're plain file reads.
+
+    The snapshot directory holds:
+
+    - `generation`, an 8-byte counter that every process keeps memory-mapped, so checking for a new snapshot costs no system calls.
+    - `index-<generation>.snap`, one file per snapshot, with a header giving its generation, when it was fetched, and the length of the file list.
+    - `refresh.lock`, which is locked by whichever process is fetching a new snapshot, so the file list is only fetched once per host.
+
+    Snapshots are written to a temporary file and renamed into place before the counter is bumped,
+    so a reader never sees a partial snapshot, and the previous snapshot is kept around for readers that are still loading it.
+
+    Needs `fcntl`, so it's only `Supported` on Unix-like systems.
+    """
+    MAGIC   : Final[bytes]         = b"OGDIDX01"
+    COUNTER : Final[struct.Struct] = struct.Struct("<Q")
+    HEADER  : Final[struct.Struct] = struct.Struct("<8sQdQ")
+    """Magic, generation, fetched-at time (seconds since the epoch), and body length."""
+
+    def __init__(self, directory:str | Path):
+        self._directory : Path                  = Path(directory)
+        self._lock      : threading.Lock        = threading.Lock()
+        self._counter   : Optional[mmap.mmap]   = None
+        self._pid       : Optional[int]         = None
+
+    @staticmethod
+    def Supported() -> bool:
+        return fcntl is not None
+
+    @property
+    def Directory(self) -> Path:
+        return self._directory
+
+    @property
+    def Generation(self) -> int:
+        """The generation of the newest published snapshot, or 0 if none has been published yet."""
+        return IndexSnapshot.COUNTER.unpack_from(self._mappedCounter(), 0)[0]
+
+    def Load(self) -> Optional[Snapshot]:
+        """Read the newest published snapshot.
+
+        :return: The snapshot, or None if none has been published yet, it was replaced and removed while being read, or its file was cut short.
+        :rtype: Optional[Snapshot]
+        """
+        ret_val : Optional[Snapshot] = None
+
+        generation = self.Generation
+        if generation > 0:
+            try:
+                with open(self._snapshotPath(generation), "rb") as snapshot_file:
+                    header = snapshot_file.read(IndexSnapshot.HEADER.size)
+                    if len(header) == IndexSnapshot.HEADER.size:
+                        magic, header_generation, fetched_at, length = IndexSnapshot.HEADER.unpack(header)
+                        if magic == IndexSnapshot.MAGIC and header_generation == generation:
+                            body = snapshot_file.read(length)
+                            if len(body) == length:
+                                ret_val = Snapshot(generation=generation, fetched_at=fetched_at, body=body)
+            except FileNotFoundError:
+                pass
+
+        return ret_val
+
+    def Publish(self, body:bytes, fetched_at:float) -> int:
+        """Publish a new snapshot of the file list. Should only be called while holding the `RefreshLock`.
+
+        :param body: The raw file list.
+        :type body: bytes
+        :param fetched_at: When the file list was fetched, in seconds since the epoch.
+        :type fetched_at: float
+        :return: The new snapshot's generation.
+        :rtype: int
+        """
+        counter    = self._mappedCounter()
+        generation = self.Generation + 1
+        handle, temp_path = tempfile.mkstemp(dir=self._directory, prefix=".index-", suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as temp_file:
+                temp_file.write(IndexSnapshot.HEADER.pack(IndexSnapshot.MAGIC, generation, fetched_at, len(body)))
+                temp_file.write(body)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, self._snapshotPath(generation))
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temp_path)
+            raise
+        IndexSnapshot.COUNTER.pack_into(counter, 0, generation)
+        counter.flush()
+        # keep the previous snapshot, in case a reader is still loading it
+        for old_snapshot in self._directory.glob("index-*.snap"):
+            if int(old_snapshot.stem.split("-", 1)[1]) < generation - 1:
+                with contextlib.suppress(FileNotFoundError):
+                    old_snapshot.unlink()
+
+        return generation
+
+    @contextlib.contextmanager
+    def RefreshLock(self) -> Iterator[None]:
+        """Hold the host-wide lock for refreshing the file list, waiting for another process to finish if it's refreshing now."""
+        self._directory.mkdir(parents=True, exist_ok=True)
+        with open(self._directory / "refresh.lock", "a+b") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _mappedCounter(self) -> mmap.mmap:
+        """Get this process's mapping of the generation counter, creating the counter if it doesn't exist yet."""
+        if self._counter is None or self._pid != os.getpid():
+            with self._lock:
+                if self._counter is None or self._pid != os.getpid():
+                    self._directory.mkdir(parents=True, exist_ok=True)
+                    fd = os.open(self._directory / "generation", os.O_RDWR | os.O_CREAT, 0o644)
+                    try:
+                        fcntl.flock(fd, fcntl.LOCK_EX)
+                        if os.fstat(fd).st_size < IndexSnapshot.COUNTER.size:
+                            os.ftruncate(fd, IndexSnapshot.COUNTER.size)
+                        fcntl.flock(fd, fcntl.LOCK_UN)
+                        self._counter = mmap.mmap(fd, IndexSnapshot.COUNTER.size, access=mmap.ACCESS_WRITE)
+                    finally:
+                        os.close(fd)
+                    self._pid = os.getpid()
+        return self._counter
+
+    def _snapshotPath(self, generation:int) -> Path:
+        return self._directory / f"index-{generation}.snap"
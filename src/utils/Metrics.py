@@ -0,0 +1,300 @@
+"""
+Metrics
+
+Contains the Metrics class, which counts requests, upstream fetches, and file list refreshes,
+and renders them, along with the stats of the caches, bulkheads, and circuit breakers, in the Prometheus text format.
+"""
+
+# import standard libraries
+import bisect
+import hmac
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Final, Iterable, List, Optional, Set, Tuple
+
+# import 3rd-party libraries
+from flask import g, request, Response
+
+# import ogd libraries
+from ogd.apis.models.APIResponse import APIResponse
+from ogd.apis.models.enums.RESTType import RESTType
+from ogd.apis.models.enums.ResponseStatus import ResponseStatus
+
+# import local files
+from utils.CircuitBreaker import CircuitState
+
+Labels = Tuple[str, ...]
+
+@dataclass(frozen=True)
+class MetricFamily:
+    """One metric, as it's rendered: a name, a type, a help line, and its samples, each a name suffix, label values, and value."""
+    name    : str
+    kind    : str
+    help    : str
+    samples : List[Tuple[str, Dict[str, str], float]] = field(default_factory=list)
+
+@dataclass(frozen=True)
+class _Declared:
+    kind   : str
+    help   : str
+    labels : Labels
+
+class _Shard:
+    """One thread's counts. Only its own thread ever writes to it, so updates don't need a lock."""
+
+    def __init__(self):
+        self.counters   : Dict[Tuple[str, Labels], float]       = {}
+        self.histograms : Dict[Tuple[str, Labels], List[float]] = {}
+
+class Metrics:
+    """Process-wide metrics, rendered at `Path` in the Prometheus text format.
+
+    Counts and observations go into a shard for each thread, which only that thread writes to,
+    so recording them takes no lock, and a scrape adds up the shards instead.
+    The stats of other components, such as `TableCache.Stats`, are only read when the metrics are scraped, through `AddStats` and `AddCollector`.
+
+    `BeforeRequest`, `AfterRequest`, and `TeardownRequest` are registered as request hooks, ahead of any other hook,
+    so each request's latency covers the time it spent waiting for a bulkhead turn, and, through the response's close, the time it spent streaming.
+    Requests are labelled by endpoint, which flask_restful names after the resource class, in lower case, so there's one series per route rather than per URL.
+
+    Every server process has its own metrics, so a deployment with several processes has to scrape each of them, or add them up.
+    The metrics name upstream hosts and show how busy the server is, so with a `token`, they're only served to scrapers that send it
+    as `Authorization: Bearer <token>`.
+    """
+    EXTENSION_KEY   : Final[str]                  = "ogd_metrics"
+    PREFIX          : Final[str]                  = "ogd_"
+    CONTENT_TYPE    : Final[str]                  = "text/plain; version=0.0.4; charset=utf-8"
+    DEFAULT_BUCKETS : Final[Tuple[float, ...]]    = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+    DECLARED        : Final[Dict[str, _Declared]] = {
+        "requests_started"                    : _Declared("counter",   "Requests that have started, by endpoint.", ("endpoint",)),
+        "requests"                            : _Declared("counter",   "Requests that have finished, by endpoint, method, and status.", ("endpoint", "method", "status")),
+        "request_duration_seconds"            : _Declared("histogram", "Time from when a request started until its response was closed, by endpoint.", ("endpoint",)),
+        "upstream_fetches"                    : _Declared("counter",   "Fetches from upstream servers, by host and outcome.", ("host", "outcome")),
+        "upstream_fetch_duration_seconds"     : _Declared("histogram", "Time taken by each fetch from an upstream server, by host.", ("host",)),
+        "upstream_fetch_bytes"                : _Declared("counter",   "Bytes fetched from upstream servers, by host.", ("host",)),
+        "file_index_refresh_duration_seconds" : _Declared("histogram", "Time taken to fetch and parse the file list.", ()),
+        "file_index_refresh_failures"         : _Declared("counter",   "File list refreshes that failed, leaving the previous copy in use.", ()),
+        "request_phase_duration_seconds"      : _Declared("histogram", "Time each request spent in each phase of being handled, by endpoint and phase.", ("endpoint", "phase"))
+    }
+    _STARTED_KEY    : Final[str]                  = "ogd_metrics_started"
+
+    def __init__(self, path:str, buckets:Optional[Iterable[float]]=None, token:Optional[str]=None):
+        self._path       : str                                        = path
+        self._token      : Optional[str]                              = token or None
+        self._buckets    : Tuple[float, ...]                          = tuple(sorted(buckets)) if buckets else Metrics.DEFAULT_BUCKETS
+        self._local      : threading.local                            = threading.local()
+        self._lock       : threading.Lock                             = threading.Lock()
+        self._shards     : List[_Shard]                               = []
+        self._collectors : List[Callable[[], Iterable[MetricFamily]]] = []
+
+    @property
+    def Path(self) -> str:
+        return self._path
+
+    def Count(self, name:str, labels:Labels=(), value:float=1):
+        """Add to one of the `DECLARED` counters."""
+        shard = self._shard()
+        key   = (name, labels)
+        shard.counters[key] = shard.counters.get(key, 0) + value
+
+    def Observe(self, name:str, value:float, labels:Labels=()):
+        """Add an observation to one of the `DECLARED` histograms."""
+        shard  = self._shard()
+        counts = shard.histograms.get((name, labels))
+        if counts is None:
+            # a count for each bucket, then the +Inf bucket, then the sum
+            counts = shard.histograms[(name, labels)] = [0.0] * (len(self._buckets) + 2)
+        counts[bisect.bisect_left(self._buckets, value)] += 1
+        counts[-1] += value
+
+    def AddCollector(self, collect:Callable[[], Iterable[MetricFamily]]):
+        """Add a function that's called on every scrape, for metrics that are read from somewhere else rather than counted here."""
+        self._collectors.append(collect)
+
+    def AddStats(self, name:str, stats:Callable[[], Dict[str, Any]], counters:Set[str], label:Optional[str]=None):
+        """Render a component's stats, such as `TableCache.Stats`, on every scrape.
+
+        :param name: Name of the component, which starts the name of each of its metrics.
+        :type name: str
+        :param stats: Function to get the stats, a mapping from each stat's name to its value.
+        :type stats: Callable[[], Dict[str, Any]]
+        :param counters: Names of the stats that only ever count up, which are rendered as counters, while the rest are rendered as gauges.
+        :type counters: Set[str]
+        :param label: If the stats are a mapping from a label value to a mapping of stats, such as `Bulkheads.Stats`, the name of that label.
+        :type label: Optional[str]
+        """
+        def _collect() -> List[MetricFamily]:
+            ret_val : Dict[str, MetricFamily] = {}
+
+            current = stats()
+            grouped = current if label is not None else {None : current}
+            for label_value, group in grouped.items():
+                labels = {label : str(label_value)} if label is not None else {}
+                for stat, value in group.items():
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        kind   = "counter" if stat in counters else "gauge"
+                        family = ret_val.setdefault(stat, MetricFamily(name=f"{name}_{stat}", kind=kind, help=f"The {stat.replace('_', ' ')} stat of the {name.replace('_', ' ')}."))
+                        family.samples.append(("_total" if kind == "counter" else "", labels, value))
+
+            return list(ret_val.values())
+
+        self.AddCollector(_collect)
+
+    def AddGauge(self, name:str, help_text:str, value:Callable[[], Optional[float]]):
+        """Render a single value on every scrape, which is left out while `value` returns None."""
+        def _collect() -> List[MetricFamily]:
+            current = value()
+            return [MetricFamily(name=name, kind="gauge", help=help_text, samples=[("", {}, current)] if current is not None else [])]
+
+        self.AddCollector(_collect)
+
+    def AddBreakers(self, stats:Callable[[], Dict[str, Dict[str, Any]]]):
+        """Render the state and transitions of each host's circuit breaker, from a function such as `HTTPClient.BreakerStats`, on every scrape."""
+        def _collect() -> List[MetricFamily]:
+            state       = MetricFamily(name="circuit_state",       kind="gauge",   help="Whether each host's circuit is in each state, as 1 or 0.")
+            failures    = MetricFamily(name="circuit_failures",    kind="gauge",   help="Failed fetches in a row from each host.")
+            rejected    = MetricFamily(name="circuit_rejected",    kind="counter", help="Fetches rejected because each host's circuit was open.")
+            transitions = MetricFamily(name="circuit_transitions", kind="counter", help="Times each host's circuit has changed state, by the change.")
+            for host, breaker in stats().items():
+                for circuit_state in CircuitState:
+                    state.samples.append(("", {"host" : host, "state" : circuit_state.value}, 1 if breaker["state"] == circuit_state.value else 0))
+                failures.samples.append(("", {"host" : host}, breaker["failures"]))
+                rejected.samples.append(("_total", {"host" : host}, breaker["rejected"]))
+                for transition, count in breaker["transitions"].items():
+                    transitions.samples.append(("_total", {"host" : host, "transition" : transition}, count))
+            return [state, failures, rejected, transitions]
+
+        self.AddCollector(_collect)
+
+    def Render(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        lines : List[str] = []
+
+        for family in self._counted() + [family for collect in self._collectors for family in collect()]:
+            name = f"{Metrics.PREFIX}{family.name}"
+            # the text format names a counter after its samples, which all end in _total
+            typed_name = f"{name}_total" if family.kind == "counter" else name
+            lines.append(f"# HELP {typed_name} {family.help}")
+            lines.append(f"# TYPE {typed_name} {family.kind}")
+            for suffix, labels, value in family.samples:
+                lines.append(f"{name}{suffix}{Metrics._formatLabels(labels)} {Metrics._formatValue(value)}")
+
+        return "\n".join(lines) + "\n"
+
+    def View(self) -> Response:
+        """Serve the metrics, or a 401 to a scraper without the token, if there is one. Registered as the view of `Path`."""
+        ret_val : Response
+
+        if self._token is not None and not hmac.compare_digest(request.headers.get("Authorization", "").encode(), f"Bearer {self._token}".encode()):
+            denied = APIResponse.Default(req_type=RESTType.GET)
+            denied.RequestErrored(msg="Metrics require a valid bearer token.", status=ResponseStatus.UNAUTHORIZED)
+            ret_val = denied.AsFlaskResponse
+            ret_val.headers["WWW-Authenticate"] = 'Bearer realm="metrics"'
+        else:
+            ret_val = Response(response=self.Render(), status=200, content_type=Metrics.CONTENT_TYPE)
+
+        return ret_val
+
+    def BeforeRequest(self):
+        """Count the request as started. Registered as a `before_request` handler."""
+        setattr(g, Metrics._STARTED_KEY, time.perf_counter())
+        self.Count("requests_started", (Metrics.Endpoint(),))
+
+    def AfterRequest(self, response:Response) -> Response:
+        """Count the request as finished once its response is closed, so a streamed response is timed until it's done. Registered as an `after_request` handler."""
+        started : Optional[float] = g.pop(Metrics._STARTED_KEY, None)
+        if started is not None:
+            labels = (Metrics.Endpoint(), request.method, str(response.status_code))
+            response.call_on_close(lambda : self._finish(labels=labels, started=started))
+
+        return response
+
+    def TeardownRequest(self, _error:Optional[BaseException]):
+        """Count a request that failed before it had a response as finished, with a status of 500. Registered as a `teardown_request` handler."""
+        started : Optional[float] = g.pop(Metrics._STARTED_KEY, None)
+        if started is not None:
+            self._finish(labels=(Metrics.Endpoint(), request.method, "500"), started=started)
+
+    def _finish(self, labels:Labels, started:float):
+        self.Count("requests", labels)
+        self.Observe("request_duration_seconds", time.perf_counter() - started, labels[:1])
+
+    def _shard(self) -> _Shard:
+        ret_val : Optional[_Shard] = getattr(self._local, "shard", None)
+
+        if ret_val is None:
+            ret_val = _Shard()
+            self._local.shard = ret_val
+            # the lock is only taken the first time each thread records something
+            with self._lock:
+                self._shards.append(ret_val)
+
+        return ret_val
+
+    def _counted(self) -> List[MetricFamily]:
+        """Add up every thread's shard into the `DECLARED` metrics, along with the number of requests in flight."""
+        counters   : Dict[Tuple[str, Labels], float]       = {}
+        histograms : Dict[Tuple[str, Labels], List[float]] = {}
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            # copying a dict or list is atomic, so the shard's thread can go on writing to it meanwhile
+            for key, value in shard.counters.copy().items():
+                counters[key] = counters.get(key, 0) + value
+            for key, counts in shard.histograms.copy().items():
+                total = histograms.setdefault(key, [0.0] * len(counts))
+                for i, count in enumerate(counts.copy()):
+                    total[i] += count
+
+        families = {name : MetricFamily(name=name, kind=declared.kind, help=declared.help) for name, declared in Metrics.DECLARED.items()}
+        for (name, labels), value in sorted(counters.items()):
+            families[name].samples.append(("_total", dict(zip(Metrics.DECLARED[name].labels, labels)), value))
+        for (name, labels), counts in sorted(histograms.items()):
+            label_dict = dict(zip(Metrics.DECLARED[name].labels, labels))
+            cumulative = 0.0
+            for bound, count in zip(self._buckets + (math.inf,), counts[:-1]):
+                cumulative += count
+                families[name].samples.append(("_bucket", label_dict | {"le" : Metrics._formatValue(bound)}, cumulative))
+            families[name].samples.append(("_sum", label_dict, counts[-1]))
+            families[name].samples.append(("_count", label_dict, cumulative))
+
+        in_flight = MetricFamily(name="requests_in_flight", kind="gauge", help="Requests that have started and not yet finished, by endpoint.")
+        finished  : Dict[str, float] = {}
+        for (name, labels), value in counters.items():
+            if name == "requests":
+                finished[labels[0]] = finished.get(labels[0], 0) + value
+        for (name, labels), value in sorted(counters.items()):
+            if name == "requests_started":
+                in_flight.samples.append(("", {"endpoint" : labels[0]}, max(0, value - finished.get(labels[0], 0))))
+
+        return list(families.values()) + [in_flight]
+
+    @staticmethod
+    def Endpoint() -> str:
+        """The request's endpoint, or "unmatched" for a request that matched no route, so a scan of random URLs doesn't add a series for each."""
+        return request.endpoint or "unmatched"
+
+    @staticmethod
+    def _formatLabels(labels:Dict[str, str]) -> str:
+        ret_val : str = ""
+
+        if len(labels) > 0:
+            escaped = {key : str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for key, value in labels.items()}
+            ret_val = "{" + ",".join(f'{key}="{value}"' for key, value in escaped.items()) + "}"
+
+        return ret_val
+
+    @staticmethod
+    def _formatValue(value:float) -> str:
+        ret_val : str
+
+        if math.isinf(value):
+            ret_val = "+Inf" if value > 0 else "-Inf"
+        elif float(value).is_integer():
+            ret_val = str(int(value))
+        else:
+            ret_val = repr(float(value))
+
+        return ret_val
@@ -0,0 +1,183 @@
+"""
+ParsePool
+
+Contains a bounded process pool for the CPU-bound work of serving dataset files,
+so that parsing one large file does not hold the GIL for every other request in the worker.
+"""
+
+# import standard libraries
+import multiprocessing
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Final, Optional, Tuple
+
+# import 3rd-party libraries
+
+# import local files
+from utils.Deadlines import Deadline, DeadlineExceededError
+from utils.ServerTiming import PhaseTimings
+
+class ParsePoolFullError(Exception):
+    """Raised when every worker is busy and the wait queue is already full."""
+
+class ParsePoolTimeoutError(Exception):
+    """Raised when a job does not finish within its timeout."""
+
+class ParsePool:
+    """Process pool with a bounded queue and a per-job timeout.
+
+    At most `max_workers + max_queued` jobs are admitted at once; anything beyond that is rejected immediately
+    with a `ParsePoolFullError`, rather than piling up behind a slow file.
+    A slot is only freed when its job actually finishes.
+    A job that has started can't be cancelled, so when one outlives its timeout, the workers are terminated and replaced,
+    which ends the job and frees its slot. Other jobs that were on those workers are run once more on the new ones.
+
+    The executor is created lazily on first use, so each (possibly forked) server process gets its own workers.
+    With `max_workers` of 0 the pool is disabled, and jobs run directly on the calling thread.
+
+    Jobs run during a request with a `Deadline` wait for their result only until the deadline,
+    and aren't started at all once it has passed.
+
+    The phases a job times with `PhaseTimings` are passed back and added to the request's timings,
+    along with a `parse_pool` phase for the job's whole run, including any time it waited for a worker.
+    """
+    EXTENSION_KEY : Final[str] = "ogd_parse_pool"
+
+    def __init__(self, max_workers:int, max_queued:int, job_timeout:float,
+                 start_method:Optional[str]=None, python_path:Optional[str]=None):
+        self._max_workers : int                           = max(0, max_workers)
+        self._max_queued  : int                           = max(0, max_queued)
+        self._job_timeout : float                         = job_timeout
+        self._slots       : threading.BoundedSemaphore    = threading.BoundedSemaphore(self._max_workers + self._max_queued or 1)
+        self._lock        : threading.Lock                = threading.Lock()
+        self._executor    : Optional[ProcessPoolExecutor] = None
+        self._recycled    : weakref.WeakSet               = weakref.WeakSet()
+
+        self._context = multiprocessing.get_context(start_method)
+        if python_path:
+            self._context.set_executable(python_path)
+
+    @property
+    def Enabled(self) -> bool:
+        return self._max_workers > 0
+
+    @property
+    def JobTimeout(self) -> float:
+        return self._job_timeout
+
+    def Run(self, fn:Callable[..., Any], *args, timeout:Optional[float]=None) -> Any:
+        """Run `fn(*args)` in a worker process and wait for its result.
+
+        `fn` and its arguments must be picklable, so `fn` should be a module-level function or a static method.
+
+        :param fn: The function to run.
+        :type fn: Callable[..., Any]
+        :param timeout: Seconds to wait for the result, defaults to the pool's job timeout.
+        :type timeout: Optional[float], optional
+        :raises ParsePoolFullError: If all workers are busy and the wait queue is full.
+        :raises ParsePoolTimeoutError: If the job did not finish in time.
+        :raises DeadlineExceededError: If the current request's deadline passed before the job finished.
+        :return: Whatever `fn` returned.
+        :rtype: Any
+        """
+        deadline = Deadline.Current()
+        if deadline is not None:
+            deadline.Check()
+        started = time.perf_counter()
+        try:
+            ret_val, phases = self._run(fn, *args, deadline=deadline, timeout=timeout)
+        finally:
+            PhaseTimings.Record("parse_pool", time.perf_counter() - started)
+        timings = PhaseTimings.Current()
+        if timings is not None:
+            timings.Merge(phases)
+
+        return ret_val
+
+    def Shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _run(self, fn:Callable[..., Any], *args, deadline:Optional[Deadline], timeout:Optional[float], retried:bool=False) -> Tuple[Any, Dict[str, float]]:
+        if not self.Enabled:
+            ret_val = ParsePool._timedJob(fn, *args)
+            # a job on the request thread can't be stopped partway, but the request still ends once it's done
+            if deadline is not None:
+                deadline.Check()
+            return ret_val
+
+        started  = time.perf_counter()
+        _timeout = timeout if timeout is not None else self._job_timeout
+        if deadline is not None:
+            _timeout = deadline.Timeout(_timeout)
+        # a retried job's last slot is released by a callback that may not have run yet, so the retry waits for a slot instead of racing it
+        if not (self._slots.acquire(timeout=_timeout) if retried else self._slots.acquire(blocking=False)):
+            raise ParsePoolFullError(f"All {self._max_workers} parse workers are busy and {self._max_queued} jobs are already waiting.")
+        executor = self._getExecutor()
+        try:
+            future : Future = executor.submit(ParsePool._timedJob, fn, *args)
+        except (BrokenProcessPool, RuntimeError):
+            self._slots.release()
+            self._reset(executor)
+            raise
+        future.add_done_callback(lambda _future : self._slots.release())
+
+        try:
+            return future.result(timeout=max(0.0, _timeout - (time.perf_counter() - started)))
+        except FutureTimeoutError as err:
+            if not future.cancel():
+                self._recycle(executor)
+            if deadline is not None and deadline.Expired:
+                raise DeadlineExceededError(f"The request's deadline of {deadline.Seconds:g} seconds passed while waiting for a parse job.") from err
+            raise ParsePoolTimeoutError(f"Parse job did not finish within {_timeout} seconds.") from err
+        except BrokenProcessPool:
+            # a job whose workers were terminated to stop some other job gets one more try, in whatever time it has left
+            if not retried and executor in self._recycled:
+                return self._run(fn, *args, deadline=deadline, timeout=max(0.0, _timeout - (time.perf_counter() - started)), retried=True)
+            self._reset(executor)
+            raise
+
+    @staticmethod
+    def _timedJob(fn:Callable[..., Any], *args) -> Tuple[Any, Dict[str, float]]:
+        """Run a job, collecting the phases it times, to pass back along with its result."""
+        timings = PhaseTimings()
+        with PhaseTimings.Using(timings):
+            ret_val = fn(*args)
+
+        return ret_val, timings.Phases
+
+    def _getExecutor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self._max_workers, mp_context=self._context)
+            return self._executor
+
+    def _reset(self, executor:ProcessPoolExecutor):
+        """Throw away a broken executor, so the next job starts a fresh set of workers.
+
+        The pool's executor is only cleared if it's still the broken one, so a late failure doesn't throw away its replacement.
+        """
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _recycle(self, executor:ProcessPoolExecutor):
+        """Terminate the workers of an executor with a stuck job, and replace it, so the job's worker and slot are freed.
+
+        Terminating the workers breaks the executor, which fails every job still on it, and so releases their slots.
+        """
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+            self._recycled.add(executor)
+        # ProcessPoolExecutor has no public way to stop a running job, so its worker processes are terminated directly
+        for process in list((executor._processes or {}).values()): # pylint: disable=protected-access
+            process.terminate()
+        executor.shutdown(wait=False)
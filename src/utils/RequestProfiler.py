@@ -0,0 +1,114 @@
+"""
+RequestProfiler
+
+Contains the RequestProfiler class, which runs requests that carry a profiling token under cProfile,
+and saves each profile to a directory for later study.
+"""
+
+# import standard libraries
+import cProfile
+import hmac
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Final, Optional
+
+# import 3rd-party libraries
+from flask import current_app, Flask, g, request, Response
+
+# import local files
+
+class _Profile:
+    """One request's profiler, and the file its stats will be saved to."""
+
+    def __init__(self, path:Path):
+        self.Path     : Path             = path
+        self.Profiler : cProfile.Profile = cProfile.Profile()
+
+class RequestProfiler:
+    """Profiles requests that send `token` in the `header` request header, so real requests can be profiled on a running server.
+
+    The profile runs from the start of the request until its response is closed, so a streamed file is profiled for as long as it streams.
+    It's then saved in the pstats format to `directory`, which tools like `snakeviz` or `flameprof` can read,
+    and the response's `header` header gives the file name.
+    At most `max_files` profiles are kept, removing the oldest first, and a `max_files` of 0 keeps every profile.
+
+    Only one request is profiled at a time in each process, since cProfile can't run twice at once,
+    so a request that asks for a profile while another is running is handled as usual, with a `header` header of `busy`.
+    Python 3.12 and later profile every thread, so a profile also includes whatever else the process was running at the time.
+    Parsing done in ParsePool worker processes isn't profiled, though its time appears as `parse_pool` in the `Server-Timing` header.
+
+    `BeforeRequest`, `AfterRequest`, and `TeardownRequest` are registered as request hooks.
+    A profiler without a token or a directory is disabled, so profiles can't be requested without one.
+    """
+    EXTENSION_KEY : Final[str] = "ogd_request_profiler"
+    BUSY          : Final[str] = "busy"
+    _PROFILE_KEY  : Final[str] = "ogd_profile"
+
+    def __init__(self, header:str, token:Optional[str], directory:Optional[str], max_files:int):
+        self._header    : str            = header
+        self._token     : Optional[str]  = token or None
+        self._directory : Optional[Path] = Path(directory) if directory else None
+        self._max_files : int            = max(0, max_files)
+        self._running   : threading.Lock = threading.Lock()
+
+    @property
+    def Enabled(self) -> bool:
+        return self._token is not None and self._directory is not None
+
+    def BeforeRequest(self):
+        """Start profiling the request, if it asked for a profile with the right token. Registered as a `before_request` handler."""
+        requested = request.headers.get(self._header)
+        if self.Enabled and requested is not None and hmac.compare_digest(requested.encode(), self._token.encode()):
+            if self._running.acquire(blocking=False):
+                profile = _Profile(path=self._directory / f"{time.strftime('%Y%m%d-%H%M%S')}-{request.endpoint or 'unmatched'}-{uuid.uuid4().hex[:8]}.prof")
+                try:
+                    profile.Profiler.enable()
+                except ValueError as err:
+                    # another profiling tool, such as a debugger, is already running in the process
+                    self._running.release()
+                    current_app.logger.warning(f"Could not profile request for {request.path}:\n{err}")
+                    setattr(g, RequestProfiler._PROFILE_KEY, RequestProfiler.BUSY)
+                else:
+                    setattr(g, RequestProfiler._PROFILE_KEY, profile)
+            else:
+                setattr(g, RequestProfiler._PROFILE_KEY, RequestProfiler.BUSY)
+
+    def AfterRequest(self, response:Response) -> Response:
+        """Hand the request's profile over to its response, to be saved when the response is closed. Registered as an `after_request` handler.
+
+        :param response: The response to the request.
+        :type response: Response
+        :return: The same response, with a header giving the profile's file name if the request was profiled, or `busy` if it couldn't be.
+        :rtype: Response
+        """
+        profile = g.pop(RequestProfiler._PROFILE_KEY, None)
+        if isinstance(profile, _Profile):
+            response.headers[self._header] = profile.Path.name
+            app : Flask = current_app._get_current_object() # pylint: disable=protected-access
+            response.call_on_close(lambda : self._finish(profile, app=app))
+        elif profile == RequestProfiler.BUSY:
+            response.headers[self._header] = RequestProfiler.BUSY
+
+        return response
+
+    def TeardownRequest(self, _error:Optional[BaseException]):
+        """Save the profile of a request that failed before it had a response. Registered as a `teardown_request` handler."""
+        profile = g.pop(RequestProfiler._PROFILE_KEY, None)
+        if isinstance(profile, _Profile):
+            self._finish(profile, app=current_app._get_current_object()) # pylint: disable=protected-access
+
+    def _finish(self, profile:_Profile, app:Flask):
+        """Stop a profile, save it, and remove the oldest profiles past `max_files`."""
+        profile.Profiler.disable()
+        self._running.release()
+        try:
+            profile.Path.parent.mkdir(parents=True, exist_ok=True)
+            profile.Profiler.dump_stats(str(profile.Path))
+            if self._max_files > 0:
+                saved = sorted(profile.Path.parent.glob("*.prof"), key=lambda path : path.stat().st_mtime)
+                for old in saved[:-self._max_files]:
+                    old.unlink(missing_ok=True)
+        except OSError as err:
+            app.logger.warning(f"Could not save the profile {profile.Path.name} to {profile.Path.parent}:\n{err}")
@@ -0,0 +1,172 @@
+"""
+ResponseCompression
+
+Contains the ResponseCompression class, which compresses response bodies with the best encoding the client accepts,
+and keeps compressed copies of bodies built from cached data.
+"""
+
+# import standard libraries
+import gzip
+import hashlib
+import zlib
+from typing import Any, Callable, Dict, Final, Iterable, Iterator, List, Optional, Set, Tuple
+
+# import 3rd-party libraries
+from flask import current_app, g, request, Response
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# import local files
+from utils.ServerTiming import PhaseTimings
+from utils.TableCache import TableCache
+
+class ResponseCompression:
+    """Compresses JSON and text responses, negotiating gzip, brotli, or zstd from the request's `Accept-Encoding`.
+
+    Brotli and zstd are only offered if the `brotli` and `zstandard` packages are installed.
+    Streamed responses are compressed as they stream, so they never need to be held in memory.
+
+    A resource can call `CacheBody` when its response is built entirely from cached data.
+    The compressed body is then kept in the TableCache, keyed by a digest of the uncompressed body,
+    so each version of a dataset's metadata or results is only ever compressed once per encoding.
+    Since these bodies are only compressed once, they're compressed at a higher level than other responses.
+    """
+    EXTENSION_KEY      : Final[str]      = "ogd_response_compression"
+    COMPRESSIBLE_TYPES : Final[Set[str]] = {"application/json", "text/plain", "text/html", "text/csv"}
+    _CACHE_FLAG        : Final[str]      = "ogd_cache_compressed_body"
+
+    def __init__(self, encodings:List[str], min_bytes:int, levels:Dict[str, int], cached_levels:Dict[str, int]):
+        self._encodings     : List[str]      = [encoding for encoding in encodings if encoding in ResponseCompression.Available()]
+        self._min_bytes     : int            = max(0, min_bytes)
+        self._levels        : Dict[str, int] = levels
+        self._cached_levels : Dict[str, int] = cached_levels
+
+    @property
+    def Encodings(self) -> List[str]:
+        """The encodings offered to clients, in order of preference, leaving out any whose package isn't installed."""
+        return self._encodings
+
+    @staticmethod
+    def Available() -> List[str]:
+        ret_val : List[str] = ["gzip"]
+
+        if brotli is not None:
+            ret_val.append("br")
+        if zstandard is not None:
+            ret_val.append("zstd")
+
+        return ret_val
+
+    @staticmethod
+    def CacheBody():
+        """Mark the current request's response body as built from cached data, so its compressed form is cached too.
+
+        Only call this for bodies that are the same every time for the same version of a dataset,
+        or else the cache just fills up with bodies that are never requested again.
+        """
+        setattr(g, ResponseCompression._CACHE_FLAG, True)
+
+    def Apply(self, response:Response) -> Response:
+        """Compress a response, if the client accepts one of the offered encodings. Registered as an `after_request` handler.
+
+        :param response: The response to compress.
+        :type response: Response
+        :return: The same response, with its body compressed and its `Content-Encoding` set, if it was worth compressing.
+        :rtype: Response
+        """
+        if len(self._encodings) > 0 and response.mimetype in ResponseCompression.COMPRESSIBLE_TYPES \
+        and "Content-Encoding" not in response.headers and not response.direct_passthrough:
+            response.vary.add("Accept-Encoding")
+            encoding = request.accept_encodings.best_match(self._encodings)
+            if encoding is not None and request.method != "HEAD" and 200 <= response.status_code < 300:
+                if response.is_streamed:
+                    response.response = ResponseCompression._compressStream(response.response, encoding=encoding, level=self._levels.get(encoding))
+                    response.headers.pop("Content-Length", None)
+                    response.headers["Content-Encoding"] = encoding
+                else:
+                    body = response.get_data()
+                    if len(body) >= self._min_bytes:
+                        with PhaseTimings.Phase("compress"):
+                            compressed = self._compressBody(body, encoding=encoding)
+                        if len(compressed) < len(body):
+                            response.set_data(compressed)
+                            response.headers["Content-Encoding"] = encoding
+
+        return response
+
+    def _compressBody(self, body:bytes, encoding:str) -> bytes:
+        ret_val : bytes
+
+        cache : Optional[TableCache] = current_app.extensions.get(TableCache.EXTENSION_KEY)
+        if g.get(ResponseCompression._CACHE_FLAG, False) and cache is not None and cache.Enabled:
+            key     = ("compressed", encoding, hashlib.blake2b(body, digest_size=16).digest())
+            ret_val = cache.GetOrCompute(key, lambda : ResponseCompression.Compress(body, encoding=encoding, level=self._cached_levels.get(encoding)))
+        else:
+            ret_val = ResponseCompression.Compress(body, encoding=encoding, level=self._levels.get(encoding))
+
+        return ret_val
+
+    @staticmethod
+    def Compress(body:bytes, encoding:str, level:Optional[int]=None) -> bytes:
+        """Compress a whole body at once.
+
+        :param body: The body to compress.
+        :type body: bytes
+        :param encoding: One of the `Available` encodings.
+        :type encoding: str
+        :param level: The compression level, or quality for brotli, defaults to each library's own default.
+        :type level: Optional[int], optional
+        :return: The compressed body.
+        :rtype: bytes
+        """
+        ret_val : bytes
+
+        match encoding:
+            case "br":
+                ret_val = brotli.compress(body, quality=level) if level is not None else brotli.compress(body)
+            case "zstd":
+                ret_val = zstandard.ZstdCompressor(level=level if level is not None else 3).compress(body)
+            case _:
+                ret_val = gzip.compress(body, compresslevel=level if level is not None else 6, mtime=0)
+
+        return ret_val
+
+    @staticmethod
+    def _compressor(encoding:str, level:Optional[int]) -> Tuple[Callable[[bytes], bytes], Callable[[], bytes]]:
+        """Get functions to compress a body piece by piece, and to finish it off."""
+        ret_val : Tuple[Callable[[bytes], bytes], Callable[[], bytes]]
+
+        match encoding:
+            case "br":
+                br_compressor = brotli.Compressor(quality=level) if level is not None else brotli.Compressor()
+                ret_val = (br_compressor.process, br_compressor.finish)
+            case "zstd":
+                zstd_compressor = zstandard.ZstdCompressor(level=level if level is not None else 3).compressobj()
+                ret_val = (zstd_compressor.compress, zstd_compressor.flush)
+            case _:
+                # wbits of 16 + MAX_WBITS gives a gzip header and trailer, instead of a bare zlib stream
+                gzip_compressor = zlib.compressobj(level if level is not None else 6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+                ret_val = (gzip_compressor.compress, gzip_compressor.flush)
+
+        return ret_val
+
+    @staticmethod
+    def _compressStream(pieces:Iterable[Any], encoding:str, level:Optional[int]) -> Iterator[bytes]:
+        compress, finish = ResponseCompression._compressor(encoding=encoding, level=level)
+        try:
+            for piece in pieces:
+                compressed = compress(piece.encode() if isinstance(piece, str) else piece)
+                if compressed:
+                    yield compressed
+            yield finish()
+        finally:
+            # closing the original iterable runs its own cleanup, such as closing a streamed file's archive
+            close = getattr(pieces, "close", None)
+            if close is not None:
+                close()
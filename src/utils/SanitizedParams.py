@@ -1,6 +1,6 @@
 # standard imports
 import datetime, re
-from typing import Optional
+from typing import List, Optional, Set, Tuple
 
 from ogd.apis.models.files.DatasetFile import FileTypes
 
@@ -78,3 +78,106 @@ class SanitizedParams:
                         ret_val = None
 
         return ret_val
+
+    @staticmethod
+    def SanitizeCount(count:Optional[int | str]) -> Optional[int]:
+        """Sanitize a non-negative count, such as a row offset or limit."""
+        ret_val: Optional[int] = None
+
+        match count:
+            case None:
+                ret_val = None
+            case int():
+                ret_val = count if count >= 0 else None
+            case str():
+                if re.search(r"^[0-9]{1,12}$", count) is not None:
+                    ret_val = int(count)
+
+        return ret_val
+
+    @staticmethod
+    def SanitizeColumns(columns:Optional[str]) -> Optional[List[str]]:
+        """Sanitize a comma-separated list of column names.
+
+        Feature names may contain letters, digits, underscores, hyphens, and periods.
+        """
+        ret_val: Optional[List[str]] = None
+
+        if columns is not None:
+            _cols = [col.strip() for col in columns.split(",") if col.strip() != ""]
+            if len(_cols) > 0 and all(re.search(r"^[A-Za-z0-9_\-\.]+$", col) is not None for col in _cols):
+                ret_val = _cols
+
+        return ret_val
+
+    @staticmethod
+    def SanitizeSessionIDs(session_ids:Optional[List[str]]) -> Optional[Set[str]]:
+        """Sanitize a list of session IDs, where each element may itself be a comma-separated list."""
+        ret_val: Optional[Set[str]] = None
+
+        if session_ids:
+            _ids = {sess_id.strip() for raw in session_ids for sess_id in raw.split(",") if sess_id.strip() != ""}
+            if len(_ids) > 0 and all(re.search(r"^[A-Za-z0-9_\-]+$", sess_id) is not None for sess_id in _ids):
+                ret_val = _ids
+
+        return ret_val
+
+    @staticmethod
+    def SanitizeAggregations(aggregations:Optional[str]) -> Optional[List[Tuple[str, str]]]:
+        """Sanitize a comma-separated list of `column:function` aggregations.
+
+        Only the syntax is checked here, the function names are checked against the supported aggregations by the caller.
+        """
+        ret_val: Optional[List[Tuple[str, str]]] = None
+
+        if aggregations is not None:
+            _aggs = [agg.strip() for agg in aggregations.split(",") if agg.strip() != ""]
+            if len(_aggs) > 0 and all(re.search(r"^[A-Za-z0-9_\-\.]+:[a-z_]+$", agg) is not None for agg in _aggs):
+                ret_val = [(col, func) for col, func in (agg.split(":") for agg in _aggs)]
+
+        return ret_val
+
+    @staticmethod
+    def SanitizeSort(sort:Optional[str]) -> Optional[Tuple[str, bool]]:
+        """Sanitize a sort column, where a leading `-` means descending order.
+
+        Column names may also contain a colon, to sort by an aggregate column such as `SessionID:count`.
+        """
+        ret_val: Optional[Tuple[str, bool]] = None
+
+        if sort is not None and re.search(r"^-?[A-Za-z0-9_\-\.:]+$", sort.strip()) is not None:
+            _sort = sort.strip()
+            ret_val = (_sort[1:], True) if _sort.startswith("-") else (_sort, False)
+
+        return ret_val
+
+    @staticmethod
+    def SanitizeMemberPattern(pattern:Optional[str]) -> Optional[str]:
+        """Sanitize a pattern for the names of members of a dataset archive.
+
+        Patterns may contain letters, digits, underscores, hyphens, and periods, as well as `*` and `?` wildcards.
+        """
+        ret_val: Optional[str] = None
+
+        if pattern is not None and re.search(r"^[A-Za-z0-9_\-\.\*\?]{1,255}$", pattern.strip()) is not None:
+            ret_val = pattern.strip()
+
+        return ret_val
+
+    @staticmethod
+    def SanitizeMonthRange(month_range:Optional[str]) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Sanitize an inclusive range of months, written as `<year>-<month>..<year>-<month>`.
+
+        :return: The first and last (year, month) of the range, or None if the range is invalid or runs backwards.
+        """
+        ret_val: Optional[Tuple[Tuple[int, int], Tuple[int, int]]] = None
+
+        if month_range is not None:
+            _match = re.search(r"^([0-9]{4})-([0-9]{1,2})\.\.([0-9]{4})-([0-9]{1,2})$", month_range.strip())
+            if _match is not None:
+                _first = (SanitizedParams.SanitizeYear(year=_match.group(1)), SanitizedParams.SanitizeMonth(month=_match.group(2)))
+                _last  = (SanitizedParams.SanitizeYear(year=_match.group(3)), SanitizedParams.SanitizeMonth(month=_match.group(4)))
+                if _first[0] and _first[1] and _last[0] and _last[1] and _first <= _last:
+                    ret_val = ((_first[0], _first[1]), (_last[0], _last[1]))
+
+        return ret_val
@@ -0,0 +1,139 @@
+"""
+ServerTiming
+
+Contains the PhaseTimings class, which adds up the time a request spends in each phase of being handled,
+and the ServerTiming class, which reports those times in each response's `Server-Timing` header and in the metrics.
+"""
+
+# import standard libraries
+import contextlib
+import threading
+import time
+from typing import Dict, Final, Iterator, Optional
+
+# import 3rd-party libraries
+from flask import g, has_app_context, Response
+
+# import local files
+from utils.Metrics import Metrics
+
+class PhaseTimings:
+    """Time spent in each phase of handling one request, such as fetching the file list, downloading a file, or parsing it.
+
+    Code times a phase with `PhaseTimings.Phase`, which adds the time to the current request's timings, or does nothing if there are none,
+    so it's safe to use anywhere, including in ParsePool workers.
+    A phase that runs more than once, or in several threads at once, adds up the time of every run.
+
+    The timings of the current request live in the app context, where `Current` finds them.
+    Threads that push an app context of their own should `Activate` the request's timings in it,
+    and threads or worker processes without an app context collect their phases with `Using`, to be passed back with `Merge`.
+    """
+    _G_KEY : Final[str]             = "ogd_phase_timings"
+    _local : Final[threading.local] = threading.local()
+
+    def __init__(self):
+        self._started : float            = time.perf_counter()
+        self._lock    : threading.Lock   = threading.Lock()
+        self._phases  : Dict[str, float] = {}
+
+    @property
+    def Elapsed(self) -> float:
+        """Seconds since the timings were started."""
+        return time.perf_counter() - self._started
+
+    @property
+    def Phases(self) -> Dict[str, float]:
+        """The total seconds spent in each phase, in the order each phase first ran."""
+        with self._lock:
+            return dict(self._phases)
+
+    @staticmethod
+    def Current() -> Optional["PhaseTimings"]:
+        """Get the timings that phases on this thread are added to, or None if nothing is timing them."""
+        ret_val : Optional[PhaseTimings] = getattr(PhaseTimings._local, "timings", None)
+
+        if ret_val is None and has_app_context():
+            ret_val = g.get(PhaseTimings._G_KEY)
+
+        return ret_val
+
+    @staticmethod
+    @contextlib.contextmanager
+    def Phase(name:str) -> Iterator[None]:
+        """Time a phase, adding it to the current timings."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            PhaseTimings.Record(name, time.perf_counter() - started)
+
+    @staticmethod
+    def Record(name:str, seconds:float):
+        """Add the time of a phase that was timed some other way to the current timings."""
+        timings = PhaseTimings.Current()
+        if timings is not None:
+            timings.Add(name, seconds)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def Using(timings:Optional["PhaseTimings"]) -> Iterator[None]:
+        """Add the phases on this thread to `timings` until the block ends, for threads and worker processes without the request's app context."""
+        previous = getattr(PhaseTimings._local, "timings", None)
+        PhaseTimings._local.timings = timings
+        try:
+            yield
+        finally:
+            PhaseTimings._local.timings = previous
+
+    def Activate(self):
+        """Make these the timings of the current app context."""
+        setattr(g, PhaseTimings._G_KEY, self)
+
+    def Add(self, name:str, seconds:float):
+        with self._lock:
+            self._phases[name] = self._phases.get(name, 0.0) + seconds
+
+    def Merge(self, phases:Dict[str, float]):
+        """Add the phases timed somewhere else, such as in a ParsePool worker."""
+        with self._lock:
+            for name, seconds in phases.items():
+                self._phases[name] = self._phases.get(name, 0.0) + seconds
+
+class ServerTiming:
+    """Times each request's phases, and reports them in the response's `Server-Timing` header, and in the metrics.
+
+    `BeforeRequest` and `AfterRequest` are registered as request hooks, ahead of the response compression hook,
+    so the header includes the time spent compressing the body.
+    Phases that only run as a streamed response is sent, after its headers have gone out, can't be included in the header.
+    The header is only added when `header` is set, since it shows clients how the server spends its time.
+    """
+    EXTENSION_KEY : Final[str] = "ogd_server_timing"
+
+    def __init__(self, header:bool, metrics:Optional[Metrics]=None):
+        self._header  : bool              = header
+        self._metrics : Optional[Metrics] = metrics
+
+    def BeforeRequest(self):
+        """Start timing the request's phases. Registered as a `before_request` handler."""
+        PhaseTimings().Activate()
+
+    def AfterRequest(self, response:Response) -> Response:
+        """Report the request's phases. Registered as an `after_request` handler.
+
+        :param response: The response to the request.
+        :type response: Response
+        :return: The same response, with a `Server-Timing` header giving each phase's time in milliseconds, and the total so far.
+        :rtype: Response
+        """
+        timings = PhaseTimings.Current()
+        if timings is not None:
+            phases = timings.Phases
+            if self._header:
+                entries = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in phases.items()]
+                response.headers.add("Server-Timing", ", ".join(entries + [f"total;dur={timings.Elapsed * 1000:.3f}"]))
+            if self._metrics is not None:
+                endpoint = Metrics.Endpoint()
+                for name, seconds in phases.items():
+                    self._metrics.Observe("request_phase_duration_seconds", seconds, (endpoint, name))
+
+        return response
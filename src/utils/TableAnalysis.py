@@ -0,0 +1,374 @@
+"""
+TableAnalysis
+
+Contains vectorized summaries of parsed dataset tables.
+"""
+
+# import standard libraries
+from typing import Any, Dict, Final, List, Optional, Sequence, Set, Tuple
+
+# import 3rd-party libraries
+import numpy as np
+import pandas as pd
+
+# import local files
+
+class TableAnalysis:
+    """Static functions for summarizing the columns of a parsed dataset table.
+
+    Tables are treated as read-only, since they are usually shared out of the TableCache.
+    """
+    DEFAULT_QUANTILES : Final[Sequence[float]] = (0.25, 0.5, 0.75)
+    NUMERIC_KINDS     : Final[Set[str]]        = {"integer", "floating", "mixed-integer-float", "decimal"}
+    DISCRETE_KINDS    : Final[Set[str]]        = {"string", "boolean", "categorical"}
+    AGGREGATIONS      : Final[Set[str]]        = {"count", "nunique", "sum", "mean", "median", "std", "min", "max"}
+    """Aggregation functions supported by `GroupAggregate`."""
+    NUMERIC_AGGREGATIONS : Final[Set[str]]     = {"sum", "mean", "median", "std"}
+    ORDERED_KINDS        : Final[Set[str]]     = DISCRETE_KINDS | {"empty", "date", "datetime", "datetime64", "timedelta", "timedelta64"}
+
+    @staticmethod
+    def NumericValues(column:pd.Series) -> Optional[np.ndarray]:
+        """Get the non-null values of a numeric column as a float64 array.
+
+        Columns are inferred from their values rather than their dtype,
+        since tables built from other tables, such as aggregates, hold their numbers with object dtype.
+
+        :param column: The column to convert.
+        :type column: pd.Series
+        :return: The non-null values, or None if the column is not numeric.
+        :rtype: Optional[np.ndarray]
+        """
+        ret_val : Optional[np.ndarray] = None
+
+        if pd.api.types.infer_dtype(column, skipna=True) in TableAnalysis.NUMERIC_KINDS:
+            values = column.to_numpy(dtype=np.float64, na_value=np.nan)
+            ret_val = values[~np.isnan(values)]
+
+        return ret_val
+
+    @staticmethod
+    def ColumnStats(table:pd.DataFrame, quantiles:Sequence[float]=DEFAULT_QUANTILES) -> Dict[str, Dict[str, Any]]:
+        """Compute summary statistics for every column of a table.
+
+        Every column gets a count of non-null values and of nulls.
+        Numeric columns also get min, max, mean, sample standard deviation, and quantiles,
+        while string and boolean columns get a count of unique values.
+        Statistics that don't apply to a column are None.
+
+        :param table: The table to summarize.
+        :type table: pd.DataFrame
+        :param quantiles: The quantiles to compute for numeric columns, defaults to the quartiles.
+        :type quantiles: Sequence[float], optional
+        :return: A mapping from each column name to its statistics.
+        :rtype: Dict[str, Dict[str, Any]]
+        """
+        ret_val : Dict[str, Dict[str, Any]] = {}
+
+        for name in table.columns:
+            column     = table[name]
+            null_count = int(column.isna().sum())
+            stats : Dict[str, Any] = {
+                "count"      : len(column) - null_count,
+                "null_count" : null_count,
+                "min"        : None,
+                "max"        : None,
+                "mean"       : None,
+                "std"        : None,
+                "quantiles"  : None,
+                "unique"     : None
+            }
+            values = TableAnalysis.NumericValues(column)
+            if values is not None:
+                if len(values) > 0:
+                    stats["min"]       = float(np.min(values))
+                    stats["max"]       = float(np.max(values))
+                    stats["mean"]      = float(np.mean(values))
+                    stats["std"]       = float(np.std(values, ddof=1)) if len(values) > 1 else None
+                    stats["quantiles"] = {f"{q * 100:g}%" : float(val) for q, val in zip(quantiles, np.quantile(values, quantiles))}
+            elif pd.api.types.infer_dtype(column, skipna=True) in TableAnalysis.DISCRETE_KINDS:
+                stats["unique"] = int(column.nunique(dropna=True))
+            ret_val[str(name)] = stats
+
+        return ret_val
+
+    @staticmethod
+    def Histogram(column:pd.Series, bins:int) -> Optional[Dict[str, List[float]]]:
+        """Bin the values of a numeric column into equal-width bins.
+
+        :param column: The column to bin.
+        :type column: pd.Series
+        :param bins: The number of bins.
+        :type bins: int
+        :return: The `bins + 1` bin `edges` and the `counts` in each bin, or None if the column is not numeric or has no values.
+        :rtype: Optional[Dict[str, List[float]]]
+        """
+        ret_val : Optional[Dict[str, List[float]]] = None
+
+        values = TableAnalysis.NumericValues(column)
+        if values is not None and len(values) > 0:
+            counts, edges = np.histogram(values, bins=bins)
+            ret_val = {"edges" : edges.tolist(), "counts" : counts.tolist()}
+
+        return ret_val
+
+    @staticmethod
+    def TopValues(column:pd.Series, top:int) -> Optional[List[Dict[str, Any]]]:
+        """Count the most common values of a string or boolean column.
+
+        :param column: The column to count.
+        :type column: pd.Series
+        :param top: The maximum number of values to return.
+        :type top: int
+        :return: Up to `top` of the most common non-null values and their counts, most common first, or None if the column is not string or boolean.
+        :rtype: Optional[List[Dict[str, Any]]]
+        """
+        ret_val : Optional[List[Dict[str, Any]]] = None
+
+        if pd.api.types.infer_dtype(column, skipna=True) in TableAnalysis.DISCRETE_KINDS:
+            counts = column.value_counts(dropna=True, sort=True).head(top)
+            ret_val = [{"value" : value, "count" : int(count)} for value, count in counts.items()]
+
+        return ret_val
+
+    @staticmethod
+    def ColumnFacets(column:pd.Series, bins:int, top:int) -> Dict[str, Any]:
+        """Summarize the distribution of a column, for charting.
+
+        Numeric columns get a histogram, and string or boolean columns get their top values.
+        The facet that doesn't apply to the column is None.
+
+        :param column: The column to summarize.
+        :type column: pd.Series
+        :param bins: The number of histogram bins for a numeric column.
+        :type bins: int
+        :param top: The number of top values for a string or boolean column.
+        :type top: int
+        :return: The column's counts, histogram, and top values.
+        :rtype: Dict[str, Any]
+        """
+        null_count = int(column.isna().sum())
+        histogram  = TableAnalysis.Histogram(column, bins=bins)
+        return {
+            "count"      : len(column) - null_count,
+            "null_count" : null_count,
+            "histogram"  : histogram,
+            "top_values" : TableAnalysis.TopValues(column, top=top) if histogram is None else None
+        }
+
+    @staticmethod
+    def UnaggregatableColumns(table:pd.DataFrame, group_by:List[str], aggregations:Optional[List[Tuple[str, str]]]) -> List[str]:
+        """Find the columns of a group-by query that can't be grouped or aggregated as requested.
+
+        Group columns, and columns counted with `nunique`, can't hold JSON lists or objects.
+        Columns compared with `min` and `max` must hold values of a single orderable kind, such as numbers, text, or dates.
+        Columns given a numeric aggregation must hold at least one number, or be empty,
+        and a group column must already be numeric, since group columns aren't converted.
+
+        :param table: The table to aggregate, which must have every requested column.
+        :type table: pd.DataFrame
+        :param group_by: The columns to group by.
+        :type group_by: List[str]
+        :param aggregations: Pairs of column and function to aggregate, or None to just count the rows in each group.
+        :type aggregations: Optional[List[Tuple[str, str]]]
+        :return: The columns `GroupAggregate` would fail on, in request order, or an empty list if the query is valid.
+        :rtype: List[str]
+        """
+        def _hashable(column:pd.Series) -> bool:
+            return column.dtype != object \
+                or pd.api.types.infer_dtype(column, skipna=True) != "mixed" \
+                or not any(isinstance(value, (dict, list)) for value in column)
+
+        def _numeric(column:pd.Series, grouped:bool) -> bool:
+            ret_val = TableAnalysis.NumericValues(column) is not None or pd.api.types.infer_dtype(column, skipna=True) == "empty"
+            if not ret_val and not grouped:
+                ret_val = bool(pd.to_numeric(column, errors="coerce").notna().any())
+            return ret_val
+
+        ret_val : List[str] = [col for col in group_by if not _hashable(table[col])]
+        for col, func in aggregations or []:
+            if func == "nunique":
+                valid = _hashable(table[col])
+            elif func in {"min", "max"}:
+                valid = TableAnalysis.NumericValues(table[col]) is not None or pd.api.types.infer_dtype(table[col], skipna=True) in TableAnalysis.ORDERED_KINDS
+            elif func in TableAnalysis.NUMERIC_AGGREGATIONS:
+                valid = _numeric(table[col], grouped=col in group_by)
+            else:
+                valid = True
+            if not valid and col not in ret_val:
+                ret_val.append(col)
+
+        return ret_val
+
+    @staticmethod
+    def GroupAggregate(table:pd.DataFrame, group_by:List[str], aggregations:Optional[List[Tuple[str, str]]]) -> pd.DataFrame:
+        """Group a table by one or more columns, and aggregate other columns within each group.
+
+        Each aggregate is named `column:function`, after the syntax used to request it.
+        Columns are converted to numbers for the numeric aggregations, with non-numeric values counted as nulls,
+        and compact integer columns are widened first, so sums can't overflow.
+        Category columns are grouped and aggregated by their values, as if they were plain text.
+
+        :param table: The table to aggregate.
+        :type table: pd.DataFrame
+        :param group_by: The columns to group by.
+        :type group_by: List[str]
+        :param aggregations: Pairs of column and function to aggregate, or None to just count the rows in each group.
+        :type aggregations: Optional[List[Tuple[str, str]]]
+        :raises TypeError: If a column can't be grouped or aggregated as requested, which `UnaggregatableColumns` checks for.
+        :return: A table with one row per group, sorted by the group columns.
+        :rtype: pd.DataFrame
+        """
+        # Only the needed columns are copied out of the (shared) table, and converted, before grouping.
+        needed = list(dict.fromkeys(group_by + [col for col, _ in (aggregations or []) if col not in group_by]))
+        source = table[needed].copy()
+        source = source.astype({col : object for col in source.select_dtypes("category").columns})
+        for col, func in aggregations or []:
+            if col not in group_by and (func in TableAnalysis.NUMERIC_AGGREGATIONS or TableAnalysis.NumericValues(source[col]) is not None):
+                source[col] = pd.to_numeric(source[col], errors="coerce")
+                if pd.api.types.is_integer_dtype(source[col].dtype):
+                    source[col] = source[col].astype("Int64")
+        grouped = source.groupby(group_by, dropna=False, sort=True)
+
+        ret_val : pd.DataFrame
+        if aggregations:
+            ret_val = grouped.agg(**{f"{col}:{func}" : pd.NamedAgg(column=col, aggfunc=func) for col, func in aggregations}).reset_index()
+        else:
+            ret_val = grouped.size().rename("count").reset_index()
+
+        return ret_val.astype(object).where(ret_val.notna(), None)
+
+    @staticmethod
+    def SortKey(column:pd.Series) -> np.ndarray:
+        """Convert a column into a float64 array that sorts in the same order as the column, with nulls as NaN.
+
+        Numeric columns are used as-is, while other columns are replaced by the rank of each distinct value.
+        NumPy sorts NaN last, so nulls end up at the end of both ascending and (negated) descending sorts.
+
+        :param column: The column to sort by.
+        :type column: pd.Series
+        :raises TypeError: If the column's values can't be ordered, such as JSON lists.
+        :return: The sort key of each row.
+        :rtype: np.ndarray
+        """
+        ret_val : np.ndarray
+
+        if pd.api.types.infer_dtype(column, skipna=True) in TableAnalysis.NUMERIC_KINDS:
+            ret_val = column.to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            codes, _ = pd.factorize(column, sort=True, use_na_sentinel=True)
+            ret_val = codes.astype(np.float64)
+            ret_val[codes < 0] = np.nan
+
+        return ret_val
+
+    @staticmethod
+    def SortPermutation(key:np.ndarray, descending:bool) -> np.ndarray:
+        """Get the positions of all rows in sorted order, with nulls last and ties kept in file order.
+
+        :param key: The sort key from `SortKey`.
+        :type key: np.ndarray
+        :param descending: Whether to sort largest-first.
+        :type descending: bool
+        :return: Every row position, in sorted order.
+        :rtype: np.ndarray
+        """
+        return np.argsort(-key if descending else key, kind="stable")
+
+    @staticmethod
+    def TopPositions(key:np.ndarray, k:Optional[int], descending:bool, candidates:Optional[np.ndarray]=None) -> np.ndarray:
+        """Get the positions of the first `k` rows in sorted order, without sorting the rest of the rows.
+
+        Uses `argpartition` to find the first `k` rows, so only those `k` are fully sorted.
+
+        :param key: The sort key from `SortKey`.
+        :type key: np.ndarray
+        :param k: The number of rows to get, or None for all rows.
+        :type k: Optional[int]
+        :param descending: Whether to sort largest-first.
+        :type descending: bool
+        :param candidates: Positions of the rows to choose from, defaults to all rows.
+        :type candidates: Optional[np.ndarray], optional
+        :return: The positions of up to `k` rows, in sorted order.
+        :rtype: np.ndarray
+        """
+        positions = candidates if candidates is not None else np.arange(len(key))
+        sub_key   = -key[positions] if descending else key[positions]
+
+        if k is not None and k < len(positions):
+            top = np.empty(0, dtype=np.intp)
+            if k > 0:
+                # argpartition only finds the k-th key; rows tied with it are then taken in file order, to match SortPermutation.
+                kth   = sub_key[np.argpartition(sub_key, k - 1)[k - 1]]
+                nulls = np.isnan(sub_key)
+                less  = ~nulls if np.isnan(kth) else sub_key < kth
+                equal = nulls  if np.isnan(kth) else sub_key == kth
+                top   = np.flatnonzero(less)
+                top   = np.concatenate([top, np.flatnonzero(equal)[:k - len(top)]])
+                top   = top[np.lexsort((top, sub_key[top]))]
+        else:
+            top = np.argsort(sub_key, kind="stable")
+
+        return positions[top]
+
+    @staticmethod
+    def JoinTables(left:pd.DataFrame, right:pd.DataFrame, on:str, left_columns:Optional[List[str]]=None, right_columns:Optional[List[str]]=None, how:str="left", right_suffix:str="") -> pd.DataFrame:
+        """Join two tables on a key column, projecting each side down to the requested columns before joining.
+
+        Only the projected columns are ever copied, so a join of a few features from each side stays small even when the source tables are wide.
+        Requested columns that aren't in a table are ignored, and the key column is always included.
+
+        :param left: The left table, such as a session feature table.
+        :type left: pd.DataFrame
+        :param right: The right table, such as a player feature table.
+        :type right: pd.DataFrame
+        :param on: The key column, which must be in both tables.
+        :type on: str
+        :param left_columns: Columns to keep from the left table, defaults to all columns.
+        :type left_columns: Optional[List[str]], optional
+        :param right_columns: Columns to keep from the right table, defaults to all columns.
+        :type right_columns: Optional[List[str]], optional
+        :param how: `left` to keep every left row, or `inner` to keep only rows with a match, defaults to `left`.
+        :type how: str, optional
+        :param right_suffix: Suffix for right columns whose names are also in the left table.
+        :type right_suffix: str, optional
+        :return: The joined table, with left rows in their original order.
+        :rtype: pd.DataFrame
+        """
+        def _project(table:pd.DataFrame, columns:Optional[List[str]]) -> pd.DataFrame:
+            keep = [on] + [col for col in (columns if columns is not None else table.columns) if col != on and col in table.columns]
+            return table[keep]
+
+        joined = _project(left, left_columns).merge(_project(right, right_columns), how=how, on=on, suffixes=("", right_suffix), sort=False)
+        return joined.astype(object).where(joined.notna(), None)
+
+    @staticmethod
+    def SampleKeys(count:int, rng:np.random.Generator) -> np.ndarray:
+        """Draw a random key for each of `count` rows, for `BottomK` sampling.
+
+        Keys are drawn in row order, so the same seed gives the same keys whether the rows arrive all at once or in chunks.
+        """
+        return rng.random(count)
+
+    @staticmethod
+    def BottomK(keys:np.ndarray, k:int) -> np.ndarray:
+        """Get the positions of the `k` smallest keys, in position order.
+
+        Keeping the rows with the `k` smallest of a set of uniform random keys gives a uniform sample of `k` rows, without replacement.
+
+        :param keys: The random key of each row.
+        :type keys: np.ndarray
+        :param k: The number of rows to keep.
+        :type k: int
+        :return: The positions of the kept rows, in ascending order.
+        :rtype: np.ndarray
+        """
+        ret_val : np.ndarray
+
+        if k <= 0:
+            ret_val = np.empty(0, dtype=np.intp)
+        elif k >= len(keys):
+            ret_val = np.arange(len(keys))
+        else:
+            ret_val = np.sort(np.argpartition(keys, k - 1)[:k])
+
+        return ret_val
@@ -0,0 +1,152 @@
+"""
+TableCache
+
+Contains the TableCache class, an in-memory cache for parsed dataset tables and results computed from them.
+"""
+
+# import standard libraries
+import dataclasses
+import json
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Final, Hashable, List, Optional, Tuple
+
+# import 3rd-party libraries
+import numpy as np
+import pandas as pd
+
+# import local files
+
+class TableCache:
+    """Thread-safe, least-recently-used cache with a total size budget in bytes.
+
+    Keys should identify the exact version of the data they were computed from
+    (see `DatasetTables.CacheKey`), so entries never need to be invalidated, only evicted.
+    Cached values are shared between request threads, and must be treated as read-only.
+
+    A budget of 0 disables caching entirely.
+    """
+    EXTENSION_KEY : Final[str] = "ogd_table_cache"
+
+    def __init__(self, max_bytes:int):
+        self._max_bytes : int                                        = max(0, max_bytes)
+        self._entries   : OrderedDict[Hashable, Tuple[Any, int]]     = OrderedDict()
+        self._pending   : Dict[Hashable, List[Any]]                  = {}
+        self._lock      : threading.Lock                             = threading.Lock()
+        self._size      : int                                        = 0
+        self._hits      : int                                        = 0
+        self._misses    : int                                        = 0
+        self._evictions : int                                        = 0
+
+    @property
+    def Enabled(self) -> bool:
+        return self._max_bytes > 0
+
+    @property
+    def Stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries"   : len(self._entries),
+                "bytes"     : self._size,
+                "max_bytes" : self._max_bytes,
+                "hits"      : self._hits,
+                "misses"    : self._misses,
+                "evictions" : self._evictions
+            }
+
+    def Get(self, key:Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+            return None
+
+    def Put(self, key:Hashable, value:Any, size:Optional[int]=None):
+        """Add a value to the cache, evicting least-recently-used entries to make room.
+
+        Values bigger than the whole budget are not cached at all.
+
+        :param key: The key to store the value under.
+        :type key: Hashable
+        :param value: The value to store.
+        :type value: Any
+        :param size: Size of the value in bytes, estimated if not given.
+        :type size: Optional[int], optional
+        """
+        _size = size if size is not None else TableCache.EstimateSize(value)
+        if _size > self._max_bytes:
+            return
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                self._size -= old_entry[1]
+            while self._entries and self._size + _size > self._max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self._evictions += 1
+            self._entries[key] = (value, _size)
+            self._size += _size
+
+    def GetOrCompute(self, key:Hashable, compute:Callable[[], Any]) -> Any:
+        """Get a cached value, or compute and cache it on a miss.
+
+        Concurrent misses on the same key wait for a single computation, rather than each parsing the same file.
+        A computed value of None is returned, but not cached.
+
+        :param key: The key of the value.
+        :type key: Hashable
+        :param compute: Function to produce the value on a miss.
+        :type compute: Callable[[], Any]
+        :return: The cached or newly-computed value.
+        :rtype: Any
+        """
+        ret_val = self.Get(key)
+
+        if ret_val is None:
+            with self._lock:
+                # each pending entry is [lock, number of threads waiting on it]
+                pending = self._pending.setdefault(key, [threading.Lock(), 0])
+                pending[1] += 1
+            try:
+                with pending[0]:
+                    ret_val = self._peek(key)
+                    if ret_val is None:
+                        ret_val = compute()
+                        if ret_val is not None:
+                            self.Put(key, ret_val)
+            finally:
+                with self._lock:
+                    pending[1] -= 1
+                    if pending[1] == 0:
+                        del self._pending[key]
+
+        return ret_val
+
+    @staticmethod
+    def EstimateSize(value:Any) -> int:
+        ret_val : int
+
+        match value:
+            case pd.DataFrame() | pd.Series():
+                ret_val = int(value.memory_usage(deep=True).sum())
+            case np.ndarray():
+                ret_val = int(value.nbytes)
+            case bytes():
+                ret_val = len(value)
+            case dict() | list():
+                ret_val = len(json.dumps(value, default=str))
+            case _ if dataclasses.is_dataclass(value) and not isinstance(value, type):
+                ret_val = len(json.dumps(dataclasses.asdict(value), default=str))
+            case _:
+                ret_val = sys.getsizeof(value)
+
+        return ret_val
+
+    def _peek(self, key:Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry is not None else None
@@ -1,7 +1,9 @@
 # import standard libraries
 import json
-from typing import Any, Dict, Optional
-from urllib import request as url_request
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional, TypeVar
 
 # import ogd libraries
 from ogd.common.configs.storage.DatasetRepositoryConfig import DatasetRepositoryConfig
@@ -12,11 +14,23 @@ from flask import current_app
 # import local files
 from ogd.common.schemas.datasets.DatasetCollectionSchema import DatasetCollectionSchema
 from ogd.common.schemas.datasets.DatasetSchema import DatasetSchema
+from utils.HTTPClient import HTTPClient
+from utils.ServerTiming import PhaseTimings
 
-def GetFileList(url:str) -> DatasetRepositoryConfig:
+def GetFileList(url:str, client:Optional[HTTPClient]=None) -> DatasetRepositoryConfig:
+    return ParseFileList(FetchFileList(url, client=client))
+
+def FetchFileList(url:str, client:Optional[HTTPClient]=None) -> bytes:
+    """Fetch the raw file list, without parsing it.
+
+    The fetch isn't timed as a download, since the file list is only ever fetched as part of the `index` phase.
+    """
+    client = client or HTTPClient.Current()
+    return client.Read(url, phase=None)
+
+def ParseFileList(raw:bytes) -> DatasetRepositoryConfig:
     # Pull the file list data into a dictionary
-    file_list_response                             = url_request.urlopen(url)
-    file_list_json     : Dict[str, Dict[str, Any]] = json.loads(file_list_response.read())
+    file_list_json     : Dict[str, Dict[str, Any]] = json.loads(raw)
     # HACK to make sure we've got a remote_url, working around bug in RepositoryIndexingConfig FromDict(...) implementation.
     if "CONFIG" in file_list_json.keys() and isinstance(file_list_json["CONFIG"], dict):
         if not "remote_url" in file_list_json["CONFIG"].keys():
@@ -26,25 +40,72 @@ def GetFileList(url:str) -> DatasetRepositoryConfig:
     file_list          : DatasetRepositoryConfig   = DatasetRepositoryConfig.FromDict(name="file_list", unparsed_elements=file_list_json)
     return file_list
 
+def DownloadFile(url:str, max_memory:int, client:Optional[HTTPClient]=None) -> SpooledTemporaryFile:
+    """Download a file without holding more than `max_memory` bytes of it in memory.
+
+    Anything past `max_memory` spills over to a temporary file on disk.
+    The caller is responsible for closing the returned file.
+    Downloads use the app's shared HTTPClient, which must be passed in when downloading from a thread without an app context.
+    """
+    ret_val = SpooledTemporaryFile(max_size=max_memory)
+    try:
+        (client or HTTPClient.Current()).CopyTo(url, ret_val)
+        ret_val.seek(0)
+    except Exception:
+        ret_val.close()
+        raise
+    return ret_val
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+def PrefetchMap(func:Callable[[T], R], items:Iterable[T], workers:int, discard:Optional[Callable[[R], None]]=None) -> Iterator[R]:
+    """Yield `func(item)` for each item, in order, while up to `workers` of the following items are computed ahead in a thread pool.
+
+    Only a bounded number of results are ever waiting for the consumer, so this can be used for things like downloads that hold on to memory or disk.
+    If the consumer stops early, results that were already computed, or are still being computed, are passed to `discard` so they can be cleaned up.
+    """
+    executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="ogd-prefetch")
+    pending  : Deque[Future] = deque()
+
+    def _discard(future:Future) -> None:
+        if discard is not None and not future.cancelled() and future.exception() is None:
+            discard(future.result())
+
+    try:
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) > workers:
+                yield pending.popleft().result()
+        while len(pending) > 0:
+            yield pending.popleft().result()
+    finally:
+        while len(pending) > 0:
+            future = pending.popleft()
+            if not future.cancel():
+                future.add_done_callback(_discard)
+        executor.shutdown(wait=False)
+
 def FindDataset(game_id:str, year:int, month:int, available_datasets:Dict[str, DatasetCollectionSchema]) -> Optional[DatasetSchema]:
     _matched_dataset : Optional[DatasetSchema] = None
 
-    game_datasets : DatasetCollectionSchema = available_datasets.get(game_id, DatasetCollectionSchema.Default())
-    # Find the best match of a dataset to the requested month-year.
-    # If there was no requested month-year, we skip this step.
-    if len(game_datasets.Datasets) > 0:
-        for _key, _dataset_schema in game_datasets.Datasets.items():
-            if _dataset_schema.Key.DateFrom and _dataset_schema.Key.DateTo:
-                # If this range contains the given year & month
-                if (year >= _dataset_schema.Key.DateFrom.year \
-                and month >= _dataset_schema.Key.DateFrom.month \
-                and year <= _dataset_schema.Key.DateTo.year \
-                and month <= _dataset_schema.Key.DateTo.month):
-                    if _dataset_schema.IsNewerThan(_matched_dataset):
-                        _matched_dataset = _dataset_schema
-            else:
-                current_app.logger.debug(f"While searching for dataset request match, found invalid dataset key '{_dataset_schema.Key}' in the server file list.")
-    else:
-        current_app.logger.warning(msg=f"GameID '{game_id}' has no available datasets")
+    with PhaseTimings.Phase("find"):
+        game_datasets : DatasetCollectionSchema = available_datasets.get(game_id, DatasetCollectionSchema.Default())
+        # Find the best match of a dataset to the requested month-year.
+        # If there was no requested month-year, we skip this step.
+        if len(game_datasets.Datasets) > 0:
+            for _key, _dataset_schema in game_datasets.Datasets.items():
+                if _dataset_schema.Key.DateFrom and _dataset_schema.Key.DateTo:
+                    # If this range contains the given year & month
+                    if (year >= _dataset_schema.Key.DateFrom.year \
+                    and month >= _dataset_schema.Key.DateFrom.month \
+                    and year <= _dataset_schema.Key.DateTo.year \
+                    and month <= _dataset_schema.Key.DateTo.month):
+                        if _dataset_schema.IsNewerThan(_matched_dataset):
+                            _matched_dataset = _dataset_schema
+                else:
+                    current_app.logger.debug(f"While searching for dataset request match, found invalid dataset key '{_dataset_schema.Key}' in the server file list.")
+        else:
+            current_app.logger.warning(msg=f"GameID '{game_id}' has no available datasets")
 
     return _matched_dataset
@@ -0,0 +1,98 @@
+"""
+StubFileServer
+
+Contains the StubFileServer class, a local stand-in for the file server, for tests that make real upstream fetches.
+"""
+
+# import standard libraries
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+# import 3rd-party libraries
+
+# import local files
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Answers each GET as its query string says.
+
+    * `status` and `times`: answer the first `times` requests to the path with `status`, and 200 after that (every request, without `times`).
+    * `delay` and `delay_times`: wait `delay` seconds before answering the first `delay_times` requests to the path (every request, without `delay_times`).
+    * `body`: the body of a 200 response, defaults to `ok`, or to the body given to `Serve` for the path.
+    """
+    protocol_version = "HTTP/1.1"
+    server : "_StubHTTPServer"
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = {name : values[0] for name, values in parse_qs(parts.query).items()}
+        hit   = self.server.Stub.Hit(parts.path)
+
+        if "delay" in query and hit <= int(query.get("delay_times", hit)):
+            time.sleep(float(query["delay"]))
+        status = int(query["status"]) if "status" in query and hit <= int(query.get("times", hit)) else 200
+        body   = (query["body"].encode() if "body" in query else self.server.Stub.Body(parts.path)) if status == 200 else b"error"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format:str, *args:Any): # pylint: disable=redefined-builtin
+        pass
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    Stub : "StubFileServer"
+
+    def handle_error(self, request:Any, client_address:Any):
+        # clients that time out close their connection mid-response, which isn't an error in the tests
+        pass
+
+class StubFileServer:
+    """A threaded HTTP server on a free local port, which counts the requests made to each path.
+
+    Use it as a context manager, build URLs with `URL`, and give paths a fixed body with `Serve`.
+    """
+
+    def __init__(self):
+        self._server : _StubHTTPServer  = _StubHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self._lock   : threading.Lock   = threading.Lock()
+        self._hits   : Dict[str, int]   = {}
+        self._bodies : Dict[str, bytes] = {}
+        self._server.Stub = self
+
+    def __enter__(self) -> "StubFileServer":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args:Any):
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def Port(self) -> int:
+        return self._server.server_address[1]
+
+    def URL(self, path:str, query:Optional[str]=None) -> str:
+        return f"http://127.0.0.1:{self.Port}{path}" + (f"?{query}" if query else "")
+
+    def Serve(self, path:str, body:bytes):
+        """Answer requests to a path with a fixed body, such as an archive that can't be passed in a query string."""
+        with self._lock:
+            self._bodies[path] = body
+
+    def Body(self, path:str) -> bytes:
+        with self._lock:
+            return self._bodies.get(path, b"ok")
+
+    def Hit(self, path:str) -> int:
+        """Count a request to a path, and get how many requests it has had, including this one."""
+        with self._lock:
+            self._hits[path] = self._hits.get(path, 0) + 1
+            return self._hits[path]
+
+    def Hits(self, path:str) -> int:
+        with self._lock:
+            return self._hits.get(path, 0)
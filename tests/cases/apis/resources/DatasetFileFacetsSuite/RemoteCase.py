@@ -0,0 +1,76 @@
+# import libraries
+import logging
+from unittest import TestCase
+# import ogd libraries
+from ogd.apis.models.APIRequest import APIRequest
+from ogd.apis.models.APIResponse import APIResponse
+from ogd.apis.models.enums.RESTType import RESTType
+from ogd.apis.models.enums.ResponseStatus import ResponseStatus
+from ogd.common.utils.Logger import Logger
+# import locals
+from tests.FileAPITestConfig import FileAPITestConfig
+from tests.config.t_config import settings
+
+class RemoteCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.testing_cfg = FileAPITestConfig.FromDict(name="FileAPITestConfig", unparsed_elements=settings)
+        Logger.InitializeLogger(
+            level       = logging.DEBUG if cls.testing_cfg.Verbose else logging.INFO,
+            use_logfile = False
+        )
+
+    def test_get(self):
+        _url = f"{self.testing_cfg.ExternEndpoint}/games/AQUALAB/datasets/2026/1/session/facets"
+        _params = {"column":"SessionID,TimeInJournal-Seconds", "bins":10, "top":5}
+        try:
+            response : APIResponse = APIRequest(url=_url, request_type="GET", params=_params, timeout=30).Execute(logger=Logger.std_logger)
+        except Exception as err: # pylint: disable=broad-exception-caught
+            self.fail(str(err))
+        else:
+            self.assertIsNotNone(response, f"No response from {_url}")
+            self.assertTrue(response.OK, f"Bad status from {_url}: {response.Status}")
+            self.assertEqual(response.Type, RESTType.GET, f"Bad type from {_url}")
+            self.assertIsInstance(response.Value, dict, f"Bad value type from {_url}")
+            if response.Value:
+                columns = response.Value.get("columns", {})
+                self.assertIn("SessionID", columns, "No facets for SessionID")
+                self.assertIn("TimeInJournal-Seconds", columns, "No facets for TimeInJournal-Seconds")
+                self.assertLessEqual(len(columns.get("SessionID", {}).get("top_values") or []), 5, "Response contained more top values than requested")
+
+    def test_get_invalidinput(self):
+        invalid_urls = {
+            f"{self.testing_cfg.ExternEndpoint}/games/1NVAL1D_GAM3/datasets/2026/1/session/facets?column=SessionID",
+            f"{self.testing_cfg.ExternEndpoint}/games/AQUALAB/datasets/1900/1/session/facets?column=SessionID",
+            f"{self.testing_cfg.ExternEndpoint}/games/AQUALAB/datasets/2026/13/session/facets?column=SessionID",
+            f"{self.testing_cfg.ExternEndpoint}/games/AQUALAB/datasets/2026/1/invalidtype/facets?column=SessionID",
+            f"{self.testing_cfg.ExternEndpoint}/games/AQUALAB/datasets/2026/1/event/facets?column=SessionID"
+        }
+        for url in invalid_urls:
+            with self.subTest(url=url):
+                try:
+                    response : APIResponse = APIRequest(url=url, request_type="GET", params={}, timeout=5).Execute(logger=Logger.std_logger)
+                except Exception as err: # pylint: disable=broad-exception-caught
+                    self.fail(str(err))
+                else:
+                    self.assertIsNotNone(response, f"No response from {url}")
+                    self.assertEqual(response.Status, ResponseStatus.BAD_REQUEST, f"Unexpected status from {url}: {response.Status}")
+                    self.assertEqual(response.Type, RESTType.GET, f"Bad type from {url}")
+                    self.assertIsNone(response.Value, f"Non-empty value from {url}")
+
+    def test_get_nonexistentdataset(self):
+        invalid_dataset_urls = {
+            f"{self.testing_cfg.ExternEndpoint}/games/NONEXISTENT_GAME/datasets/2026/1/session/facets?column=SessionID",
+            f"{self.testing_cfg.ExternEndpoint}/games/BLOOM/datasets/2020/1/session/facets?column=SessionID" # Bloom data doesn't start until well after 2020
+        }
+        for url in invalid_dataset_urls:
+            with self.subTest(url=url):
+                try:
+                    response : APIResponse = APIRequest(url=url, request_type="GET", params={}, timeout=5).Execute(logger=Logger.std_logger)
+                except Exception as err: # pylint: disable=broad-exception-caught
+                    self.fail(str(err))
+                else:
+                    self.assertIsNotNone(response, f"No response from {url}")
+                    self.assertEqual(response.Status, ResponseStatus.NOT_FOUND, f"Unexpected status from {url}: {response.Status}")
+                    self.assertEqual(response.Type, RESTType.GET, f"Bad type from {url}")
+                    self.assertIsNone(response.Value, f"Non-empty value from {url}")
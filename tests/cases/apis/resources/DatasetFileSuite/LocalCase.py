@@ -1,4 +1,5 @@
 # import libraries
+import gzip
 import logging
 from json.decoder import JSONDecodeError
 from unittest import TestCase
@@ -76,12 +77,183 @@ class LocalCase(TestCase):
         else:
             self.fail("Could not generate APIResponse from test response")
 
+    def test_get_events(self):
+        _url = "/games/AQUALAB/datasets/2026/1/event?limit=10&columns=session_id,event_name"
+        # 1. Run request
+        raw_response = self.server.get(_url)
+        try:
+            response = APIResponse.FromDict(all_elements=raw_response.json or {}, status=ResponseStatus(raw_response.status_code))
+        except JSONDecodeError as err:
+            self.fail(f"Could not parse {raw_response.text} to JSON!\n{err}")
+        raw_response.close()
+        # 2. Perform assertions
+        if response:
+            self.assertTrue(response.OK, f"Bad status from {_url}: {response.Status}")
+            self.assertIsInstance(response.Value, dict, f"Bad value type from {_url}")
+            if response.Value:
+                self.assertEqual(response.Value.get("columns"), ["session_id", "event_name"], "Response did not contain only the requested columns")
+                self.assertEqual(len(response.Value.get("rows", [])), 10, "Response did not contain the requested number of rows")
+        else:
+            self.fail("Could not generate APIResponse from test response")
+
+    def test_get_combined(self):
+        _url = "/games/AQUALAB/datasets/2026/1/combined?columns=SessionID,PlayerCount,SessionCount&limit=50"
+        # 1. Run request
+        raw_response = self.server.get(_url)
+        try:
+            response = APIResponse.FromDict(all_elements=raw_response.json or {}, status=ResponseStatus(raw_response.status_code))
+        except JSONDecodeError as err:
+            self.fail(f"Could not parse {raw_response.text} to JSON!\n{err}")
+        raw_response.close()
+        # 2. Perform assertions
+        if response:
+            self.assertTrue(response.OK, f"Bad status from {_url}: {response.Status}")
+            self.assertIsInstance(response.Value, dict, f"Bad value type from {_url}")
+            if response.Value:
+                for col in response.Value.get("columns", []):
+                    with self.subTest(col=col):
+                        self.assertIn(col, ["SessionID", "PlayerCount", "SessionCount"], f"Response contained unrequested column {col}")
+                self.assertLessEqual(len(response.Value.get("rows", [])), 50, "Response contained more rows than the requested limit")
+        else:
+            self.fail("Could not generate APIResponse from test response")
+
+    def test_get_query(self):
+        _url = "/games/AQUALAB/datasets/2026/1/session?columns=SessionID,AppVersions&offset=5&limit=20"
+        # 1. Run request
+        raw_response = self.server.get(_url)
+        try:
+            response = APIResponse.FromDict(all_elements=raw_response.json or {}, status=ResponseStatus(raw_response.status_code))
+        except JSONDecodeError as err:
+            self.fail(f"Could not parse {raw_response.text} to JSON!\n{err}")
+        raw_response.close()
+        # 2. Perform assertions
+        if response:
+            self.assertTrue(response.OK, f"Bad status from {_url}: {response.Status}")
+            self.assertIsInstance(response.Value, dict, f"Bad value type from {_url}")
+            if response.Value:
+                self.assertEqual(response.Value.get("columns"), ["SessionID", "AppVersions"], "Response did not contain only the requested columns")
+                self.assertLessEqual(len(response.Value.get("rows", [])), 20, "Response contained more rows than the requested limit")
+        else:
+            self.fail("Could not generate APIResponse from test response")
+
+    def test_get_aggregate(self):
+        _url = "/games/AQUALAB/datasets/2026/1/session?group_by=AppVersions&agg=SessionID:count,TimeInJournal-Seconds:mean"
+        # 1. Run request
+        raw_response = self.server.get(_url)
+        try:
+            response = APIResponse.FromDict(all_elements=raw_response.json or {}, status=ResponseStatus(raw_response.status_code))
+        except JSONDecodeError as err:
+            self.fail(f"Could not parse {raw_response.text} to JSON!\n{err}")
+        raw_response.close()
+        # 2. Perform assertions
+        if response:
+            self.assertTrue(response.OK, f"Bad status from {_url}: {response.Status}")
+            self.assertIsInstance(response.Value, dict, f"Bad value type from {_url}")
+            if response.Value:
+                self.assertEqual(response.Value.get("columns"), ["AppVersions", "SessionID:count", "TimeInJournal-Seconds:mean"], "Response did not contain the group and aggregate columns")
+        else:
+            self.fail("Could not generate APIResponse from test response")
+
+    def test_get_sorted(self):
+        _url = "/games/AQUALAB/datasets/2026/1/session?sort=-TimeInJournal-Seconds&limit=10&columns=SessionID,TimeInJournal-Seconds"
+        # 1. Run request
+        raw_response = self.server.get(_url)
+        try:
+            response = APIResponse.FromDict(all_elements=raw_response.json or {}, status=ResponseStatus(raw_response.status_code))
+        except JSONDecodeError as err:
+            self.fail(f"Could not parse {raw_response.text} to JSON!\n{err}")
+        raw_response.close()
+        # 2. Perform assertions
+        if response:
+            self.assertTrue(response.OK, f"Bad status from {_url}: {response.Status}")
+            self.assertIsInstance(response.Value, dict, f"Bad value type from {_url}")
+            if response.Value:
+                rows = response.Value.get("rows", [])
+                self.assertLessEqual(len(rows), 10, "Response contained more rows than the requested limit")
+                values = [row.get("TimeInJournal-Seconds") for row in rows if row.get("TimeInJournal-Seconds") is not None]
+                self.assertEqual(values, sorted(values, reverse=True), "Rows were not sorted in descending order")
+        else:
+            self.fail("Could not generate APIResponse from test response")
+
+    def test_get_sampled(self):
+        _url = "/games/AQUALAB/datasets/2026/1/session?sample=10&seed=42&columns=SessionID"
+        # 1. Run request, twice
+        first_response  = self.server.get(_url)
+        second_response = self.server.get(_url)
+        try:
+            response        = APIResponse.FromDict(all_elements=first_response.json or {}, status=ResponseStatus(first_response.status_code))
+            repeat_response = APIResponse.FromDict(all_elements=second_response.json or {}, status=ResponseStatus(second_response.status_code))
+        except JSONDecodeError as err:
+            self.fail(f"Could not parse {first_response.text} to JSON!\n{err}")
+        first_response.close()
+        second_response.close()
+        # 2. Perform assertions
+        if response and repeat_response:
+            self.assertTrue(response.OK, f"Bad status from {_url}: {response.Status}")
+            self.assertIsInstance(response.Value, dict, f"Bad value type from {_url}")
+            if response.Value:
+                self.assertLessEqual(len(response.Value.get("rows", [])), 10, "Response contained more rows than the requested sample")
+                self.assertEqual(response.Value, repeat_response.Value, "Sample with the same seed was not repeated")
+        else:
+            self.fail("Could not generate APIResponse from test response")
+
+    def test_get_members(self):
+        _url = "/games/AQUALAB/datasets/2026/1/session?members=*.tsv&columns=SessionID&limit=5"
+        # 1. Run request
+        raw_response = self.server.get(_url)
+        try:
+            response = APIResponse.FromDict(all_elements=raw_response.json or {}, status=ResponseStatus(raw_response.status_code))
+        except JSONDecodeError as err:
+            self.fail(f"Could not parse {raw_response.text} to JSON!\n{err}")
+        raw_response.close()
+        # 2. Perform assertions
+        if response:
+            self.assertTrue(response.OK, f"Bad status from {_url}: {response.Status}")
+            self.assertIsInstance(response.Value, dict, f"Bad value type from {_url}")
+            if response.Value:
+                self.assertIsInstance(response.Value.get("members"), dict, "Response did not contain a members mapping")
+                for name, member in response.Value.get("members", {}).items():
+                    self.assertTrue(name.endswith(".tsv"), f"Member {name} did not match the requested pattern")
+                    self.assertEqual(member.get("columns"), ["SessionID"], f"Member {name} had unexpected columns")
+                    self.assertLessEqual(len(member.get("rows", [])), 5, f"Member {name} contained more rows than the requested limit")
+        else:
+            self.fail("Could not generate APIResponse from test response")
+
+    def test_get_compressed(self):
+        _url = "/games/AQUALAB/datasets/2026/1/session?columns=SessionID,AppVersions"
+        # 1. Run request, with and without compression
+        plain_response      = self.server.get(_url)
+        compressed_response = self.server.get(_url, headers={"Accept-Encoding" : "gzip"})
+        plain_body          = plain_response.get_data()
+        compressed_body     = compressed_response.get_data()
+        plain_response.close()
+        compressed_response.close()
+        # 2. Perform assertions
+        self.assertEqual(compressed_response.status_code, plain_response.status_code, f"Bad status from {_url}")
+        self.assertIn("Accept-Encoding", compressed_response.headers.get("Vary", ""), "Response did not vary on Accept-Encoding")
+        self.assertIsNone(plain_response.headers.get("Content-Encoding"), "Response was compressed without being asked")
+        if len(plain_body) >= 1024:
+            self.assertEqual(compressed_response.headers.get("Content-Encoding"), "gzip", "Response was not gzip-compressed")
+            self.assertEqual(gzip.decompress(compressed_body), plain_body, "Compressed response did not match the uncompressed response")
+
     def test_get_invalidinput(self):
         invalid_urls = {
             "/games/1NVAL1D_GAM3/datasets/2026/1/population",
             "/games/AQUALAB/datasets/1900/1/population",
             "/games/AQUALAB/datasets/2026/13/population",
-            "/games/AQUALAB/datasets/2026/1/invalidtype"
+            "/games/AQUALAB/datasets/2026/1/invalidtype",
+            "/games/AQUALAB/datasets/2026/1/population?limit=-1",
+            "/games/AQUALAB/datasets/2026/1/population?columns=;DROP",
+            "/games/AQUALAB/datasets/2026/1/session?group_by=AppVersions&agg=SessionID:invalidfunc",
+            "/games/AQUALAB/datasets/2026/1/session?agg=SessionID:count",
+            "/games/AQUALAB/datasets/2026/1/event?group_by=event_name",
+            "/games/AQUALAB/datasets/2026/1/session?sort=NotAColumn",
+            "/games/AQUALAB/datasets/2026/1/session?sort=;DROP",
+            "/games/AQUALAB/datasets/2026/1/session?sample=0",
+            "/games/AQUALAB/datasets/2026/1/session?seed=42",
+            "/games/AQUALAB/datasets/2026/1/session?sample=10&limit=5",
+            "/games/AQUALAB/datasets/2026/1/session?members=;DROP",
+            "/games/AQUALAB/datasets/2026/1/session?members=*.tsv&group_by=AppVersions"
         }
         for url in invalid_urls:
             with self.subTest(url=url):
@@ -48,12 +48,104 @@ class RemoteCase(TestCase):
                     with self.subTest(col=col):
                         self.assertIn(col, response.Value.get("columns", []), f"No datasets for {col}")
 
+    def test_get_events(self):
+        _url = f"{self.testing_cfg.ExternEndpoint}/games/AQUALAB/datasets/2026/1/event"
+        _params = {"limit":10, "columns":"session_id,event_name"}
+        try:
+            response : APIResponse = APIRequest(url=_url, request_type="GET", params=_params, timeout=30).Execute(logger=Logger.std_logger)
+        except Exception as err: # pylint: disable=broad-exception-caught
+            self.fail(str(err))
+        else:
+            self.assertTrue(response.OK, f"Bad status from {_url}: {response.Status}")
+            self.assertIsInstance(response.Value, dict, f"Bad value type from {_url}")
+            if response.Value:
+                self.assertEqual(response.Value.get("columns"), ["session_id", "event_name"], "Response did not contain only the requested columns")
+                self.assertEqual(len(response.Value.get("rows", [])), 10, "Response did not contain the requested number of rows")
+
+    def test_get_combined(self):
+        _url = f"{self.testing_cfg.ExternEndpoint}/games/AQUALAB/datasets/2026/1/combined"
+        _params = {"columns":"SessionID,PlayerCount,SessionCount", "limit":50}
+        try:
+            response : APIResponse = APIRequest(url=_url, request_type="GET", params=_params, timeout=30).Execute(logger=Logger.std_logger)
+        except Exception as err: # pylint: disable=broad-exception-caught
+            self.fail(str(err))
+        else:
+            self.assertTrue(response.OK, f"Bad status from {_url}: {response.Status}")
+            self.assertIsInstance(response.Value, dict, f"Bad value type from {_url}")
+            if response.Value:
+                for col in response.Value.get("columns", []):
+                    with self.subTest(col=col):
+                        self.assertIn(col, _params["columns"].split(","), f"Response contained unrequested column {col}")
+                self.assertLessEqual(len(response.Value.get("rows", [])), 50, "Response contained more rows than the requested limit")
+
+    def test_get_query(self):
+        _url = f"{self.testing_cfg.ExternEndpoint}/games/AQUALAB/datasets/2026/1/session"
+        _params = {"columns":"SessionID,AppVersions", "offset":5, "limit":20}
+        try:
+            response : APIResponse = APIRequest(url=_url, request_type="GET", params=_params, timeout=5).Execute(logger=Logger.std_logger)
+        except Exception as err: # pylint: disable=broad-exception-caught
+            self.fail(str(err))
+        else:
+            self.assertTrue(response.OK, f"Bad status from {_url}: {response.Status}")
+            self.assertIsInstance(response.Value, dict, f"Bad value type from {_url}")
+            if response.Value:
+                self.assertEqual(response.Value.get("columns"), ["SessionID", "AppVersions"], "Response did not contain only the requested columns")
+                self.assertLessEqual(len(response.Value.get("rows", [])), 20, "Response contained more rows than the requested limit")
+
+    def test_get_aggregate(self):
+        _url = f"{self.testing_cfg.ExternEndpoint}/games/AQUALAB/datasets/2026/1/session"
+        _params = {"group_by":"AppVersions", "agg":"SessionID:count,TimeInJournal-Seconds:mean"}
+        try:
+            response : APIResponse = APIRequest(url=_url, request_type="GET", params=_params, timeout=30).Execute(logger=Logger.std_logger)
+        except Exception as err: # pylint: disable=broad-exception-caught
+            self.fail(str(err))
+        else:
+            self.assertTrue(response.OK, f"Bad status from {_url}: {response.Status}")
+            self.assertIsInstance(response.Value, dict, f"Bad value type from {_url}")
+            if response.Value:
+                self.assertEqual(response.Value.get("columns"), ["AppVersions", "SessionID:count", "TimeInJournal-Seconds:mean"], "Response did not contain the group and aggregate columns")
+
+    def test_get_sorted(self):
+        _url = f"{self.testing_cfg.ExternEndpoint}/games/AQUALAB/datasets/2026/1/session"
+        _params = {"sort":"-TimeInJournal-Seconds", "limit":10, "columns":"SessionID,TimeInJournal-Seconds"}
+        try:
+            response : APIResponse = APIRequest(url=_url, request_type="GET", params=_params, timeout=30).Execute(logger=Logger.std_logger)
+        except Exception as err: # pylint: disable=broad-exception-caught
+            self.fail(str(err))
+        else:
+            self.assertTrue(response.OK, f"Bad status from {_url}: {response.Status}")
+            self.assertIsInstance(response.Value, dict, f"Bad value type from {_url}")
+            if response.Value:
+                rows = response.Value.get("rows", [])
+                self.assertLessEqual(len(rows), 10, "Response contained more rows than the requested limit")
+                values = [row.get("TimeInJournal-Seconds") for row in rows if row.get("TimeInJournal-Seconds") is not None]
+                self.assertEqual(values, sorted(values, reverse=True), "Rows were not sorted in descending order")
+
+    def test_get_sampled(self):
+        _url = f"{self.testing_cfg.ExternEndpoint}/games/AQUALAB/datasets/2026/1/session"
+        _params = {"sample":10, "seed":42, "columns":"SessionID"}
+        try:
+            response        : APIResponse = APIRequest(url=_url, request_type="GET", params=_params, timeout=30).Execute(logger=Logger.std_logger)
+            repeat_response : APIResponse = APIRequest(url=_url, request_type="GET", params=_params, timeout=30).Execute(logger=Logger.std_logger)
+        except Exception as err: # pylint: disable=broad-exception-caught
+            self.fail(str(err))
+        else:
+            self.assertTrue(response.OK, f"Bad status from {_url}: {response.Status}")
+            self.assertIsInstance(response.Value, dict, f"Bad value type from {_url}")
+            if response.Value:
+                self.assertLessEqual(len(response.Value.get("rows", [])), 10, "Response contained more rows than the requested sample")
+                self.assertEqual(response.Value, repeat_response.Value, "Sample with the same seed was not repeated")
+
     def test_get_invalidinput(self):
         invalid_urls = {
             f"{self.testing_cfg.ExternEndpoint}/games/1NVAL1D_GAM3/datasets/2026/1/population",
             f"{self.testing_cfg.ExternEndpoint}/games/AQUALAB/datasets/1900/1/population",
             f"{self.testing_cfg.ExternEndpoint}/games/AQUALAB/datasets/2026/13/population",
-            f"{self.testing_cfg.ExternEndpoint}/games/AQUALAB/datasets/2026/1/invalidtype"
+            f"{self.testing_cfg.ExternEndpoint}/games/AQUALAB/datasets/2026/1/invalidtype",
+            f"{self.testing_cfg.ExternEndpoint}/games/AQUALAB/datasets/2026/1/population?limit=-1",
+            f"{self.testing_cfg.ExternEndpoint}/games/AQUALAB/datasets/2026/1/session?group_by=AppVersions&agg=SessionID:invalidfunc",
+            f"{self.testing_cfg.ExternEndpoint}/games/AQUALAB/datasets/2026/1/session?sort=NotAColumn",
+            f"{self.testing_cfg.ExternEndpoint}/games/AQUALAB/datasets/2026/1/session?sample=10&limit=5"
         }
         for url in invalid_urls:
             with self.subTest(url=url):
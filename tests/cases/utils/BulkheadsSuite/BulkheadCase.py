@@ -0,0 +1,99 @@
+# import libraries
+import threading
+import time
+from unittest import TestCase
+# import locals
+from utils.Bulkheads import Bulkhead
+
+class BulkheadCase(TestCase):
+    """Test of the Bulkhead class.
+
+    Fixture:
+    * A fresh Bulkhead for each test, since every test changes its turns.
+
+    Case Categories:
+    * Enter(...) function
+        * Admits up to max_active requests, queues up to max_queued more, and rejects the rest.
+        * Queued requests time out, and are admitted in turn as running requests Leave.
+    * Concurrency
+        * Threads that never exceed max_active + max_queued are never turned away.
+    """
+
+    def test_Enter_admits(self):
+        bulkhead = Bulkhead(name="test", max_active=2, max_queued=0, queue_timeout=1.0)
+        self.assertTrue(bulkhead.Enter())
+        self.assertTrue(bulkhead.Enter())
+        self.assertEqual(bulkhead.Stats["active"], 2)
+        self.assertEqual(bulkhead.Stats["admitted"], 2)
+
+    def test_Enter_rejects(self):
+        bulkhead = Bulkhead(name="test", max_active=1, max_queued=0, queue_timeout=1.0)
+        self.assertTrue(bulkhead.Enter())
+        self.assertFalse(bulkhead.Enter())
+        self.assertEqual(bulkhead.Stats["rejected"], 1)
+
+    def test_Enter_disabled(self):
+        bulkhead = Bulkhead(name="test", max_active=0, max_queued=0, queue_timeout=1.0)
+        for _ in range(100):
+            self.assertTrue(bulkhead.Enter())
+        self.assertEqual(bulkhead.Stats["active"], 0)
+
+    def test_Enter_times_out(self):
+        bulkhead = Bulkhead(name="test", max_active=1, max_queued=1, queue_timeout=0.1)
+        self.assertTrue(bulkhead.Enter())
+        start = time.perf_counter()
+        self.assertFalse(bulkhead.Enter())
+        self.assertGreaterEqual(time.perf_counter() - start, 0.1)
+        stats = bulkhead.Stats
+        self.assertEqual(stats["timed_out"], 1)
+        self.assertEqual(stats["waiting"], 0)
+        self.assertEqual(stats["active"], 1)
+
+    def test_Enter_queues(self):
+        bulkhead = Bulkhead(name="test", max_active=1, max_queued=2, queue_timeout=5.0)
+        self.assertTrue(bulkhead.Enter())
+        order   : list = []
+        waiters : list = []
+        for index in range(2):
+            waiter = threading.Thread(target=lambda index=index : order.append((index, bulkhead.Enter())))
+            waiter.start()
+            waiters.append(waiter)
+            while bulkhead.Stats["waiting"] < index + 1:
+                time.sleep(0.001)
+        # the queue is full, so a third request is turned away
+        self.assertFalse(bulkhead.Enter())
+        bulkhead.Leave()
+        waiters[0].join(timeout=5.0)
+        self.assertEqual(order, [(0, True)])
+        # a new arrival can't take the turn of a request still waiting
+        self.assertEqual(bulkhead.Stats["active"], 1)
+        bulkhead.Leave()
+        waiters[1].join(timeout=5.0)
+        self.assertEqual(order, [(0, True), (1, True)])
+        bulkhead.Leave()
+        self.assertEqual(bulkhead.Stats["active"], 0)
+
+    def test_Enter_concurrent(self):
+        bulkhead = Bulkhead(name="test", max_active=2, max_queued=2, queue_timeout=5.0)
+        results  : list = []
+        peak     : list = [0]
+        def _work():
+            for _ in range(300):
+                admitted = bulkhead.Enter()
+                results.append(admitted)
+                if admitted:
+                    peak[0] = max(peak[0], bulkhead.Stats["active"])
+                    # hold the turn briefly, so waiters are woken while other threads keep arriving
+                    time.sleep(0.0005)
+                    bulkhead.Leave()
+        threads = [threading.Thread(target=_work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = bulkhead.Stats
+        self.assertEqual(results.count(False), 0, f"Turned away requests within the bulkhead's capacity: {stats}")
+        self.assertEqual(stats["admitted"], 1200)
+        self.assertEqual(stats["active"], 0)
+        self.assertEqual(stats["waiting"], 0)
+        self.assertLessEqual(peak[0], 2)
@@ -0,0 +1,139 @@
+# import libraries
+import json
+import time
+from unittest import TestCase
+from urllib.parse import quote
+# import 3rd-party libraries
+import pandas as pd
+from flask import Flask
+from flask_restful import Api
+# import ogd libraries
+from ogd.apis.models.files.DatasetFile import FileTypes
+# import locals
+from apis.resources.DatasetFile import DatasetFile
+from configs.FileAPIConfig import FileAPIConfig
+from utils.CircuitBreaker import CircuitBreaker, CircuitOpenError, CircuitState
+from utils.DatasetTables import DatasetTables
+from utils.DiskCache import DiskCache
+from utils.FileAPIContext import FileAPIContext
+from utils.FileIndex import FileIndex
+from utils.HTTPClient import HTTPClient
+from utils.TableCache import TableCache
+from tests.StubFileServer import StubFileServer
+
+class CircuitBreakerCase(TestCase):
+    """Test of the CircuitBreaker class, and of serving cached tables while a circuit is open.
+
+    Fixture:
+    * A fresh breaker for each test, with a short reset time.
+    * For the stale-cache fallback, the DatasetFile resource with a file list on a stub file server, whose dataset files always fail.
+
+    Case Categories:
+    * Acquire(...) and Record(...) functions
+        * Opens after `failure_threshold` failures in a row, and rejects fetches while open.
+        * A success, or a fetch cut short, doesn't add to the failures in a row.
+        * Lets one probe through once half-open, which closes the circuit if it succeeds, or opens it again if it fails.
+        * A fetch that started before the circuit opened doesn't close it.
+        * Never opens with a `failure_threshold` of 0.
+    * DatasetFile resource
+        * While the file server's circuit is open, a cached table is served with a `Warning` header, and an uncached one gets a 503.
+    """
+
+    def setUp(self):
+        self.breaker = CircuitBreaker(host="files.example.org", failure_threshold=2, reset_seconds=0.2, half_open_probes=1)
+
+    def _open(self):
+        for _ in range(2):
+            self.breaker.Record(probe=self.breaker.Acquire(), healthy=False)
+
+    def test_opens_after_failures(self):
+        self.breaker.Record(probe=self.breaker.Acquire(), healthy=False)
+        self.assertEqual(self.breaker.State, CircuitState.CLOSED)
+        self.breaker.Record(probe=self.breaker.Acquire(), healthy=False)
+        self.assertEqual(self.breaker.State, CircuitState.OPEN)
+        with self.assertRaises(CircuitOpenError) as raised:
+            self.breaker.Acquire()
+        self.assertEqual(raised.exception.Host, "files.example.org")
+        self.assertEqual(self.breaker.Stats["rejected"], 1)
+
+    def test_failures_in_a_row(self):
+        self.breaker.Record(probe=self.breaker.Acquire(), healthy=False)
+        self.breaker.Record(probe=self.breaker.Acquire(), healthy=True)
+        self.breaker.Record(probe=self.breaker.Acquire(), healthy=False)
+        self.breaker.Record(probe=self.breaker.Acquire(), healthy=None)
+        self.assertEqual(self.breaker.State, CircuitState.CLOSED)
+        self.assertEqual(self.breaker.Stats["failures"], 1)
+
+    def test_half_open_probe_closes(self):
+        self._open()
+        time.sleep(0.25)
+        self.assertEqual(self.breaker.State, CircuitState.HALF_OPEN)
+        probe = self.breaker.Acquire()
+        self.assertTrue(probe)
+        # only one probe is let through at a time
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.Acquire()
+        self.breaker.Record(probe=probe, healthy=True)
+        self.assertEqual(self.breaker.State, CircuitState.CLOSED)
+        self.assertEqual(self.breaker.Stats["transitions"], {"opened" : 1, "half_opened" : 1, "closed" : 1})
+
+    def test_half_open_probe_reopens(self):
+        self._open()
+        time.sleep(0.25)
+        self.breaker.Record(probe=self.breaker.Acquire(), healthy=False)
+        self.assertEqual(self.breaker.State, CircuitState.OPEN)
+        self.assertEqual(self.breaker.Stats["transitions"]["opened"], 2)
+
+    def test_late_success_stays_open(self):
+        early = self.breaker.Acquire()
+        self._open()
+        self.breaker.Record(probe=early, healthy=True)
+        self.assertEqual(self.breaker.State, CircuitState.OPEN)
+
+    def test_disabled(self):
+        breaker = CircuitBreaker(host="files.example.org", failure_threshold=0, reset_seconds=0.2, half_open_probes=1)
+        for _ in range(10):
+            breaker.Record(probe=breaker.Acquire(), healthy=False)
+        self.assertEqual(breaker.State, CircuitState.CLOSED)
+
+    def test_DatasetFile_stale_fallback(self):
+        app = Flask("CircuitBreakerCase")
+        Api(app).add_resource(DatasetFile, "/games/<string:game_id>/datasets/<int:year>/<int:month>/<string:file_type>")
+        with StubFileServer() as server:
+            file_list = {
+                "CONFIG"  : {"files_base" : server.URL("/"), "templates_base" : server.URL("/")},
+                "AQUALAB" : {
+                    "AQUALAB_20250601_to_20250630" : {
+                        "ogd_revision" : "5c61198", "start_date" : "06/01/2025", "end_date" : "06/30/2025", "date_modified" : "07/01/2025",
+                        "sessions" : 2, "players" : 1,
+                        "sessions_file" : "AQUALAB/AQUALAB_20250601_to_20250630_5c61198_session-features.zip?status=503",
+                        "players_file"  : "AQUALAB/AQUALAB_20250601_to_20250630_5c61198_player-features.zip?status=503"
+                    }
+                }
+            }
+            client  = HTTPClient(max_hosts=1, max_per_host=2, block=False, connect_timeout=2.0, read_timeout=5.0, retries=0, backoff=0.0, failure_threshold=1)
+            # the file list has a client of its own, so fetching it doesn't close the file server's circuit
+            lister  = HTTPClient(max_hosts=1, max_per_host=1, block=False, connect_timeout=2.0, read_timeout=5.0, retries=0, backoff=0.0)
+            index   = FileIndex(url=server.URL("/file_list.json", f"body={quote(json.dumps(file_list))}"), client=lister, refresh_seconds=60)
+            # the downloads fail before anything is parsed or compressed, so the parse pool and compression are left out
+            context = FileAPIContext(
+                config=FileAPIConfig.FromDict(name="CircuitBreakerCase", unparsed_elements={}), index=index, http_client=client, parse_pool=None,
+                table_cache=TableCache(max_bytes=1024 * 1024), disk_cache=DiskCache(directory=None, max_bytes=0, max_age_seconds=0, evict_interval=0), compression=None
+            )
+            app.extensions[FileAPIContext.EXTENSION_KEY] = context
+            app.extensions[HTTPClient.EXTENSION_KEY]     = client
+            with app.app_context():
+                dataset = next(iter(context.FileList().Games["AQUALAB"].Datasets.values()))
+                dataset.BaseFileLocation = context.FileList().RemoteURL
+                context.table_cache.Put(DatasetTables.CacheKey(dataset, FileTypes.SESSION, "table"), pd.DataFrame({"SessionID" : ["a", "b"], "JobsCompleted" : [1, 2]}))
+
+            test_client = app.test_client()
+            # the first failure opens the circuit
+            with test_client.get("/games/AQUALAB/datasets/2025/6/session") as response:
+                self.assertEqual(response.status_code, 500)
+            with test_client.get("/games/AQUALAB/datasets/2025/6/session") as response:
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("Stale", response.headers["Warning"])
+                self.assertIn("JobsCompleted", response.get_data(as_text=True))
+            with test_client.get("/games/AQUALAB/datasets/2025/6/player") as response:
+                self.assertEqual(response.status_code, 503)
@@ -0,0 +1,83 @@
+# import libraries
+from io import StringIO
+from unittest import TestCase
+# import 3rd-party libraries
+import numpy as np
+import pandas as pd
+# import locals
+from utils.ColumnTypes import ColumnTypes
+
+_MONTH_FULL    : str = "SessionID\tAppVersion\tJobsCompleted\tActiveTime\tFinished\tNote\n" \
+                     + "a\t1.0\t3\t10.5\tTrue\thello\n" \
+                     + "b\t1.0\t5\t2.25\tFalse\thi\n" \
+                     + "c\t1.0\t7\t0.0\tTrue\thello\n" \
+                     + "d\t1.1\t9\t1.5\tFalse\thello\n"
+_MONTH_MISSING : str = "SessionID\tAppVersion\tJobsCompleted\tActiveTime\tFinished\tNote\n" \
+                     + "e\t1.1\t\t4.0\tTrue\t\n" \
+                     + "f\t1.1\t2\t\t\thello\n"
+
+def _read(tsv:str, types=None) -> pd.DataFrame:
+    return ColumnTypes.Apply(pd.read_csv(StringIO(tsv), sep="\t", dtype={"AppVersion" : str}), types=types)
+
+class ColumnTypesCase(TestCase):
+    """Test of the ColumnTypes class, offline, on small tables read with `pd.read_csv`, as the parser reads them.
+
+    Fixture:
+    * Two months of the same small table, one of them with a missing value in each column.
+
+    Case Categories:
+    * Apply(...) function
+        * Gives the same columns the same types in every month, whether or not they have missing values.
+        * Leaves columns whose values don't fit their parse type as parsed, and makes nulls in text columns None.
+    * Learn(...) function
+        * Learns types from one month that parse the next month the same way.
+    * Compact(...) function
+        * Downcasts integers and turns repetitive text into categories, only rounding floats when asked.
+    * ForEncoding(...) function
+        * Gives the same plain Python values for a table whether or not it was compacted, without changing the table.
+    """
+
+    def test_Apply_nullable(self):
+        full    = _read(_MONTH_FULL)
+        missing = _read(_MONTH_MISSING, types={"JobsCompleted" : "Int64", "Finished" : "boolean"})
+        self.assertEqual(full["JobsCompleted"].dtype, "Int64")
+        self.assertEqual(missing["JobsCompleted"].dtype, "Int64")
+        self.assertEqual(full["Finished"].dtype, "boolean")
+        self.assertEqual(missing["Finished"].dtype, "boolean")
+        self.assertIs(missing["Note"][0], None)
+
+    def test_Apply_misfit(self):
+        table = _read(_MONTH_FULL, types={"Note" : "Int64", "Missing" : "float64"})
+        self.assertEqual(table["Note"].dtype, object)
+        self.assertEqual(table["Note"].tolist(), ["hello", "hi", "hello", "hello"])
+
+    def test_Learn_round_trip(self):
+        learned = ColumnTypes.Learn(ColumnTypes.Compact(_read(_MONTH_FULL)))
+        self.assertEqual(learned, {
+            "SessionID" : "object", "AppVersion" : "category", "JobsCompleted" : "Int64",
+            "ActiveTime" : "float64", "Finished" : "boolean", "Note" : "category"
+        })
+        missing = _read(_MONTH_MISSING, types=learned)
+        self.assertEqual(missing["JobsCompleted"].dtype, "Int64")
+        self.assertEqual(missing["Finished"].dtype, "boolean")
+        self.assertIsInstance(missing["AppVersion"].dtype, pd.CategoricalDtype)
+
+    def test_Compact(self):
+        table = ColumnTypes.Compact(_read(_MONTH_FULL))
+        self.assertEqual(table["JobsCompleted"].dtype, "Int8")
+        self.assertEqual(table["ActiveTime"].dtype, np.float64)
+        self.assertIsInstance(table["Note"].dtype, pd.CategoricalDtype)
+        self.assertEqual(table["SessionID"].dtype, object)
+        self.assertEqual(ColumnTypes.Compact(_read(_MONTH_FULL), float32=True)["ActiveTime"].dtype, np.float32)
+
+    def test_ForEncoding_round_trip(self):
+        for tsv in (_MONTH_FULL, _MONTH_MISSING):
+            types     = {"JobsCompleted" : "Int64", "Finished" : "boolean"}
+            plain     = ColumnTypes.ForEncoding(_read(tsv, types=types)).values.tolist()
+            compacted = ColumnTypes.Compact(_read(tsv, types=types))
+            dtypes    = compacted.dtypes.copy()
+            self.assertEqual(ColumnTypes.ForEncoding(compacted).values.tolist(), plain)
+            # the compacted table is left as it was, since it may be shared out of the cache
+            self.assertTrue(compacted.dtypes.equals(dtypes))
+        self.assertEqual(plain[1][2:5], [2, None, None])
+        self.assertEqual(type(plain[1][2]), int)
@@ -0,0 +1,76 @@
+# import libraries
+import zipfile
+from io import BytesIO
+from unittest import TestCase
+# import 3rd-party libraries
+import pandas as pd
+# import locals
+from utils.DatasetFileParser import DatasetFileParser, FileTooLargeError, TableTooLargeError
+
+def _archive(member:str, tsv:str) -> zipfile.ZipFile:
+    raw = BytesIO()
+    with zipfile.ZipFile(raw, "w", zipfile.ZIP_DEFLATED) as zipped:
+        zipped.writestr(member, tsv)
+    return zipfile.ZipFile(BytesIO(raw.getvalue()))
+
+def _member(size:int) -> zipfile.ZipInfo:
+    with _archive("table.tsv", "x" * size) as zipped:
+        return zipped.getinfo("table.tsv")
+
+class DatasetFileParserCase(TestCase):
+    """Test of the DatasetFileParser class, with small archives built in memory.
+
+    Fixture:
+    * Each test builds its own archive, since each needs a particular table.
+
+    Case Categories:
+    * CheckSize(...) function
+        * Passes tables up to each limit, and treats a limit of 0 as no limit.
+        * Raises a FileTooLargeError over the file limit, ahead of a TableTooLargeError over the table limit.
+    * ReadChunks(...) function
+        * Decides the JSON columns once, in the first chunk, and decodes them the same way in every chunk.
+    """
+
+    def test_CheckSize_within(self):
+        member = _member(1000)
+        DatasetFileParser.CheckSize(member, max_file_bytes=1000, max_table_bytes=1000)
+        DatasetFileParser.CheckSize(member, max_file_bytes=0, max_table_bytes=0)
+        DatasetFileParser.CheckSize(member, max_file_bytes=2000)
+
+    def test_CheckSize_file(self):
+        member = _member(1000)
+        with self.assertRaises(FileTooLargeError) as raised:
+            DatasetFileParser.CheckSize(member, max_file_bytes=999, max_table_bytes=500)
+        # over both limits, the table can't be served at all, rather than only streamed
+        self.assertNotIsInstance(raised.exception, TableTooLargeError)
+        self.assertEqual((raised.exception.member, raised.exception.size, raised.exception.limit), ("table.tsv", 1000, 999))
+        self.assertEqual(raised.exception.Description, "1,000 bytes uncompressed, over the 999 bytes limit")
+
+    def test_CheckSize_table(self):
+        member = _member(3 * 2**20)
+        with self.assertRaises(TableTooLargeError) as raised:
+            DatasetFileParser.CheckSize(member, max_file_bytes=0, max_table_bytes=2**20)
+        self.assertEqual(raised.exception.Description, "3.0 MB uncompressed, over the 1.0 MB limit")
+
+    def test_ReadChunks_json_decided_once(self):
+        tsv = "id\tdata\tnote\n" \
+              "1\t{\"a\": 1}\ta\n" \
+              "2\t{\"a\": 2}\tb\n" \
+              "3\t\t{\"looks\": \"like json\"}\n" \
+              "4\t{\"a\": 4}\t[1, 2]\n"
+        with _archive("table.tsv", tsv) as zipped:
+            chunks = list(DatasetFileParser.ReadChunks(zipped=zipped, member="table.tsv", use_columns=None, chunk_rows=2))
+        self.assertEqual(len(chunks), 2)
+        table = pd.concat(chunks, ignore_index=True)
+        # decoded in every chunk, even one where the column has a missing value
+        self.assertEqual(table["data"][0], {"a": 1})
+        self.assertEqual(table["data"][3], {"a": 4})
+        self.assertTrue(pd.isna(table["data"][2]))
+        # left as text in every chunk, even one where it happens to look like JSON
+        self.assertEqual(list(table["note"]), ["a", "b", "{\"looks\": \"like json\"}", "[1, 2]"])
+
+    def test_ReadChunks_no_decode(self):
+        tsv = "id\tdata\n1\t{\"a\": 1}\n"
+        with _archive("table.tsv", tsv) as zipped:
+            chunks = list(DatasetFileParser.ReadChunks(zipped=zipped, member="table.tsv", use_columns=None, chunk_rows=2, decode_json=False))
+        self.assertEqual(chunks[0]["data"][0], "{\"a\": 1}")
@@ -0,0 +1,101 @@
+# import libraries
+import io
+import json
+import zipfile
+from typing import Optional
+from unittest import TestCase
+from urllib.parse import quote
+# import 3rd-party libraries
+from flask import Flask
+# import ogd libraries
+from ogd.apis.models.files.DatasetFile import FileTypes
+# import locals
+from configs.FileAPIConfig import FileAPIConfig
+from utils.DatasetFileParser import TableTooLargeError
+from utils.DatasetTables import DatasetTables
+from utils.DiskCache import DiskCache
+from utils.FileAPIContext import FileAPIContext
+from utils.FileIndex import FileIndex
+from utils.HTTPClient import HTTPClient
+from utils.ParsePool import ParsePool
+from utils.TableCache import TableCache
+from tests.StubFileServer import StubFileServer
+
+_SESSIONS_PATH : str = "/AQUALAB/AQUALAB_20250601_to_20250630_5c61198_session-features.zip"
+
+def _archive(rows:bytes, repeat:int=1) -> bytes:
+    """Build a session archive whose table is `rows` written `repeat` times, compressed so even a huge table makes a small archive."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zipped:
+        with zipped.open("AQUALAB_20250601_to_20250630_5c61198_session-features.tsv", "w", force_zip64=True) as member:
+            for _ in range(repeat):
+                member.write(rows)
+    return buffer.getvalue()
+
+class DatasetTablesCase(TestCase):
+    """Test of the DatasetTables class's loading of whole tables.
+
+    Fixture:
+    * A file list on a stub file server, whose session archive each test serves itself.
+    * A context with a table cache and no disk cache, and a parse pool only where a table is actually parsed.
+
+    Case Categories:
+    * LoadTable(...) function
+        * Parses a table in the parse pool, and serves it from the cache after that.
+        * Rejects a table over the size limit from the archive's central directory, before the parse pool is used,
+          and rejects it again from the cached member info, without downloading it again.
+    """
+
+    @staticmethod
+    def _context(server:StubFileServer, parse_pool:Optional[ParsePool]) -> FileAPIContext:
+        file_list = {
+            "CONFIG"  : {"files_base" : server.URL("/"), "templates_base" : server.URL("/")},
+            "AQUALAB" : {
+                "AQUALAB_20250601_to_20250630" : {
+                    "ogd_revision" : "5c61198", "start_date" : "06/01/2025", "end_date" : "06/30/2025", "date_modified" : "07/01/2025",
+                    "sessions" : 2, "players" : 1,
+                    "sessions_file" : _SESSIONS_PATH.lstrip("/"),
+                    "players_file"  : "AQUALAB/AQUALAB_20250601_to_20250630_5c61198_player-features.zip"
+                }
+            }
+        }
+        client = HTTPClient(max_hosts=1, max_per_host=2, block=False, connect_timeout=2.0, read_timeout=5.0, retries=0, backoff=0.0)
+        return FileAPIContext(
+            config=FileAPIConfig.FromDict(name="DatasetTablesCase", unparsed_elements={}),
+            index=FileIndex(url=server.URL("/file_list.json", f"body={quote(json.dumps(file_list))}"), client=client, refresh_seconds=60),
+            http_client=client, parse_pool=parse_pool, table_cache=TableCache(max_bytes=1024 * 1024),
+            disk_cache=DiskCache(directory=None, max_bytes=0, max_age_seconds=0, evict_interval=0), compression=None
+        )
+
+    def test_LoadTable_parsed(self):
+        pool = ParsePool(max_workers=1, max_queued=0, job_timeout=30.0, start_method="spawn")
+        try:
+            with StubFileServer() as server:
+                server.Serve(_SESSIONS_PATH, _archive(b"SessionID\tJobsCompleted\na\t1\nb\t2\n"))
+                app = Flask("DatasetTablesCase")
+                app.extensions[FileAPIContext.EXTENSION_KEY] = context = self._context(server, parse_pool=pool)
+                with app.app_context():
+                    dataset = next(iter(context.FileList().Games["AQUALAB"].Datasets.values()))
+                    dataset.BaseFileLocation = context.FileList().RemoteURL
+                    table = DatasetTables.LoadTable(dataset=dataset, file_type=FileTypes.SESSION)
+                    self.assertEqual(table["SessionID"].tolist(), ["a", "b"])
+                    self.assertEqual(table["JobsCompleted"].tolist(), [1, 2])
+                    self.assertIs(DatasetTables.LoadTable(dataset=dataset, file_type=FileTypes.SESSION), table)
+                self.assertEqual(server.Hits(_SESSIONS_PATH), 1)
+        finally:
+            pool.Shutdown()
+
+    def test_LoadTable_too_large(self):
+        cfg = FileAPIConfig.FromDict(name="DatasetTablesCase", unparsed_elements={})
+        with StubFileServer() as server:
+            # a table just over the limit; the pool is left out, so reaching it would fail with something other than TableTooLargeError
+            server.Serve(_SESSIONS_PATH, _archive(b"0" * 2**20, repeat=cfg.SizeLimitTableBytes // 2**20 + 1))
+            app = Flask("DatasetTablesCase")
+            app.extensions[FileAPIContext.EXTENSION_KEY] = context = self._context(server, parse_pool=None)
+            with app.app_context():
+                dataset = next(iter(context.FileList().Games["AQUALAB"].Datasets.values()))
+                dataset.BaseFileLocation = context.FileList().RemoteURL
+                for _ in range(2):
+                    with self.assertRaises(TableTooLargeError):
+                        DatasetTables.LoadTable(dataset=dataset, file_type=FileTypes.SESSION)
+            self.assertEqual(server.Hits(_SESSIONS_PATH), 1)
@@ -0,0 +1,81 @@
+# import libraries
+import time
+from unittest import TestCase
+# import 3rd-party libraries
+from flask import Flask
+from flask_restful import Api
+# import locals
+from apis.resources.DatasetList import DatasetList
+from utils.Deadlines import Deadline, DeadlineExceededError, Deadlines
+from utils.FileAPIContext import FileAPIContext
+from utils.FileIndex import FileIndex
+from utils.HTTPClient import HTTPClient
+from tests.StubFileServer import StubFileServer
+
+class DeadlinesCase(TestCase):
+    """Test of the Deadline and Deadlines classes.
+
+    Fixture:
+    * A bare Flask app, for the deadline to live in.
+    * For the 504 response, the DatasetList resource with a file index on a stub file server that's slower than the deadline.
+
+    Case Categories:
+    * Deadline
+        * Expires once its time is up, and shortens timeouts to end by then.
+        * Is only found in the app context it was activated in.
+    * Deadlines
+        * Gives each endpoint its own deadline, or the default, and no deadline for 0.
+        * A request whose upstream fetch outlasts its deadline gets a 504, as soon as the deadline passes.
+    """
+
+    def setUp(self):
+        self.app = Flask("DeadlinesCase")
+
+    def test_Deadline_expiry(self):
+        deadline = Deadline(seconds=0.1)
+        deadline.Check()
+        self.assertFalse(deadline.Expired)
+        self.assertLessEqual(deadline.Timeout(5.0), 0.1)
+        self.assertEqual(deadline.Timeout(0.01), 0.01)
+        time.sleep(0.15)
+        self.assertTrue(deadline.Expired)
+        self.assertEqual(deadline.Remaining(), 0.0)
+        with self.assertRaises(DeadlineExceededError):
+            deadline.Check()
+
+    def test_Deadline_Current(self):
+        self.assertIsNone(Deadline.Current())
+        deadline = Deadline(seconds=10)
+        with self.app.app_context():
+            self.assertIsNone(Deadline.Current())
+            deadline.Activate()
+            self.assertIs(Deadline.Current(), deadline)
+        with self.app.app_context():
+            self.assertIsNone(Deadline.Current())
+
+    def test_Deadlines_SecondsFor(self):
+        deadlines = Deadlines(default_seconds=30, route_seconds={"datasetfile" : 120, "gamelist" : 0})
+        self.assertEqual(deadlines.SecondsFor("datasetfile"), 120)
+        self.assertEqual(deadlines.SecondsFor("datasetlist"), 30)
+        self.assertEqual(deadlines.SecondsFor(None), 30)
+        with self.app.test_request_context("/"):
+            Deadlines(default_seconds=0, route_seconds={}).BeforeRequest()
+            self.assertIsNone(Deadline.Current())
+            deadlines.BeforeRequest()
+            self.assertEqual(Deadline.Current().Seconds, 30)
+
+    def test_Deadlines_504(self):
+        api = Api(self.app)
+        api.add_resource(DatasetList, "/games/<string:game_id>/datasets")
+        self.app.before_request(Deadlines(default_seconds=0.3, route_seconds={}).BeforeRequest)
+        with StubFileServer() as server:
+            client = HTTPClient(max_hosts=1, max_per_host=1, block=False, connect_timeout=2.0, read_timeout=5.0, retries=0, backoff=0.0)
+            # DatasetList only uses the file list, so the rest of the context is left out
+            self.app.extensions[FileAPIContext.EXTENSION_KEY] = FileAPIContext(
+                config=None, index=FileIndex(url=server.URL("/file_list.json", "delay=2"), client=client, refresh_seconds=60),
+                http_client=client, parse_pool=None, table_cache=None, disk_cache=None, compression=None
+            )
+            started = time.perf_counter()
+            with self.app.test_client().get("/games/AQUALAB/datasets") as response:
+                self.assertEqual(response.status_code, 504)
+            self.assertLess(time.perf_counter() - started, 1.5)
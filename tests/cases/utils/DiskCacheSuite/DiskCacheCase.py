@@ -0,0 +1,99 @@
+# import libraries
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import TestCase
+# import locals
+from utils.DiskCache import DiskCache
+
+_HOLD_LOCK = """
+import fcntl, sys, time
+with open(sys.argv[1], "a+b") as lock_file:
+    fcntl.lockf(lock_file.fileno(), fcntl.LOCK_EX)
+    print("locked", flush=True)
+    sys.stdin.read()
+"""
+
+class DiskCacheCase(TestCase):
+    """Test of the DiskCache class, in a temporary directory.
+
+    Fixture:
+    * A fresh cache directory for each test, with no Flask app, as in the threads that use the cache outside of a request.
+
+    Case Categories:
+    * GetOrCompute(...) function
+        * Caches computed values, and logs unreadable entries to its logger, without an app context.
+    * Evict(...) function
+        * Removes old lock files, but not ones held by another process or by a thread in this process.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.logger    = logging.getLogger("DiskCacheCase")
+        self.cache     = DiskCache(directory=self.directory.name, max_bytes=1024 * 1024, max_age_seconds=0, evict_interval=0, logger=self.logger)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _oldLock(self, key:str) -> Path:
+        """Make an entry's lock file, dated two hours ago."""
+        path = self.cache._entryPath(key).with_suffix(".lock")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+        old = time.time() - 7200
+        os.utime(path, (old, old))
+        return path
+
+    def test_GetOrCompute_cached(self):
+        self.assertEqual(self.cache.GetOrCompute("key", lambda : [1, 2]), [1, 2])
+        self.assertEqual(self.cache.GetOrCompute("key", lambda : [3]), [1, 2])
+        self.assertEqual(self.cache.Stats["hits"], 1)
+
+    def test_GetOrCompute_bad_entry_no_app(self):
+        path = self.cache._entryPath("key")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"not a pickle")
+        with self.assertLogs(self.logger, level=logging.WARNING):
+            self.assertEqual(self.cache.GetOrCompute("key", lambda : [1, 2]), [1, 2])
+        # the entry is read again under its lock, in case another process wrote it meanwhile
+        self.assertEqual(self.cache.Stats["errors"], 2)
+
+    def test_Evict_old_lock(self):
+        path = self._oldLock("idle")
+        self.cache.Evict()
+        self.assertFalse(path.exists())
+
+    def test_Evict_lock_held_by_process(self):
+        path   = self._oldLock("busy")
+        holder = subprocess.Popen([sys.executable, "-c", _HOLD_LOCK, str(path)], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        try:
+            self.assertEqual(holder.stdout.readline().strip(), "locked")
+            self.cache.Evict()
+            self.assertTrue(path.exists())
+        finally:
+            holder.communicate("")
+        self.cache.Evict()
+        self.assertFalse(path.exists())
+
+    def test_Evict_lock_held_by_thread(self):
+        path     = self._oldLock("busy")
+        started  = threading.Event()
+        finish   = threading.Event()
+        def _compute():
+            started.set()
+            finish.wait(5)
+            return [1]
+        worker = threading.Thread(target=self.cache.GetOrCompute, args=("busy", _compute))
+        worker.start()
+        try:
+            self.assertTrue(started.wait(5))
+            self.cache.Evict()
+            self.assertTrue(path.exists())
+        finally:
+            finish.set()
+            worker.join()
@@ -0,0 +1,118 @@
+# import libraries
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from urllib.parse import quote
+# import locals
+from utils.FileIndex import FileIndex
+from utils.HTTPClient import HTTPClient
+from utils.IndexSnapshot import IndexSnapshot
+from tests.StubFileServer import StubFileServer
+
+_FILE_LIST : str = '{"CONFIG": {"files_base": "http://127.0.0.1/", "templates_base": "http://127.0.0.1/"}}'
+
+def _client() -> HTTPClient:
+    return HTTPClient(max_hosts=4, max_per_host=4, block=False, connect_timeout=2.0, read_timeout=5.0,
+                      retries=0, backoff=0.0, failure_threshold=0, reset_seconds=30.0)
+
+def _getFromProcess(url:str, directory:str, start, results):
+    """Get the file list in a new process, sharing the snapshot directory, once every process is ready."""
+    index = FileIndex(url=url, client=_client(), refresh_seconds=60, snapshot=IndexSnapshot(directory))
+    start.wait()
+    index.Get()
+    results.put(index._generation) # pylint: disable=protected-access
+
+class FileIndexCase(TestCase):
+    """Test of the FileIndex class, against a local stub file server.
+
+    Fixture:
+    * One StubFileServer for the class, with a separate path for each test, since it counts requests by path.
+    * A fresh snapshot directory for each test.
+
+    Case Categories:
+    * Get(...) function from many threads
+        * Threads that find no copy yet all wait for a single fetch, and share its result.
+        * Once the copy is stale, one thread refreshes it, while the rest keep getting the previous copy without waiting.
+    * Get(...) function with a snapshot
+        * Processes that want the file list at the same time share a single fetch.
+    * IndexSnapshot
+        * Loads the newest published file list, keeps the one before it for readers still loading it, and removes older ones.
+        * Treats a snapshot cut short as not published.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StubFileServer().__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.__exit__()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_Get_threads_first_fetch(self):
+        index = FileIndex(url=self.server.URL("/first_fetch", f"delay=0.3&body={quote(_FILE_LIST)}"), client=_client(), refresh_seconds=60)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            file_lists = list(pool.map(lambda _ : index.Get(), range(8)))
+        self.assertEqual(self.server.Hits("/first_fetch"), 1)
+        self.assertTrue(all(file_list is file_lists[0] for file_list in file_lists))
+
+    def test_Get_threads_stale(self):
+        index = FileIndex(url=self.server.URL("/stale", f"delay=0.5&body={quote(_FILE_LIST)}"), client=_client(), refresh_seconds=0.1)
+        previous = index.Get()
+        time.sleep(0.2)
+        def _timedGet(_item:int):
+            started = time.perf_counter()
+            return index.Get(), time.perf_counter() - started
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(_timedGet, range(8)))
+        self.assertEqual(self.server.Hits("/stale"), 2)
+        # only the refreshing thread waits for the fetch, and gets the new copy
+        waited = [file_list for file_list, seconds in results if seconds >= 0.4]
+        self.assertEqual(len(waited), 1)
+        self.assertIsNot(waited[0], previous)
+        self.assertEqual(sum(1 for file_list, _ in results if file_list is previous), 7)
+
+    def test_Get_snapshot_processes(self):
+        # the delay keeps the first fetch going until the other process is waiting on it
+        url     = self.server.URL("/processes", f"delay=0.5&body={quote(_FILE_LIST)}")
+        context = multiprocessing.get_context("spawn")
+        start   = context.Event()
+        results = context.Queue()
+        workers = [context.Process(target=_getFromProcess, args=(url, self.directory.name, start, results)) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        start.set()
+        generations = [results.get(timeout=30) for _ in workers]
+        for worker in workers:
+            worker.join(timeout=30)
+            self.assertEqual(worker.exitcode, 0)
+        self.assertEqual(self.server.Hits("/processes"), 1)
+        self.assertEqual(generations, [1, 1])
+
+    def test_IndexSnapshot_publish_load(self):
+        snapshot = IndexSnapshot(self.directory.name)
+        self.assertEqual(snapshot.Generation, 0)
+        self.assertIsNone(snapshot.Load())
+        with snapshot.RefreshLock():
+            for body in (b"first", b"second", b"third"):
+                snapshot.Publish(body=body, fetched_at=1000.0)
+        loaded = snapshot.Load()
+        self.assertEqual((loaded.generation, loaded.fetched_at, loaded.body), (3, 1000.0, b"third"))
+        self.assertEqual(sorted(path.name for path in snapshot.Directory.glob("index-*.snap")), ["index-2.snap", "index-3.snap"])
+        # another process's mapping of the counter sees the same generation
+        self.assertEqual(IndexSnapshot(self.directory.name).Generation, 3)
+
+    def test_IndexSnapshot_truncated(self):
+        snapshot = IndexSnapshot(self.directory.name)
+        with snapshot.RefreshLock():
+            snapshot.Publish(body=b"file list", fetched_at=1000.0)
+        path = snapshot.Directory / "index-1.snap"
+        path.write_bytes(path.read_bytes()[:-1])
+        self.assertIsNone(snapshot.Load())
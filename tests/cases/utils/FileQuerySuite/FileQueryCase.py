@@ -0,0 +1,107 @@
+# import libraries
+from unittest import TestCase
+# import 3rd-party libraries
+import numpy as np
+import pandas as pd
+from werkzeug.datastructures import MultiDict
+# import locals
+from utils.FileQuery import FileQuery
+from utils.TableAnalysis import TableAnalysis
+
+class FileQueryCase(TestCase):
+    """Test of the FileQuery class.
+
+    Fixture:
+    * A small session table, with sessions from three app versions and one session without a version.
+
+    Case Categories:
+    * FromArgs(...) function
+        * Parses grouping and aggregations, and rejects unknown functions, aggregations without a group, and columns with a group.
+        * Picks a seed for a sample without one, and rejects samples combined with paging, sorting, or grouping.
+    * Apply(...) function, for aggregates
+        * Filters sessions before grouping, then sorts, and pages through, the aggregated rows.
+    * Apply(...) function, for sorts
+        * Keeps the sort order while filtering sessions and paging, with nulls last.
+        * Gives the same page from just the first rows of the order as from the full order.
+    * Apply(...) and ApplyToChunks(...) functions, for samples
+        * A seed always gives the same sample, in file order, and different seeds give different samples.
+        * A sample from a streamed table, in chunks of any size, matches the sample from the whole table.
+    * BottomK(...) function
+        * Keeps the positions of the `k` smallest keys, in order, or every position when `k` covers them all.
+    """
+
+    def setUp(self):
+        self.table = pd.DataFrame({
+            "SessionID"     : ["a", "b", "c", "d", "e", "f"],
+            "AppVersion"    : ["1.0", "1.1", "1.0", "1.2", None, "1.0"],
+            "JobsCompleted" : [4, 2, 5, 1, 7, 3]
+        })
+
+    def test_FromArgs_aggregate(self):
+        query = FileQuery.FromArgs(MultiDict({"group_by" : "AppVersion", "agg" : "JobsCompleted:sum,SessionID:count", "sort" : "-JobsCompleted:sum"}))
+        self.assertEqual(query.group_by, ["AppVersion"])
+        self.assertEqual(query.aggregations, [("JobsCompleted", "sum"), ("SessionID", "count")])
+        self.assertEqual(query.AggregateOutputColumns, ["AppVersion", "JobsCompleted:sum", "SessionID:count"])
+        self.assertTrue(query.NeedsTable)
+        self.assertIsNone(FileQuery.FromArgs(MultiDict({"group_by" : "AppVersion", "agg" : "JobsCompleted:mode"})))
+        self.assertIsNone(FileQuery.FromArgs(MultiDict({"agg" : "JobsCompleted:sum"})))
+        self.assertIsNone(FileQuery.FromArgs(MultiDict({"group_by" : "AppVersion", "columns" : "SessionID"})))
+
+    def test_Apply_aggregate(self):
+        query  = FileQuery(session_ids={"a", "b", "c", "d", "e"}, group_by=["AppVersion"], aggregations=[("JobsCompleted", "sum")], sort=("JobsCompleted:sum", True), offset=1, limit=2)
+        result = query.Apply(self.table)
+        # sums are 1.0 : 9, None : 7, 1.1 : 2, 1.2 : 1, with session f left out
+        self.assertEqual(list(result.columns), ["AppVersion", "JobsCompleted:sum"])
+        self.assertEqual(result.values.tolist(), [[None, 7], ["1.1", 2]])
+        counted = FileQuery(group_by=["AppVersion"]).Apply(self.table)
+        self.assertEqual(counted.values.tolist(), [["1.0", 3], ["1.1", 1], ["1.2", 1], [None, 1]])
+
+    def test_Apply_sort(self):
+        query  = FileQuery(columns=["SessionID"], session_ids={"a", "b", "d", "e"}, sort=("AppVersion", True), offset=1, limit=2)
+        result = query.Apply(self.table)
+        # descending by version is d, b, a, with e's null version last
+        self.assertEqual(result["SessionID"].tolist(), ["b", "a"])
+        self.assertEqual(FileQuery(columns=["SessionID"], sort=("AppVersion", True)).Apply(self.table)["SessionID"].tolist(), ["d", "b", "a", "c", "f", "e"])
+
+    def test_Apply_sort_order_prefix(self):
+        query = FileQuery(sort=("JobsCompleted", False), offset=1, limit=3)
+        key   = TableAnalysis.SortKey(self.table["JobsCompleted"])
+        full  = query.Apply(self.table, order=TableAnalysis.SortPermutation(key, descending=False))
+        top   = query.Apply(self.table, order=TableAnalysis.TopPositions(key, k=4, descending=False))
+        self.assertEqual(full["SessionID"].tolist(), ["b", "f", "a"])
+        pd.testing.assert_frame_equal(top, full)
+        pd.testing.assert_frame_equal(query.Apply(self.table), full)
+
+    def test_FromArgs_sample(self):
+        query = FileQuery.FromArgs(MultiDict({"sample" : "3"}))
+        self.assertEqual(query.sample, 3)
+        self.assertIsNotNone(query.seed)
+        self.assertEqual(FileQuery.FromArgs(MultiDict({"sample" : "3", "seed" : "42"})).seed, 42)
+        for args in ({"sample" : "3", "limit" : "2"}, {"sample" : "3", "sort" : "SessionID"}, {"sample" : "3", "group_by" : "AppVersion"}, {"sample" : "0"}, {"seed" : "42"}):
+            self.assertIsNone(FileQuery.FromArgs(MultiDict(args)), args)
+
+    def test_Apply_sample_reproducible(self):
+        table   = pd.DataFrame({"SessionID" : [f"s{i}" for i in range(500)], "Value" : np.arange(500)})
+        sampled = FileQuery(sample=20, seed=123).Apply(table)
+        self.assertEqual(len(sampled), 20)
+        self.assertTrue(sampled["Value"].is_monotonic_increasing)
+        pd.testing.assert_frame_equal(FileQuery(sample=20, seed=123).Apply(table), sampled)
+        self.assertNotEqual(FileQuery(sample=20, seed=124).Apply(table)["Value"].tolist(), sampled["Value"].tolist())
+        for chunk_rows in (1, 7, 64, 500):
+            chunks   = [table.iloc[start:start + chunk_rows] for start in range(0, len(table), chunk_rows)]
+            streamed = pd.concat(list(FileQuery(sample=20, seed=123).ApplyToChunks(chunks)))
+            pd.testing.assert_frame_equal(streamed, sampled, obj=f"chunks of {chunk_rows}")
+
+    def test_Apply_sample_sessions(self):
+        sampled = FileQuery(columns=["SessionID"], session_ids={"a", "c", "e"}, sample=2, seed=9).Apply(self.table)
+        self.assertEqual(len(sampled), 2)
+        self.assertTrue(set(sampled["SessionID"]) <= {"a", "c", "e"})
+        self.assertEqual(list(sampled.columns), ["SessionID"])
+        self.assertEqual(len(FileQuery(sample=10, seed=9).Apply(self.table)), len(self.table))
+
+    def test_BottomK(self):
+        keys = np.array([0.5, 0.1, 0.9, 0.3, 0.7])
+        self.assertEqual(TableAnalysis.BottomK(keys, 2).tolist(), [1, 3])
+        self.assertEqual(TableAnalysis.BottomK(keys, 0).tolist(), [])
+        self.assertEqual(TableAnalysis.BottomK(keys, 5).tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(TableAnalysis.BottomK(keys, 9).tolist(), [0, 1, 2, 3, 4])
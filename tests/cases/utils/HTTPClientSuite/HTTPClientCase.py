@@ -0,0 +1,123 @@
+# import libraries
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from unittest import TestCase
+from urllib import error as url_error
+# import 3rd-party libraries
+import urllib3
+# import locals
+from utils.Deadlines import Deadline, DeadlineExceededError
+from utils.HTTPClient import HTTPClient
+from tests.StubFileServer import StubFileServer
+
+def _client(retries:int=3, read_timeout:float=5.0, failure_threshold:int=0, max_per_host:int=4, block:bool=False) -> HTTPClient:
+    return HTTPClient(max_hosts=4, max_per_host=max_per_host, block=block, connect_timeout=2.0, read_timeout=read_timeout,
+                      retries=retries, backoff=0.0, failure_threshold=failure_threshold, reset_seconds=30.0)
+
+class HTTPClientCase(TestCase):
+    """Test of the HTTPClient class, against a local stub file server.
+
+    Fixture:
+    * One StubFileServer for the class, with a separate path for each test, since it counts requests by path.
+
+    Case Categories:
+    * CopyTo(...) function
+        * Retries 502, 503, and 504 responses until they succeed, or raises the last one as an HTTPError once the retries are used up.
+        * Raises other error statuses at once, without retrying.
+        * Copies the whole body, however small the chunks.
+    * Connection pool
+        * Reuses one keep-alive connection for fetches one after another.
+        * With `block`, never opens more than `max_per_host` connections to a host, however many threads fetch at once.
+    * CopyTo(...) function with a deadline
+        * Keeps retrying error statuses and read timeouts, while there's time left.
+        * Stops retrying once the deadline passes.
+    * Circuit breaking
+        * Timeouts cut short by a deadline don't count against the host, but full timeouts do.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StubFileServer().__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.__exit__()
+
+    def test_CopyTo_retries_status(self):
+        client = _client(retries=3)
+        body   = client.Read(self.server.URL("/retries_status", "status=503&times=2"))
+        self.assertEqual(body, b"ok")
+        self.assertEqual(self.server.Hits("/retries_status"), 3)
+
+    def test_CopyTo_retries_used_up(self):
+        client = _client(retries=2)
+        with self.assertRaises(url_error.HTTPError) as raised:
+            client.Read(self.server.URL("/retries_used_up", "status=502"))
+        self.assertEqual(raised.exception.code, 502)
+        self.assertEqual(self.server.Hits("/retries_used_up"), 3)
+
+    def test_CopyTo_no_retry_client_error(self):
+        client = _client(retries=3)
+        with self.assertRaises(url_error.HTTPError) as raised:
+            client.Read(self.server.URL("/no_retry", "status=404"))
+        self.assertEqual(raised.exception.code, 404)
+        self.assertEqual(self.server.Hits("/no_retry"), 1)
+
+    def test_CopyTo_chunks(self):
+        client      = _client()
+        destination = BytesIO()
+        client.CopyTo(self.server.URL("/chunks", "body=abcdefghij"), destination, chunk_bytes=3)
+        self.assertEqual(destination.getvalue(), b"abcdefghij")
+
+    def test_pool_reuses_connection(self):
+        client = _client()
+        url    = self.server.URL("/reuse")
+        for _ in range(5):
+            self.assertEqual(client.Read(url), b"ok")
+        pool = client._pool.connection_from_url(url) # pylint: disable=protected-access
+        self.assertEqual(pool.num_requests, 5)
+        self.assertEqual(pool.num_connections, 1)
+
+    def test_pool_blocks_at_max_per_host(self):
+        client = _client(max_per_host=2, block=True)
+        url    = self.server.URL("/blocks", "delay=0.1")
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            bodies = list(pool.map(lambda _ : client.Read(url), range(8)))
+        self.assertEqual(bodies, [b"ok"] * 8)
+        self.assertLessEqual(client._pool.connection_from_url(url).num_connections, 2) # pylint: disable=protected-access
+
+    def test_CopyTo_deadline_retries_status(self):
+        client = _client(retries=3)
+        body   = client.Read(self.server.URL("/deadline_status", "status=503&times=2"), deadline=Deadline(seconds=10))
+        self.assertEqual(body, b"ok")
+        self.assertEqual(self.server.Hits("/deadline_status"), 3)
+
+    def test_CopyTo_deadline_retries_timeout(self):
+        client = _client(retries=3, read_timeout=0.2)
+        body   = client.Read(self.server.URL("/deadline_timeout", "delay=1&delay_times=1"), deadline=Deadline(seconds=10))
+        self.assertEqual(body, b"ok")
+        self.assertEqual(self.server.Hits("/deadline_timeout"), 2)
+
+    def test_CopyTo_deadline_stops_retries(self):
+        client = _client(retries=10, read_timeout=0.3)
+        start  = time.perf_counter()
+        with self.assertRaises(DeadlineExceededError):
+            client.Read(self.server.URL("/deadline_stops", "delay=2"), deadline=Deadline(seconds=0.5))
+        self.assertLess(time.perf_counter() - start, 1.5)
+        self.assertLessEqual(self.server.Hits("/deadline_stops"), 2)
+
+    def test_CopyTo_cut_short_not_counted(self):
+        client = _client(retries=0, read_timeout=5.0, failure_threshold=1)
+        with self.assertRaises(DeadlineExceededError):
+            client.Read(self.server.URL("/cut_short", "delay=2"), deadline=Deadline(seconds=0.3))
+        stats = client.BreakerStats[f"127.0.0.1:{self.server.Port}"]
+        self.assertEqual(stats["state"], "closed")
+        self.assertEqual(stats["failures"], 0)
+
+    def test_CopyTo_full_timeout_counted(self):
+        client = _client(retries=0, read_timeout=0.2, failure_threshold=1)
+        with self.assertRaises(urllib3.exceptions.HTTPError):
+            client.CopyTo(self.server.URL("/full_timeout", "delay=1"), BytesIO())
+        stats = client.BreakerStats[f"127.0.0.1:{self.server.Port}"]
+        self.assertEqual(stats["state"], "open")
@@ -0,0 +1,80 @@
+# import libraries
+import threading
+from unittest import TestCase
+# import 3rd-party libraries
+from flask import Flask
+# import locals
+from utils.Metrics import Metrics
+
+class MetricsCase(TestCase):
+    """Test of the Metrics class.
+
+    Fixture:
+    * A fresh Metrics for each test, with a few small buckets, since each test counts its own samples.
+
+    Case Categories:
+    * Render(...) function
+        * Renders counters, histograms, and collected stats in the Prometheus text format.
+        * Adds up the counts of every thread.
+    * View(...) function
+        * Only serves the metrics to scrapers with the token, if there is one.
+    """
+
+    def setUp(self):
+        self.metrics = Metrics(path="/metrics", buckets=[0.1, 1.0])
+
+    def test_Render_counter(self):
+        self.metrics.Count("upstream_fetches", ("files.example.org", "ok"))
+        self.metrics.Count("upstream_fetches", ("files.example.org", "ok"), 2)
+        lines = self.metrics.Render().splitlines()
+        self.assertIn("# TYPE ogd_upstream_fetches_total counter", lines)
+        self.assertIn('ogd_upstream_fetches_total{host="files.example.org",outcome="ok"} 3', lines)
+
+    def test_Render_histogram(self):
+        for value in (0.05, 0.5, 5.0):
+            self.metrics.Observe("upstream_fetch_duration_seconds", value, ("files.example.org",))
+        lines = self.metrics.Render().splitlines()
+        self.assertIn("# TYPE ogd_upstream_fetch_duration_seconds histogram", lines)
+        self.assertIn('ogd_upstream_fetch_duration_seconds_bucket{host="files.example.org",le="0.1"} 1', lines)
+        self.assertIn('ogd_upstream_fetch_duration_seconds_bucket{host="files.example.org",le="1"} 2', lines)
+        self.assertIn('ogd_upstream_fetch_duration_seconds_bucket{host="files.example.org",le="+Inf"} 3', lines)
+        self.assertIn('ogd_upstream_fetch_duration_seconds_sum{host="files.example.org"} 5.55', lines)
+        self.assertIn('ogd_upstream_fetch_duration_seconds_count{host="files.example.org"} 3', lines)
+
+    def test_Render_stats(self):
+        self.metrics.AddStats("table_cache", lambda : {"hits" : 4, "bytes" : 1024, "enabled" : True}, counters={"hits"})
+        self.metrics.AddStats("bulkhead", lambda : {"files" : {"active" : 2}, "metadata" : {"active" : 0}}, counters=set(), label="bulkhead")
+        lines = self.metrics.Render().splitlines()
+        self.assertIn("# TYPE ogd_table_cache_hits_total counter", lines)
+        self.assertIn("ogd_table_cache_hits_total 4", lines)
+        self.assertIn("# TYPE ogd_table_cache_bytes gauge", lines)
+        self.assertIn("ogd_table_cache_bytes 1024", lines)
+        # flags aren't numbers to Prometheus, so they're left out
+        self.assertFalse(any("enabled" in line for line in lines))
+        self.assertIn('ogd_bulkhead_active{bulkhead="files"} 2', lines)
+        self.assertIn('ogd_bulkhead_active{bulkhead="metadata"} 0', lines)
+
+    def test_Render_threads(self):
+        def _count():
+            for _ in range(1000):
+                self.metrics.Count("file_index_refresh_failures")
+        threads = [threading.Thread(target=_count) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertIn("ogd_file_index_refresh_failures_total 4000", self.metrics.Render().splitlines())
+
+    def test_View_token(self):
+        metrics = Metrics(path="/metrics", token="s3cret")
+        app     = Flask(__name__)
+        app.add_url_rule(metrics.Path, endpoint="metrics", view_func=metrics.View)
+        client  = app.test_client()
+        with client.get("/metrics") as response:
+            self.assertEqual(response.status_code, 401)
+            self.assertIn("Bearer", response.headers.get("WWW-Authenticate", ""))
+        with client.get("/metrics", headers={"Authorization" : "Bearer wrong"}) as response:
+            self.assertEqual(response.status_code, 401)
+        with client.get("/metrics", headers={"Authorization" : "Bearer s3cret"}) as response:
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("# TYPE ogd_requests_total counter", response.get_data(as_text=True))
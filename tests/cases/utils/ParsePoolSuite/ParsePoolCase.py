@@ -0,0 +1,114 @@
+# import libraries
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+# import 3rd-party libraries
+from flask import Flask
+# import locals
+from utils.Deadlines import Deadline, DeadlineExceededError
+from utils.ParsePool import ParsePool, ParsePoolFullError, ParsePoolTimeoutError
+from utils.ServerTiming import PhaseTimings
+
+def _timedWork(seconds:float) -> str:
+    """A job that times a phase of its own, as parse jobs do. Module-level, so it can be pickled for the workers."""
+    with PhaseTimings.Phase("read_csv"):
+        time.sleep(seconds)
+    return "done"
+
+class ParsePoolCase(TestCase):
+    """Test of the ParsePool class, with spawned worker processes.
+
+    Fixture:
+    * A fresh pool for each test, shut down afterwards. Jobs are builtins or module-level functions, so the workers can unpickle them.
+
+    Case Categories:
+    * Run(...) function
+        * Returns the job's result, from a worker or from the calling thread when the pool is disabled.
+        * Raises a ParsePoolTimeoutError for a job that outlives its timeout, and a DeadlineExceededError once the request's deadline passes.
+        * Rejects jobs at once with a ParsePoolFullError when the workers and queue are full.
+        * Stops a started job that outlives its timeout by replacing the workers, which frees its slot, and runs other jobs on those workers again.
+        * Adds the phases a job times to the request's timings.
+    """
+
+    def setUp(self):
+        self.pool = ParsePool(max_workers=1, max_queued=1, job_timeout=10.0, start_method="spawn")
+
+    def tearDown(self):
+        self.pool.Shutdown()
+
+    def test_Run_result(self):
+        self.assertEqual(self.pool.Run(pow, 2, 10), 1024)
+
+    def test_Run_disabled(self):
+        pool = ParsePool(max_workers=0, max_queued=0, job_timeout=10.0)
+        self.assertFalse(pool.Enabled)
+        self.assertEqual(pool.Run(pow, 2, 10), 1024)
+
+    def test_Run_timeout(self):
+        # start the worker first, so the timeout only covers the job
+        self.pool.Run(pow, 2, 10)
+        started = time.perf_counter()
+        with self.assertRaises(ParsePoolTimeoutError):
+            self.pool.Run(time.sleep, 1.0, timeout=0.2)
+        self.assertLess(time.perf_counter() - started, 0.8)
+
+    def test_Run_deadline(self):
+        self.pool.Run(pow, 2, 10)
+        app = Flask("ParsePoolCase")
+        with app.app_context():
+            Deadline(seconds=0.2).Activate()
+            with self.assertRaises(DeadlineExceededError):
+                self.pool.Run(time.sleep, 1.0)
+            # once the deadline has passed, jobs aren't started at all
+            with self.assertRaises(DeadlineExceededError):
+                self.pool.Run(pow, 2, 10)
+
+    def test_Run_full(self):
+        self.pool.Run(pow, 2, 10)
+        with ThreadPoolExecutor(max_workers=2) as threads:
+            running = [threads.submit(self.pool.Run, time.sleep, 0.5) for _ in range(2)]
+            time.sleep(0.1)
+            with self.assertRaises(ParsePoolFullError):
+                self.pool.Run(pow, 2, 10)
+            for job in running:
+                job.result()
+        # finished jobs free their slots
+        self.assertEqual(self.pool.Run(pow, 2, 10), 1024)
+
+    def test_Run_timeout_recycles(self):
+        pool = ParsePool(max_workers=1, max_queued=0, job_timeout=10.0, start_method="spawn")
+        try:
+            worker = pool.Run(os.getpid)
+            started = time.perf_counter()
+            with self.assertRaises(ParsePoolTimeoutError):
+                pool.Run(time.sleep, 60.0, timeout=0.2)
+            # the stuck job's worker is terminated, which frees the only slot as soon as the pool notices
+            time.sleep(0.5)
+            self.assertNotEqual(pool.Run(os.getpid), worker)
+            self.assertEqual(pool.Run(pow, 2, 10), 1024)
+            self.assertLess(time.perf_counter() - started, 10.0)
+        finally:
+            pool.Shutdown()
+
+    def test_Run_timeout_retries_others(self):
+        pool = ParsePool(max_workers=2, max_queued=0, job_timeout=10.0, start_method="spawn")
+        try:
+            # start both workers first, so both jobs are running when the stuck one times out
+            with ThreadPoolExecutor(max_workers=2) as threads:
+                list(threads.map(lambda _ : pool.Run(time.sleep, 0.2), range(2)))
+                stuck = threads.submit(pool.Run, time.sleep, 60.0, timeout=0.3)
+                other = threads.submit(pool.Run, _timedWork, 1.0)
+                with self.assertRaises(ParsePoolTimeoutError):
+                    stuck.result()
+                self.assertEqual(other.result(), "done")
+        finally:
+            pool.Shutdown()
+
+    def test_Run_phases(self):
+        timings = PhaseTimings()
+        with PhaseTimings.Using(timings):
+            self.assertEqual(self.pool.Run(_timedWork, 0.05), "done")
+        phases = timings.Phases
+        self.assertGreaterEqual(phases["read_csv"], 0.05)
+        self.assertGreaterEqual(phases["parse_pool"], phases["read_csv"])
@@ -0,0 +1,87 @@
+# import libraries
+import pstats
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+# import 3rd-party libraries
+from flask import Flask
+# import locals
+from utils.RequestProfiler import RequestProfiler
+
+_HEADER : str = "X-OGD-Profile"
+
+class RequestProfilerCase(TestCase):
+    """Test of the RequestProfiler class.
+
+    Fixture:
+    * A bare Flask app with one route, and the profiler's hooks registered, saving profiles to a fresh directory for each test.
+
+    Case Categories:
+    * Token check
+        * Only requests that send the right token are profiled, and a profiler without a token is disabled.
+    * Saving profiles
+        * Each profile is saved when its response is closed, with its file name in the response's header, keeping at most `max_files`.
+    * Busy path
+        * A request that asks for a profile while another is running is handled as usual, with a header of `busy`.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _client(self, token:str="secret", max_files:int=0):
+        app      = Flask("RequestProfilerCase")
+        profiler = RequestProfiler(header=_HEADER, token=token, directory=self.directory.name, max_files=max_files)
+        app.before_request(profiler.BeforeRequest)
+        app.after_request(profiler.AfterRequest)
+        app.teardown_request(profiler.TeardownRequest)
+        app.add_url_rule("/work", "work", lambda : str(sum(range(1000))))
+        return app.test_client()
+
+    @property
+    def _profiles(self):
+        return sorted(Path(self.directory.name).glob("*.prof"))
+
+    def test_token_check(self):
+        client = self._client()
+        for headers in ({}, {_HEADER : "wrong"}, {_HEADER : ""}):
+            with client.get("/work", headers=headers) as response:
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn(_HEADER, response.headers)
+        self.assertEqual(self._profiles, [])
+
+    def test_disabled_without_token(self):
+        self.assertFalse(RequestProfiler(header=_HEADER, token="", directory=self.directory.name, max_files=0).Enabled)
+        self.assertFalse(RequestProfiler(header=_HEADER, token="secret", directory=None, max_files=0).Enabled)
+
+    def test_profile_saved(self):
+        client = self._client()
+        with client.get("/work", headers={_HEADER : "secret"}) as response:
+            name = response.headers[_HEADER]
+            self.assertRegex(name, r"^\d{8}-\d{6}-work-[0-9a-f]{8}\.prof$")
+        self.assertEqual([path.name for path in self._profiles], [name])
+        # the saved profile can be read with pstats
+        pstats.Stats(str(self._profiles[0]))
+
+    def test_max_files(self):
+        client = self._client(max_files=2)
+        for _ in range(3):
+            with client.get("/work", headers={_HEADER : "secret"}):
+                pass
+        self.assertEqual(len(self._profiles), 2)
+
+    def test_busy(self):
+        client  = self._client()
+        running = client.get("/work", headers={_HEADER : "secret"})
+        try:
+            with client.get("/work", headers={_HEADER : "secret"}) as busy:
+                self.assertEqual(busy.status_code, 200)
+                self.assertEqual(busy.headers[_HEADER], RequestProfiler.BUSY)
+        finally:
+            running.close()
+        # once the running profile is saved, the next request can be profiled
+        with client.get("/work", headers={_HEADER : "secret"}) as response:
+            self.assertNotEqual(response.headers[_HEADER], RequestProfiler.BUSY)
+        self.assertEqual(len(self._profiles), 2)
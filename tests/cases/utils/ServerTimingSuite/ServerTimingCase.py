@@ -0,0 +1,96 @@
+# import libraries
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+# import 3rd-party libraries
+from flask import Flask, Response
+# import locals
+from configs.FileAPIConfig import FileAPIConfig
+from utils.FileAPIContext import FileAPIContext
+from utils.FileIndex import FileIndex
+from utils.HTTPClient import HTTPClient
+from utils.Metrics import Metrics
+from utils.ServerTiming import PhaseTimings, ServerTiming
+from tests.StubFileServer import StubFileServer
+
+class ServerTimingCase(TestCase):
+    """Test of the PhaseTimings and ServerTiming classes.
+
+    Fixture:
+    * A bare Flask app, to give the timings an app context to live in.
+    * For upstream fetches, an HTTPClient on a stub file server.
+
+    Case Categories:
+    * PhaseTimings
+        * Phases timed in pool threads are added to the request's timings, whether they push an app context or not.
+        * Phases with nothing timing them are dropped.
+        * Dataset file fetches are timed as `download`, but the file list fetch is only timed as part of `index`.
+    * ServerTiming
+        * Reports phases in the metrics, and only in the header when asked to.
+        * The header is off by default.
+    """
+
+    def setUp(self):
+        self.app = Flask("ServerTimingCase")
+
+    def test_PhaseTimings_Activate_threads(self):
+        with self.app.app_context():
+            timings = PhaseTimings()
+            timings.Activate()
+            def _load(_item:int):
+                with self.app.app_context():
+                    timings.Activate()
+                    PhaseTimings.Record("download", 0.5)
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                list(pool.map(_load, range(4)))
+            self.assertEqual(timings.Phases, {"download" : 2.0})
+
+    def test_PhaseTimings_Using_threads(self):
+        timings = PhaseTimings()
+        def _parse(_item:int):
+            with PhaseTimings.Using(timings):
+                PhaseTimings.Record("read_csv", 0.25)
+            PhaseTimings.Record("read_csv", 10.0)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(_parse, range(4)))
+        self.assertEqual(timings.Phases, {"read_csv" : 1.0})
+
+    def test_PhaseTimings_no_timings(self):
+        with self.app.app_context():
+            PhaseTimings.Record("download", 1.0)
+            self.assertIsNone(PhaseTimings.Current())
+
+    def test_PhaseTimings_fetches(self):
+        with StubFileServer() as server:
+            client  = HTTPClient(max_hosts=1, max_per_host=1, block=False, connect_timeout=2.0, read_timeout=5.0, retries=0, backoff=0.0)
+            index   = FileIndex(url=server.URL("/file_list.json", "body={}"), client=client, refresh_seconds=60)
+            context = FileAPIContext(config=None, index=index, http_client=client, parse_pool=None, table_cache=None, disk_cache=None, compression=None)
+            with self.app.app_context():
+                timings = PhaseTimings()
+                timings.Activate()
+                context.FileList()
+                self.assertEqual(list(timings.Phases), ["index"])
+                client.Read(server.URL("/file.zip"))
+                self.assertEqual(list(timings.Phases), ["index", "download"])
+
+    def test_ServerTiming_header(self):
+        timing = ServerTiming(header=True)
+        with self.app.test_request_context("/"):
+            timing.BeforeRequest()
+            PhaseTimings.Record("download", 0.002)
+            response = timing.AfterRequest(Response())
+        self.assertTrue(response.headers["Server-Timing"].startswith("download;dur=2.000, total;dur="))
+
+    def test_ServerTiming_metrics_only(self):
+        metrics = Metrics(path="/metrics")
+        timing  = ServerTiming(header=False, metrics=metrics)
+        with self.app.test_request_context("/"):
+            timing.BeforeRequest()
+            PhaseTimings.Record("download", 0.002)
+            response = timing.AfterRequest(Response())
+        self.assertNotIn("Server-Timing", response.headers)
+        self.assertIn('ogd_request_phase_duration_seconds_count{endpoint="unmatched",phase="download"} 1', metrics.Render().splitlines())
+
+    def test_ServerTiming_header_default(self):
+        # FileAPIConfig is a singleton, so check the defaults it starts from rather than building one
+        self.assertTrue(FileAPIConfig._DEFAULT_SERVER_TIMING["ENABLED"])
+        self.assertFalse(FileAPIConfig._DEFAULT_SERVER_TIMING["HEADER"])
@@ -0,0 +1,297 @@
+# import libraries
+import json
+from typing import Dict, Optional
+from unittest import TestCase
+from urllib.parse import quote
+# import 3rd-party libraries
+import numpy as np
+import pandas as pd
+from flask import Flask
+from flask_restful import Api
+# import ogd libraries
+from ogd.apis.models.files.DatasetFile import FileTypes
+# import locals
+from apis.resources.DatasetFile import DatasetFile
+from apis.resources.DatasetFileFacets import DatasetFileFacets
+from apis.resources.DatasetFileJoin import DatasetFileJoin
+from apis.resources.DatasetFileRange import DatasetFileRange
+from apis.resources.DatasetFileStats import DatasetFileStats
+from configs.FileAPIConfig import FileAPIConfig
+from utils.DatasetTables import DatasetTables
+from utils.DiskCache import DiskCache
+from utils.FileAPIContext import FileAPIContext
+from utils.FileIndex import FileIndex
+from utils.HTTPClient import HTTPClient
+from utils.TableAnalysis import TableAnalysis
+from utils.TableCache import TableCache
+from tests.StubFileServer import StubFileServer
+
+def _sessions(month:int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "SessionID"     : [f"{month}a", f"{month}b", f"{month}c", f"{month}d"],
+        "AppVersion"    : ["1.0", "1.1", "1.0", None],
+        "JobsCompleted" : pd.Series([100, 100, 27, 3], dtype="int8"),
+        "Jobs"          : [{"kelp" : 1}, {"kelp" : 2}, None, {"bloom" : 1}],
+        "PlayerID"      : ["p1", "p2", "p1", "p9"]
+    })
+
+def _players() -> pd.DataFrame:
+    return pd.DataFrame({
+        "PlayerID"      : ["p2", "p1", "p3"],
+        "JobsCompleted" : [30, 12, 0],
+        "Sessions"      : [1, 2, 0]
+    })
+
+class TableAnalysisCase(TestCase):
+    """Test of the TableAnalysis class, and of the dataset file resources' queries on cached tables.
+
+    Fixture:
+    * Small session tables, with a text column, a compact integer column, and a JSON column,
+      and a player table with one player who has no sessions, where one session's player is missing.
+    * For the resources, a file list on a stub file server with datasets for June and July 2025,
+      whose session tables are put in the table cache up front, so nothing is downloaded or parsed.
+
+    Case Categories:
+    * ColumnStats(...) function
+        * Gives numeric columns their range, mean, sample standard deviation, and quartiles, and text columns a count of unique values.
+        * Counts nulls in every column, and leaves the statistics that don't apply to a column as None.
+    * ColumnFacets(...) function
+        * Bins numeric columns into equal-width bins, including the maximum in the last bin.
+        * Counts the top values of text columns, most common first, and leaves out nulls.
+        * Gives JSON columns neither facet.
+    * GroupAggregate(...) function
+        * Groups nulls together, sorts by the group columns, and counts rows when there are no aggregations.
+        * Widens compact integers before summing, and converts text to numbers for numeric aggregations.
+    * SortKey(...), SortPermutation(...), and TopPositions(...) functions
+        * Sort nulls last in both directions, and keep tied rows in file order.
+        * The first `k` rows from TopPositions match the full sort for every `k`, including ties across the `k`-th row, and with candidate rows.
+        * Refuse to sort JSON columns.
+    * JoinTables(...) function
+        * Keeps left rows in order, with nulls for missing matches, or drops them for an inner join.
+        * Projects each side to the requested columns, always keeps the key, and suffixes clashing right columns.
+    * UnaggregatableColumns(...) function
+        * Finds JSON group columns, JSON columns counted with `nunique` or compared with `min`, and text given a numeric aggregation.
+    * DatasetFileStats resource
+        * Summarizes every column of the cached table, along with its row count.
+    * DatasetFileFacets resource
+        * Gives facets for only the requested columns that are in the table.
+    * DatasetFile resource
+        * Sorts a page of the table, and answers a sort on a JSON column with a 400.
+        * Samples the same rows for the same seed, and reports the seed it sampled with.
+    * DatasetFileJoin resource
+        * Joins the requested sessions to their players, and pages through the result.
+    * DatasetFileRange resource
+        * Concatenates the months in order, with the month first, and leaves out months without a dataset.
+        * Applies column selection, session filters, paging, sorts, and grouping to the months together.
+    * DatasetFile and DatasetFileRange resources
+        * A group-by query a column can't support gets a 400, rather than a 500.
+    """
+
+    @staticmethod
+    def _serve(server:StubFileServer, tables:Dict[str, pd.DataFrame], players:Optional[Dict[str, pd.DataFrame]]=None) -> Flask:
+        """Build an app whose file list comes from the stub server, with each month's session table, and any player tables, already cached."""
+        app  = Flask("TableAnalysisCase")
+        api  = Api(app)
+        api.add_resource(DatasetFileStats, "/games/<string:game_id>/datasets/<int:year>/<int:month>/<string:file_type>/stats")
+        api.add_resource(DatasetFileFacets, "/games/<string:game_id>/datasets/<int:year>/<int:month>/<string:file_type>/facets")
+        api.add_resource(DatasetFileJoin,  "/games/<string:game_id>/datasets/<int:year>/<int:month>/joined")
+        api.add_resource(DatasetFileRange, "/games/<string:game_id>/datasets/<string:month_range>/<string:file_type>")
+        api.add_resource(DatasetFile,      "/games/<string:game_id>/datasets/<int:year>/<int:month>/<string:file_type>")
+        datasets = {
+            f"AQUALAB_2025{month}01_to_2025{month}{last}" : {
+                "ogd_revision" : "5c61198", "start_date" : f"{month}/01/2025", "end_date" : f"{month}/{last}/2025", "date_modified" : "08/01/2025",
+                "sessions" : 4, "players" : 1,
+                "sessions_file" : f"AQUALAB/AQUALAB_2025{month}01_to_2025{month}{last}_5c61198_session-features.zip?status=404",
+                "players_file"  : f"AQUALAB/AQUALAB_2025{month}01_to_2025{month}{last}_5c61198_player-features.zip?status=404"
+            } for month, last in (("06", "30"), ("07", "31"))
+        }
+        file_list = {"CONFIG" : {"files_base" : server.URL("/"), "templates_base" : server.URL("/")}, "AQUALAB" : datasets}
+        client    = HTTPClient(max_hosts=1, max_per_host=2, block=False, connect_timeout=2.0, read_timeout=5.0, retries=0, backoff=0.0)
+        # the tables are all cached, so the parse pool and compression are left out
+        context   = FileAPIContext(
+            config=FileAPIConfig.FromDict(name="TableAnalysisCase", unparsed_elements={}),
+            index=FileIndex(url=server.URL("/file_list.json", f"body={quote(json.dumps(file_list))}"), client=client, refresh_seconds=60),
+            http_client=client, parse_pool=None, table_cache=TableCache(max_bytes=16 * 1024 * 1024),
+            disk_cache=DiskCache(directory=None, max_bytes=0, max_age_seconds=0, evict_interval=0), compression=None
+        )
+        app.extensions[FileAPIContext.EXTENSION_KEY] = context
+        app.extensions[HTTPClient.EXTENSION_KEY]     = client
+        with app.app_context():
+            for dataset in context.FileList().Games["AQUALAB"].Datasets.values():
+                dataset.BaseFileLocation = context.FileList().RemoteURL
+                month = f"{dataset.Key.DateFrom.month:02}"
+                context.table_cache.Put(DatasetTables.CacheKey(dataset, FileTypes.SESSION, "table"), tables[month])
+                if players is not None and month in players:
+                    context.table_cache.Put(DatasetTables.CacheKey(dataset, FileTypes.PLAYER, "table"), players[month])
+        return app
+
+    def test_ColumnStats(self):
+        stats = TableAnalysis.ColumnStats(_sessions(6).assign(Empty=[None] * 4))
+        self.assertEqual(list(stats), ["SessionID", "AppVersion", "JobsCompleted", "Jobs", "PlayerID", "Empty"])
+        jobs_completed = stats["JobsCompleted"]
+        self.assertEqual((jobs_completed["count"], jobs_completed["null_count"]), (4, 0))
+        self.assertEqual((jobs_completed["min"], jobs_completed["max"], jobs_completed["mean"]), (3.0, 100.0, 57.5))
+        self.assertAlmostEqual(jobs_completed["std"], pd.Series([100, 100, 27, 3]).std())
+        self.assertEqual(jobs_completed["quantiles"], {"25%" : 21.0, "50%" : 63.5, "75%" : 100.0})
+        self.assertIsNone(jobs_completed["unique"])
+        self.assertEqual((stats["AppVersion"]["count"], stats["AppVersion"]["null_count"], stats["AppVersion"]["unique"]), (3, 1, 2))
+        self.assertIsNone(stats["AppVersion"]["mean"])
+        # JSON and all-null columns only get their counts
+        self.assertEqual({name : value for name, value in stats["Jobs"].items() if value is not None}, {"count" : 3, "null_count" : 1})
+        self.assertEqual({name : value for name, value in stats["Empty"].items() if value is not None}, {"count" : 0, "null_count" : 4})
+
+    def test_DatasetFileStats(self):
+        with StubFileServer() as server:
+            test_client = self._serve(server, {"06" : _sessions(6), "07" : _sessions(7)}).test_client()
+            with test_client.get("/games/AQUALAB/datasets/2025/6/session/stats") as response:
+                self.assertEqual(response.status_code, 200)
+                stats = response.get_json()["val"]
+            self.assertEqual(stats["row_count"], 4)
+            self.assertEqual(stats["columns"]["JobsCompleted"]["max"], 100.0)
+            self.assertEqual(stats["columns"]["SessionID"]["unique"], 4)
+
+    def test_ColumnFacets(self):
+        table   = _sessions(6)
+        numeric = TableAnalysis.ColumnFacets(table["JobsCompleted"], bins=4, top=10)
+        self.assertEqual(numeric["histogram"], {"edges" : [3.0, 27.25, 51.5, 75.75, 100.0], "counts" : [2, 0, 0, 2]})
+        self.assertIsNone(numeric["top_values"])
+        text = TableAnalysis.ColumnFacets(table["AppVersion"], bins=4, top=1)
+        self.assertEqual((text["count"], text["null_count"]), (3, 1))
+        self.assertIsNone(text["histogram"])
+        self.assertEqual(text["top_values"], [{"value" : "1.0", "count" : 2}])
+        json_col = TableAnalysis.ColumnFacets(table["Jobs"], bins=4, top=10)
+        self.assertIsNone(json_col["histogram"])
+        self.assertIsNone(json_col["top_values"])
+
+    def test_DatasetFileFacets(self):
+        with StubFileServer() as server:
+            test_client = self._serve(server, {"06" : _sessions(6), "07" : _sessions(7)}).test_client()
+            with test_client.get("/games/AQUALAB/datasets/2025/6/session/facets?column=JobsCompleted,AppVersion,Missing&bins=2") as response:
+                self.assertEqual(response.status_code, 200)
+                facets = response.get_json()["val"]["columns"]
+            self.assertEqual(list(facets), ["JobsCompleted", "AppVersion"])
+            self.assertEqual(facets["JobsCompleted"]["histogram"]["counts"], [2, 2])
+            self.assertEqual(facets["AppVersion"]["top_values"][0], {"value" : "1.0", "count" : 2})
+
+    def test_GroupAggregate_count(self):
+        result = TableAnalysis.GroupAggregate(_sessions(6), group_by=["AppVersion"], aggregations=None)
+        self.assertEqual(result["AppVersion"].tolist(), ["1.0", "1.1", None])
+        self.assertEqual(result["count"].tolist(), [2, 1, 1])
+
+    def test_GroupAggregate_numeric(self):
+        table  = _sessions(6).assign(Score=["1.5", "2.5", "x", "4"])
+        result = TableAnalysis.GroupAggregate(table, group_by=["AppVersion"], aggregations=[("JobsCompleted", "sum"), ("Score", "mean"), ("SessionID", "nunique")])
+        self.assertEqual(result["JobsCompleted:sum"].tolist(), [127, 100, 3])
+        self.assertEqual(result["Score:mean"].tolist(), [1.5, 2.5, 4.0])
+        self.assertEqual(result["SessionID:nunique"].tolist(), [2, 1, 1])
+
+    def test_SortPermutation_ties_nulls(self):
+        key = TableAnalysis.SortKey(pd.Series([2.0, None, 1.0, 2.0, None, 1.0]))
+        self.assertEqual(TableAnalysis.SortPermutation(key, descending=False).tolist(), [2, 5, 0, 3, 1, 4])
+        self.assertEqual(TableAnalysis.SortPermutation(key, descending=True).tolist(), [0, 3, 2, 5, 1, 4])
+        text = TableAnalysis.SortKey(pd.Series(["b", None, "a", "b"]))
+        self.assertEqual(TableAnalysis.SortPermutation(text, descending=False).tolist(), [2, 0, 3, 1])
+        with self.assertRaises(TypeError):
+            TableAnalysis.SortKey(_sessions(6)["Jobs"])
+
+    def test_TopPositions_matches_sort(self):
+        # few distinct values and plenty of nulls, so most cutoffs fall inside a run of ties
+        rng        = np.random.default_rng(7)
+        values     = rng.integers(0, 4, size=40).astype(float)
+        values[rng.random(40) < 0.3] = np.nan
+        key        = TableAnalysis.SortKey(pd.Series(values))
+        candidates = np.flatnonzero(rng.random(40) < 0.6)
+        for descending in (False, True):
+            full = TableAnalysis.SortPermutation(key, descending=descending)
+            for k in range(0, 42):
+                self.assertEqual(TableAnalysis.TopPositions(key, k=k, descending=descending).tolist(), full[:k].tolist(), f"k={k}, descending={descending}")
+                in_candidates = full[np.isin(full, candidates)]
+                self.assertEqual(TableAnalysis.TopPositions(key, k=k, descending=descending, candidates=candidates).tolist(), in_candidates[:k].tolist())
+            self.assertEqual(TableAnalysis.TopPositions(key, k=None, descending=descending).tolist(), full.tolist())
+
+    def test_JoinTables(self):
+        joined = TableAnalysis.JoinTables(_sessions(6), _players(), on="PlayerID", left_columns=["SessionID", "JobsCompleted"], right_columns=["JobsCompleted"], right_suffix="-Player")
+        self.assertEqual(list(joined.columns), ["PlayerID", "SessionID", "JobsCompleted", "JobsCompleted-Player"])
+        self.assertEqual(joined["SessionID"].tolist(), ["6a", "6b", "6c", "6d"])
+        self.assertEqual(joined["JobsCompleted-Player"].tolist(), [12, 30, 12, None])
+        inner = TableAnalysis.JoinTables(_sessions(6), _players(), on="PlayerID", left_columns=["SessionID", "Unknown"], right_columns=[], how="inner")
+        self.assertEqual(list(inner.columns), ["PlayerID", "SessionID"])
+        self.assertEqual(inner["SessionID"].tolist(), ["6a", "6b", "6c"])
+
+    def test_DatasetFileJoin(self):
+        with StubFileServer() as server:
+            test_client = self._serve(server, {"06" : _sessions(6), "07" : _sessions(7)}, players={"06" : _players()}).test_client()
+            with test_client.get("/games/AQUALAB/datasets/2025/6/joined?session_columns=SessionID&player_columns=Sessions&session_id=6b,6c,6d&limit=2") as response:
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.get_json()["val"]["rows"], [
+                    {"PlayerID" : "p2", "SessionID" : "6b", "Sessions" : 1},
+                    {"PlayerID" : "p1", "SessionID" : "6c", "Sessions" : 2}
+                ])
+            with test_client.get("/games/AQUALAB/datasets/2025/6/joined?session_columns=SessionID&player_columns=Sessions&how=inner&offset=2") as response:
+                self.assertEqual([row["SessionID"] for row in response.get_json()["val"]["rows"]], ["6c"])
+
+    def test_UnaggregatableColumns(self):
+        table = _sessions(6)
+        self.assertEqual(TableAnalysis.UnaggregatableColumns(table, group_by=["AppVersion"], aggregations=[("JobsCompleted", "mean"), ("Jobs", "count")]), [])
+        self.assertEqual(TableAnalysis.UnaggregatableColumns(table, group_by=["Jobs"], aggregations=None), ["Jobs"])
+        self.assertEqual(TableAnalysis.UnaggregatableColumns(table, group_by=["AppVersion"], aggregations=[("Jobs", "nunique")]), ["Jobs"])
+        self.assertEqual(TableAnalysis.UnaggregatableColumns(table, group_by=["AppVersion"], aggregations=[("Jobs", "min")]), ["Jobs"])
+        self.assertEqual(TableAnalysis.UnaggregatableColumns(table, group_by=["AppVersion"], aggregations=[("AppVersion", "mean")]), ["AppVersion"])
+        self.assertEqual(TableAnalysis.UnaggregatableColumns(table, group_by=["AppVersion"], aggregations=[("SessionID", "sum")]), ["SessionID"])
+        # the queries it rejects are the ones GroupAggregate would fail on
+        for group_by, aggs in ((["Jobs"], None), (["AppVersion"], [("Jobs", "nunique")]), (["AppVersion"], [("AppVersion", "mean")])):
+            with self.assertRaises(TypeError):
+                TableAnalysis.GroupAggregate(table, group_by=group_by, aggregations=aggs)
+
+    def test_DatasetFile_sort(self):
+        with StubFileServer() as server:
+            test_client = self._serve(server, {"06" : _sessions(6), "07" : _sessions(7)}).test_client()
+            with test_client.get("/games/AQUALAB/datasets/2025/6/session?sort=-JobsCompleted&columns=SessionID&limit=3") as response:
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual([row["SessionID"] for row in response.get_json()["val"]["rows"]], ["6a", "6b", "6c"])
+            with test_client.get("/games/AQUALAB/datasets/2025/6/session?sort=AppVersion&columns=SessionID&session_id=6b,6c,6d") as response:
+                self.assertEqual([row["SessionID"] for row in response.get_json()["val"]["rows"]], ["6c", "6b", "6d"])
+            with test_client.get("/games/AQUALAB/datasets/2025/6/session?sort=Jobs") as response:
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("can't be sorted", response.get_data(as_text=True))
+
+    def test_DatasetFile_sample(self):
+        with StubFileServer() as server:
+            test_client = self._serve(server, {"06" : _sessions(6), "07" : _sessions(7)}).test_client()
+            samples = []
+            for _ in range(2):
+                with test_client.get("/games/AQUALAB/datasets/2025/6/session?sample=2&seed=11&columns=SessionID") as response:
+                    self.assertEqual(response.status_code, 200)
+                    self.assertIn("sampled with seed 11", response.get_json()["msg"])
+                    samples.append(response.get_json()["val"]["rows"])
+            self.assertEqual(len(samples[0]), 2)
+            self.assertEqual(samples[0], samples[1])
+
+    def test_DatasetFileRange_concat(self):
+        with StubFileServer() as server:
+            test_client = self._serve(server, {"06" : _sessions(6), "07" : _sessions(7)}).test_client()
+            with test_client.get("/games/AQUALAB/datasets/2025-5..2025-7/session?columns=SessionID,JobsCompleted") as response:
+                self.assertEqual(response.status_code, 200)
+                table = response.get_json()["val"]
+            self.assertEqual(table["columns"], ["month", "SessionID", "JobsCompleted"])
+            self.assertEqual([row["SessionID"] for row in table["rows"]], ["6a", "6b", "6c", "6d", "7a", "7b", "7c", "7d"])
+            self.assertEqual([row["month"] for row in table["rows"]], ["2025-06"] * 4 + ["2025-07"] * 4)
+            with test_client.get("/games/AQUALAB/datasets/2025-6..2025-7/session?columns=SessionID&session_id=6d,7a,7b&offset=1&limit=2") as response:
+                self.assertEqual([(row["month"], row["SessionID"]) for row in response.get_json()["val"]["rows"]], [("2025-07", "7a"), ("2025-07", "7b")])
+            # ties on JobsCompleted are kept in month order
+            with test_client.get("/games/AQUALAB/datasets/2025-6..2025-7/session?columns=SessionID&sort=-JobsCompleted&limit=5") as response:
+                self.assertEqual([row["SessionID"] for row in response.get_json()["val"]["rows"]], ["6a", "6b", "7a", "7b", "6c"])
+            with test_client.get("/games/AQUALAB/datasets/2025-6..2025-7/session?group_by=month&agg=JobsCompleted:sum") as response:
+                self.assertEqual(response.get_json()["val"]["rows"], [{"month" : "2025-06", "JobsCompleted:sum" : 230}, {"month" : "2025-07", "JobsCompleted:sum" : 230}])
+
+    def test_resources_unaggregatable_400(self):
+        with StubFileServer() as server:
+            test_client = self._serve(server, {"06" : _sessions(6), "07" : _sessions(7)}).test_client()
+            for query in ("group_by=Jobs", "group_by=AppVersion&agg=Jobs:nunique", "group_by=AppVersion&agg=AppVersion:mean"):
+                for path in ("/games/AQUALAB/datasets/2025/6/session", "/games/AQUALAB/datasets/2025-6..2025-7/session"):
+                    with test_client.get(f"{path}?{query}") as response:
+                        self.assertEqual(response.status_code, 400, f"{path}?{query}")
+                        self.assertIn("can't be grouped or aggregated", response.get_data(as_text=True))
+            with test_client.get("/games/AQUALAB/datasets/2025/6/session?group_by=AppVersion&agg=JobsCompleted:sum") as response:
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual([row["JobsCompleted:sum"] for row in response.get_json()["val"]["rows"]], [127, 100, 3])
@@ -0,0 +1,5 @@
+settings = {
+    "EXTERN_ENDPOINT":"ENDPOINT_PLACEHOLDER",
+    "API_VERSION":"VERSION_PLACEHOLDER",
+    "VERBOSE":False,
+}
\ No newline at end of file